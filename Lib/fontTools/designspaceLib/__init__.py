@@ -2,6 +2,7 @@
 
 from fontTools.misc.py23 import *
 from fontTools.misc.loggingTools import LogMixin
+from bisect import bisect_left
 import collections
 import os
 import posixpath
@@ -17,7 +18,7 @@ from fontTools.misc import plistlib
 __all__ = [
     'DesignSpaceDocumentError', 'DesignSpaceDocument', 'SourceDescriptor',
     'InstanceDescriptor', 'AxisDescriptor', 'RuleDescriptor', 'BaseDocReader',
-    'BaseDocWriter'
+    'BaseDocWriter', 'CompiledRules'
 ]
 
 # ElementTree allows to find namespace-prefixed elements, but not attributes
@@ -185,22 +186,169 @@ def processRules(rules, location, glyphNames):
     """ Apply these rules at this location to these glyphnames.minimum
         - rule order matters
     """
-    newNames = []
+    rules = [rule for rule in rules if evaluateRule(rule, location)]
+    if not rules:
+        return glyphNames
+    substitutions = _combineSubstitutions(rules)
+    return [substitutions.get(name, name) for name in glyphNames]
+
+
+def _combineSubstitutions(rules):
+    """ Return a dict mapping glyph names to the names they are replaced
+        with, once the substitutions of all these rules are applied in order.
+    """
+    combined = {}
+    # the names of the glyphs that are currently replaced with each name,
+    # so that only the substitutions that apply are looked at
+    replaced = collections.defaultdict(set)
     for rule in rules:
-        if evaluateRule(rule, location):
-            for name in glyphNames:
-                swap = False
-                for a, b in rule.subs:
-                    if name == a:
-                        swap = True
-                        break
-                if swap:
-                    newNames.append(b)
+        subs = {}
+        for a, b in rule.subs:
+            # the first substitution of a glyph wins
+            subs.setdefault(a, b)
+        changes = []
+        for a, b in subs.items():
+            for name in replaced.get(a, ()):
+                changes.append((name, b))
+            if a not in combined:
+                changes.append((a, b))
+        for name, newName in changes:
+            if name in combined:
+                replaced[combined[name]].discard(name)
+            combined[name] = newName
+            replaced[newName].add(name)
+    return combined
+
+
+class CompiledRules(object):
+    """ Apply the substitutions of a list of rules at many locations.
+
+        Whether a condition matches a location only depends on where the
+        location is relative to the minimum and maximum values of the
+        conditions. So for each axis, these values cut the axis into
+        segments, and the condition sets that match in each segment are
+        stored as a bit mask. Finding the rules that match a location takes
+        a bisection and a bitwise 'and' per axis, and the substitutions of
+        each combination of rules are only computed once.
+
+            compiled = CompiledRules(document.rules)
+            for instance in document.instances:
+                names = compiled.processRules(instance.location, glyphNames)
+
+        The rules must not be changed after they are compiled.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        # the index of the rule of each condition set, by bit number; the
+        # bits are numbered in rule order
+        self._conditionSetRules = []
+        conditionsByAxis = collections.OrderedDict()
+        # evaluateConditions() fails on conditions with no minimum and no
+        # maximum, so these rules are never compiled
+        self._compiled = True
+        for ruleIndex, rule in enumerate(self.rules):
+            for conditions in rule.conditionSets:
+                bit = len(self._conditionSetRules)
+                self._conditionSetRules.append(ruleIndex)
+                for cd in conditions:
+                    minimum = cd.get('minimum')
+                    maximum = cd.get('maximum')
+                    if minimum is None and maximum is None:
+                        self._compiled = False
+                    conditionsByAxis.setdefault(cd['name'], []).append(
+                        (bit, minimum, maximum)
+                    )
+        self._allBits = (1 << len(self._conditionSetRules)) - 1
+        self._axes = [
+            self._compileAxis(name, conditions)
+            for name, conditions in conditionsByAxis.items()
+        ]
+        self._substitutions = {}  # tuple of rule indices --> substitutions
+
+    def _compileAxis(self, name, conditions):
+        # An axis is cut into segments by the sorted minimum and maximum
+        # values: segment 2 * i + 1 is the value bounds[i], segment 2 * i
+        # the values between bounds[i - 1] and bounds[i].
+        bounds = sorted(set(
+            value
+            for _, minimum, maximum in conditions
+            for value in (minimum, maximum)
+            if value is not None
+        ))
+        numSegments = 2 * len(bounds) + 1
+        ranges = {}
+        for bit, minimum, maximum in conditions:
+            first, last = ranges.get(bit, (0, numSegments - 1))
+            if minimum is not None:
+                first = max(first, 2 * bisect_left(bounds, minimum) + 1)
+            if maximum is not None:
+                last = min(last, 2 * bisect_left(bounds, maximum) + 1)
+            ranges[bit] = first, last
+        # condition sets with no conditions on this axis match everywhere
+        mask = self._allBits
+        added = [0] * (numSegments + 1)
+        removed = [0] * (numSegments + 1)
+        for bit, (first, last) in ranges.items():
+            mask &= ~(1 << bit)
+            if first <= last:
+                added[first] |= 1 << bit
+                removed[last + 1] |= 1 << bit
+        masks = []
+        for segment in range(numSegments):
+            mask = (mask | added[segment]) & ~removed[segment]
+            masks.append(mask)
+        return name, bounds, masks
+
+    def _getSubstitutions(self, location):
+        if not self._compiled:
+            rules = [rule for rule in self.rules if evaluateRule(rule, location)]
+            return _combineSubstitutions(rules) if rules else None
+        matched = self._allBits
+        try:
+            for name, bounds, masks in self._axes:
+                value = location[name]
+                i = bisect_left(bounds, value)
+                if i < len(bounds) and bounds[i] == value:
+                    matched &= masks[2 * i + 1]
                 else:
-                    newNames.append(name)
-            glyphNames = newNames
-            newNames = []
-    return glyphNames
+                    matched &= masks[2 * i]
+        except (KeyError, TypeError):
+            # let evaluateRule() deal with missing axes and odd values
+            rules = [rule for rule in self.rules if evaluateRule(rule, location)]
+            return _combineSubstitutions(rules) if rules else None
+        if not matched:
+            return None
+        ruleIndices = []
+        while matched:
+            lowest = matched & -matched
+            ruleIndex = self._conditionSetRules[lowest.bit_length() - 1]
+            if not ruleIndices or ruleIndices[-1] != ruleIndex:
+                ruleIndices.append(ruleIndex)
+            matched ^= lowest
+        ruleIndices = tuple(ruleIndices)
+        substitutions = self._substitutions.get(ruleIndices)
+        if substitutions is None:
+            substitutions = _combineSubstitutions(
+                [self.rules[i] for i in ruleIndices]
+            )
+            self._substitutions[ruleIndices] = substitutions
+        return substitutions
+
+    def getSubstitutions(self, location):
+        """ Return a dict mapping the glyph names that the rules matching
+            this location replace, to the names they are replaced with.
+        """
+        return dict(self._getSubstitutions(location) or {})
+
+    def processRules(self, location, glyphNames):
+        """ Apply the rules at this location to these glyph names, like
+            the processRules() function.
+        """
+        substitutions = self._getSubstitutions(location)
+        if substitutions is None:
+            return glyphNames
+        return [substitutions.get(name, name) for name in glyphNames]
 
 
 class InstanceDescriptor(SimpleDescriptor):
@@ -990,6 +1138,30 @@ class BaseDocReader(LogMixin):
             self.documentObject.lib = plistlib.fromtree(libElement[0])
 
 
+def _nameKey(descriptor):
+    return descriptor.name
+
+
+def _filenameKey(descriptor):
+    return descriptor.filename
+
+
+def _locationKey(descriptor):
+    return _makeLocationKey(descriptor.location)
+
+
+def _makeLocationKey(location):
+    # a key that compares like the location dict, and that can be hashed
+    # unless the location has unhashable values
+    if location is None:
+        return None
+    try:
+        return tuple(sorted(location.items()))
+    except TypeError:
+        # axis names that can't be sorted; this key is not hashable
+        return dict(location)
+
+
 class DesignSpaceDocument(LogMixin, AsDictMixin):
     """ Read, write data from the designspace file"""
     def __init__(self, readerClass=None, writerClass=None):
@@ -1014,6 +1186,9 @@ class DesignSpaceDocument(LogMixin, AsDictMixin):
         self.lib = {}
         """Custom data associated with the whole document."""
 
+        # indexes of the descriptors, used by the lookup methods
+        self._indexes = {}
+
         #
         if readerClass is not None:
             self.readerClass = readerClass
@@ -1184,11 +1359,70 @@ class DesignSpaceDocument(LogMixin, AsDictMixin):
         return names
 
     def getAxis(self, name):
-        for axisDescriptor in self.axes:
-            if axisDescriptor.name == name:
-                return axisDescriptor
+        for axisDescriptor in self._lookup("axes", _nameKey, name):
+            return axisDescriptor
         return None
 
+    def getSource(self, name):
+        """Return the first SourceDescriptor with this name, or None."""
+        for sourceDescriptor in self._lookup("sources", _nameKey, name):
+            return sourceDescriptor
+        return None
+
+    def getInstance(self, name):
+        """Return the first InstanceDescriptor with this name, or None."""
+        for instanceDescriptor in self._lookup("instances", _nameKey, name):
+            return instanceDescriptor
+        return None
+
+    def getSourcesByFilename(self, filename):
+        """Return the list of SourceDescriptors with this filename, e.g.
+        the sources of the different layers of a UFO."""
+        return self._lookup("sources", _filenameKey, filename)
+
+    def getSourcesAtLocation(self, location):
+        """Return the list of SourceDescriptors whose location is equal to
+        this location."""
+        return self._lookup("sources", _locationKey, _makeLocationKey(location))
+
+    def getInstancesAtLocation(self, location):
+        """Return the list of InstanceDescriptors whose location is equal to
+        this location."""
+        return self._lookup("instances", _locationKey, _makeLocationKey(location))
+
+    def _lookup(self, listName, keyFunc, key):
+        """Return the descriptors of the given list for which keyFunc
+        returns key, in the order of the list.
+
+        The descriptors are looked up in an index, which is rebuilt when
+        descriptors were added or removed, when the descriptors found no
+        longer match (like TTFont.getGlyphID() does with the reverse glyph
+        map), and when none are found. So descriptors can be changed in
+        place, but a descriptor changed to match a key that another one
+        already matches is only found once the index is rebuilt.
+        """
+        descriptors = getattr(self, listName)
+        index = self._indexes.get((listName, keyFunc))
+        try:
+            if (
+                index is not None
+                and index[0] is descriptors
+                and index[1] == len(descriptors)
+            ):
+                found = [descriptors[i] for i in index[2].get(key, ())]
+                if found and all(keyFunc(d) == key for d in found):
+                    return found
+            positions = {}
+            for i, descriptor in enumerate(descriptors):
+                positions.setdefault(keyFunc(descriptor), []).append(i)
+            self._indexes[(listName, keyFunc)] = (
+                descriptors, len(descriptors), positions
+            )
+            return [descriptors[i] for i in positions.get(key, ())]
+        except TypeError:
+            # keys that can't be hashed, like locations with list values
+            return [d for d in descriptors if keyFunc(d) == key]
+
     def findDefault(self):
         """Set and return SourceDescriptor at the default location or None.
 
@@ -1201,10 +1435,9 @@ class DesignSpaceDocument(LogMixin, AsDictMixin):
         # it against the SourceDescriptor locations (always in design space).
         default_location_design = self.newDefaultLocation()
 
-        for sourceDescriptor in self.sources:
-            if sourceDescriptor.location == default_location_design:
-                self.default = sourceDescriptor
-                return sourceDescriptor
+        for sourceDescriptor in self.getSourcesAtLocation(default_location_design):
+            self.default = sourceDescriptor
+            return sourceDescriptor
 
         return None
 
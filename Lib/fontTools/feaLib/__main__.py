@@ -1,6 +1,6 @@
 from fontTools.misc.py23 import *
 from fontTools.ttLib import TTFont
-from fontTools.feaLib.builder import addOpenTypeFeatures, Builder
+from fontTools.feaLib.builder import addOpenTypeFeatures, Builder, timer
 from fontTools import configLogger
 from fontTools.misc.cliTools import makeOutputFileName
 import sys
@@ -27,10 +27,15 @@ def main(args=None):
     parser.add_argument(
         "-v", "--verbose", help="increase the logger verbosity. Multiple -v "
         "options are allowed.", action="count", default=0)
+    parser.add_argument(
+        "--timing", action="store_true",
+        help="log the time spent in each build phase")
     options = parser.parse_args(args)
 
     levels = ["WARNING", "INFO", "DEBUG"]
     configLogger(level=levels[min(len(levels) - 1, options.verbose)])
+    if options.timing:
+        timer.logger.setLevel(logging.DEBUG)
 
     output_font = options.output_font or makeOutputFileName(options.input_font)
     log.info("Compiling features to '%s'" % (output_font))
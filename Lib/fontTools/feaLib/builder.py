@@ -1,11 +1,14 @@
 from fontTools.misc.py23 import *
 from fontTools.misc import sstruct
 from fontTools.misc.textTools import binary2num, safeEval
+from fontTools.misc.loggingTools import Timer
+from fontTools.misc.bulkTools import mapInProcesses
 from fontTools.feaLib.error import FeatureLibError
 from fontTools.feaLib.parser import Parser
 from fontTools.feaLib.ast import FeatureFile
 from fontTools.otlLib import builder as otl
 from fontTools.otlLib.maxContextCalc import maxCtxFont
+from fontTools.otlLib.optimize import compactPairPosSubtable
 from fontTools.ttLib import newTable, getTableModule
 from fontTools.ttLib.tables import otBase, otTables
 from collections import defaultdict, OrderedDict
@@ -14,20 +17,23 @@ import logging
 
 
 log = logging.getLogger(__name__)
+timer = Timer(logger=logging.getLogger(__name__ + ".timer"))
 
 
-def addOpenTypeFeatures(font, featurefile, tables=None):
-    builder = Builder(font, featurefile)
+def addOpenTypeFeatures(font, featurefile, tables=None, parseTreeCache=None):
+    builder = Builder(font, featurefile, parseTreeCache=parseTreeCache)
     builder.build(tables=tables)
 
 
-def addOpenTypeFeaturesFromString(font, features, filename=None, tables=None):
+def addOpenTypeFeaturesFromString(font, features, filename=None, tables=None,
+                                  parseTreeCache=None):
     featurefile = UnicodeIO(tounicode(features))
     if filename:
         # the directory containing 'filename' is used as the root of relative
         # include paths; if None is provided, the current directory is assumed
         featurefile.name = filename
-    addOpenTypeFeatures(font, featurefile, tables=tables)
+    addOpenTypeFeatures(font, featurefile, tables=tables,
+                        parseTreeCache=parseTreeCache)
 
 
 class Builder(object):
@@ -44,7 +50,17 @@ class Builder(object):
         "vhea",
     ])
 
-    def __init__(self, font, featurefile):
+    # Number of worker processes used to build lookups. With the default
+    # of 0 (or 1) lookups are built serially; None means os.cpu_count().
+    # Chaining contextual lookups refer to the indices of other lookups,
+    # so they are always built in this process.
+    buildWorkers = 0
+
+    # Whether to split class-based PairPos subtables into smaller ones
+    # where the kerning matrix is sparse; see fontTools.otlLib.optimize.
+    compactPairPos = False
+
+    def __init__(self, font, featurefile, parseTreeCache=None):
         self.font = font
         # 'featurefile' can be either a path or file object (in which case we
         # parse it into an AST), or a pre-parsed AST instance
@@ -52,6 +68,9 @@ class Builder(object):
             self.parseTree, self.file = featurefile, None
         else:
             self.parseTree, self.file = None, featurefile
+        # optional feaLib.cache.ParseTreeCache, to reuse the parse trees
+        # of previously seen feature files
+        self.parseTreeCache = parseTreeCache
         self.glyphMap = font.getReverseGlyphMap()
         self.default_language_systems_ = set()
         self.script_ = None
@@ -104,8 +123,14 @@ class Builder(object):
 
     def build(self, tables=None):
         if self.parseTree is None:
-            self.parseTree = Parser(self.file, self.glyphMap).parse()
-        self.parseTree.build(self)
+            with timer("parse feature file"):
+                if self.parseTreeCache is not None:
+                    self.parseTree = self.parseTreeCache.parse(
+                        self.file, self.glyphMap)
+                else:
+                    self.parseTree = Parser(self.file, self.glyphMap).parse()
+        with timer("process parse tree"):
+            self.parseTree.build(self)
         # by default, build all the supported tables
         if tables is None:
             tables = self.supportedTables
@@ -128,7 +153,8 @@ class Builder(object):
         for tag in ('GPOS', 'GSUB'):
             if tag not in tables:
                 continue
-            table = self.makeTable(tag)
+            with timer("build '%s'" % tag):
+                table = self.makeTable(tag)
             if (table.ScriptList.ScriptCount > 0 or
                     table.FeatureList.FeatureCount > 0 or
                     table.LookupList.LookupCount > 0):
@@ -140,7 +166,8 @@ class Builder(object):
                 "OS/2" in self.font):
             self.font["OS/2"].usMaxContext = maxCtxFont(self.font)
         if "GDEF" in tables:
-            gdef = self.buildGDEF()
+            with timer("build 'GDEF'"):
+                gdef = self.buildGDEF()
             if gdef:
                 self.font["GDEF"] = gdef
             elif "GDEF" in self.font:
@@ -529,7 +556,22 @@ class Builder(object):
                 continue
             lookup.lookup_index = len(lookups)
             lookups.append(lookup)
-        return [l.build() for l in lookups]
+        with timer("build %d %s lookups" % (len(lookups), tag)):
+            built = self.buildLookupsInParallel_(lookups)
+            return [built[i] if i in built else l.build()
+                    for i, l in enumerate(lookups)]
+
+    def buildLookupsInParallel_(self, lookups):
+        """Build the lookups that don't refer to other lookups in a pool of
+        worker processes, if so configured; return {lookup_index: Lookup}.
+        """
+        indices = [i for i, l in enumerate(lookups)
+                   if not isinstance(l, _CHAINING_LOOKUP_BUILDERS)]
+        results = mapInProcesses(
+            _buildLookups, [lookups[i] for i in indices], self.buildWorkers)
+        if results is None:
+            return {}
+        return dict(zip(indices, results))
 
     def makeTable(self, tag):
         table = getattr(otTables, tag, None)()
@@ -986,6 +1028,7 @@ class Builder(object):
     def add_class_pair_pos(self, location, glyphclass1, value1,
                            glyphclass2, value2):
         lookup = self.get_lookup_(location, PairPosBuilder)
+        lookup.compact = self.compactPairPos
         lookup.addClassPair(location, glyphclass1, value1, glyphclass2, value2)
 
     def add_subtable_break(self, location):
@@ -1107,6 +1150,12 @@ def makeOpenTypeValueRecord(v, pairPosContext):
     return valRec, valRec.getFormat()
 
 
+def _buildLookups(lookups):
+    """Build a list of lookups in a worker process; see
+    Builder.buildLookupsInParallel_()."""
+    return [lookup.build() for lookup in lookups]
+
+
 class LookupBuilder(object):
     SUBTABLE_BREAK_ = "SUBTABLE_BREAK"
 
@@ -1120,6 +1169,13 @@ class LookupBuilder(object):
         self.lookup_index = None  # assigned when making final tables
         assert table in ('GPOS', 'GSUB')
 
+    def __getstate__(self):
+        # Lookups are built from their rules and glyphMap alone, so leave
+        # the font behind when sending them to worker processes.
+        state = self.__dict__.copy()
+        state["font"] = None
+        return state
+
     def equals(self, other):
         return (isinstance(other, self.__class__) and
                 self.table == other.table and
@@ -1145,7 +1201,7 @@ class LookupBuilder(object):
         for mark classes as the AFDKO makeotf tool.
         """
         ids = {}
-        for mark in sorted(marks.keys(), key=self.font.getGlyphID):
+        for mark in sorted(marks.keys(), key=self.glyphMap.__getitem__):
             markClassName, _markAnchor = marks[mark]
             if markClassName not in ids:
                 ids[markClassName] = len(ids)
@@ -1560,6 +1616,7 @@ class PairPosBuilder(LookupBuilder):
         self.pairs = []  # [(gc1, value1, gc2, value2)*]
         self.glyphPairs = {}  # (glyph1, glyph2) --> (value1, value2)
         self.locations = {}  # (gc1, gc2) --> (filepath, line, column)
+        self.compact = False  # see Builder.compactPairPos
 
     def addClassPair(self, location, glyphclass1, value1, glyphclass2, value2):
         self.pairs.append((glyphclass1, value1, glyphclass2, value2))
@@ -1613,7 +1670,12 @@ class PairPosBuilder(LookupBuilder):
             subtables.extend(
                 otl.buildPairPosGlyphs(self.glyphPairs, self.glyphMap))
         for key in sorted(builders.keys()):
-            subtables.extend(builders[key].subtables())
+            for st in builders[key].subtables():
+                if self.compact:
+                    subtables.extend(
+                        compactPairPosSubtable(st, self.glyphMap))
+                else:
+                    subtables.append(st)
         return self.buildLookup_(subtables)
 
 
@@ -1648,3 +1710,6 @@ class SinglePosBuilder(LookupBuilder):
     def build(self):
         subtables = otl.buildSinglePos(self.mapping, self.glyphMap)
         return self.buildLookup_(subtables)
+
+
+_CHAINING_LOOKUP_BUILDERS = (ChainContextPosBuilder, ChainContextSubstBuilder)
@@ -0,0 +1,188 @@
+"""Cache of parsed feature files.
+
+Parsing a large feature file is expensive, and build systems often compile
+the same file (and the files it includes) for several masters or instances.
+A ParseTreeCache keeps the parse tree of each feature file it has seen,
+keyed by the contents of the file and by the glyph names it was parsed
+with. Since the files included by a feature file are only known after
+parsing it, the cache also records the contents of each included file, and
+an entry is only reused while all of them are unchanged.
+
+    cache = ParseTreeCache()
+    addOpenTypeFeatures(font1, "features.fea", parseTreeCache=cache)
+    addOpenTypeFeatures(font2, "features.fea", parseTreeCache=cache)
+
+Parse trees are stored pickled, so every lookup returns a fresh copy that
+the caller is free to modify. If a directory is given, entries are also
+stored there, and shared between processes.
+
+Unpickling data can run arbitrary code, so the entries stored in the
+directory are signed with a secret key, and files whose signature does not
+match are ignored. By default the key is a random one kept in a file only
+readable by the user, ~/.cache/fonttools/feaLib-cache.key, so entries are
+only shared between the processes of the same user; processes of several
+users can share a directory by passing the same key, which must be kept
+secret from anyone else able to write to the directory.
+"""
+from fontTools.misc.py23 import *
+from fontTools.misc.bulkTools import pausedGarbageCollection
+from fontTools.feaLib.parser import Parser
+import hashlib
+import hmac
+import logging
+import os
+import pickle
+import tempfile
+
+
+log = logging.getLogger(__name__)
+
+
+class ParseTreeCache(object):
+    """Cache of parse trees, in memory and, if 'directory' is given, in
+    files there. The files are signed with 'key' (bytes), by default the
+    key of the user; see the module docstring. Anyone who knows the key
+    and can write to the directory can run code in the processes using
+    the cache."""
+
+    def __init__(self, directory=None, key=None):
+        self.directory = directory
+        self.entries_ = {}  # key --> (includes, pickled parse tree)
+        if directory is not None and key is None:
+            key = _userKey()
+        self.signingKey_ = key
+
+    def parse(self, featurefile, glyphNames=(), followIncludes=True):
+        """Return the parse tree of 'featurefile' (a path or file object),
+        like Parser(featurefile, glyphNames, followIncludes).parse()."""
+        if hasattr(featurefile, "read"):
+            text = featurefile.read()
+            filename = getattr(featurefile, "name", None)
+        else:
+            with open(featurefile, "r", encoding="utf-8") as f:
+                text = f.read()
+            filename = featurefile
+
+        key = self.makeKey_(text, filename, glyphNames, followIncludes)
+        entry = self.getEntry_(key)
+        if entry is not None:
+            includes, data = entry
+            if all(_hashFile(path) == digest for path, digest in includes):
+                log.debug("Using cached parse tree for %s",
+                          filename or "<features>")
+                return _loads(data)
+
+        featurefile = UnicodeIO(text)
+        featurefile.name = filename
+        parser = Parser(featurefile, glyphNames,
+                        followIncludes=followIncludes)
+        doc = parser.parse()
+        includes = [(path, _hashFile(path))
+                    for path in parser.lexer_.includes_]
+        data = pickle.dumps(doc, pickle.HIGHEST_PROTOCOL)
+        self.setEntry_(key, (includes, data))
+        return doc
+
+    def clear(self):
+        self.entries_.clear()
+
+    @staticmethod
+    def makeKey_(text, filename, glyphNames, followIncludes):
+        h = hashlib.sha256()
+        # Relative includes are resolved against the directory of the
+        # feature file, or the current directory if it has no name.
+        if filename is not None:
+            h.update(tobytes(os.path.abspath(filename), "utf-8"))
+        else:
+            h.update(tobytes(os.getcwd(), "utf-8"))
+        h.update(b"\0" if followIncludes else b"\1")
+        h.update(tobytes(text, "utf-8"))
+        h.update(b"\0")
+        h.update(tobytes("\n".join(sorted(glyphNames)), "utf-8"))
+        return h.hexdigest()
+
+    def getEntry_(self, key):
+        entry = self.entries_.get(key)
+        if entry is None and self.directory is not None:
+            try:
+                with open(self.entryPath_(key), "rb") as f:
+                    signature = f.read(_SIGNATURE_SIZE)
+                    data = f.read()
+            except (IOError, OSError):
+                return None
+            if not hmac.compare_digest(signature, self.sign_(data)):
+                log.warning("Ignoring cache entry with a bad signature: %s",
+                            self.entryPath_(key))
+                return None
+            try:
+                entry = pickle.loads(data)
+            except (EOFError, pickle.UnpicklingError):
+                return None
+            self.entries_[key] = entry
+        return entry
+
+    def setEntry_(self, key, entry):
+        self.entries_[key] = entry
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # write to a temporary file first, so that concurrent builds
+        # never see partially written entries
+        data = pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.sign_(data))
+            f.write(data)
+        os.replace(tmp, self.entryPath_(key))
+
+    def sign_(self, data):
+        return hmac.new(self.signingKey_, data, hashlib.sha256).digest()
+
+    def entryPath_(self, key):
+        return os.path.join(self.directory, key + ".pickle")
+
+
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+def _userKey():
+    # The key signing the cache entries of this user, read from a file only
+    # the user can read, which is created if needed; if that fails, a new
+    # key, so that the entries written are only used by this cache.
+    path = os.path.join(
+        os.path.expanduser("~"), ".cache", "fonttools", "feaLib-cache.key")
+    try:
+        try:
+            with open(path, "rb") as f:
+                key = f.read()
+        except FileNotFoundError:
+            key = b""
+        if len(key) < 32:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            # create the key under a temporary name, so that a concurrent
+            # process never reads it partially written
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(os.urandom(32))
+            os.replace(tmp, path)
+            with open(path, "rb") as f:
+                key = f.read()
+    except (IOError, OSError) as e:
+        log.warning("Can't use the key in %s (%s); cache entries won't "
+                    "be shared", path, e)
+        key = os.urandom(32)
+    return key
+
+
+def _loads(data):
+    # parse trees consist of many small objects
+    with pausedGarbageCollection():
+        return pickle.loads(data)
+
+
+def _hashFile(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (IOError, OSError):
+        return None
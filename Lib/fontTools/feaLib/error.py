@@ -5,6 +5,10 @@ class FeatureLibError(Exception):
         Exception.__init__(self, message)
         self.location = location
 
+    def __reduce__(self):
+        # so that errors raised in worker processes can be pickled
+        return (self.__class__, (Exception.__str__(self), self.location))
+
     def __str__(self):
         message = Exception.__str__(self)
         if self.location:
@@ -31,6 +31,25 @@ class Lexer(object):
 
     RE_GLYPHCLASS = re.compile(r"^[A-Za-z_0-9.\-]+$")
 
+    # Leading whitespace, followed by one token. The group names are the
+    # token types; alternatives are tried in order, so e.g. "+" and ":"
+    # (which may start glyph names) are lexed as NAME rather than SYMBOL.
+    RE_TOKEN_ = re.compile(r"""
+        [ \t]*
+        (?:
+            (?P<NEWLINE>\r\n?|\n)
+          | (?P<COMMENT>\#[^\r\n]*)
+          | (?P<CID>\\[0-9]+)
+          | (?P<GLYPHCLASS>@[A-Za-z0-9_.+*:^~!/-]*)
+          | (?P<NAME>[A-Za-z_+*:.^~!\\][A-Za-z0-9_.+*:^~!/-]*)
+          | (?P<HEXADECIMAL>0[xX][0-9A-Fa-f]*)
+          | (?P<OCTAL>0[0-9]+)
+          | (?P<FLOAT>-?[0-9]+\.+[0-9]*)
+          | (?P<NUMBER>-?[0-9]+)
+          | (?P<SYMBOL>[,;:\-+'{}\[\]<>()=])
+          | (?P<STRING>"[^"]*")
+        )""", re.VERBOSE)
+
     MODE_NORMAL_ = "NORMAL"
     MODE_FILENAME_ = "FILENAME"
 
@@ -60,6 +79,63 @@ class Lexer(object):
         return (self.filename_ or "<features>", self.line_, column)
 
     def next_(self):
+        match = Lexer.RE_TOKEN_.match(self.text_, self.pos_)
+        if match is None:
+            return self.next_special_()
+        token_type = match.lastgroup
+        start, self.pos_ = match.span(token_type)
+        # The current line and its start offset are tracked incrementally,
+        # so the location is computed without rescanning the text.
+        location = (self.filename_ or "<features>", self.line_,
+                    start - self.line_start_ + 1)
+
+        if token_type == Lexer.NEWLINE:
+            self.line_ += 1
+            self.line_start_ = self.pos_
+            return (Lexer.NEWLINE, None, location)
+        token = match.group(token_type)
+        if token_type == Lexer.COMMENT:
+            return (Lexer.COMMENT, token, location)
+        if self.mode_ is Lexer.MODE_FILENAME_:
+            self.pos_ = start
+            return self.next_special_()
+        if token_type == Lexer.NAME:
+            if token == "include":
+                self.mode_ = Lexer.MODE_FILENAME_
+            return (Lexer.NAME, token, location)
+        if token_type == Lexer.SYMBOL:
+            return (Lexer.SYMBOL, token, location)
+        if token_type == Lexer.NUMBER:
+            return (Lexer.NUMBER, int(token, 10), location)
+        if token_type == Lexer.GLYPHCLASS:
+            glyphclass = token[1:]
+            if len(glyphclass) < 1:
+                raise FeatureLibError("Expected glyph class name", location)
+            if len(glyphclass) > 63:
+                raise FeatureLibError(
+                    "Glyph class names must not be longer than 63 characters",
+                    location)
+            if not Lexer.RE_GLYPHCLASS.match(glyphclass):
+                raise FeatureLibError(
+                    "Glyph class names must consist of letters, digits, "
+                    "underscore, period or hyphen", location)
+            return (Lexer.GLYPHCLASS, glyphclass, location)
+        if token_type == Lexer.FLOAT:
+            return (Lexer.FLOAT, float(token), location)
+        if token_type == Lexer.CID:
+            return (Lexer.CID, int(token[1:], 10), location)
+        if token_type == Lexer.HEXADECIMAL:
+            return (Lexer.HEXADECIMAL, int(token, 16), location)
+        if token_type == Lexer.OCTAL:
+            return (Lexer.OCTAL, int(token, 8), location)
+        assert token_type == Lexer.STRING, token_type
+        # strip newlines embedded within a string
+        string = token[1:-1].replace("\r", "").replace("\n", "")
+        return (Lexer.STRING, string, location)
+
+    def next_special_(self):
+        # Handles what RE_TOKEN_ does not: the end of the text, file names
+        # following an include statement, and errors.
         self.scan_over_(Lexer.CHAR_WHITESPACE_)
         location = self.location_()
         start = self.pos_
@@ -68,21 +144,6 @@ class Lexer(object):
         if start >= limit:
             raise StopIteration()
         cur_char = text[start]
-        next_char = text[start + 1] if start + 1 < limit else None
-
-        if cur_char == "\n":
-            self.pos_ += 1
-            self.line_ += 1
-            self.line_start_ = self.pos_
-            return (Lexer.NEWLINE, None, location)
-        if cur_char == "\r":
-            self.pos_ += (2 if next_char == "\n" else 1)
-            self.line_ += 1
-            self.line_start_ = self.pos_
-            return (Lexer.NEWLINE, None, location)
-        if cur_char == "#":
-            self.scan_until_(Lexer.CHAR_NEWLINE_)
-            return (Lexer.COMMENT, text[start:self.pos_], location)
 
         if self.mode_ is Lexer.MODE_FILENAME_:
             if cur_char != "(":
@@ -97,68 +158,9 @@ class Lexer(object):
             self.mode_ = Lexer.MODE_NORMAL_
             return (Lexer.FILENAME, text[start + 1:self.pos_ - 1], location)
 
-        if cur_char == "\\" and next_char in Lexer.CHAR_DIGIT_:
-            self.pos_ += 1
-            self.scan_over_(Lexer.CHAR_DIGIT_)
-            return (Lexer.CID, int(text[start + 1:self.pos_], 10), location)
-        if cur_char == "@":
-            self.pos_ += 1
-            self.scan_over_(Lexer.CHAR_NAME_CONTINUATION_)
-            glyphclass = text[start + 1:self.pos_]
-            if len(glyphclass) < 1:
-                raise FeatureLibError("Expected glyph class name", location)
-            if len(glyphclass) > 63:
-                raise FeatureLibError(
-                    "Glyph class names must not be longer than 63 characters",
-                    location)
-            if not Lexer.RE_GLYPHCLASS.match(glyphclass):
-                raise FeatureLibError(
-                    "Glyph class names must consist of letters, digits, "
-                    "underscore, period or hyphen", location)
-            return (Lexer.GLYPHCLASS, glyphclass, location)
-        if cur_char in Lexer.CHAR_NAME_START_:
-            self.pos_ += 1
-            self.scan_over_(Lexer.CHAR_NAME_CONTINUATION_)
-            token = text[start:self.pos_]
-            if token == "include":
-                self.mode_ = Lexer.MODE_FILENAME_
-            return (Lexer.NAME, token, location)
-        if cur_char == "0" and next_char in "xX":
-            self.pos_ += 2
-            self.scan_over_(Lexer.CHAR_HEXDIGIT_)
-            return (Lexer.HEXADECIMAL, int(text[start:self.pos_], 16), location)
-        if cur_char == "0" and next_char in Lexer.CHAR_DIGIT_:
-            self.scan_over_(Lexer.CHAR_DIGIT_)
-            return (Lexer.OCTAL, int(text[start:self.pos_], 8), location)
-        if cur_char in Lexer.CHAR_DIGIT_:
-            self.scan_over_(Lexer.CHAR_DIGIT_)
-            if self.pos_ >= limit or text[self.pos_] != ".":
-                return (Lexer.NUMBER, int(text[start:self.pos_], 10), location)
-            self.scan_over_(".")
-            self.scan_over_(Lexer.CHAR_DIGIT_)
-            return (Lexer.FLOAT, float(text[start:self.pos_]), location)
-        if cur_char == "-" and next_char in Lexer.CHAR_DIGIT_:
-            self.pos_ += 1
-            self.scan_over_(Lexer.CHAR_DIGIT_)
-            if self.pos_ >= limit or text[self.pos_] != ".":
-                return (Lexer.NUMBER, int(text[start:self.pos_], 10), location)
-            self.scan_over_(".")
-            self.scan_over_(Lexer.CHAR_DIGIT_)
-            return (Lexer.FLOAT, float(text[start:self.pos_]), location)
-        if cur_char in Lexer.CHAR_SYMBOL_:
-            self.pos_ += 1
-            return (Lexer.SYMBOL, cur_char, location)
         if cur_char == '"':
-            self.pos_ += 1
-            self.scan_until_('"')
-            if self.pos_ < self.text_length_ and self.text_[self.pos_] == '"':
-                self.pos_ += 1
-                # strip newlines embedded within a string
-                string = re.sub("[\r\n]", "", text[start + 1:self.pos_ - 1])
-                return (Lexer.STRING, string, location)
-            else:
-                raise FeatureLibError("Expected '\"' to terminate string",
-                                      location)
+            raise FeatureLibError("Expected '\"' to terminate string",
+                                  location)
         raise FeatureLibError("Unexpected character: %r" % cur_char,
                               location)
 
@@ -193,6 +195,7 @@ class IncludingLexer(object):
     def __init__(self, featurefile):
         self.lexers_ = [self.make_lexer_(featurefile)]
         self.featurefilepath = self.lexers_[0].filename_
+        self.includes_ = []  # paths of the included files, in order
 
     def __iter__(self):
         return self
@@ -232,6 +235,7 @@ class IncludingLexer(object):
                                           fname_location)
                 try:
                     self.lexers_.append(self.make_lexer_(path))
+                    self.includes_.append(path)
                 except IOError as err:
                     # FileNotFoundError does not exist on Python < 3.3
                     import errno
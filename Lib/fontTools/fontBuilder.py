@@ -133,6 +133,7 @@ fb.save("test.otf")
 from .misc.py23 import *
 from .ttLib import TTFont, newTable
 from .ttLib.tables._c_m_a_p import cmap_classes
+from .ttLib.tables._g_l_y_f import Glyph
 from .ttLib.tables._n_a_m_e import NameRecord, makeName
 from .misc.timeTools import timestampNow
 import struct
@@ -364,6 +365,19 @@ class FontBuilder(object):
         for k, v in values.items():
             setattr(table, k, v)
 
+    def _itemsByGlyphName(self, values):
+        """Return the (glyphName, value) items of `values`, a dict keyed
+        by glyph name, or a sequence of values in glyph order.
+        """
+        if hasattr(values, "items"):
+            return values.items()
+        glyphOrder = self.font.getGlyphOrder()
+        values = list(values)
+        if len(values) != len(glyphOrder):
+            raise ValueError(
+                "expected %d values in glyph order, got %d" % (len(glyphOrder), len(values)))
+        return zip(glyphOrder, values)
+
     def setupHead(self, **values):
         """Create a new `head` table and initialize it with default values,
         which can be overridden by keyword arguments.
@@ -488,8 +502,11 @@ class FontBuilder(object):
         which can be overridden by keyword arguments.
         """
         if "xAvgCharWidth" not in values:
-            gs = self.font.getGlyphSet()
-            widths = [gs[glyphName].width for glyphName in gs.keys() if gs[glyphName].width > 0]
+            # the advance widths are taken from the metrics, rather than
+            # from a glyph set, which would decompile all glyphs
+            metrics = self.font["hmtx"].metrics
+            widths = [metrics[glyphName][0] for glyphName in self.font.getGlyphOrder()]
+            widths = [width for width in widths if width > 0]
             values["xAvgCharWidth"] = int(round(sum(widths) / float(len(widths))))
         self._initTableWithValues("OS/2", _OS2Defaults, values)
         if not ("ulUnicodeRange1" in values or "ulUnicodeRange2" in values or
@@ -607,13 +624,29 @@ class FontBuilder(object):
     def setupGlyf(self, glyphs, calcGlyphBounds=True):
         """Create the `glyf` table from a dict, that maps glyph names
         to `fontTools.ttLib.tables._g_l_y_f.Glyph` objects, for example
-        as made by `fontTools.pens.ttGlyphPen.TTGlyphPen`.
+        as made by `fontTools.pens.ttGlyphPen.TTGlyphPen`. The `glyphs`
+        argument can also be a sequence of glyphs in glyph order.
+
+        Instead of a `Glyph` object, a glyph can be given as compiled
+        glyph data (bytes), as found in the `glyf` table of a font file.
+        This skips building the glyph objects of large fonts: the data
+        is kept as is, like the glyphs of a font read from a file, and
+        only decompiled when the glyph is accessed through the `glyf`
+        table, or when the font is saved with its bounding boxes
+        recalculated; it is then written as is if its bounds are right.
 
         If `calcGlyphBounds` is True, the bounds of all glyphs will be
         calculated. Only pass False if your glyph objects already have
-        their bounding box values set.
+        their bounding box values set. The bounds of glyphs given as
+        compiled data are taken from the data.
         """
         assert self.isTTF
+        if not hasattr(glyphs, "items") or any(
+                isinstance(glyph, bytes) for glyph in glyphs.values()):
+            glyphs = {
+                glyphName: Glyph(glyph) if isinstance(glyph, bytes) else glyph
+                for glyphName, glyph in self._itemsByGlyphName(glyphs)
+            }
         self.font["loca"] = newTable("loca")
         self.font["glyf"] = newTable("glyf")
         self.font["glyf"].glyphs = glyphs
@@ -632,18 +665,21 @@ class FontBuilder(object):
         gvar.variations = variations
 
     def calcGlyphBounds(self):
-        """Calculate the bounding boxes of all glyphs in the `glyf` table.
-        This is usually not called explicitly by client code.
+        """Calculate the bounding boxes of all glyphs in the `glyf` table,
+        except those which are still compiled data, whose bounds are part
+        of the data. This is usually not called explicitly by client code.
         """
         glyphTable = self.font["glyf"]
         for glyph in glyphTable.glyphs.values():
-            glyph.recalcBounds(glyphTable)
+            if not hasattr(glyph, "data"):
+                glyph.recalcBounds(glyphTable)
 
     def setupHorizontalMetrics(self, metrics):
         """Create a new `hmtx` table, for horizontal metrics.
 
         The `metrics` argument must be a dict, mapping glyph names to
-        `(width, leftSidebearing)` tuples.
+        `(width, leftSidebearing)` tuples, or a sequence of such tuples
+        in glyph order.
         """
         self.setupMetrics('hmtx', metrics)
 
@@ -651,7 +687,8 @@ class FontBuilder(object):
         """Create a new `vmtx` table, for horizontal metrics.
 
         The `metrics` argument must be a dict, mapping glyph names to
-        `(height, topSidebearing)` tuples.
+        `(height, topSidebearing)` tuples, or a sequence of such tuples
+        in glyph order.
         """
         self.setupMetrics('vmtx', metrics)
 
@@ -660,8 +697,7 @@ class FontBuilder(object):
         assert tableTag in ("hmtx", "vmtx")
         mtxTable = self.font[tableTag] = newTable(tableTag)
         roundedMetrics = {}
-        for gn in metrics:
-            w, lsb = metrics[gn]
+        for gn, (w, lsb) in self._itemsByGlyphName(metrics):
             roundedMetrics[gn] = int(round(w)), int(round(lsb))
         mtxTable.metrics = roundedMetrics
 
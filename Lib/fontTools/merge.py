@@ -960,14 +960,11 @@ class Merger(object):
 		# Settle on a mega glyph order.
 		#
 		fonts = [ttLib.TTFont(fontfile) for fontfile in fontfiles]
-		glyphOrders = [font.getGlyphOrder() for font in fonts]
+		glyphOrders = [list(font.getGlyphOrder()) for font in fonts]
 		megaGlyphOrder = self._mergeGlyphOrders(glyphOrders)
-		# Reload fonts and set new glyph names on them.
-		# TODO Is it necessary to reload font?  I think it is.  At least
-		# it's safer, in case tables were loaded to provide glyph names.
-		fonts = [ttLib.TTFont(fontfile) for fontfile in fontfiles]
+		# Set new glyph names on the fonts, instead of loading them again.
 		for font,glyphOrder in zip(fonts, glyphOrders):
-			font.setGlyphOrder(glyphOrder)
+			self._renameGlyphs(font, glyphOrder)
 		mega.setGlyphOrder(megaGlyphOrder)
 
 		for font in fonts:
@@ -1002,6 +999,9 @@ class Merger(object):
 				else:
 					log.info("Dropped '%s'.", tag)
 
+				del tables, table
+				self._releaseTable(fonts, tag)
+
 		del self.duplicateGlyphsPerFont
 		del self.fonts
 
@@ -1009,6 +1009,35 @@ class Merger(object):
 
 		return mega
 
+	# Tables that are decompiled before the glyph names are final (to build
+	# the glyph order), but don't store glyph names; they need not be
+	# decompiled again once the fonts' glyphs are renamed.
+	_glyphNameIndependentTables = {'GlyphOrder', 'maxp', 'post'}
+
+	def _renameGlyphs(self, font, glyphOrder):
+		"""Set the renamed glyphOrder on font. Tables that were already
+		decompiled using the old glyph names are unloaded, so that they
+		get decompiled again from the font data using the new names."""
+		if glyphOrder == font.getGlyphOrder():
+			return
+		for tag in list(font.tables.keys()):
+			if tag not in self._glyphNameIndependentTables:
+				del font.tables[tag]
+		font.setGlyphOrder(glyphOrder)
+
+	# Small tables that other tables read while decompiling; these are
+	# kept around until the end of the merge, rather than being
+	# decompiled again.
+	_sharedTables = {'head', 'hhea', 'vhea', 'maxp', 'loca'}
+
+	def _releaseTable(self, fonts, tag):
+		"""Unload the input fonts' 'tag' table once it's been merged,
+		to keep memory use down when merging many fonts."""
+		if tag in self._sharedTables:
+			return
+		for font in fonts:
+			font.tables.pop(tag, None)
+
 	def _mergeGlyphOrders(self, glyphOrders):
 		"""Modifies passed-in glyphOrders to reflect new glyph names.
 		Returns glyphOrder for the merged font."""
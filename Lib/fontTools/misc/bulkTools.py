@@ -0,0 +1,72 @@
+"""Helpers for processing many items at once: in a pool of worker processes,
+and with the cyclic garbage collector paused."""
+
+from contextlib import contextmanager
+import gc
+import logging
+import os
+import pickle
+
+
+__all__ = ["mapInProcesses", "pausedGarbageCollection"]
+
+
+log = logging.getLogger(__name__)
+
+
+def mapInProcesses(func, items, maxWorkers=None, args=()):
+	"""Call func(chunk, *args) for chunks of 'items' in a pool of worker
+	processes, and return the concatenation of the lists it returns, which
+	hold one result per item of the chunk.
+
+	'maxWorkers' is the number of worker processes, by default the number
+	of CPUs. The items are split into a few chunks per worker, to even out
+	the load. func, the chunks and args must be picklable; func must be
+	defined at module level.
+
+	None is returned, so that the caller can do the work in this process
+	instead, if there is no point in using worker processes (a single
+	worker, or fewer than two items), or if the pool can't be used: the
+	platform can't start processes, a worker died, or the arguments can't
+	be pickled.
+	"""
+	workers = maxWorkers
+	if workers is None:
+		workers = os.cpu_count() or 1
+	if workers <= 1 or len(items) < 2:
+		return None
+
+	from concurrent.futures import ProcessPoolExecutor
+	from concurrent.futures.process import BrokenProcessPool
+
+	chunkSize = -(-len(items) // (workers * 4))
+	chunks = [items[i:i+chunkSize] for i in range(0, len(items), chunkSize)]
+	log.debug(
+		"running %s on %d items in %d worker processes",
+		getattr(func, "__name__", func), len(items), workers)
+	try:
+		with ProcessPoolExecutor(workers) as executor:
+			results = list(executor.map(
+				func, chunks, *[[arg] * len(chunks) for arg in args]))
+	except (OSError, BrokenProcessPool, pickle.PicklingError, TypeError, AttributeError) as e:
+		# pickling local objects raises AttributeError or TypeError
+		log.warning(
+			"running %s in worker processes failed (%s); running it serially",
+			getattr(func, "__name__", func), e)
+		return None
+	return [result for chunkResults in results for result in chunkResults]
+
+
+@contextmanager
+def pausedGarbageCollection():
+	"""Context manager disabling the cyclic garbage collector, if enabled,
+	while building many small objects, such as parse trees or glyphs: the
+	collector would otherwise be triggered over and over, to find no
+	garbage."""
+	enabled = gc.isenabled()
+	gc.disable()
+	try:
+		yield
+	finally:
+		if enabled:
+			gc.enable()
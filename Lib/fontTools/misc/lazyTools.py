@@ -0,0 +1,57 @@
+"""Containers whose items are loaded on first access."""
+
+from collections.abc import MutableMapping
+
+
+__all__ = ["LazyDict"]
+
+
+class _Unloaded(object):
+	# marks the values of a LazyDict that were not loaded yet
+	pass
+
+
+class LazyDict(MutableMapping):
+
+	"""A dict whose values are loaded when they are first accessed.
+
+	It is created with its keys, in order; subclasses implement
+	_loadValue(key), which returns the value of a key that was not loaded
+	yet. Values can be set and deleted as in a dict. Iterating over the
+	keys, or testing whether a key is in the dict, loads nothing; getting
+	the values (including with values() and items()) loads them.
+	"""
+
+	def __init__(self, keys=()):
+		self._dict = dict.fromkeys(keys, _Unloaded)
+
+	def _loadValue(self, key):
+		raise NotImplementedError
+
+	def isLoaded(self, key):
+		"""Return whether the value of 'key' was loaded or set."""
+		return self._dict[key] is not _Unloaded
+
+	def __getitem__(self, key):
+		value = self._dict[key]
+		if value is _Unloaded:
+			value = self._dict[key] = self._loadValue(key)
+		return value
+
+	def __setitem__(self, key, value):
+		self._dict[key] = value
+
+	def __delitem__(self, key):
+		del self._dict[key]
+
+	def __contains__(self, key):
+		return key in self._dict
+
+	def __iter__(self):
+		return iter(self._dict)
+
+	def __len__(self):
+		return len(self._dict)
+
+	def __repr__(self):
+		return "<%s with %d items>" % (self.__class__.__name__, len(self))
@@ -9,6 +9,7 @@ from numbers import Integral
 from types import SimpleNamespace
 from collections.abc import Mapping
 from functools import singledispatch
+from xml.parsers.expat import ParserCreate, ExpatError
 
 from fontTools.misc import etree
 
@@ -276,6 +277,132 @@ _TARGET_END_HANDLERS = {
 }
 
 
+class _PlistParser:
+    """ Property list reader which builds the objects straight from the
+    events of an expat parser, like the CPython plistlib module's
+    _PlistParser class, instead of going through the ElementTree Target
+    API. It handles the same elements as PlistTarget, in the same way,
+    but with less overhead for each element.
+    """
+
+    def __init__(self, use_builtin_types=None, dict_type=dict):
+        self.stack = []
+        self.current_key = None
+        self.root = None
+        if use_builtin_types is None:
+            self._use_builtin_types = USE_BUILTIN_TYPES
+        else:
+            if use_builtin_types is False:
+                warnings.warn(
+                    "Setting use_builtin_types to False is deprecated and will be "
+                    "removed soon.",
+                    DeprecationWarning,
+                )
+            self._use_builtin_types = use_builtin_types
+        self._dict_type = dict_type
+        self._data = []
+
+    def parse(self, fp):
+        parser = ParserCreate()
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        # the text is collected by the C method, without a Python call
+        parser.CharacterDataHandler = self._data.append
+        parser.EntityDeclHandler = self.entity_decl
+        try:
+            parser.Parse(fp.read(), True)
+        except ExpatError as e:
+            _raise_parse_error(e)
+        return self.root
+
+    def entity_decl(
+        self, entityName, is_parameter_entity, value, base, systemId, publicId,
+        notationName,
+    ):
+        # reject all entity declarations, to protect against XML
+        # vulnerabilities such as the "billion laughs" attack
+        raise ValueError("XML entity declarations are not supported in plist files")
+
+    def start(self, tag, attrib):
+        self._data.clear()
+        if tag == "dict":
+            d = self._dict_type()
+            self.add_object(d)
+            self.stack.append(d)
+        elif tag == "array":
+            a = []
+            self.add_object(a)
+            self.stack.append(a)
+
+    def end(self, tag):
+        # the most common elements are checked first
+        if tag == "key":
+            if self.current_key or not isinstance(self.stack[-1], type({})):
+                raise ValueError("unexpected key")
+            self.current_key = "".join(self._data)
+            return
+        elif tag == "integer":
+            value = int("".join(self._data))
+        elif tag == "string":
+            value = "".join(self._data)
+        elif tag == "real":
+            value = float("".join(self._data))
+        elif tag == "dict":
+            if self.current_key:
+                raise ValueError("missing value for key '%s'" % self.current_key)
+            self.stack.pop()
+            return
+        elif tag == "array":
+            self.stack.pop()
+            return
+        elif tag == "true":
+            value = True
+        elif tag == "false":
+            value = False
+        elif tag == "data":
+            if self._use_builtin_types:
+                value = b64decode("".join(self._data))
+            else:
+                value = Data.fromBase64("".join(self._data))
+        elif tag == "date":
+            value = _date_from_string("".join(self._data))
+        else:
+            return
+        self.add_object(value)
+
+    def add_object(self, value):
+        current_key = self.current_key
+        if current_key is not None:
+            d = self.stack[-1]
+            if not isinstance(d, type({})):
+                raise ValueError("unexpected element: %r" % d)
+            d[current_key] = value
+            self.current_key = None
+        elif not self.stack:
+            # this is the root object
+            self.root = value
+        else:
+            a = self.stack[-1]
+            if not isinstance(a, type([])):
+                raise ValueError("unexpected element: %r" % a)
+            a.append(value)
+
+
+def _raise_parse_error(error):
+    # raise the same exception as the parser of the etree module would
+    message = str(error)
+    if etree._have_lxml:
+        raise etree.ParseError(
+            message, error.code, error.lineno, error.offset
+        ) from None
+    err = etree.ParseError(message)
+    err.code = error.code
+    err.position = error.lineno, error.offset
+    raise err from None
+
+
 # functions to build element tree from plist data
 
 
@@ -383,6 +510,183 @@ _make_element.register(bytearray)(_data_element)
 _make_element.register(Data)(lambda v, ctx: _data_element(v.data, ctx))
 
 
+# functions to write plist data as XML text, without building an element
+# tree first; the text is the same that ElementTree.write() would produce
+# from the tree built by totree().
+
+# the characters which are not allowed in XML documents
+_invalid_xml_string = re.compile(
+    "[\u0000-\u0008\u000B-\u000C\u000E-\u001F\uD800-\uDFFF\uFFFE-\uFFFF]"
+)
+
+
+def _escape(text):
+    if text and _invalid_xml_string.search(text):
+        raise ValueError(
+            "All strings must be XML compatible: Unicode or ASCII, "
+            "no NULL bytes or control characters"
+        )
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if "\r" in text and etree._have_lxml:
+        # lxml escapes carriage returns
+        text = text.replace("\r", "&#13;")
+    return text
+
+
+def _write_string(value, ctx):
+    ctx.write("<string>%s</string>" % _escape(value))
+
+
+def _write_bool(value, ctx):
+    ctx.write("<true/>" if value else "<false/>")
+
+
+def _write_integer(value, ctx):
+    if -1 << 63 <= value < 1 << 64:
+        ctx.write("<integer>%d</integer>" % value)
+    else:
+        raise OverflowError(value)
+
+
+def _write_real(value, ctx):
+    ctx.write("<real>%s</real>" % _escape(repr(value)))
+
+
+def _write_dict(d, ctx):
+    items = d.items()
+    if ctx.sort_keys:
+        items = sorted(items)
+    write = ctx.write
+    if ctx.pretty_print:
+        indent = "\n" + "  " * (ctx.indent_level + 1)
+    else:
+        indent = ""
+    write("<dict>")
+    start = len(ctx.parts)
+    ctx.indent_level += 1
+    for key, value in items:
+        if not isinstance(key, str):
+            if ctx.skipkeys:
+                continue
+            raise TypeError("keys must be strings")
+        write("%s<key>%s</key>%s" % (indent, _escape(key), indent))
+        # inline the most common values
+        valueType = type(value)
+        if valueType is int and -1 << 63 <= value < 1 << 64:
+            write("<integer>%d</integer>" % value)
+        elif valueType is str:
+            write("<string>%s</string>" % _escape(value))
+        else:
+            _write_element(value, ctx)
+    ctx.indent_level -= 1
+    if len(ctx.parts) == start:
+        ctx.parts[-1] = "<dict/>"
+    else:
+        write(indent[:-2] + "</dict>")
+
+
+def _write_array(array, ctx):
+    if len(array) == 0:
+        ctx.write("<array/>")
+        return
+    write = ctx.write
+    if ctx.pretty_print:
+        indent = "\n" + "  " * (ctx.indent_level + 1)
+    else:
+        indent = ""
+    write("<array>")
+    ctx.indent_level += 1
+    for value in array:
+        write(indent)
+        valueType = type(value)
+        if valueType is str:
+            write("<string>%s</string>" % _escape(value))
+        else:
+            _write_element(value, ctx)
+    ctx.indent_level -= 1
+    write(indent[:-2] + "</array>")
+
+
+def _write_date(date, ctx):
+    ctx.write("<date>%s</date>" % _date_to_string(date))
+
+
+def _write_data(data, ctx):
+    text = _encode_base64(
+        data,
+        maxlinelength=(76 if ctx.pretty_print else None),
+        indent_level=ctx.indent_level,
+    )
+    ctx.write("<data>%s</data>" % text.decode("ascii"))
+
+
+def _write_string_or_data(raw_bytes, ctx):
+    if ctx.use_builtin_types:
+        _write_data(raw_bytes, ctx)
+    else:
+        try:
+            string = raw_bytes.decode(encoding="ascii", errors="strict")
+        except UnicodeDecodeError:
+            raise ValueError(
+                "invalid non-ASCII bytes; use unicode string instead: %r"
+                % raw_bytes
+            )
+        _write_string(string, ctx)
+
+
+@singledispatch
+def _write_element(value, ctx):
+    raise TypeError("unsupported type: %s" % type(value))
+
+_write_element.register(str)(_write_string)
+_write_element.register(bool)(_write_bool)
+_write_element.register(Integral)(_write_integer)
+_write_element.register(float)(_write_real)
+_write_element.register(Mapping)(_write_dict)
+_write_element.register(list)(_write_array)
+_write_element.register(tuple)(_write_array)
+_write_element.register(datetime)(_write_date)
+_write_element.register(bytes)(_write_string_or_data)
+_write_element.register(bytearray)(_write_data)
+_write_element.register(Data)(lambda v, ctx: _write_data(v.data, ctx))
+
+
+def _tostring(
+    value,
+    sort_keys=True,
+    skipkeys=False,
+    use_builtin_types=None,
+    pretty_print=True,
+):
+    # return the text of the <plist> element for the given value
+    if use_builtin_types is None:
+        use_builtin_types = USE_BUILTIN_TYPES
+    parts = []
+    context = SimpleNamespace(
+        sort_keys=sort_keys,
+        skipkeys=skipkeys,
+        use_builtin_types=use_builtin_types,
+        pretty_print=pretty_print,
+        indent_level=1,
+        parts=parts,
+        write=parts.append,
+    )
+    if pretty_print:
+        parts.append('<plist version="1.0">\n  ')
+        _write_element(value, context)
+        parts.append("\n</plist>\n")
+    else:
+        parts.append('<plist version="1.0">')
+        _write_element(value, context)
+        parts.append("</plist>")
+    return "".join(parts)
+
+
 # Public functions to create element tree from plist-compatible python
 # data structures and viceversa, for use when (de)serializing GLIF xml.
 
@@ -433,17 +737,10 @@ def load(fp, use_builtin_types=None, dict_type=dict):
         raise AttributeError(
             "'%s' object has no attribute 'read'" % type(fp).__name__
         )
-    target = PlistTarget(
+    parser = _PlistParser(
         use_builtin_types=use_builtin_types, dict_type=dict_type
     )
-    parser = etree.XMLParser(target=target)
-    result = etree.parse(fp, parser=parser)
-    # lxml returns the target object directly, while ElementTree wraps
-    # it as the root of an ElementTree object
-    try:
-        return result.getroot()
-    except AttributeError:
-        return result
+    return parser.parse(fp)
 
 
 def loads(value, use_builtin_types=None, dict_type=dict):
@@ -463,27 +760,21 @@ def dump(
         raise AttributeError(
             "'%s' object has no attribute 'write'" % type(fp).__name__
         )
-    root = etree.Element("plist", version="1.0")
-    el = totree(
+    text = _tostring(
         value,
         sort_keys=sort_keys,
         skipkeys=skipkeys,
         use_builtin_types=use_builtin_types,
         pretty_print=pretty_print,
     )
-    root.append(el)
-    tree = etree.ElementTree(root)
-    # we write the doctype ourselves instead of using the 'doctype' argument
-    # of 'write' method, becuse lxml will force adding a '\n' even when
-    # pretty_print is False.
+    # the XML declaration and the doctype are only followed by a '\n' when
+    # pretty_print is True
     if pretty_print:
         header = b"\n".join((XML_DECLARATION, PLIST_DOCTYPE, b""))
     else:
         header = XML_DECLARATION + PLIST_DOCTYPE
     fp.write(header)
-    tree.write(
-        fp, encoding="utf-8", pretty_print=pretty_print, xml_declaration=False
-    )
+    fp.write(text.encode("utf-8"))
 
 
 def dumps(
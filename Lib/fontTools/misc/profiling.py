@@ -0,0 +1,243 @@
+"""Instrumentation of the work fontTools does to read, compile and write fonts.
+
+Some hot paths of fontTools.ttLib report what they do as events. An event
+has a name, a key (the tag of the table it concerns, or None), and the time
+it took in seconds:
+
+	decompile       a table decompiled by TTFont, on first access
+	compile         a table compiled by TTFont, to be saved
+	getAllData      the data of an OpenType layout table being assembled
+	fixOverflows    a round of fixing the offset overflows of a table
+	decompileGlyph  a glyph of 'glyf', or the variations of one in 'gvar',
+	                being decompiled
+	compileGlyph    a glyph of 'glyf', or the variations of one in 'gvar',
+	                being compiled
+	toXML           a table written to TTX
+	fromXML         an element of a table read from TTX
+
+The time of an event includes the time of the events nested in it: the
+'compile' event of a GPOS table includes its 'getAllData' events.
+
+Events are sent to sinks, which are callables taking the name, key and
+time of the event; the Sink subclasses of this module log them, write them
+as JSON, or sum them up. Sinks are registered with addSink(), or by using
+them as context managers:
+
+	>>> from fontTools.ttLib import TTFont, newTable
+	>>> font = TTFont()
+	>>> font["name"] = newTable("name")
+	>>> font["name"].names = []
+	>>> with Stats() as stats:
+	...     data = font.getTableData("name")
+	>>> stats.counts
+	{('compile', 'name'): 1}
+
+As long as no sink is registered, the module-level 'enabled' flag is false,
+and the hooks cost next to nothing: measure() returns a context manager
+which does nothing, and timed() returns the function it is passed as is.
+The hottest paths check 'enabled' themselves, and time their work with
+clock() and emit().
+"""
+
+import json
+import logging
+import timeit
+
+
+__all__ = [
+	"addSink",
+	"removeSink",
+	"measure",
+	"timed",
+	"emit",
+	"clock",
+	"Sink",
+	"CallbackSink",
+	"LoggingSink",
+	"JSONSink",
+	"Stats",
+]
+
+
+log = logging.getLogger(__name__)
+
+# timeit.default_timer choses the most accurate clock for each platform
+clock = timeit.default_timer
+
+# whether any sink is registered; the hooks check it before doing anything
+enabled = False
+
+# the registered sinks, replaced rather than modified when sinks are added
+# or removed, so that events can be emitted while it changes
+_sinks = ()
+
+
+def addSink(sink):
+	"""Register a sink, a callable which is called with the name, key and
+	time of all events."""
+	global _sinks, enabled
+	_sinks = _sinks + (sink,)
+	enabled = True
+
+
+def removeSink(sink):
+	"""Unregister a sink which was registered with addSink()."""
+	global _sinks, enabled
+	sinks = list(_sinks)
+	sinks.remove(sink)
+	_sinks = tuple(sinks)
+	enabled = bool(_sinks)
+
+
+def emit(event, key, elapsed):
+	"""Send an event to all registered sinks."""
+	for sink in _sinks:
+		sink(event, key, elapsed)
+
+
+class _Measure(object):
+
+	__slots__ = ("event", "key", "start")
+
+	def __init__(self, event, key):
+		self.event = event
+		self.key = key
+
+	def __enter__(self):
+		self.start = clock()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		emit(self.event, self.key, clock() - self.start)
+
+
+class _NullMeasure(object):
+
+	__slots__ = ()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		pass
+
+
+_nullMeasure = _NullMeasure()
+
+
+def measure(event, key=None):
+	"""Return a context manager which emits an event with the time taken
+	by the code it wraps; it does nothing if no sink is registered."""
+	if not enabled:
+		return _nullMeasure
+	return _Measure(event, key)
+
+
+def timed(func, event, key=None):
+	"""Return a function which calls 'func', and emits an event with the
+	time taken by each call. If no sink is registered, 'func' is returned
+	as is: this is for functions called in loops, like the ones compiling
+	the glyphs of a table one by one."""
+	if not enabled:
+		return func
+
+	def wrapper(*args, **kwargs):
+		start = clock()
+		try:
+			return func(*args, **kwargs)
+		finally:
+			emit(event, key, clock() - start)
+
+	return wrapper
+
+
+class Sink(object):
+
+	"""Base class of the sinks of this module. Subclasses implement
+	__call__(event, key, elapsed). A sink used as a context manager is
+	registered while in the with-statement."""
+
+	def __call__(self, event, key, elapsed):
+		raise NotImplementedError
+
+	def __enter__(self):
+		addSink(self)
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		removeSink(self)
+
+
+class CallbackSink(Sink):
+
+	"""Sink which calls a function with the name, key and time of each
+	event."""
+
+	def __init__(self, callback):
+		self.callback = callback
+
+	def __call__(self, event, key, elapsed):
+		self.callback(event, key, elapsed)
+
+
+class LoggingSink(Sink):
+
+	"""Sink which logs the events, by default with the logger of this
+	module, at the DEBUG level."""
+
+	def __init__(self, logger=None, level=logging.DEBUG):
+		self.logger = logger if logger is not None else log
+		self.level = level
+
+	def __call__(self, event, key, elapsed):
+		if key is None:
+			self.logger.log(self.level, "Took %.3fs to %s", elapsed, event)
+		else:
+			self.logger.log(self.level, "Took %.3fs to %s '%s'", elapsed, event, key)
+
+
+class JSONSink(Sink):
+
+	"""Sink which writes the events to a text file, one JSON object per
+	line, like {"event": "compile", "key": "GPOS", "time": 0.0123}."""
+
+	def __init__(self, file):
+		self.file = file
+
+	def __call__(self, event, key, elapsed):
+		self.file.write(json.dumps(
+			{"event": event, "key": None if key is None else str(key), "time": elapsed}))
+		self.file.write("\n")
+
+
+class Stats(Sink):
+
+	"""Sink which counts the events, and sums up their times, by name and
+	key. 'counts' and 'times' are dictionaries keyed by (event, key)
+	tuples."""
+
+	def __init__(self):
+		self.counts = {}
+		self.times = {}
+
+	def __call__(self, event, key, elapsed):
+		k = (event, key)
+		self.counts[k] = self.counts.get(k, 0) + 1
+		self.times[k] = self.times.get(k, 0.0) + elapsed
+
+	def clear(self):
+		self.counts.clear()
+		self.times.clear()
+
+	def report(self, limit=None):
+		"""Return the counts and total times of the events as a table of
+		text, from the longest to the shortest; 'limit' is the maximum
+		number of lines."""
+		items = sorted(self.times.items(), key=lambda item: -item[1])
+		if limit is not None:
+			items = items[:limit]
+		lines = ["%-16s %-6s %8s %10s" % ("event", "key", "count", "time (s)")]
+		for (event, key), elapsed in items:
+			lines.append("%-16s %-6s %8d %10.3f" % (
+				event, "" if key is None else key, self.counts[(event, key)], elapsed))
+		return "\n".join(lines)
@@ -44,6 +44,14 @@ unpack2(fmt, data, object=None)
 calcsize(fmt)
 	like struct.calcsize(), but uses our own fmt strings:
 	it returns the size of the data in bytes.
+
+compile(fmt)
+	Returns a (cached) SStruct object for 'fmt', which precomputes
+	the struct.Struct, the element names and the fixed point
+	conversions. It offers the same operations as the functions
+	above as methods, plus unpack_into() and pack_into(), which
+	work on any buffer (eg. a memoryview) at a given offset. Use
+	it in code that packs or unpacks the same format many times.
 """
 
 from fontTools.misc.py23 import *
@@ -59,52 +67,111 @@ class Error(Exception):
 	pass
 
 def pack(fmt, obj):
-	formatstring, names, fixes = getformat(fmt)
-	elements = []
-	if not isinstance(obj, dict):
-		obj = obj.__dict__
-	for name in names:
-		value = obj[name]
-		if name in fixes:
-			# fixed point conversion
-			value = fl2fi(value, fixes[name])
-		elif isinstance(value, basestring):
-			value = tobytes(value)
-		elements.append(value)
-	data = struct.pack(*(formatstring,) + tuple(elements))
-	return data
+	return compile(fmt).pack(obj)
 
 def unpack(fmt, data, obj=None):
-	if obj is None:
-		obj = {}
-	data = tobytes(data)
-	formatstring, names, fixes = getformat(fmt)
-	if isinstance(obj, dict):
-		d = obj
-	else:
-		d = obj.__dict__
-	elements = struct.unpack(formatstring, data)
-	for i in range(len(names)):
-		name = names[i]
-		value = elements[i]
-		if name in fixes:
-			# fixed point conversion
-			value = fi2fl(value, fixes[name])
-		elif isinstance(value, bytes):
+	return compile(fmt).unpack(data, obj)
+
+def unpack2(fmt, data, obj=None):
+	return compile(fmt).unpack2(data, obj)
+
+def calcsize(fmt):
+	return compile(fmt).size
+
+
+class SStruct(object):
+
+	"""A compiled sstruct format. Don't instantiate directly, use
+	sstruct.compile(fmt), which caches the result.
+	"""
+
+	def __init__(self, fmt):
+		formatstring, names, fixes = getformat(fmt)
+		self.format = formatstring
+		self.names = names
+		self.fixes = fixes
+		self._struct = struct.Struct(formatstring)
+		self.size = self._struct.size
+		# Fixed point elements, as (index, precisionBits) pairs
+		self._fixes = tuple((names.index(name), bits)
+				for name, bits in sorted(fixes.items()))
+		# Indices of the elements that unpack to byte strings
+		self._strings = tuple(i for i, formatchar
+				in enumerate(_elementChars(formatstring))
+				if formatchar in "csp")
+
+	def __repr__(self):
+		return "<%s %r>" % (self.__class__.__name__, self.format)
+
+	def _values(self, elements):
+		if not (self._fixes or self._strings):
+			return elements
+		elements = list(elements)
+		for i, bits in self._fixes:
+			elements[i] = fi2fl(elements[i], bits)
+		for i in self._strings:
 			try:
-				value = tostr(value)
+				elements[i] = tostr(elements[i])
 			except UnicodeDecodeError:
 				pass
-		d[name] = value
-	return obj
+		return elements
 
-def unpack2(fmt, data, obj=None):
-	length = calcsize(fmt)
-	return unpack(fmt, data[:length], obj), data[length:]
+	def _elements(self, obj):
+		if not isinstance(obj, dict):
+			obj = obj.__dict__
+		elements = [obj[name] for name in self.names]
+		for i, bits in self._fixes:
+			elements[i] = fl2fi(elements[i], bits)
+		for i in self._strings:
+			if isinstance(elements[i], basestring):
+				elements[i] = tobytes(elements[i])
+		return elements
 
-def calcsize(fmt):
-	formatstring, names, fixes = getformat(fmt)
-	return struct.calcsize(formatstring)
+	def _store(self, elements, obj):
+		if obj is None:
+			obj = {}
+		d = obj if isinstance(obj, dict) else obj.__dict__
+		d.update(zip(self.names, self._values(elements)))
+		return obj
+
+	def pack(self, obj):
+		return self._struct.pack(*self._elements(obj))
+
+	def pack_into(self, buffer, offset, obj):
+		self._struct.pack_into(buffer, offset, *self._elements(obj))
+
+	def unpack(self, data, obj=None):
+		if isinstance(data, unicode):
+			data = tobytes(data)
+		return self._store(self._struct.unpack(data), obj)
+
+	def unpack2(self, data, obj=None):
+		size = self.size
+		return self.unpack(data[:size], obj), data[size:]
+
+	def unpack_into(self, obj, buffer, offset=0):
+		"""Unpack the struct from 'buffer' (anything supporting the
+		buffer protocol, eg. a memoryview) starting at 'offset', into
+		'obj', which is returned. Trailing data is ignored.
+		"""
+		return self._store(self._struct.unpack_from(buffer, offset), obj)
+
+
+_compiledcache = {}
+
+def compile(fmt):
+	try:
+		return _compiledcache[fmt]
+	except KeyError:
+		compiled = _compiledcache[fmt] = SStruct(fmt)
+		return compiled
+
+def _elementChars(formatstring):
+	# yield the struct format char of each named element
+	for m in re.finditer(r"[0-9]*([^0-9])", formatstring):
+		formatchar = m.group(1)
+		if formatchar not in "x@=<>!":
+			yield formatchar
 
 
 # matches "name:formatchar" (whitespace is allowed)
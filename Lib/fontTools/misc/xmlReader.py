@@ -1,6 +1,7 @@
 from fontTools.misc.py23 import *
 from fontTools import ttLib
 from fontTools.misc.textTools import safeEval
+from fontTools.misc import profiling
 from fontTools.ttLib.tables.DefaultTable import DefaultTable
 import sys
 import os
@@ -119,6 +120,7 @@ class XMLReader(object):
 				tableClass = ttLib.getTableClass(tag)
 				if tableClass is None:
 					tableClass = DefaultTable
+			self.currentTag = tag
 			if tag == 'loca' and tag in self.ttFont:
 				# Special-case the 'loca' table as we need the
 				#    original if the 'glyf' table isn't recompiled.
@@ -152,7 +154,8 @@ class XMLReader(object):
 				self.root = None
 			elif self.stackSize == 2:
 				name, attrs, content = self.root
-				self.currentTable.fromXML(name, attrs, content, self.ttFont)
+				with profiling.measure("fromXML", self.currentTag):
+					self.currentTable.fromXML(name, attrs, content, self.ttFont)
 				self.root = None
 
 
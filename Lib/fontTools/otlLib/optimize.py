@@ -0,0 +1,438 @@
+"""Optimizations of OpenType Layout lookups that preserve their behavior.
+
+PairPos format 2 subtables store a dense Class1Count x Class2Count matrix
+of value records. Kerning between classes that never meet (for example,
+between glyphs of different scripts) still costs a full row of empty
+records for every first class, so large kerning sets produce bloated
+subtables. compactPairPosSubtable() splits such a subtable into several,
+each holding a cluster of first classes together with only the second
+classes they actually kern with, whenever that makes the lookup smaller:
+
+    subtables = compactPairPosSubtable(subtable, font.getReverseGlyphMap())
+
+compactLookup() does the same for all PairPos subtables of a GPOS lookup,
+and compactGPOS() for all lookups of a font. As every subtable has to be
+visited by layout engines, a subtable is split into at most maxSubtables
+(by default, MAX_SUBTABLES) new ones, even if more would be smaller.
+"""
+from fontTools.misc.py23 import *
+from fontTools.ttLib.tables import otTables as ot
+import heapq
+import logging
+
+
+__all__ = [
+    'MAX_SUBTABLES', 'compactPairPosSubtable', 'compactLookup', 'compactGPOS']
+
+
+log = logging.getLogger(__name__)
+
+
+# Size of a PairPos format 2 subtable header, of the headers of its
+# Coverage and two ClassDef tables, and of the offset from the lookup.
+_PAIRPOS2_OVERHEAD = 16 + 4 + 4 + 4 + 2
+
+MAX_SUBTABLES = 8
+
+
+def compactGPOS(font, maxSubtables=MAX_SUBTABLES):
+    """Compact the PairPos subtables of all lookups in the font's GPOS
+    table, in place."""
+    if "GPOS" not in font:
+        return
+    table = font["GPOS"].table
+    if not table.LookupList:
+        return
+    glyphMap = font.getReverseGlyphMap()
+    for lookup in table.LookupList.Lookup:
+        compactLookup(lookup, glyphMap, maxSubtables)
+
+
+def compactLookup(lookup, glyphMap, maxSubtables=MAX_SUBTABLES):
+    """Replace each PairPos format 2 subtable of a GPOS lookup with the
+    result of compactPairPosSubtable(), in place. Extension subtables are
+    handled too."""
+    if lookup.LookupType == 9:
+        if not all(isinstance(st.ExtSubTable, ot.PairPos)
+                   for st in lookup.SubTable):
+            return
+    elif lookup.LookupType != 2:
+        return
+    subtables = []
+    for st in lookup.SubTable:
+        if lookup.LookupType != 9:
+            subtables.extend(_compactPairPos(st, glyphMap, maxSubtables))
+            continue
+        for compacted in _compactPairPos(
+                st.ExtSubTable, glyphMap, maxSubtables):
+            ext = ot.ExtensionPos()
+            ext.Format = 1
+            ext.ExtensionLookupType = 2
+            ext.ExtSubTable = compacted
+            subtables.append(ext)
+    lookup.SubTable = subtables
+    lookup.SubTableCount = len(subtables)
+
+
+def _compactPairPos(subtable, glyphMap, maxSubtables):
+    if subtable.Format != 2:
+        return [subtable]
+    return compactPairPosSubtable(subtable, glyphMap, maxSubtables)
+
+
+def compactPairPosSubtable(subtable, glyphMap, maxSubtables=MAX_SUBTABLES):
+    """Split a PairPos format 2 subtable into a list of at most maxSubtables
+    subtables that is (by estimate) smaller, and return it; or return
+    [subtable] if splitting does not pay off.
+
+    The first glyphs are partitioned between the new subtables, so that
+    each pair of glyphs is still positioned by exactly the same subtable
+    and value records as before; every new subtable only keeps the second
+    classes which have non-empty value records in one of its rows.
+    """
+    assert subtable.Format == 2, subtable.Format
+    if not subtable.Coverage or not subtable.Class1Record:
+        return [subtable]
+    classDefs1 = subtable.ClassDef1.classDefs if subtable.ClassDef1 else {}
+    classDefs2 = subtable.ClassDef2.classDefs if subtable.ClassDef2 else {}
+    class1Count = len(subtable.Class1Record)
+    class2Count = subtable.Class2Count
+
+    rows = {}  # class1 --> [glyph]
+    for glyph in subtable.Coverage.glyphs:
+        class1 = classDefs1.get(glyph, 0)
+        if class1 < class1Count:
+            rows.setdefault(class1, []).append(glyph)
+    columns = {}  # class2 --> [glyph]
+    for glyph, class2 in classDefs2.items():
+        if 0 < class2 < class2Count:
+            columns.setdefault(class2, []).append(glyph)
+    if not rows:
+        return [subtable]
+
+    # Bit i of a row's mask is set if the row has a non-empty value record
+    # for class2 i. Glyphs of the second classes that are left out of a
+    # new subtable fall into its class 0, so a row which positions class 0
+    # has to keep all second classes.
+    allColumns = (1 << class2Count) - 1
+    masks = {}
+    for class1 in rows:
+        mask = 0
+        for class2, record in enumerate(
+                subtable.Class1Record[class1].Class2Record):
+            if not (_isEmptyValue(record.Value1) and
+                    _isEmptyValue(record.Value2)):
+                mask |= 1 << class2
+        masks[class1] = allColumns if mask & 1 else mask
+
+    valueSize = 2 * (_bitCount(subtable.ValueFormat1) +
+                     _bitCount(subtable.ValueFormat2))
+    columnSize = (sum(_glyphSetSize(glyphs, glyphMap)
+                      for glyphs in columns.values()) /
+                  max(1, class2Count - 1))
+    rowSizes = {class1: _glyphSetSize(glyphs, glyphMap)
+                for class1, glyphs in rows.items()}
+
+    clusters = _clusterRows(
+        masks, rowSizes, columnSize, valueSize, max(1, maxSubtables))
+    usedColumns = 0
+    for mask, _ in clusters:
+        usedColumns |= mask
+    if len(clusters) == 1 and usedColumns | 1 == allColumns:
+        return [subtable]
+
+    result = []
+    for mask, classes1 in clusters:
+        result.append(_buildPairPosSubtable(
+            subtable, rows, columns, mask, classes1, rowSizes, glyphMap))
+    log.debug("split PairPos subtable with %d x %d classes into %d",
+              class1Count, class2Count, len(result))
+    return result
+
+
+class _Cluster(object):
+    """A set of first classes that would share a PairPos subtable, with
+    the second classes they kern with."""
+
+    __slots__ = ("mask", "classes1", "rowsSize", "class0Size", "hasClass0",
+                 "numColumns", "size")
+
+    def __init__(self, mask, classes1, rowsSize, class0Size, hasClass0):
+        self.mask = mask
+        self.classes1 = classes1
+        self.numColumns = _bitCount(mask >> 1)  # not counting class 0
+        # bytes taken by the glyphs of all rows, and of the ones that go
+        # into class 0 (the original class 0, or else the largest row)
+        self.rowsSize = rowsSize
+        self.class0Size = class0Size
+        self.hasClass0 = hasClass0
+        self.size = None
+
+    @classmethod
+    def fromRows(cls, mask, classes1, rowSizes):
+        hasClass0 = 0 in classes1
+        if hasClass0:
+            class0Size = rowSizes[0]
+        else:
+            class0Size = max(rowSizes[class1] for class1 in classes1)
+        return cls(mask, classes1,
+                   sum(rowSizes[class1] for class1 in classes1),
+                   class0Size, hasClass0)
+
+    def merge(self, other):
+        return _Cluster(self.mask | other.mask,
+                        self.classes1 + other.classes1,
+                        self.rowsSize + other.rowsSize,
+                        self.mergedClass0Size_(other),
+                        self.hasClass0 or other.hasClass0)
+
+    def estimateSize(self, columnSize, valueSize):
+        """Estimate the size of a PairPos format 2 subtable holding the
+        first classes of this cluster, and the second classes of its mask.
+        """
+        self.size = _estimateSize(
+            self.mask, len(self.classes1), self.rowsSize, self.class0Size,
+            columnSize, valueSize)
+        return self.size
+
+    def mergeGain(self, other, columnSize, valueSize):
+        """Return by how much merging with other cluster reduces the
+        estimated size."""
+        size = _estimateSize(
+            self.mask | other.mask, len(self.classes1) + len(other.classes1),
+            self.rowsSize + other.rowsSize, self.mergedClass0Size_(other),
+            columnSize, valueSize)
+        return self.size + other.size - size
+
+    def mayGain(self, other, valueSize):
+        """Return False if merging with other cluster can't reduce the
+        estimated size. Clusters without common second classes only gain
+        from it if they are small: the merged subtable saves a header, but
+        holds an empty value record for each row of one cluster and second
+        class of the other."""
+        if self.mask & other.mask:
+            return True
+        return valueSize * (len(self.classes1) * other.numColumns +
+                            len(other.classes1) * self.numColumns
+                            ) < _PAIRPOS2_OVERHEAD
+
+    def mergedClass0Size_(self, other):
+        if self.hasClass0:
+            return self.class0Size
+        if other.hasClass0:
+            return other.class0Size
+        return max(self.class0Size, other.class0Size)
+
+
+def _estimateSize(mask, numRows, rowsSize, class0Size, columnSize,
+                  valueSize):
+    numColumns = _bitCount(mask | 1)
+    # glyphs of all rows are in the Coverage, and all but the ones of
+    # class 0 are in ClassDef1
+    return (_PAIRPOS2_OVERHEAD +
+            2 * rowsSize - class0Size +
+            (numColumns - 1) * columnSize +  # ClassDef2
+            numRows * numColumns * valueSize)  # Class1Record
+
+
+def _clusterRows(masks, rowSizes, columnSize, valueSize, maxClusters):
+    """Greedily merge clusters of first classes, as long as that reduces
+    the estimated total size or there are more than maxClusters clusters.
+    Return a list of (mask, [class1]) tuples."""
+    # rows that kern with the same second classes always go together
+    byMask = {}
+    for class1 in sorted(masks):
+        byMask.setdefault(masks[class1], []).append(class1)
+
+    clusters = {}  # id --> _Cluster, in the order of their ids
+    for i, (mask, classes1) in enumerate(byMask.items()):
+        cluster = _Cluster.fromRows(mask, classes1, rowSizes)
+        cluster.estimateSize(columnSize, valueSize)
+        clusters[i] = cluster
+
+    def findCandidates(i, allPairs):
+        # the merges of cluster i worth considering: as long as merges pay
+        # off, the ones that may gain, and then all of them
+        cluster = clusters[i]
+        result = _MergeCandidates()
+        for j, other in clusters.items():
+            if j != i and (allPairs or cluster.mayGain(other, valueSize)):
+                result.add(-cluster.mergeGain(other, columnSize, valueSize),
+                           j, clusters)
+        return result
+
+    # Only the best merge of each cluster is kept in the heap, as (-gain,
+    # id, id) with the smaller id first; entries of merged clusters are
+    # dropped when they come up.
+    heap = []
+    best = {}  # id --> (-gain, id) of the merge of the cluster in the heap
+    candidates = {i: _MergeCandidates() for i in clusters}
+
+    def pushBest(i, allPairs):
+        merge = candidates[i].best(clusters)
+        if merge is None and candidates[i].floor is not None:
+            # the best merges are all gone; look for the next ones
+            candidates[i] = findCandidates(i, allPairs)
+            merge = candidates[i].best(clusters)
+        if merge is None:
+            best.pop(i, None)
+            return
+        best[i] = merge
+        negGain, j = merge
+        heapq.heappush(heap, (negGain, min(i, j), max(i, j)))
+
+    ids = list(clusters)
+    for n, i in enumerate(ids):
+        cluster = clusters[i]
+        for j in ids[n + 1:]:
+            other = clusters[j]
+            if cluster.mayGain(other, valueSize):
+                negGain = -cluster.mergeGain(other, columnSize, valueSize)
+                candidates[i].add(negGain, j, clusters)
+                candidates[j].add(negGain, i, clusters)
+        pushBest(i, False)
+
+    allPairs = False
+    nextId = len(clusters)
+    while len(clusters) > 1:
+        while heap and (heap[0][1] not in clusters or
+                        heap[0][2] not in clusters):
+            heapq.heappop(heap)
+        if not heap or heap[0][0] >= 0:
+            if len(clusters) <= maxClusters:
+                break
+            if not allPairs:
+                # no merge pays off any more, but there are too many
+                # clusters: the best merges may be between any of them
+                allPairs = True
+                del heap[:]
+                for i in clusters:
+                    candidates[i] = findCandidates(i, allPairs)
+                for i in clusters:
+                    pushBest(i, allPairs)
+                continue
+        _, a, b = heapq.heappop(heap)
+        merged = clusters.pop(a).merge(clusters.pop(b))
+        merged.estimateSize(columnSize, valueSize)
+        for i in (a, b):
+            del candidates[i]
+            best.pop(i, None)
+        clusters[nextId] = merged
+
+        candidates[nextId] = _MergeCandidates()
+        for i, cluster in clusters.items():
+            if i == nextId or not (
+                    allPairs or cluster.mayGain(merged, valueSize)):
+                continue
+            negGain = -cluster.mergeGain(merged, columnSize, valueSize)
+            candidates[nextId].add(negGain, i, clusters)
+            candidates[i].add(negGain, nextId, clusters)
+            # the merged cluster has the largest id, so it is only the
+            # best merge of another cluster if it gains more
+            if i not in best or negGain < best[i][0]:
+                best[i] = (negGain, nextId)
+                heapq.heappush(heap, (negGain, i, nextId))
+        pushBest(nextId, allPairs)
+        for i in [i for i, (_, j) in best.items() if j == a or j == b]:
+            pushBest(i, allPairs)
+        nextId += 1
+
+        if len(heap) > 2 * len(clusters) + 64:
+            heap = [(negGain, min(i, j), max(i, j))
+                    for i, (negGain, j) in best.items()]
+            heapq.heapify(heap)
+
+    return sorted(((cluster.mask, sorted(cluster.classes1))
+                   for cluster in clusters.values()),
+                  key=lambda cluster: cluster[1][0])
+
+
+class _MergeCandidates(object):
+    """The clusters that a cluster may best be merged with, as a heap of
+    (-gain, id) tuples. Only about LIMIT of the best ones are kept: all the
+    clusters missing from the heap come after 'floor' (None if none are
+    missing). Merged clusters are dropped lazily."""
+
+    __slots__ = ("heap", "floor")
+
+    LIMIT = 32
+
+    def __init__(self):
+        self.heap = []
+        self.floor = None
+
+    def add(self, negGain, i, clusters):
+        candidate = (negGain, i)
+        if self.floor is not None and candidate > self.floor:
+            return
+        heapq.heappush(self.heap, candidate)
+        if len(self.heap) > 2 * self.LIMIT:
+            heap = sorted(c for c in self.heap if c[1] in clusters)
+            if len(heap) > self.LIMIT:
+                self.floor = heap[self.LIMIT - 1]
+                del heap[self.LIMIT:]
+            self.heap = heap  # a sorted list is a heap
+
+    def best(self, clusters):
+        """Return the (-gain, id) of the best merge, or None if there are
+        none left; then, if floor is not None, the candidates have to be
+        looked for again."""
+        heap = self.heap
+        while heap and heap[0][1] not in clusters:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+
+def _buildPairPosSubtable(subtable, rows, columns, mask, classes1,
+                          rowSizes, glyphMap):
+    # Class 0 of the new subtable holds the original class 0 if it is part
+    # of this cluster, otherwise the row that would take most space in
+    # ClassDef1.
+    classes1 = list(classes1)
+    if 0 not in classes1:
+        first = max(classes1, key=lambda c: (rowSizes[c], -c))
+        classes1.remove(first)
+        classes1.insert(0, first)
+    classes2 = [0] + [c for c in sorted(columns) if mask & (1 << c)]
+
+    self = ot.PairPos()
+    self.Format = 2
+    self.ValueFormat1 = subtable.ValueFormat1
+    self.ValueFormat2 = subtable.ValueFormat2
+    self.Coverage = ot.Coverage()
+    self.Coverage.glyphs = sorted(
+        (g for c in classes1 for g in rows[c]), key=glyphMap.__getitem__)
+    self.ClassDef1 = ot.ClassDef()
+    self.ClassDef1.classDefs = {
+        g: i for i, c in enumerate(classes1) if i for g in rows[c]}
+    self.ClassDef2 = ot.ClassDef()
+    self.ClassDef2.classDefs = {
+        g: i for i, c in enumerate(classes2) if i for g in columns[c]}
+    self.Class1Record = []
+    for class1 in classes1:
+        records = subtable.Class1Record[class1].Class2Record
+        rec1 = ot.Class1Record()
+        rec1.Class2Record = [records[class2] for class2 in classes2]
+        self.Class1Record.append(rec1)
+    self.Class1Count = len(classes1)
+    self.Class2Count = len(classes2)
+    return self
+
+
+def _isEmptyValue(value):
+    return value is None or not any(vars(value).values())
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    _bitCount = int.bit_count
+else:
+    def _bitCount(n):
+        return bin(n).count("1")
+
+
+def _glyphSetSize(glyphs, glyphMap):
+    """Bytes taken by a set of glyphs in a Coverage or ClassDef table,
+    whichever of the range and list formats is smaller."""
+    glyphIDs = sorted(glyphMap[g] for g in glyphs)
+    ranges = 1 + sum(1 for a, b in zip(glyphIDs, glyphIDs[1:]) if b != a + 1)
+    return min(2 * len(glyphIDs), 6 * ranges)
@@ -0,0 +1,410 @@
+"""Compact, array-backed alternative to RecordingPen.
+
+RecordingPen keeps a list of (operator, (point, point, ...)) tuples, which
+costs well over a hundred bytes per point. ArrayRecordingPen records the
+same calls into a few arrays instead:
+
+	- one operator code and one point count per pen call;
+	- the x, y coordinates of all points, flattened into one array;
+	- the operator and point ranges of each contour, so that individual
+	  contours can be sliced out without replaying the whole outline.
+
+It can be replayed onto segment pens and point pens, converted to and from
+RecordingPen values, and transformed without going through a pen.
+
+	>>> pen = ArrayRecordingPen()
+	>>> pen.moveTo((0, 0))
+	>>> pen.lineTo((0, 100))
+	>>> pen.qCurveTo((50, 75), (60, 50), (50, 0))
+	>>> pen.closePath()
+	>>> pen.addComponent("a", (1, 0, 0, 1, 10, 0))
+	>>> pen.value == [
+	... 	('moveTo', ((0, 0),)),
+	... 	('lineTo', ((0, 100),)),
+	... 	('qCurveTo', ((50, 75), (60, 50), (50, 0))),
+	... 	('closePath', ()),
+	... 	('addComponent', ('a', (1, 0, 0, 1, 10, 0)))]
+	True
+	>>> pen.numContours
+	1
+	>>> pen.transform((2, 0, 0, 2, 0, 0)).getContour(0).value[:2]
+	[('moveTo', ((0.0, 0.0),)), ('lineTo', ((0.0, 200.0),))]
+"""
+
+from fontTools.misc.py23 import *
+from fontTools.pens.basePen import AbstractPen
+import array
+
+
+__all__ = ["ArrayRecordingPen"]
+
+
+# operator codes
+_MOVE = 0
+_LINE = 1
+_QCURVE = 2
+_CURVE = 3
+_CLOSE = 4
+_END = 5
+_COMPONENT = 6
+_QCURVE_IMPLIED = 7  # qCurveTo whose on-curve point is None
+
+
+class ArrayRecordingPen(AbstractPen):
+
+	"""Pen recording operations into compact arrays; see module docstring.
+
+	The coordinates are stored in an array of the given 'typecode' ("d" by
+	default); "f" halves their memory at the cost of precision, and an
+	integer typecode can be used for outlines known to be integral.
+
+	The recording can be replayed with pen.replay(otherPen) or, since
+	ArrayRecordingPen also behaves like a glyph, with pen.draw(otherPen)
+	and pen.drawPoints(pointPen). pen.value returns the recording in the
+	same format as RecordingPen.value.
+	"""
+
+	def __init__(self, typecode="d"):
+		self._ops = array.array("B")
+		self._counts = array.array("L")
+		self._coords = array.array(typecode)
+		self._components = []
+		# (start, end) operator and point indices of each contour
+		self._contourOps = array.array("L")
+		self._contourPoints = array.array("L")
+
+	# Pen protocol
+
+	def _beginContour(self):
+		if len(self._contourOps) % 2:
+			# previous contour was not closed, e.g. a bare moveTo
+			self._endContour()
+		self._contourOps.append(len(self._ops))
+		self._contourPoints.append(len(self._coords) // 2)
+
+	def _endContour(self):
+		self._contourOps.append(len(self._ops))
+		self._contourPoints.append(len(self._coords) // 2)
+
+	def moveTo(self, pt):
+		self._beginContour()
+		self._ops.append(_MOVE)
+		self._counts.append(1)
+		self._coords.extend(pt)
+
+	def lineTo(self, pt):
+		self._ops.append(_LINE)
+		self._counts.append(1)
+		self._coords.extend(pt)
+
+	def curveTo(self, *points):
+		self._ops.append(_CURVE)
+		self._counts.append(len(points))
+		extend = self._coords.extend
+		for pt in points:
+			extend(pt)
+
+	def qCurveTo(self, *points):
+		if points[-1] is None:
+			self._beginContour()
+			self._ops.append(_QCURVE_IMPLIED)
+			points = points[:-1]
+		else:
+			self._ops.append(_QCURVE)
+		self._counts.append(len(points))
+		extend = self._coords.extend
+		for pt in points:
+			extend(pt)
+
+	def closePath(self):
+		self._ops.append(_CLOSE)
+		self._counts.append(0)
+		self._endContour()
+
+	def endPath(self):
+		self._ops.append(_END)
+		self._counts.append(0)
+		self._endContour()
+
+	def addComponent(self, glyphName, transformation):
+		self._ops.append(_COMPONENT)
+		self._counts.append(0)
+		self._components.append((glyphName, transformation))
+
+	# Replay
+
+	def replay(self, pen):
+		"""Replay the recording onto a segment pen."""
+		self._replay(pen, 0, len(self._ops), 0, len(self._coords) // 2, 0)
+
+	draw = replay
+
+	def drawPoints(self, pointPen):
+		"""Replay the recording onto a point pen."""
+		from fontTools.pens.pointPen import SegmentToPointPen
+		self.replay(SegmentToPointPen(pointPen))
+
+	def _replay(self, pen, opStart, opEnd, pointStart, pointEnd, componentStart):
+		counts = self._counts
+		components = self._components
+		# build the point tuples of the replayed range in one go rather
+		# than per operator
+		it = iter(self._coords[2*pointStart:2*pointEnd])
+		points = list(zip(it, it))
+		p = 0
+		k = componentStart
+		for i in range(opStart, opEnd):
+			op = self._ops[i]
+			if op == _LINE:
+				pen.lineTo(points[p])
+				p += 1
+			elif op == _QCURVE:
+				n = counts[i]
+				pen.qCurveTo(*points[p:p+n])
+				p += n
+			elif op == _CURVE:
+				n = counts[i]
+				pen.curveTo(*points[p:p+n])
+				p += n
+			elif op == _MOVE:
+				pen.moveTo(points[p])
+				p += 1
+			elif op == _CLOSE:
+				pen.closePath()
+			elif op == _END:
+				pen.endPath()
+			elif op == _COMPONENT:
+				pen.addComponent(*components[k])
+				k += 1
+			else:
+				n = counts[i]
+				pen.qCurveTo(*(points[p:p+n] + [None]))
+				p += n
+
+	@property
+	def value(self):
+		"""The recording as a RecordingPen-style list of tuples."""
+		from fontTools.pens.recordingPen import RecordingPen
+		pen = RecordingPen()
+		self.replay(pen)
+		return pen.value
+
+	# Contours
+
+	def __len__(self):
+		return len(self._ops)
+
+	@property
+	def numContours(self):
+		return (len(self._contourOps) + 1) // 2
+
+	def _contourRange(self, index):
+		contourOps = self._contourOps
+		contourPoints = self._contourPoints
+		opStart = contourOps[2*index]
+		pointStart = contourPoints[2*index]
+		if 2*index + 1 < len(contourOps):
+			opEnd = contourOps[2*index+1]
+			pointEnd = contourPoints[2*index+1]
+		else:
+			# still being drawn
+			opEnd = len(self._ops)
+			pointEnd = len(self._coords) // 2
+		return opStart, opEnd, pointStart, pointEnd
+
+	def getContour(self, index):
+		"""Return a new ArrayRecordingPen containing only the contour at
+		'index'. The underlying arrays are sliced, not replayed."""
+		if index < 0:
+			index += self.numContours
+		if not 0 <= index < self.numContours:
+			raise IndexError("contour index out of range")
+		opStart, opEnd, pointStart, pointEnd = self._contourRange(index)
+		result = self.__class__(self._coords.typecode)
+		result._ops = self._ops[opStart:opEnd]
+		result._counts = self._counts[opStart:opEnd]
+		result._coords = self._coords[2*pointStart:2*pointEnd]
+		result._contourOps = array.array("L", [0, opEnd - opStart])
+		result._contourPoints = array.array("L", [0, pointEnd - pointStart])
+		return result
+
+	def contours(self):
+		"""Iterate over the contours, as returned by getContour()."""
+		for i in range(self.numContours):
+			yield self.getContour(i)
+
+	def drawContour(self, index, pen):
+		"""Replay a single contour onto a segment pen."""
+		opStart, opEnd, pointStart, pointEnd = self._contourRange(index)
+		self._replay(pen, opStart, opEnd, pointStart, pointEnd, 0)
+
+	# Transformations
+
+	def transform(self, transformation):
+		"""Return a new ArrayRecordingPen with all coordinates and component
+		transformations transformed by 'transformation', which is either a
+		six-tuple or a fontTools.misc.transform.Transform object."""
+		from fontTools.misc.transform import Transform
+		if not hasattr(transformation, "transformPoint"):
+			transformation = Transform(*transformation)
+		xx, xy, yx, yy, dx, dy = transformation
+		coords = self._coords
+		xs = coords[0::2]
+		ys = coords[1::2]
+		newCoords = array.array("d", bytes(8 * len(coords)))
+		newCoords[0::2] = array.array("d", [xx*x + yx*y + dx for x, y in zip(xs, ys)])
+		newCoords[1::2] = array.array("d", [xy*x + yy*y + dy for x, y in zip(xs, ys)])
+		result = self.__class__("d")
+		result._ops = self._ops[:]
+		result._counts = self._counts[:]
+		result._coords = newCoords
+		result._components = [
+			(glyphName, transformation.transform(t))
+			for glyphName, t in self._components]
+		result._contourOps = self._contourOps[:]
+		result._contourPoints = self._contourPoints[:]
+		return result
+
+	def __eq__(self, other):
+		if type(self) != type(other):
+			return NotImplemented
+		return (self._ops == other._ops and
+				self._counts == other._counts and
+				self._coords == other._coords and
+				self._components == other._components)
+
+	def __ne__(self, other):
+		result = self.__eq__(other)
+		return result if result is NotImplemented else not result
+
+	# Conversion
+
+	@classmethod
+	def fromRecording(cls, recording, typecode="d"):
+		"""Build an ArrayRecordingPen from a RecordingPen.value style list."""
+		pen = cls(typecode)
+		for operator, operands in recording:
+			getattr(pen, operator)(*operands)
+		return pen
+
+	@classmethod
+	def fromGlyph(cls, glyph, typecode="d"):
+		"""Record any glyph object with a draw() method. Glyphs from a
+		TrueType TTFont glyph set are read directly from the 'glyf' table.
+		"""
+		from fontTools.ttLib.ttFont import _TTGlyphGlyf
+		if isinstance(glyph, _TTGlyphGlyf):
+			ttGlyph = glyph._glyph
+			offset = glyph.lsb - ttGlyph.xMin if hasattr(ttGlyph, "xMin") else 0
+			return cls.fromGlyfGlyph(
+				ttGlyph, glyph._glyphset._glyphs, offset, typecode=typecode)
+		pen = cls(typecode)
+		glyph.draw(pen)
+		return pen
+
+	@classmethod
+	def fromGlyfGlyph(cls, glyph, glyfTable, offset=0, typecode="d"):
+		"""Record a 'glyf' table Glyph, producing the same calls as
+		Glyph.draw(pen, glyfTable, offset) without replaying them."""
+		pen = cls(typecode)
+		if glyph.isComposite():
+			for component in glyph.components:
+				pen.addComponent(*component.getComponentInfo())
+			return pen
+		coordinates, endPts, flags = glyph.getCoordinates(glyfTable)
+		if offset:
+			coordinates = coordinates.copy()
+			coordinates.translate((offset, 0))
+		a = coordinates.array
+		if a.typecode != typecode:
+			a = array.array(typecode, a)
+		ops = pen._ops
+		counts = pen._counts
+		coords = pen._coords
+		start = 0
+		for end in endPts:
+			end = end + 1
+			pen._beginContour()
+			cFlags = [f & 0x01 for f in flags[start:end]]
+			if 1 not in cFlags:
+				ops.append(_QCURVE_IMPLIED)
+				counts.append(end - start)
+				coords.extend(a[2*start:2*end])
+			else:
+				# Rotate so that the contour ends on its first on-curve
+				# point, which is also where it starts; see Glyph.draw().
+				firstOnCurve = start + cFlags.index(1) + 1
+				indices = list(range(firstOnCurve, end)) + list(range(start, firstOnCurve))
+				last = indices[-1]
+				ops.append(_MOVE)
+				counts.append(1)
+				coords.extend(a[2*last:2*last+2])
+				n = 0
+				for i in indices:
+					coords.extend(a[2*i:2*i+2])
+					n += 1
+					if flags[i] & 0x01:
+						if n == 1:
+							ops.append(_LINE)
+						else:
+							ops.append(_QCURVE)
+						counts.append(n)
+						n = 0
+			ops.append(_CLOSE)
+			counts.append(0)
+			pen._endContour()
+			start = end
+		return pen
+
+
+def _benchmark(path):
+	"""Compare memory use and replay time of RecordingPen and
+	ArrayRecordingPen for all the glyphs of the font at 'path'."""
+	from fontTools.ttLib import TTFont
+	from fontTools.pens.basePen import NullPen
+	from fontTools.pens.recordingPen import RecordingPen
+	import gc
+	import time
+	import tracemalloc
+
+	font = TTFont(path)
+	glyphSet = font.getGlyphSet()
+	glyphNames = font.getGlyphOrder()
+	# decompile everything up front
+	for glyphName in glyphNames:
+		glyphSet[glyphName].draw(NullPen())
+
+	def record(factory):
+		gc.collect()
+		tracemalloc.start()
+		t0 = time.time()
+		recordings = [factory(glyphSet[glyphName]) for glyphName in glyphNames]
+		t1 = time.time()
+		size = tracemalloc.get_traced_memory()[0]
+		tracemalloc.stop()
+		return recordings, size, t1 - t0
+
+	def recordingPen(glyph):
+		pen = RecordingPen()
+		glyph.draw(pen)
+		return pen
+
+	for name, factory in (("RecordingPen", recordingPen),
+						  ("ArrayRecordingPen", ArrayRecordingPen.fromGlyph)):
+		recordings, size, recordTime = record(factory)
+		nullPen = NullPen()
+		t0 = time.time()
+		for pen in recordings:
+			pen.replay(nullPen)
+		replayTime = time.time() - t0
+		print("%-18s %10.1f KiB  record %.3fs  replay %.3fs" % (
+			name, size / 1024, recordTime, replayTime))
+
+
+if __name__ == "__main__":
+	import sys
+	if len(sys.argv) > 1:
+		_benchmark(sys.argv[1])
+	else:
+		import doctest
+		sys.exit(doctest.testmod().failed)
@@ -0,0 +1,456 @@
+"""Compute bounds, area and moments for many glyphs at once.
+
+The single-glyph pens (BoundsPen, AreaPen, MomentsPen, StatisticsPen)
+receive one segment at a time through the BasePen callbacks. When the
+same measurements are wanted for every glyph of a font, most of the time
+is spent in that dispatch rather than in the arithmetic. The functions in
+this module instead flatten a whole glyph set into two buffers:
+
+	types:  array('B') of segment operator codes (see below)
+	coords: array('d') of flattened x, y coordinates
+
+and then walk the buffers in a single loop per measurement.
+
+TrueType glyphs from a 'glyf' table are flattened straight from their
+GlyphCoordinates and flags, without going through a pen. Other glyphs
+(CFF charstrings, UFO glyphs, ...) are drawn once onto a FlattenPen.
+
+Operator codes, and the number of points that follow each of them in
+the 'coords' buffer:
+
+	MOVE    1  start of a contour
+	LINE    1  straight line to the point
+	QCURVE  2  one quadratic segment (off-curve point, on-curve point)
+	CURVE   3  one cubic segment (two off-curve points, on-curve point)
+	CLOSE   0  close the current contour
+	END     0  end the current (open) contour
+
+	>>> stats = calcGlyphSetStatistics({"square": _Square()}, moments=True)
+	>>> stats.getBounds("square")
+	(0.0, 0.0, 100.0, 100.0)
+	>>> stats.area[0]
+	-10000.0
+	>>> stats.meanX[0], stats.meanY[0]
+	(50.0, 50.0)
+"""
+
+from fontTools.misc.py23 import *
+from fontTools.misc.bezierTools import calcCubicBounds, calcQuadraticBounds
+from fontTools.pens.basePen import BasePen
+from fontTools.pens.momentsPen import MomentsPen
+import array
+
+
+__all__ = [
+	"MOVE", "LINE", "QCURVE", "CURVE", "CLOSE", "END",
+	"FlattenPen", "flattenGlyfGlyph", "flattenGlyphSet",
+	"GlyphSetStatistics", "calcGlyphSetStatistics",
+]
+
+
+MOVE, LINE, QCURVE, CURVE, CLOSE, END = range(6)
+
+# number of (x, y) points following each operator code
+_pointCounts = (1, 1, 2, 3, 0, 0)
+
+_NAN = float("nan")
+
+
+class FlattenPen(BasePen):
+
+	"""Pen that appends the atomic segments it receives to a pair of
+	'types' and 'coords' buffers (see the module docstring). Quadratic
+	splines and super-beziers are decomposed by BasePen, so every QCURVE
+	and CURVE entry is a single segment.
+	"""
+
+	def __init__(self, glyphSet=None, types=None, coords=None):
+		BasePen.__init__(self, glyphSet)
+		self.types = array.array("B") if types is None else types
+		self.coords = array.array("d") if coords is None else coords
+
+	def _moveTo(self, pt):
+		self.types.append(MOVE)
+		self.coords.extend(pt)
+
+	def _lineTo(self, pt):
+		self.types.append(LINE)
+		self.coords.extend(pt)
+
+	def _qCurveToOne(self, pt1, pt2):
+		self.types.append(QCURVE)
+		coords = self.coords
+		coords.extend(pt1)
+		coords.extend(pt2)
+
+	def _curveToOne(self, pt1, pt2, pt3):
+		self.types.append(CURVE)
+		coords = self.coords
+		coords.extend(pt1)
+		coords.extend(pt2)
+		coords.extend(pt3)
+
+	def _closePath(self):
+		self.types.append(CLOSE)
+
+	def _endPath(self):
+		self.types.append(END)
+
+
+def flattenGlyfGlyph(glyph, glyfTable, types, coords, offset=0):
+	"""Append the outline of a 'glyf' Glyph to the 'types' and 'coords'
+	buffers, producing the same segments as drawing it onto a FlattenPen.
+	Components are resolved with Glyph.getCoordinates(). The 'offset' is
+	added to all x coordinates, like for Glyph.draw().
+	"""
+	coordinates, endPts, flags = glyph.getCoordinates(glyfTable)
+	if not endPts:
+		return
+	a = coordinates.array
+	appendType = types.append
+	extend = coords.extend
+	start = 0
+	for end in endPts:
+		if end < start:
+			continue
+		first = None
+		for i in range(start, end + 1):
+			if flags[i] & 0x01:
+				first = i
+				break
+		if first is None:
+			# No on-curve points at all: start at the implied on-curve
+			# point between the last and the first off-curve points.
+			sx = 0.5 * (a[2*end] + a[2*start]) + offset
+			sy = 0.5 * (a[2*end+1] + a[2*start+1])
+			order = range(start, end + 1)
+		else:
+			sx = a[2*first] + offset
+			sy = a[2*first+1]
+			order = list(range(first + 1, end + 1)) + list(range(start, first + 1))
+		appendType(MOVE)
+		extend((sx, sy))
+		pending = None
+		for i in order:
+			x = a[2*i] + offset
+			y = a[2*i+1]
+			if flags[i] & 0x01:
+				if pending is None:
+					appendType(LINE)
+					extend((x, y))
+				else:
+					appendType(QCURVE)
+					extend(pending)
+					extend((x, y))
+					pending = None
+			else:
+				if pending is not None:
+					px, py = pending
+					appendType(QCURVE)
+					extend((px, py, 0.5 * (px + x), 0.5 * (py + y)))
+				pending = (x, y)
+		if pending is not None:
+			appendType(QCURVE)
+			extend(pending)
+			extend((sx, sy))
+		appendType(CLOSE)
+		start = end + 1
+
+
+def flattenGlyphSet(glyphSet, glyphNames=None):
+	"""Flatten the outlines of the glyphs in 'glyphSet' (all glyphs
+	unless 'glyphNames' is given) into shared buffers.
+
+	Return a (glyphNames, types, coords, typeStarts) tuple, where the
+	segments of glyph i are types[typeStarts[i]:typeStarts[i+1]]. The
+	coordinates are consumed sequentially, following _pointCounts.
+	"""
+	from fontTools.ttLib.ttFont import _TTGlyphSet, _TTGlyphGlyf
+
+	if glyphNames is None:
+		glyphNames = list(glyphSet.keys())
+	types = array.array("B")
+	coords = array.array("d")
+	typeStarts = array.array("L", [0])
+	if isinstance(glyphSet, _TTGlyphSet) and glyphSet._glyphType is _TTGlyphGlyf:
+		glyfTable = glyphSet._glyphs
+		hmtx = glyphSet._hmtx
+		with glyfTable.componentCache():
+			for glyphName in glyphNames:
+				glyph = glyfTable[glyphName]
+				lsb = hmtx[glyphName][1]
+				offset = lsb - glyph.xMin if hasattr(glyph, "xMin") else 0
+				flattenGlyfGlyph(glyph, glyfTable, types, coords, offset)
+				typeStarts.append(len(types))
+	else:
+		pen = FlattenPen(glyphSet, types, coords)
+		for glyphName in glyphNames:
+			glyphSet[glyphName].draw(pen)
+			typeStarts.append(len(types))
+	return glyphNames, types, coords, typeStarts
+
+
+class _MomentsAccumulator(MomentsPen):
+
+	"""MomentsPen whose current point is set directly by the caller, so
+	its per-segment formulas can be applied without the BasePen state
+	machine."""
+
+	def __init__(self):
+		MomentsPen.__init__(self)
+		self.currentPoint = None
+
+	def _getCurrentPoint(self):
+		return self.currentPoint
+
+	def reset(self):
+		self.area = 0
+		self.momentX = 0
+		self.momentY = 0
+		self.momentXX = 0
+		self.momentXY = 0
+		self.momentYY = 0
+
+
+class GlyphSetStatistics(object):
+
+	"""Per-glyph measurements returned by calcGlyphSetStatistics().
+
+	Each measurement is an array('d') indexed like 'glyphNames':
+
+		xMin, yMin, xMax, yMax: bounds; NaN for glyphs with no outline
+		area: signed area, like AreaPen
+		momentX, momentY, momentXX, momentXY, momentYY: like MomentsPen
+		meanX, meanY: center of mass, like StatisticsPen
+
+	Measurements that were not requested are None.
+	"""
+
+	def __init__(self, glyphNames):
+		self.glyphNames = glyphNames
+		self.xMin = self.yMin = self.xMax = self.yMax = None
+		self.area = None
+		self.momentX = self.momentY = None
+		self.momentXX = self.momentXY = self.momentYY = None
+		self.meanX = self.meanY = None
+		self._indices = None
+
+	def __len__(self):
+		return len(self.glyphNames)
+
+	def index(self, glyphName):
+		if self._indices is None:
+			self._indices = {n: i for i, n in enumerate(self.glyphNames)}
+		return self._indices[glyphName]
+
+	def getBounds(self, glyphName):
+		"""Return the (xMin, yMin, xMax, yMax) bounds of 'glyphName', or
+		None if it has no outline."""
+		i = self.index(glyphName)
+		xMin = self.xMin[i]
+		if xMin != xMin:  # NaN
+			return None
+		return (xMin, self.yMin[i], self.xMax[i], self.yMax[i])
+
+
+def _zeros(n):
+	return array.array("d", bytes(8 * n))
+
+
+def _calcBounds(stats, types, coords, typeStarts, control):
+	n = len(typeStarts) - 1
+	xMins, yMins, xMaxs, yMaxs = _zeros(n), _zeros(n), _zeros(n), _zeros(n)
+	c = 0
+	for gi in range(n):
+		xMin = yMin = xMax = yMax = None
+		x0 = y0 = 0
+		for k in range(typeStarts[gi], typeStarts[gi+1]):
+			op = types[k]
+			if op == CLOSE or op == END:
+				continue
+			nPoints = _pointCounts[op]
+			x = coords[c + 2*nPoints - 2]
+			y = coords[c + 2*nPoints - 1]
+			if xMin is None:
+				# a MOVE always comes first
+				xMin = xMax = x
+				yMin = yMax = y
+			else:
+				if x < xMin: xMin = x
+				elif x > xMax: xMax = x
+				if y < yMin: yMin = y
+				elif y > yMax: yMax = y
+			if nPoints > 1:
+				# Like BoundsPen, only compute the exact curve bounds if
+				# an off-curve point lies outside the bounds so far.
+				outside = False
+				for j in range(c, c + 2*nPoints - 2, 2):
+					px = coords[j]; py = coords[j+1]
+					if control:
+						if px < xMin: xMin = px
+						elif px > xMax: xMax = px
+						if py < yMin: yMin = py
+						elif py > yMax: yMax = py
+					elif not (xMin <= px <= xMax and yMin <= py <= yMax):
+						outside = True
+				if outside:
+					if op == QCURVE:
+						bounds = calcQuadraticBounds(
+							(x0, y0), (coords[c], coords[c+1]), (x, y))
+					else:
+						bounds = calcCubicBounds(
+							(x0, y0), (coords[c], coords[c+1]),
+							(coords[c+2], coords[c+3]), (x, y))
+					bxMin, byMin, bxMax, byMax = bounds
+					if bxMin < xMin: xMin = bxMin
+					if byMin < yMin: yMin = byMin
+					if bxMax > xMax: xMax = bxMax
+					if byMax > yMax: yMax = byMax
+			c += 2 * nPoints
+			x0 = x; y0 = y
+		if xMin is None:
+			xMin = yMin = xMax = yMax = _NAN
+		xMins[gi] = xMin; yMins[gi] = yMin
+		xMaxs[gi] = xMax; yMaxs[gi] = yMax
+	stats.xMin, stats.yMin, stats.xMax, stats.yMax = xMins, yMins, xMaxs, yMaxs
+
+
+def _calcArea(stats, types, coords, typeStarts):
+	n = len(typeStarts) - 1
+	areas = _zeros(n)
+	c = 0
+	for gi in range(n):
+		value = 0
+		x0 = y0 = sx = sy = 0
+		for k in range(typeStarts[gi], typeStarts[gi+1]):
+			op = types[k]
+			if op == MOVE:
+				sx = x0 = coords[c]; sy = y0 = coords[c+1]; c += 2
+				continue
+			if op == LINE:
+				x1 = coords[c]; y1 = coords[c+1]; c += 2
+			elif op == QCURVE:
+				# https://github.com/Pomax/bezierinfo/issues/44
+				x1 = coords[c+2]; y1 = coords[c+3]
+				ax = coords[c] - x0; ay = coords[c+1] - y0
+				bx = x1 - x0; by = y1 - y0
+				value -= (bx * ay - ax * by) / 3
+				c += 4
+			elif op == CURVE:
+				ax = coords[c] - x0; ay = coords[c+1] - y0
+				bx = coords[c+2] - x0; by = coords[c+3] - y0
+				x1 = coords[c+4]; y1 = coords[c+5]
+				cx = x1 - x0; cy = y1 - y0
+				value -= (
+						ax * (   -   by -   cy) +
+						bx * (ay        - 2*cy) +
+						cx * (ay + 2*by       )
+					) * 0.15
+				c += 6
+			elif op == CLOSE:
+				x1 = sx; y1 = sy
+			else:
+				if (x0, y0) != (sx, sy):
+					# Area is not defined for open contours.
+					raise NotImplementedError
+				continue
+			value -= (x1 - x0) * (y1 + y0) * .5
+			x0 = x1; y0 = y1
+		areas[gi] = value
+	stats.area = areas
+
+
+def _calcMoments(stats, types, coords, typeStarts):
+	n = len(typeStarts) - 1
+	areas = _zeros(n)
+	momentsX, momentsY = _zeros(n), _zeros(n)
+	momentsXX, momentsXY, momentsYY = _zeros(n), _zeros(n), _zeros(n)
+	meansX, meansY = _zeros(n), _zeros(n)
+	acc = _MomentsAccumulator()
+	lineTo = acc._lineTo
+	qCurveTo = acc._qCurveToOne
+	curveTo = acc._curveToOne
+	c = 0
+	for gi in range(n):
+		acc.reset()
+		start = None
+		for k in range(typeStarts[gi], typeStarts[gi+1]):
+			op = types[k]
+			if op == MOVE:
+				start = acc.currentPoint = (coords[c], coords[c+1]); c += 2
+			elif op == LINE:
+				pt = (coords[c], coords[c+1]); c += 2
+				lineTo(pt)
+				acc.currentPoint = pt
+			elif op == QCURVE:
+				pt = (coords[c+2], coords[c+3])
+				qCurveTo((coords[c], coords[c+1]), pt)
+				acc.currentPoint = pt
+				c += 4
+			elif op == CURVE:
+				pt = (coords[c+4], coords[c+5])
+				curveTo((coords[c], coords[c+1]), (coords[c+2], coords[c+3]), pt)
+				acc.currentPoint = pt
+				c += 6
+			elif op == CLOSE:
+				if acc.currentPoint != start:
+					lineTo(start)
+			elif acc.currentPoint != start:
+				# Green theorem is not defined on open contours.
+				raise NotImplementedError
+		area = acc.area
+		areas[gi] = area
+		momentsX[gi] = acc.momentX
+		momentsY[gi] = acc.momentY
+		momentsXX[gi] = acc.momentXX
+		momentsXY[gi] = acc.momentXY
+		momentsYY[gi] = acc.momentYY
+		if area:
+			meansX[gi] = acc.momentX / area
+			meansY[gi] = acc.momentY / area
+	stats.area = areas
+	stats.momentX, stats.momentY = momentsX, momentsY
+	stats.momentXX, stats.momentXY, stats.momentYY = momentsXX, momentsXY, momentsYY
+	stats.meanX, stats.meanY = meansX, meansY
+
+
+def calcGlyphSetStatistics(glyphSet, glyphNames=None, bounds=True,
+		area=True, moments=False, controlBounds=False):
+	"""Measure the glyphs in 'glyphSet' (all of them, unless 'glyphNames'
+	is given) and return a GlyphSetStatistics object.
+
+	If 'bounds' is true, compute the outline bounds like BoundsPen, or
+	the control point bounds like ControlBoundsPen if 'controlBounds' is
+	also true. If 'area' is true, compute the signed area like AreaPen.
+	If 'moments' is true, compute the moments and the center of mass
+	like StatisticsPen (this implies 'area').
+
+	'glyphSet' can be any glyph set; the ones returned by
+	TTFont.getGlyphSet() for TrueType fonts are read directly from the
+	'glyf' table.
+	"""
+	glyphNames, types, coords, typeStarts = flattenGlyphSet(glyphSet, glyphNames)
+	stats = GlyphSetStatistics(glyphNames)
+	if bounds:
+		_calcBounds(stats, types, coords, typeStarts, controlBounds)
+	if moments:
+		_calcMoments(stats, types, coords, typeStarts)
+	elif area:
+		_calcArea(stats, types, coords, typeStarts)
+	return stats
+
+
+class _Square(object):
+
+	def draw(self, pen):
+		pen.moveTo((0, 0))
+		pen.lineTo((0, 100))
+		pen.lineTo((100, 100))
+		pen.lineTo((100, 0))
+		pen.closePath()
+
+
+if __name__ == "__main__":
+	import sys
+	import doctest
+	sys.exit(doctest.testmod().failed)
@@ -1,9 +1,15 @@
 """Pen recording operations that can be accessed or replayed."""
 from fontTools.misc.py23 import *
 from fontTools.pens.basePen import AbstractPen, DecomposingPen
+from fontTools.pens.pointPen import AbstractPointPen
 
 
-__all__ = ["replayRecording", "RecordingPen", "DecomposingRecordingPen"]
+__all__ = [
+	"replayRecording",
+	"RecordingPen",
+	"DecomposingRecordingPen",
+	"RecordingPointPen",
+]
 
 
 def replayRecording(recording, pen):
@@ -89,6 +95,53 @@ class DecomposingRecordingPen(DecomposingPen, RecordingPen):
 	skipMissingComponents = False
 
 
+class RecordingPointPen(AbstractPointPen):
+	"""PointPen recording operations that can be accessed or replayed.
+
+	The recording can be accessed as pen.value; or replayed using
+	pointPen.replay(otherPointPen). Each item of pen.value is a tuple of
+	method name, tuple of positional arguments and dict of keyword
+	arguments.
+
+	>>> pen = RecordingPointPen()
+	>>> pen.beginPath()
+	>>> pen.addPoint((0, 0), "line", identifier="p1")
+	>>> pen.endPath()
+	>>> pen.addComponent("a", (1, 0, 0, 1, 10, 0))
+	>>> for item in pen.value:
+	...     print(item)
+	('beginPath', (), {})
+	('addPoint', ((0, 0), 'line', False, None), {'identifier': 'p1'})
+	('endPath', (), {})
+	('addComponent', ('a', (1, 0, 0, 1, 10, 0)), {})
+	"""
+
+	def __init__(self):
+		self.value = []
+
+	def beginPath(self, identifier=None, **kwargs):
+		if identifier is not None:
+			kwargs["identifier"] = identifier
+		self.value.append(("beginPath", (), kwargs))
+
+	def endPath(self):
+		self.value.append(("endPath", (), {}))
+
+	def addPoint(self, pt, segmentType=None, smooth=False, name=None, identifier=None, **kwargs):
+		if identifier is not None:
+			kwargs["identifier"] = identifier
+		self.value.append(("addPoint", (pt, segmentType, smooth, name), kwargs))
+
+	def addComponent(self, baseGlyphName, transformation, identifier=None, **kwargs):
+		if identifier is not None:
+			kwargs["identifier"] = identifier
+		self.value.append(("addComponent", (baseGlyphName, transformation), kwargs))
+
+	def replay(self, pointPen):
+		for operator, args, kwargs in self.value:
+			getattr(pointPen, operator)(*args, **kwargs)
+
+
 if __name__ == "__main__":
 	from fontTools.pens.basePen import _TestPen
 	pen = RecordingPen()
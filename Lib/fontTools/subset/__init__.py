@@ -6,6 +6,7 @@ from fontTools.misc.py23 import *
 from fontTools.misc.fixedTools import otRound
 from fontTools import ttLib
 from fontTools.ttLib.tables import otTables
+from fontTools.ttLib.tables.C_O_L_R_ import ColorLayers
 from fontTools.otlLib.maxContextCalc import maxCtxFont
 from fontTools.pens.basePen import NullPen
 from fontTools.misc.loggingTools import Timer
@@ -383,6 +384,25 @@ def _add_method(*clazzes):
 def _uniq_sort(l):
 	return sorted(set(l))
 
+class _GlyphSet(frozenset):
+	"""Frozenset of the glyph names retained by the subsetter, which also
+	holds their sorted glyph IDs into 'glyphOrder', looked up once per run.
+	Coverage and ClassDef tables read from the font use these to intersect
+	their glyph IDs with the set."""
+
+	def __new__(cls, reverseGlyphMap, glyphOrder):
+		self = super(_GlyphSet, cls).__new__(cls, reverseGlyphMap)
+		self.glyphOrder = glyphOrder
+		self.glyphIDs = sorted(reverseGlyphMap.values())
+		return self
+
+def _glyph_ids(glyphIDs, glyphs):
+	# Returns the sorted glyph IDs of 'glyphs' in the glyph order of the
+	# _CoverageGlyphIDs or _ClassDefGlyphIDs 'glyphIDs', if known, or None.
+	if isinstance(glyphs, _GlyphSet) and glyphs.glyphOrder is glyphIDs.glyphOrder:
+		return glyphs.glyphIDs
+	return None
+
 def _dict_subset(d, glyphs):
 	return {g:d[g] for g in glyphs}
 
@@ -393,28 +413,59 @@ def _list_subset(l, indices):
 @_add_method(otTables.Coverage)
 def intersect(self, glyphs):
 	"""Returns ascending list of matching coverage values."""
+	glyphIDs = self.getGlyphIDs()
+	if glyphIDs is not None:
+		return glyphIDs.intersect(glyphs, _glyph_ids(glyphIDs, glyphs))
 	return [i for i,g in enumerate(self.glyphs) if g in glyphs]
 
 @_add_method(otTables.Coverage)
 def intersect_glyphs(self, glyphs):
 	"""Returns set of intersecting glyphs."""
+	glyphIDs = self.getGlyphIDs()
+	if glyphIDs is not None:
+		glyphOrder = glyphIDs.glyphOrder
+		return set(glyphOrder[glyphIDs.getGlyphID(i)]
+			   for i in glyphIDs.intersect(glyphs, _glyph_ids(glyphIDs, glyphs)))
 	return set(g for g in self.glyphs if g in glyphs)
 
 @_add_method(otTables.Coverage)
 def subset(self, glyphs):
 	"""Returns ascending list of remaining coverage values."""
 	indices = self.intersect(glyphs)
-	self.glyphs = [g for g in self.glyphs if g in glyphs]
+	glyphIDs = self.getGlyphIDs()
+	if glyphIDs is not None:
+		self.setGlyphIDs(glyphIDs.take(indices))
+	else:
+		self.glyphs = [g for g in self.glyphs if g in glyphs]
 	return indices
 
 @_add_method(otTables.Coverage)
 def remap(self, coverage_map):
 	"""Remaps coverage."""
+	glyphIDs = self.getGlyphIDs()
+	if glyphIDs is not None:
+		remapped = glyphIDs.take(coverage_map)
+		if remapped is not None:
+			self.setGlyphIDs(remapped)
+			return
 	self.glyphs = [self.glyphs[i] for i in coverage_map]
 
+def _classdef_items(classdef, glyphs):
+	# Returns the sorted (glyphID, class) items of a ClassDef read from a
+	# font, for the glyphs it classifies, or None.
+	glyphIDs = classdef.getGlyphIDs()
+	if glyphIDs is None:
+		return None
+	return glyphIDs.intersect(glyphs, _glyph_ids(glyphIDs, glyphs))
+
 @_add_method(otTables.ClassDef)
 def intersect(self, glyphs):
 	"""Returns ascending list of matching class values."""
+	items = _classdef_items(self, glyphs)
+	if items is not None:
+		return _uniq_sort(
+			 ([0] if len(items) < len(glyphs) else []) +
+				[v for g,v in items])
 	return _uniq_sort(
 		 ([0] if any(g not in self.classDefs for g in glyphs) else []) +
 			[v for g,v in self.classDefs.items() if g in glyphs])
@@ -422,6 +473,12 @@ def intersect(self, glyphs):
 @_add_method(otTables.ClassDef)
 def intersect_class(self, glyphs, klass):
 	"""Returns set of glyphs matching class."""
+	items = _classdef_items(self, glyphs)
+	if items is not None:
+		glyphOrder = self.getGlyphIDs().glyphOrder
+		if klass == 0:
+			return set(glyphs) - set(glyphOrder[g] for g,v in items)
+		return set(glyphOrder[g] for g,v in items if v == klass)
 	if klass == 0:
 		return set(g for g in glyphs if g not in self.classDefs)
 	return set(g for g,v in self.classDefs.items()
@@ -430,12 +487,22 @@ def intersect_class(self, glyphs, klass):
 @_add_method(otTables.ClassDef)
 def subset(self, glyphs, remap=False):
 	"""Returns ascending list of remaining classes."""
-	self.classDefs = {g:v for g,v in self.classDefs.items() if g in glyphs}
+	items = _classdef_items(self, glyphs)
+	if items is not None:
+		glyphIDs = self.getGlyphIDs()
+		glyphIDs = glyphIDs.fromItems(glyphIDs.glyphOrder, items)
+		self.setGlyphIDs(glyphIDs)
+		classes = glyphIDs.classes
+		unclassified = len(items) < len(glyphs)
+	else:
+		self.classDefs = {g:v for g,v in self.classDefs.items() if g in glyphs}
+		classes = self.classDefs.values()
+		unclassified = any(g not in self.classDefs for g in glyphs)
 	# Note: while class 0 has the special meaning of "not matched",
 	# if no glyph will ever /not match/, we can optimize class 0 out too.
 	indices = _uniq_sort(
-		 ([0] if any(g not in self.classDefs for g in glyphs) else []) +
-			list(self.classDefs.values()))
+		 ([0] if unclassified else []) +
+			list(classes))
 	if remap:
 		self.remap(indices)
 	return indices
@@ -443,6 +510,13 @@ def subset(self, glyphs, remap=False):
 @_add_method(otTables.ClassDef)
 def remap(self, class_map):
 	"""Remaps classes."""
+	glyphIDs = self.getGlyphIDs()
+	if glyphIDs is not None:
+		class_map = {v:i for i,v in reversed(list(enumerate(class_map)))}
+		self.setGlyphIDs(glyphIDs.__class__(glyphIDs.glyphOrder,
+			glyphIDs.starts, glyphIDs.ends,
+			[class_map[v] for v in glyphIDs.classes]))
+		return
 	self.classDefs = {g:class_map.index(v) for g,v in self.classDefs.items()}
 
 @_add_method(otTables.SingleSubst)
@@ -1031,7 +1105,7 @@ def subset_glyphs(self, s):
 		rss = [rss[i] for i in indices if i < rssCount]
 		del rssCount
 		# Delete, but not renumber, unreachable rulesets.
-		indices = getattr(self, c.ClassDef).intersect(self.Coverage.glyphs)
+		indices = getattr(self, c.ClassDef).intersect(set(self.Coverage.glyphs))
 		rss = [rss if i in indices else None for i,rss in enumerate(rss)]
 
 		for rs in rss:
@@ -1948,19 +2022,28 @@ def subset_glyphs(self, s):
 
 @_add_method(ttLib.getTableClass('COLR'))
 def closure_glyphs(self, s):
+	colorLayers = self.ColorLayers
+	if isinstance(colorLayers, ColorLayers):
+		getLayerGlyphNames = colorLayers.getLayerGlyphNames
+	else:
+		getLayerGlyphNames = lambda g: [l.name for l in colorLayers[g]]
 	decompose = s.glyphs
 	while decompose:
 		layers = set()
 		for g in decompose:
-			for l in self.ColorLayers.get(g, []):
-				layers.add(l.name)
+			if g in colorLayers:
+				layers.update(getLayerGlyphNames(g))
 		layers -= s.glyphs
 		s.glyphs.update(layers)
 		decompose = layers
 
 @_add_method(ttLib.getTableClass('COLR'))
 def subset_glyphs(self, s):
-	self.ColorLayers = {g: self.ColorLayers[g] for g in s.glyphs if g in self.ColorLayers}
+	if isinstance(self.ColorLayers, ColorLayers):
+		# slice the arrays of the layers that were not loaded
+		self.ColorLayers = self.ColorLayers.subset(s.glyphs)
+	else:
+		self.ColorLayers = {g: self.ColorLayers[g] for g in s.glyphs if g in self.ColorLayers}
 	return bool(self.ColorLayers)
 
 # TODO: prune unused palettes
@@ -2611,6 +2694,7 @@ class Subsetter(object):
 		del self.glyphs
 
 	def _subset_glyphs(self, font):
+		glyphs = _GlyphSet(self.reverseOrigGlyphMap, font.getGlyphOrder())
 		for tag in self._sort_tables(font):
 			clazz = ttLib.getTableClass(tag)
 
@@ -2619,7 +2703,7 @@ class Subsetter(object):
 			elif hasattr(clazz, 'subset_glyphs'):
 				with timer("subset '%s'" % tag):
 					table = font[tag]
-					self.glyphs = self.glyphs_retained
+					self.glyphs = glyphs
 					retain = table.subset_glyphs(self)
 					del self.glyphs
 				if not retain:
@@ -458,13 +458,13 @@ class DirectoryEntry(object):
 		self.uncompressed = False # if True, always embed entry raw
 
 	def fromFile(self, file):
-		sstruct.unpack(self.format, file.read(self.formatSize), self)
+		sstruct.compile(self.format).unpack(file.read(self.formatSize), self)
 
 	def fromString(self, str):
-		sstruct.unpack(self.format, str, self)
+		sstruct.compile(self.format).unpack(str, self)
 
 	def toString(self):
-		return sstruct.pack(self.format, self)
+		return sstruct.compile(self.format).pack(self)
 
 	def __repr__(self):
 		if hasattr(self, "tag"):
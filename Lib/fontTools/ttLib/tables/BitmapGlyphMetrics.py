@@ -29,19 +29,22 @@ smallGlyphMetricsFormat = """
   Advance:  B
 """
 
+bigGlyphMetricsStruct = sstruct.compile(bigGlyphMetricsFormat)
+smallGlyphMetricsStruct = sstruct.compile(smallGlyphMetricsFormat)
+
 class BitmapGlyphMetrics(object):
 
 	def toXML(self, writer, ttFont):
 		writer.begintag(self.__class__.__name__)
 		writer.newline()
-		for metricName in sstruct.getformat(self.__class__.binaryFormat)[1]:
+		for metricName in self.__class__.binaryStruct.names:
 			writer.simpletag(metricName, value=getattr(self, metricName))
 			writer.newline()
 		writer.endtag(self.__class__.__name__)
 		writer.newline()
 
 	def fromXML(self, name, attrs, content, ttFont):
-		metricNames = set(sstruct.getformat(self.__class__.binaryFormat)[1])
+		metricNames = set(self.__class__.binaryStruct.names)
 		for element in content:
 			if not isinstance(element, tuple):
 				continue
@@ -55,6 +58,8 @@ class BitmapGlyphMetrics(object):
 
 class BigGlyphMetrics(BitmapGlyphMetrics):
 	binaryFormat = bigGlyphMetricsFormat
+	binaryStruct = bigGlyphMetricsStruct
 
 class SmallGlyphMetrics(BitmapGlyphMetrics):
 	binaryFormat = smallGlyphMetricsFormat
+	binaryStruct = smallGlyphMetricsStruct
@@ -4,9 +4,8 @@
 
 
 from fontTools.misc.py23 import *
-from fontTools.misc import sstruct
 from . import E_B_D_T_
-from .BitmapGlyphMetrics import BigGlyphMetrics, bigGlyphMetricsFormat, SmallGlyphMetrics, smallGlyphMetricsFormat
+from .BitmapGlyphMetrics import BigGlyphMetrics, bigGlyphMetricsStruct, SmallGlyphMetrics, smallGlyphMetricsStruct
 from .E_B_D_T_ import BitmapGlyph, BitmapPlusSmallMetricsMixin, BitmapPlusBigMetricsMixin
 import struct
 
@@ -38,7 +37,7 @@ class cbdt_bitmap_format_17(BitmapPlusSmallMetricsMixin, ColorBitmapGlyph):
 
 	def decompile(self):
 		self.metrics = SmallGlyphMetrics()
-		dummy, data = sstruct.unpack2(smallGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = smallGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		(dataLen,) = struct.unpack(">L", data[:4])
 		data = data[4:]
 
@@ -48,7 +47,7 @@ class cbdt_bitmap_format_17(BitmapPlusSmallMetricsMixin, ColorBitmapGlyph):
 
 	def compile(self, ttFont):
 		dataList = []
-		dataList.append(sstruct.pack(smallGlyphMetricsFormat, self.metrics))
+		dataList.append(smallGlyphMetricsStruct.pack(self.metrics))
 		dataList.append(struct.pack(">L", len(self.imageData)))
 		dataList.append(self.imageData)
 		return bytesjoin(dataList)
@@ -57,7 +56,7 @@ class cbdt_bitmap_format_18(BitmapPlusBigMetricsMixin, ColorBitmapGlyph):
 
 	def decompile(self):
 		self.metrics = BigGlyphMetrics()
-		dummy, data = sstruct.unpack2(bigGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = bigGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		(dataLen,) = struct.unpack(">L", data[:4])
 		data = data[4:]
 
@@ -67,7 +66,7 @@ class cbdt_bitmap_format_18(BitmapPlusBigMetricsMixin, ColorBitmapGlyph):
 
 	def compile(self, ttFont):
 		dataList = []
-		dataList.append(sstruct.pack(bigGlyphMetricsFormat, self.metrics))
+		dataList.append(bigGlyphMetricsStruct.pack(self.metrics))
 		dataList.append(struct.pack(">L", len(self.imageData)))
 		dataList.append(self.imageData)
 		return bytesjoin(dataList)
@@ -4,8 +4,11 @@
 
 from fontTools.misc.py23 import *
 from fontTools.misc.textTools import safeEval
+from fontTools.misc.lazyTools import LazyDict
 from . import DefaultTable
+import array
 import struct
+import sys
 
 
 class table_C_O_L_R_(DefaultTable.DefaultTable):
@@ -19,59 +22,47 @@ class table_C_O_L_R_(DefaultTable.DefaultTable):
 		self.getGlyphName = ttFont.getGlyphName # for use in get/set item functions, for access by GID
 		self.version, numBaseGlyphRecords, offsetBaseGlyphRecord, offsetLayerRecord, numLayerRecords = struct.unpack(">HHLLH", data[:14])
 		assert (self.version == 0), "Version of COLR table is higher than I know how to handle"
-		glyphOrder = ttFont.getGlyphOrder()
-		gids = []
-		layerLists = []
-		glyphPos = offsetBaseGlyphRecord
-		for i in range(numBaseGlyphRecords):
-			gid, firstLayerIndex, numLayers = struct.unpack(">HHH", data[glyphPos:glyphPos+6])
-			glyphPos += 6
-			gids.append(gid)
+		# (gid, firstLayerIndex, numLayers) base glyph records
+		baseGlyphs = _decompileUInt16Array(data, offsetBaseGlyphRecord, 3 * numBaseGlyphRecords)
+		# (layerGid, colorID) layer records
+		layers = _decompileUInt16Array(data, offsetLayerRecord, 2 * numLayerRecords)
+		for firstLayerIndex, numLayers in zip(baseGlyphs[1::3], baseGlyphs[2::3]):
 			assert (firstLayerIndex + numLayers <= numLayerRecords)
-			layerPos = offsetLayerRecord + firstLayerIndex * 4
-			layers = []
-			for j in range(numLayers):
-				layerGid, colorID = struct.unpack(">HH", data[layerPos:layerPos+4])
-				try:
-					layerName = glyphOrder[layerGid]
-				except IndexError:
-					layerName = self.getGlyphName(layerGid)
-				layerPos += 4
-				layers.append(LayerRecord(layerName, colorID))
-			layerLists.append(layers)
-
-		self.ColorLayers = colorLayerLists = {}
-		try:
-			names = [glyphOrder[gid] for gid in gids]
-		except IndexError:
-			getGlyphName = self.getGlyphName
-			names = map(getGlyphName, gids)
+		self.ColorLayers = ColorLayers(ttFont.getGlyphOrder(), self.getGlyphName, baseGlyphs, layers)
 
-		for name, layerList in zip(names, layerLists):
-			colorLayerLists[name] = layerList
+	def _iterLayerRecords(self, getGlyphID):
+		# yield (glyphName, [layerGid, colorID, ...]) tuples
+		if isinstance(self.ColorLayers, ColorLayers):
+			return self.ColorLayers._iterLayerRecords(getGlyphID)
+		return (
+			(glyphName, [v for layer in layers for v in (getGlyphID(layer.name), layer.colorID)])
+			for glyphName, layers in self.ColorLayers.items()
+		)
 
 	def compile(self, ttFont):
 		ordered = []
 		ttFont.getReverseGlyphMap(rebuild=True)
-		glyphNames = self.ColorLayers.keys()
-		for glyphName in glyphNames:
+		for glyphName, layers in self._iterLayerRecords(ttFont.getGlyphID):
 			try:
 				gid = ttFont.getGlyphID(glyphName)
 			except:
 				assert 0, "COLR table contains a glyph name not in ttFont.getGlyphNames(): " + str(glyphName)
-			ordered.append([gid, glyphName, self.ColorLayers[glyphName]])
+			ordered.append((gid, glyphName, layers))
 		ordered.sort()
 
-		glyphMap = []
-		layerMap = []
+		glyphMap = array.array("H")
+		layerMap = array.array("H")
 		for (gid, glyphName, layers) in ordered:
-			glyphMap.append(struct.pack(">HHH", gid, len(layerMap), len(layers)))
-			for layer in layers:
-				layerMap.append(struct.pack(">HH", ttFont.getGlyphID(layer.name), layer.colorID))
-
-		dataList = [struct.pack(">HHLLH", self.version, len(glyphMap), 14, 14+6*len(glyphMap), len(layerMap))]
-		dataList.extend(glyphMap)
-		dataList.extend(layerMap)
+			glyphMap.extend((gid, len(layerMap) // 2, len(layers) // 2))
+			layerMap.extend(layers)
+		numBaseGlyphRecords = len(glyphMap) // 3
+		if sys.byteorder != "big":
+			glyphMap.byteswap()
+			layerMap.byteswap()
+
+		dataList = [struct.pack(">HHLLH", self.version, numBaseGlyphRecords, 14, 14+6*numBaseGlyphRecords, len(layerMap) // 2)]
+		dataList.append(glyphMap.tobytes())
+		dataList.append(layerMap.tobytes())
 		data = bytesjoin(dataList)
 		return data
 
@@ -138,6 +129,107 @@ class table_C_O_L_R_(DefaultTable.DefaultTable):
 	def __delitem__(self, glyphSelector):
 		del self.ColorLayers[glyphSelector]
 
+def _decompileUInt16Array(data, offset, numElements):
+	result = array.array("H", data[offset : offset + 2 * numElements])
+	if sys.byteorder != "big": result.byteswap()
+	assert len(result) == numElements, result
+	return result
+
+class ColorLayers(LazyDict):
+
+	"""
+	The color layers of a decompiled COLR table: a dict of lists of
+	LayerRecord objects, by base glyph name. The base glyph and layer
+	records are kept in arrays of glyph IDs, color IDs and layer indices,
+	and the LayerRecord objects of a glyph are created when it is accessed.
+
+	The glyph IDs of the records are those of the glyph order of the font
+	when the table was decompiled.
+	"""
+
+	def __init__(self, glyphOrder, getGlyphName, baseGlyphs, layers):
+		try:
+			names = [glyphOrder[gid] for gid in baseGlyphs[0::3]]
+		except IndexError:
+			names = [getGlyphName(gid) for gid in baseGlyphs[0::3]]
+		LazyDict.__init__(self, names)
+		# base glyph name --> index of its base glyph record
+		self._indices = {name: i for i, name in enumerate(names)}
+		self._glyphOrder = glyphOrder
+		self._getGlyphName = getGlyphName
+		self._baseGlyphs = baseGlyphs
+		self._layers = layers
+
+	def _getLayerName(self, gid):
+		try:
+			return self._glyphOrder[gid]
+		except IndexError:
+			return self._getGlyphName(gid)
+
+	def _getLayerRecords(self, glyphName):
+		# return the (layerName, colorID) records of a glyph that was not loaded
+		i = 3 * self._indices[glyphName]
+		firstLayerIndex, numLayers = self._baseGlyphs[i+1:i+3]
+		layers = self._layers[2*firstLayerIndex:2*(firstLayerIndex+numLayers)]
+		return list(zip(map(self._getLayerName, layers[0::2]), layers[1::2]))
+
+	def _loadValue(self, glyphName):
+		return [
+			LayerRecord(layerName, colorID)
+			for layerName, colorID in self._getLayerRecords(glyphName)
+		]
+
+	def _iterLayerRecords(self, getGlyphID):
+		# map the glyph IDs of the layers to those of the current glyph order
+		gidMap = {}
+		for glyphName in self:
+			if self.isLoaded(glyphName):
+				layers = [v for layer in self[glyphName] for v in (getGlyphID(layer.name), layer.colorID)]
+			else:
+				i = 3 * self._indices[glyphName]
+				firstLayerIndex, numLayers = self._baseGlyphs[i+1:i+3]
+				layers = self._layers[2*firstLayerIndex:2*(firstLayerIndex+numLayers)]
+				for j in range(0, len(layers), 2):
+					gid = layers[j]
+					newGid = gidMap.get(gid)
+					if newGid is None:
+						newGid = gidMap[gid] = getGlyphID(self._getLayerName(gid))
+					layers[j] = newGid
+			yield glyphName, layers
+
+	def getLayerGlyphNames(self, glyphName):
+		"""Return the list of the layer glyph names of a base glyph, without
+		creating its LayerRecord objects."""
+		if self.isLoaded(glyphName):
+			return [layer.name for layer in self[glyphName]]
+		return [layerName for layerName, _ in self._getLayerRecords(glyphName)]
+
+	def subset(self, glyphNames):
+		"""Return a new ColorLayers with the base glyphs in glyphNames. The
+		records of the glyphs that were not loaded are sliced from the
+		arrays."""
+		baseGlyphs = array.array("H")
+		layers = array.array("H")
+		loaded = {}
+		for glyphName in self:
+			if glyphName not in glyphNames:
+				continue
+			if self.isLoaded(glyphName):
+				loaded[glyphName] = self[glyphName]
+				if glyphName in self._indices:
+					# keep the base glyph record, so the order is kept
+					gid = self._baseGlyphs[3 * self._indices[glyphName]]
+					baseGlyphs.extend((gid, len(layers) // 2, 0))
+				continue
+			i = 3 * self._indices[glyphName]
+			gid, firstLayerIndex, numLayers = self._baseGlyphs[i:i+3]
+			baseGlyphs.extend((gid, len(layers) // 2, numLayers))
+			layers.extend(self._layers[2*firstLayerIndex:2*(firstLayerIndex+numLayers)])
+		result = self.__class__(self._glyphOrder, self._getGlyphName, baseGlyphs, layers)
+		for glyphName, value in loaded.items():
+			result[glyphName] = value
+		return result
+
 class LayerRecord(object):
 
 	def __init__(self, name=None, colorID=None):
@@ -24,17 +24,15 @@ class table_C_P_A_L_(DefaultTable.DefaultTable):
 		self.version, self.numPaletteEntries, numPalettes, numColorRecords, goffsetFirstColorRecord = struct.unpack(">HHHHL", data[:12])
 		assert (self.version <= 1), "Version of CPAL table is higher than I know how to handle"
 		self.palettes = []
-		pos = 12
-		for i in range(numPalettes):
-			startIndex = struct.unpack(">H", data[pos:pos+2])[0]
+		startIndices = struct.unpack(">%dH" % numPalettes, data[12:12+2*numPalettes])
+		colors = {}  # startIndex --> palette colors, as palettes may share them
+		for startIndex in startIndices:
 			assert (startIndex + self.numPaletteEntries <= numColorRecords)
-			pos += 2
-			palette = []
-			ppos = goffsetFirstColorRecord + startIndex * 4
-			for j in range(self.numPaletteEntries):
-				palette.append( Color(*struct.unpack(">BBBB", data[ppos:ppos+4])) )
-				ppos += 4
-			self.palettes.append(palette)
+			if startIndex not in colors:
+				ppos = goffsetFirstColorRecord + startIndex * 4
+				colorRecords = data[ppos:ppos+4*self.numPaletteEntries]
+				colors[startIndex] = list(map(Color._make, struct.iter_unpack(">BBBB", colorRecords)))
+			self.palettes.append(list(colors[startIndex]))
 		if self.version == 0:
 			offsetToPaletteTypeArray = 0
 			offsetToPaletteLabelArray = 0
@@ -110,8 +108,8 @@ class table_C_P_A_L_(DefaultTable.DefaultTable):
 
 	def _compilePalette(self, palette):
 		assert(len(palette) == self.numPaletteEntries)
-		pack = lambda c: struct.pack(">BBBB", c.blue, c.green, c.red, c.alpha)
-		return bytesjoin([pack(color) for color in palette])
+		return struct.pack(">%dB" % (4 * len(palette)), *(
+			value for c in palette for value in (c.blue, c.green, c.red, c.alpha)))
 
 	def _compileColorRecords(self):
 		colorRecords, colorRecordIndices, pool = [], [], {}
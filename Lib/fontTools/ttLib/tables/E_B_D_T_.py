@@ -1,7 +1,8 @@
 from fontTools.misc.py23 import *
 from fontTools.misc import sstruct
 from fontTools.misc.textTools import safeEval, readHex, hexStr, deHexStr
-from .BitmapGlyphMetrics import BigGlyphMetrics, bigGlyphMetricsFormat, SmallGlyphMetrics, smallGlyphMetricsFormat
+from fontTools.misc.lazyTools import LazyDict
+from .BitmapGlyphMetrics import BigGlyphMetrics, bigGlyphMetricsStruct, SmallGlyphMetrics, smallGlyphMetricsStruct
 from . import DefaultTable
 import itertools
 import os
@@ -23,6 +24,8 @@ ebdtComponentFormat = """
 	yOffset:   b
 """
 
+ebdtComponentStruct = sstruct.compile(ebdtComponentFormat)
+
 class table_E_B_D_T_(DefaultTable.DefaultTable):
 
 	# Keep a reference to the name of the data locator table.
@@ -48,24 +51,12 @@ class table_E_B_D_T_(DefaultTable.DefaultTable):
 		# Pull out the EBLC table and loop through glyphs.
 		# A strike is a concept that spans both tables.
 		# The actual bitmap data is stored in the EBDT.
+		# The glyphs are only created when they are accessed.
 		locator = ttFont[self.__class__.locatorName]
-		self.strikeData = []
-		for curStrike in locator.strikes:
-			bitmapGlyphDict = {}
-			self.strikeData.append(bitmapGlyphDict)
-			for indexSubTable in curStrike.indexSubTables:
-				dataIter = zip(indexSubTable.names, indexSubTable.locations)
-				for curName, curLoc in dataIter:
-					# Don't create duplicate data entries for the same glyphs.
-					# Instead just use the structures that already exist if they exist.
-					if curLoc in glyphDict:
-						curGlyph = glyphDict[curLoc]
-					else:
-						curGlyphData = data[slice(*curLoc)]
-						imageFormatClass = self.getImageFormatClass(indexSubTable.imageFormat)
-						curGlyph = imageFormatClass(curGlyphData, ttFont)
-						glyphDict[curLoc] = curGlyph
-					bitmapGlyphDict[curName] = curGlyph
+		self.strikeData = [
+			LazyBitmapGlyphs(self, data, ttFont, curStrike.indexSubTables, glyphDict)
+			for curStrike in locator.strikes
+		]
 
 	def compile(self, ttFont):
 
@@ -100,7 +91,11 @@ class table_E_B_D_T_(DefaultTable.DefaultTable):
 					glyph = curGlyphDict[curName]
 					objectId = id(glyph)
 					if objectId not in glyphDict:
-						data = glyph.compile(ttFont)
+						# Pass through the data of the glyphs that were not decompiled,
+						# except for components, whose glyph IDs may have changed.
+						data = vars(glyph).get("data")
+						if data is None or isinstance(glyph, ComponentBitmapGlyph):
+							data = glyph.compile(ttFont)
 						data = curIndexSubTable.padBitmapData(data)
 						startByte = dataSize
 						dataSize += len(data)
@@ -178,12 +173,46 @@ class table_E_B_D_T_(DefaultTable.DefaultTable):
 			assert self.strikeData[strikeIndex] is None, "Duplicate strike EBDT indices."
 			self.strikeData[strikeIndex] = bitmapGlyphDict
 
+class LazyBitmapGlyphs(LazyDict):
+
+	"""
+	The bitmap glyphs of a strike, by glyph name, as decompiled from the
+	data of the table. The BitmapGlyph objects are created when they are
+	accessed.
+	"""
+
+	def __init__(self, table, data, ttFont, indexSubTables, glyphDict):
+		locations = {}
+		for indexSubTable in indexSubTables:
+			imageFormat = indexSubTable.imageFormat
+			for curName, curLoc in zip(indexSubTable.names, indexSubTable.locations):
+				locations[curName] = (curLoc, imageFormat)
+		LazyDict.__init__(self, locations)
+		self._locations = locations
+		self._table = table
+		self._data = data
+		self._ttFont = ttFont
+		# maps intervals of data to the BitmapGlyph, across strikes
+		self._glyphDict = glyphDict
+
+	def _loadValue(self, glyphName):
+		curLoc, imageFormat = self._locations[glyphName]
+		# Don't create duplicate data entries for the same glyphs.
+		# Instead just use the structures that already exist if they exist.
+		curGlyph = self._glyphDict.get(curLoc)
+		if curGlyph is None:
+			curGlyphData = self._data[slice(*curLoc)]
+			imageFormatClass = self._table.getImageFormatClass(imageFormat)
+			curGlyph = imageFormatClass(curGlyphData, self._ttFont)
+			self._glyphDict[curLoc] = curGlyph
+		return curGlyph
+
 class EbdtComponent(object):
 
 	def toXML(self, writer, ttFont):
 		writer.begintag('ebdtComponent', [('name', self.name)])
 		writer.newline()
-		for componentName in sstruct.getformat(ebdtComponentFormat)[1][1:]:
+		for componentName in ebdtComponentStruct.names[1:]:
 			writer.simpletag(componentName, value=getattr(self, componentName))
 			writer.newline()
 		writer.endtag('ebdtComponent')
@@ -191,7 +220,7 @@ class EbdtComponent(object):
 
 	def fromXML(self, name, attrs, content, ttFont):
 		self.name = attrs['name']
-		componentNames = set(sstruct.getformat(ebdtComponentFormat)[1][1:])
+		componentNames = set(ebdtComponentStruct.names[1:])
 		for element in content:
 			if not isinstance(element, tuple):
 				continue
@@ -608,11 +637,11 @@ class ebdt_bitmap_format_1(ByteAlignedBitmapMixin, BitmapPlusSmallMetricsMixin,
 
 	def decompile(self):
 		self.metrics = SmallGlyphMetrics()
-		dummy, data = sstruct.unpack2(smallGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = smallGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		self.imageData = data
 
 	def compile(self, ttFont):
-		data = sstruct.pack(smallGlyphMetricsFormat, self.metrics)
+		data = smallGlyphMetricsStruct.pack(self.metrics)
 		return data + self.imageData
 
 
@@ -620,11 +649,11 @@ class ebdt_bitmap_format_2(BitAlignedBitmapMixin, BitmapPlusSmallMetricsMixin, B
 
 	def decompile(self):
 		self.metrics = SmallGlyphMetrics()
-		dummy, data = sstruct.unpack2(smallGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = smallGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		self.imageData = data
 
 	def compile(self, ttFont):
-		data = sstruct.pack(smallGlyphMetricsFormat, self.metrics)
+		data = smallGlyphMetricsStruct.pack(self.metrics)
 		return data + self.imageData
 
 
@@ -640,11 +669,11 @@ class ebdt_bitmap_format_6(ByteAlignedBitmapMixin, BitmapPlusBigMetricsMixin, Bi
 
 	def decompile(self):
 		self.metrics = BigGlyphMetrics()
-		dummy, data = sstruct.unpack2(bigGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = bigGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		self.imageData = data
 
 	def compile(self, ttFont):
-		data = sstruct.pack(bigGlyphMetricsFormat, self.metrics)
+		data = bigGlyphMetricsStruct.pack(self.metrics)
 		return data + self.imageData
 
 
@@ -652,11 +681,11 @@ class ebdt_bitmap_format_7(BitAlignedBitmapMixin, BitmapPlusBigMetricsMixin, Bit
 
 	def decompile(self):
 		self.metrics = BigGlyphMetrics()
-		dummy, data = sstruct.unpack2(bigGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = bigGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		self.imageData = data
 
 	def compile(self, ttFont):
-		data = sstruct.pack(bigGlyphMetricsFormat, self.metrics)
+		data = bigGlyphMetricsStruct.pack(self.metrics)
 		return data + self.imageData
 
 
@@ -702,26 +731,27 @@ class ebdt_bitmap_format_8(BitmapPlusSmallMetricsMixin, ComponentBitmapGlyph):
 
 	def decompile(self):
 		self.metrics = SmallGlyphMetrics()
-		dummy, data = sstruct.unpack2(smallGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = smallGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		data = data[1:]
 
 		(numComponents,) = struct.unpack(">H", data[:2])
-		data = data[2:]
+		offset = 2
 		self.componentArray = []
 		for i in range(numComponents):
 			curComponent = EbdtComponent()
-			dummy, data = sstruct.unpack2(ebdtComponentFormat, data, curComponent)
+			ebdtComponentStruct.unpack_into(curComponent, data, offset)
+			offset += ebdtComponentStruct.size
 			curComponent.name = self.ttFont.getGlyphName(curComponent.glyphCode)
 			self.componentArray.append(curComponent)
 
 	def compile(self, ttFont):
 		dataList = []
-		dataList.append(sstruct.pack(smallGlyphMetricsFormat, self.metrics))
+		dataList.append(smallGlyphMetricsStruct.pack(self.metrics))
 		dataList.append(b'\0')
 		dataList.append(struct.pack(">H", len(self.componentArray)))
 		for curComponent in self.componentArray:
 			curComponent.glyphCode = ttFont.getGlyphID(curComponent.name)
-			dataList.append(sstruct.pack(ebdtComponentFormat, curComponent))
+			dataList.append(ebdtComponentStruct.pack(curComponent))
 		return bytesjoin(dataList)
 
 
@@ -729,23 +759,24 @@ class ebdt_bitmap_format_9(BitmapPlusBigMetricsMixin, ComponentBitmapGlyph):
 
 	def decompile(self):
 		self.metrics = BigGlyphMetrics()
-		dummy, data = sstruct.unpack2(bigGlyphMetricsFormat, self.data, self.metrics)
+		dummy, data = bigGlyphMetricsStruct.unpack2(self.data, self.metrics)
 		(numComponents,) = struct.unpack(">H", data[:2])
-		data = data[2:]
+		offset = 2
 		self.componentArray = []
 		for i in range(numComponents):
 			curComponent = EbdtComponent()
-			dummy, data = sstruct.unpack2(ebdtComponentFormat, data, curComponent)
+			ebdtComponentStruct.unpack_into(curComponent, data, offset)
+			offset += ebdtComponentStruct.size
 			curComponent.name = self.ttFont.getGlyphName(curComponent.glyphCode)
 			self.componentArray.append(curComponent)
 
 	def compile(self, ttFont):
 		dataList = []
-		dataList.append(sstruct.pack(bigGlyphMetricsFormat, self.metrics))
+		dataList.append(bigGlyphMetricsStruct.pack(self.metrics))
 		dataList.append(struct.pack(">H", len(self.componentArray)))
 		for curComponent in self.componentArray:
 			curComponent.glyphCode = ttFont.getGlyphID(curComponent.name)
-			dataList.append(sstruct.pack(ebdtComponentFormat, curComponent))
+			dataList.append(ebdtComponentStruct.pack(curComponent))
 		return bytesjoin(dataList)
 
 
@@ -2,7 +2,7 @@ from fontTools.misc.py23 import *
 from fontTools.misc import sstruct
 from . import DefaultTable
 from fontTools.misc.textTools import safeEval
-from .BitmapGlyphMetrics import BigGlyphMetrics, bigGlyphMetricsFormat, SmallGlyphMetrics, smallGlyphMetricsFormat
+from .BitmapGlyphMetrics import BigGlyphMetrics, bigGlyphMetricsStruct, SmallGlyphMetrics
 import struct
 import itertools
 from collections import deque
@@ -51,6 +51,11 @@ bitmapSizeTableFormatPart2 = """
 	flags:           b
 """
 
+eblcHeaderStruct = sstruct.compile(eblcHeaderFormat)
+bitmapSizeTableStructPart1 = sstruct.compile(bitmapSizeTableFormatPart1)
+sbitLineMetricsStruct = sstruct.compile(sbitLineMetricsFormat)
+bitmapSizeTableStructPart2 = sstruct.compile(bitmapSizeTableFormatPart2)
+
 indexSubTableArrayFormat = ">HHL"
 indexSubTableArraySize = struct.calcsize(indexSubTableArrayFormat)
 
@@ -76,24 +81,25 @@ class table_E_B_L_C_(DefaultTable.DefaultTable):
 		origData = data
 		i = 0;
 
-		dummy = sstruct.unpack(eblcHeaderFormat, data[:8], self)
-		i += 8;
+		eblcHeaderStruct.unpack_into(self, data)
+		i += eblcHeaderStruct.size
 
 		self.strikes = []
 		for curStrikeIndex in range(self.numSizes):
 			curStrike = Strike()
 			self.strikes.append(curStrike)
 			curTable = curStrike.bitmapSizeTable
-			dummy = sstruct.unpack2(bitmapSizeTableFormatPart1, data[i:i+16], curTable)
-			i += 16
+			bitmapSizeTableStructPart1.unpack_into(curTable, data, i)
+			i += bitmapSizeTableStructPart1.size
 			for metric in ('hori', 'vert'):
 				metricObj = SbitLineMetrics()
 				vars(curTable)[metric] = metricObj
-				dummy = sstruct.unpack2(sbitLineMetricsFormat, data[i:i+12], metricObj)
-				i += 12
-			dummy = sstruct.unpack(bitmapSizeTableFormatPart2, data[i:i+8], curTable)
-			i += 8
+				sbitLineMetricsStruct.unpack_into(metricObj, data, i)
+				i += sbitLineMetricsStruct.size
+			bitmapSizeTableStructPart2.unpack_into(curTable, data, i)
+			i += bitmapSizeTableStructPart2.size
 
+		dataView = memoryview(data)
 		for curStrike in self.strikes:
 			curTable = curStrike.bitmapSizeTable
 			for subtableIndex in range(curTable.numberOfIndexSubTables):
@@ -107,7 +113,8 @@ class table_E_B_L_C_(DefaultTable.DefaultTable):
 				(indexFormat, imageFormat, imageDataOffset) = tup
 
 				indexFormatClass = self.getIndexFormatClass(indexFormat)
-				indexSubTable = indexFormatClass(data[i+indexSubHeaderSize:], ttFont)
+				# a view, not a copy of the rest of the table for each subtable
+				indexSubTable = indexFormatClass(dataView[i+indexSubHeaderSize:], ttFont)
 				indexSubTable.firstGlyphIndex = firstGlyphIndex
 				indexSubTable.lastGlyphIndex = lastGlyphIndex
 				indexSubTable.additionalOffsetToIndexSubtable = additionalOffsetToIndexSubtable
@@ -121,7 +128,7 @@ class table_E_B_L_C_(DefaultTable.DefaultTable):
 
 		dataList = []
 		self.numSizes = len(self.strikes)
-		dataList.append(sstruct.pack(eblcHeaderFormat, self))
+		dataList.append(eblcHeaderStruct.pack(self))
 
 		# Data size of the header + bitmapSizeTable needs to be calculated
 		# in order to form offsets. This value will hold the size of the data
@@ -155,9 +162,9 @@ class table_E_B_L_C_(DefaultTable.DefaultTable):
 		# (3) Consolidate all the data into the main dataList in the correct order.
 
 		for curStrike in self.strikes:
-			dataSize += sstruct.calcsize(bitmapSizeTableFormatPart1)
-			dataSize += len(('hori', 'vert')) * sstruct.calcsize(sbitLineMetricsFormat)
-			dataSize += sstruct.calcsize(bitmapSizeTableFormatPart2)
+			dataSize += bitmapSizeTableStructPart1.size
+			dataSize += len(('hori', 'vert')) * sbitLineMetricsStruct.size
+			dataSize += bitmapSizeTableStructPart2.size
 
 		indexSubTablePairDataList = []
 		for curStrike in self.strikes:
@@ -193,13 +200,13 @@ class table_E_B_L_C_(DefaultTable.DefaultTable):
 
 		for curStrike in self.strikes:
 			curTable = curStrike.bitmapSizeTable
-			data = sstruct.pack(bitmapSizeTableFormatPart1, curTable)
+			data = bitmapSizeTableStructPart1.pack(curTable)
 			dataList.append(data)
 			for metric in ('hori', 'vert'):
 				metricObj = vars(curTable)[metric]
-				data = sstruct.pack(sbitLineMetricsFormat, metricObj)
+				data = sbitLineMetricsStruct.pack(metricObj)
 				dataList.append(data)
-			data = sstruct.pack(bitmapSizeTableFormatPart2, curTable)
+			data = bitmapSizeTableStructPart2.pack(curTable)
 			dataList.append(data)
 		dataList.extend(indexSubTablePairDataList)
 
@@ -266,8 +273,8 @@ class BitmapSizeTable(object):
 	# Returns all the simple metric names that bitmap size table
 	# cares about in terms of XML creation.
 	def _getXMLMetricNames(self):
-		dataNames = sstruct.getformat(bitmapSizeTableFormatPart1)[1]
-		dataNames = dataNames + sstruct.getformat(bitmapSizeTableFormatPart2)[1]
+		dataNames = bitmapSizeTableStructPart1.names
+		dataNames = dataNames + bitmapSizeTableStructPart2.names
 		# Skip the first 3 data names because they are byte offsets and counts.
 		return dataNames[3:]
 
@@ -307,14 +314,14 @@ class SbitLineMetrics(object):
 	def toXML(self, name, writer, ttFont):
 		writer.begintag('sbitLineMetrics', [('direction', name)])
 		writer.newline()
-		for metricName in sstruct.getformat(sbitLineMetricsFormat)[1]:
+		for metricName in sbitLineMetricsStruct.names:
 			writer.simpletag(metricName, value=getattr(self, metricName))
 			writer.newline()
 		writer.endtag('sbitLineMetrics')
 		writer.newline()
 
 	def fromXML(self, name, attrs, content, ttFont):
-		metricNames = set(sstruct.getformat(sbitLineMetricsFormat)[1])
+		metricNames = set(sbitLineMetricsStruct.names)
 		for element in content:
 			if not isinstance(element, tuple):
 				continue
@@ -434,9 +441,8 @@ def _createOffsetArrayIndexSubTableMixin(formatStringForDataType):
 		def decompile(self):
 
 			numGlyphs = self.lastGlyphIndex - self.firstGlyphIndex + 1
-			indexingOffsets = [glyphIndex * offsetDataSize for glyphIndex in range(numGlyphs+2)]
-			indexingLocations = zip(indexingOffsets, indexingOffsets[1:])
-			offsetArray = [struct.unpack(dataFormat, self.data[slice(*loc)])[0] for loc in indexingLocations]
+			offsetArray = struct.unpack_from(
+				">%d%s" % (numGlyphs+1, formatStringForDataType), self.data)
 
 			glyphIds = list(range(self.firstGlyphIndex, self.lastGlyphIndex+1))
 			modifiedOffsets = [offset + self.imageDataOffset for offset in offsetArray]
@@ -526,7 +532,7 @@ class eblc_index_sub_table_2(FixedSizeIndexSubTableMixin, EblcIndexSubTable):
 	def decompile(self):
 		(self.imageSize,) = struct.unpack(">L", self.data[:4])
 		self.metrics = BigGlyphMetrics()
-		sstruct.unpack2(bigGlyphMetricsFormat, self.data[4:], self.metrics)
+		bigGlyphMetricsStruct.unpack_into(self.metrics, self.data, 4)
 		glyphIds = list(range(self.firstGlyphIndex, self.lastGlyphIndex+1))
 		offsets = [self.imageSize * i + self.imageDataOffset for i in range(len(glyphIds)+1)]
 		self.locations = list(zip(offsets, offsets[1:]))
@@ -541,7 +547,7 @@ class eblc_index_sub_table_2(FixedSizeIndexSubTableMixin, EblcIndexSubTable):
 
 		dataList = [EblcIndexSubTable.compile(self, ttFont)]
 		dataList.append(struct.pack(">L", self.imageSize))
-		dataList.append(sstruct.pack(bigGlyphMetricsFormat, self.metrics))
+		dataList.append(bigGlyphMetricsStruct.pack(self.metrics))
 		return bytesjoin(dataList)
 
 class eblc_index_sub_table_3(_createOffsetArrayIndexSubTableMixin('H'), EblcIndexSubTable):
@@ -552,11 +558,9 @@ class eblc_index_sub_table_4(EblcIndexSubTable):
 	def decompile(self):
 
 		(numGlyphs,) = struct.unpack(">L", self.data[:4])
-		data = self.data[4:]
-		indexingOffsets = [glyphIndex * codeOffsetPairSize for glyphIndex in range(numGlyphs+2)]
-		indexingLocations = zip(indexingOffsets, indexingOffsets[1:])
-		glyphArray = [struct.unpack(codeOffsetPairFormat, data[slice(*loc)]) for loc in indexingLocations]
-		glyphIds, offsets = list(map(list, zip(*glyphArray)))
+		glyphArray = struct.unpack_from(">%dH" % (2 * (numGlyphs+1)), self.data, 4)
+		glyphIds = list(glyphArray[0::2])
+		offsets = list(glyphArray[1::2])
 		# There are one too many glyph ids. Get rid of the last one.
 		glyphIds.pop()
 
@@ -594,10 +598,10 @@ class eblc_index_sub_table_5(FixedSizeIndexSubTableMixin, EblcIndexSubTable):
 		self.origDataLen = 0
 		(self.imageSize,) = struct.unpack(">L", self.data[:4])
 		data = self.data[4:]
-		self.metrics, data = sstruct.unpack2(bigGlyphMetricsFormat, data, BigGlyphMetrics())
+		self.metrics, data = bigGlyphMetricsStruct.unpack2(data, BigGlyphMetrics())
 		(numGlyphs,) = struct.unpack(">L", data[:4])
 		data = data[4:]
-		glyphIds = [struct.unpack(">H", data[2*i:2*(i+1)])[0] for i in range(numGlyphs)]
+		glyphIds = struct.unpack_from(">%dH" % numGlyphs, data)
 
 		offsets = [self.imageSize * i + self.imageDataOffset for i in range(len(glyphIds)+1)]
 		self.locations = list(zip(offsets, offsets[1:]))
@@ -608,7 +612,7 @@ class eblc_index_sub_table_5(FixedSizeIndexSubTableMixin, EblcIndexSubTable):
 		self.imageDataOffset = min(next(iter(zip(*self.locations))))
 		dataList = [EblcIndexSubTable.compile(self, ttFont)]
 		dataList.append(struct.pack(">L", self.imageSize))
-		dataList.append(sstruct.pack(bigGlyphMetricsFormat, self.metrics))
+		dataList.append(bigGlyphMetricsStruct.pack(self.metrics))
 		glyphIds = list(map(ttFont.getGlyphID, self.names))
 		dataList.append(struct.pack(">L", len(glyphIds)))
 		dataList += [struct.pack(">H", curId) for curId in glyphIds]
@@ -5,6 +5,10 @@ try:
 	import xml.etree.cElementTree as ET
 except ImportError:
 	import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from collections.abc import MutableSequence
+from bisect import bisect_right
+import gzip
 import struct
 import re
 import logging
@@ -55,6 +59,11 @@ Color values must be less than 256.
 The number of color records in each </colorPalette> must be the same as
 the number of <colorParamUINameID> elements.
 
+When the table is decompiled, its docList is an SVGDocumentList, which only
+reads the document index: the documents are decompressed and decoded when
+they are accessed, and getDocument(glyphID) looks up the document of a
+single glyph.
+
 """
 
 XML = ET.XML
@@ -87,6 +96,7 @@ doc_index_entry_format_0 = """
 """
 
 doc_index_entry_format_0Size = sstruct.calcsize(doc_index_entry_format_0)
+doc_index_entry_struct = struct.Struct(">HHLL")
 
 colorRecord_format_0 = """
 	red:                      B
@@ -163,26 +173,34 @@ class table_S_V_G_(DefaultTable.DefaultTable):
 		self.numEntries = numEntries = struct.unpack(">H", data[pos:pos+2])[0]
 		pos += 2
 		if self.numEntries > 0:
-			data2 = data[pos:]
-			self.docList = []
-			self.entries = entries = []
-			for i in range(self.numEntries):
-				docIndexEntry, data2 = sstruct.unpack2(doc_index_entry_format_0, data2, DocumentIndexEntry())
-				entries.append(docIndexEntry)
-
-			for entry in entries:
-				start = entry.svgDocOffset + subTableStart
-				end = start + entry.svgDocLength
-				doc = data[start:end]
-				if doc.startswith(b"\x1f\x8b"):
-					import gzip
-					bytesIO = BytesIO(doc)
-					with gzip.GzipFile(None, "r", fileobj=bytesIO) as gunzipper:
-						doc = gunzipper.read()
+			end = pos + doc_index_entry_format_0Size * numEntries
+			records = list(doc_index_entry_struct.iter_unpack(data[pos:end]))
+			for startGlyphID, endGlyphID, offset, length in records:
+				if data.startswith(_GZIP_MAGIC, subTableStart + offset):
 					self.compressed = True
-					del bytesIO
-				doc = tostr(doc, "utf_8")
-				self.docList.append( [doc, entry.startGlyphID, entry.endGlyphID] )
+					break
+			self.docList = SVGDocumentList(data, subTableStart, records)
+
+	def getDocument(self, glyphID):
+		"""Return the SVG document for the given glyph ID, or None."""
+		docList = getattr(self, "docList", None)
+		if docList is None:
+			return None
+		if isinstance(docList, SVGDocumentList):
+			return docList.getDocument(glyphID)
+		for doc, startGlyphID, endGlyphID in docList:
+			if startGlyphID <= glyphID <= endGlyphID:
+				return doc
+		return None
+
+	def _iterDocData(self, compress):
+		# yield (docBytes, startGlyphID, endGlyphID) tuples
+		if isinstance(self.docList, SVGDocumentList):
+			return self.docList._iterData(compress)
+		return (
+			(_encodeDoc(tobytes(doc, encoding="utf_8"), compress), startGlyphID, endGlyphID)
+			for doc, startGlyphID, endGlyphID in self.docList
+		)
 
 	def compile(self, ttFont):
 		if hasattr(self, "version1"):
@@ -201,18 +219,9 @@ class table_S_V_G_(DefaultTable.DefaultTable):
 		datum = struct.pack(">H",numEntries)
 		entryList.append(datum)
 		curOffset = len(datum) + doc_index_entry_format_0Size*numEntries
-		for doc, startGlyphID, endGlyphID in self.docList:
+		compress = getattr(self, "compressed", False)
+		for docBytes, startGlyphID, endGlyphID in self._iterDocData(compress):
 			docOffset = curOffset
-			docBytes = tobytes(doc, encoding="utf_8")
-			if getattr(self, "compressed", False) and not docBytes.startswith(b"\x1f\x8b"):
-				import gzip
-				bytesIO = BytesIO()
-				with gzip.GzipFile(None, "w", fileobj=bytesIO) as gzipper:
-					gzipper.write(docBytes)
-				gzipped = bytesIO.getvalue()
-				if len(gzipped) < len(docBytes):
-					docBytes = gzipped
-				del gzipped, bytesIO
 			docLength = len(docBytes)
 			curOffset += docLength
 			entry = struct.pack(">HHLL", startGlyphID, endGlyphID, docOffset, docLength)
@@ -257,9 +266,8 @@ class table_S_V_G_(DefaultTable.DefaultTable):
 		dataList = [header]
 		docList = []
 		curOffset = SVG_format_1Size + doc_index_entry_format_0Size*numEntries
-		for doc, startGlyphID, endGlyphID in self.docList:
+		for docBytes, startGlyphID, endGlyphID in self._iterDocData(False):
 			docOffset = curOffset
-			docBytes = tobytes(doc, encoding="utf_8")
 			docLength = len(docBytes)
 			curOffset += docLength
 			entry = struct.pack(">HHLL", startGlyphID, endGlyphID, docOffset, docLength)
@@ -271,7 +279,11 @@ class table_S_V_G_(DefaultTable.DefaultTable):
 
 	def toXML(self, writer, ttFont):
 		writer.newline()
-		for doc, startGID, endGID in self.docList:
+		docList = self.docList
+		if isinstance(docList, SVGDocumentList):
+			# don't keep the decoded documents
+			docList = docList._iterItems()
+		for doc, startGID, endGID in docList:
 			writer.begintag("svgDoc", startGlyphID=startGID, endGlyphID=endGID)
 			writer.newline()
 			writer.writecdata(doc)
@@ -323,6 +335,195 @@ class table_S_V_G_(DefaultTable.DefaultTable):
 		else:
 			log.warning("Unknown %s %s", name, content)
 
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# default number of decoded documents SVGDocumentList.getDocument() caches
+DOC_CACHE_SIZE = 32
+
+
+def _encodeDoc(docBytes, compress):
+	if compress and not docBytes.startswith(_GZIP_MAGIC):
+		bytesIO = BytesIO()
+		with gzip.GzipFile(None, "w", fileobj=bytesIO) as gzipper:
+			gzipper.write(docBytes)
+		gzipped = bytesIO.getvalue()
+		if len(gzipped) < len(docBytes):
+			docBytes = gzipped
+	return docBytes
+
+
+class SVGDocumentList(MutableSequence):
+
+	"""
+	The documents of a decompiled SVG table, as a list of
+	[doc, startGlyphID, endGlyphID] lists, like the docList of a table
+	built from XML.
+
+	Only the document index is read when the table is decompiled. An item
+	is decoded (and gunzipped) when it is first accessed, and it is then
+	kept, so that it can be modified in place. getDocument() looks up the
+	document of a glyph without keeping its item; the last 'cacheSize'
+	documents it decoded are cached. When compiling, the items that were
+	not accessed, or whose document was not replaced, are written from
+	their original data.
+	"""
+
+	def __init__(self, data, subTableStart, records, cacheSize=DOC_CACHE_SIZE):
+		self._data = data
+		self._subTableStart = subTableStart
+		# (startGlyphID, endGlyphID, offset, length) tuples of the documents
+		# in 'data', or None for items that were added to the list
+		self._records = records
+		# the items that were accessed or added, and the documents they
+		# were decoded with
+		self._items = [None] * len(records)
+		self._docs = [None] * len(records)
+		self._cacheSize = cacheSize
+		self._cache = OrderedDict()  # (offset, length) --> doc
+		self._index = None
+
+	def __len__(self):
+		return len(self._records)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		item = self._items[index]
+		if item is None:
+			startGlyphID, endGlyphID, offset, length = self._records[index]
+			doc = self._decode(offset, length)
+			item = self._items[index] = [doc, startGlyphID, endGlyphID]
+			self._docs[index] = doc
+			self._index = None
+		return item
+
+	def __setitem__(self, index, item):
+		if isinstance(index, slice):
+			items = list(item)
+			indices = range(*index.indices(len(self)))
+			if index.step not in (None, 1):
+				if len(items) != len(indices):
+					raise ValueError(
+						"attempt to assign sequence of size %d to extended slice of size %d"
+						% (len(items), len(indices)))
+				for i, item in zip(indices, items):
+					self[i] = item
+				return
+			del self[index]
+			for i, item in enumerate(items, indices.start):
+				self.insert(i, item)
+			return
+		self._items[index] = item
+		self._records[index] = self._docs[index] = None
+		self._index = None
+
+	def __delitem__(self, index):
+		del self._items[index]
+		del self._records[index]
+		del self._docs[index]
+		self._index = None
+
+	def insert(self, index, item):
+		self._items.insert(index, item)
+		self._records.insert(index, None)
+		self._docs.insert(index, None)
+		self._index = None
+
+	def __eq__(self, other):
+		if not isinstance(other, (list, SVGDocumentList)):
+			return NotImplemented
+		if len(self) != len(other):
+			return False
+		if isinstance(other, SVGDocumentList):
+			other = other._iterItems()
+		return all(list(a) == list(b) for a, b in zip(self._iterItems(), other))
+
+	__hash__ = None
+
+	def __repr__(self):
+		return "<%s with %d documents>" % (self.__class__.__name__, len(self))
+
+	def getDocument(self, glyphID):
+		"""Return the document for the given glyph ID, or None."""
+		if self._index is None:
+			self._buildIndex()
+		startGlyphIDs, indices, accessed = self._index
+		# the glyph IDs of the items that were accessed may have changed
+		for i in accessed:
+			doc, startGlyphID, endGlyphID = self._items[i]
+			if startGlyphID <= glyphID <= endGlyphID:
+				return doc
+		pos = bisect_right(startGlyphIDs, glyphID) - 1
+		if pos < 0:
+			return None
+		i = indices[pos]
+		startGlyphID, endGlyphID, offset, length = self._records[i]
+		if glyphID > endGlyphID or self._items[i] is not None:
+			return None
+		key = (offset, length)
+		doc = self._cache.get(key)
+		if doc is not None:
+			self._cache.move_to_end(key)
+			return doc
+		doc = self._decode(offset, length)
+		if self._cacheSize > 0:
+			self._cache[key] = doc
+			if len(self._cache) > self._cacheSize:
+				self._cache.popitem(last=False)
+		return doc
+
+	def _buildIndex(self):
+		accessed = []
+		ranges = []
+		for i, item in enumerate(self._items):
+			if item is not None:
+				accessed.append(i)
+			else:
+				ranges.append((self._records[i][0], i))
+		# the documents must be sorted by glyph ID, but don't rely on it
+		ranges.sort()
+		self._index = ([r[0] for r in ranges], [r[1] for r in ranges], accessed)
+
+	def _getBytes(self, offset, length):
+		start = self._subTableStart + offset
+		return self._data[start:start+length]
+
+	def _decode(self, offset, length):
+		doc = self._getBytes(offset, length)
+		if doc.startswith(_GZIP_MAGIC):
+			doc = gzip.decompress(doc)
+		return tostr(doc, "utf_8")
+
+	def _iterItems(self):
+		# yield the items without keeping the ones that are decoded
+		for item, record in zip(self._items, self._records):
+			if item is None:
+				startGlyphID, endGlyphID, offset, length = record
+				item = [self._decode(offset, length), startGlyphID, endGlyphID]
+			yield item
+
+	def _iterData(self, compress):
+		# yield (docBytes, startGlyphID, endGlyphID) tuples, reusing the
+		# original data of the documents that were not replaced
+		for item, record, doc in zip(self._items, self._records, self._docs):
+			if item is None:
+				startGlyphID, endGlyphID, offset, length = record
+			else:
+				if record is None or item[0] is not doc:
+					docBytes = tobytes(item[0], encoding="utf_8")
+					yield _encodeDoc(docBytes, compress), item[1], item[2]
+					continue
+				_, _, offset, length = record
+				_, startGlyphID, endGlyphID = item
+			docBytes = self._getBytes(offset, length)
+			if docBytes.startswith(_GZIP_MAGIC):
+				if not compress:
+					docBytes = gzip.decompress(docBytes)
+			else:
+				docBytes = _encodeDoc(docBytes, compress)
+			yield docBytes, startGlyphID, endGlyphID
+
+
 class DocumentIndexEntry(object):
 	def __init__(self):
 		self.startGlyphID = None # USHORT
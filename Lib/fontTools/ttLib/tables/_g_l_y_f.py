@@ -1,8 +1,11 @@
 """_g_l_y_f.py -- Converter classes for the 'glyf' table."""
 
 from collections import namedtuple
+from contextlib import contextmanager
 from fontTools.misc.py23 import *
 from fontTools.misc import sstruct
+from fontTools.misc import profiling
+from fontTools.misc.bulkTools import mapInProcesses
 from fontTools import ttLib
 from fontTools import version
 from fontTools.misc.textTools import safeEval, pad
@@ -54,6 +57,15 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
 	# no padding, except for when padding would allow to use short loca offsets.
 	padding = 1
 
+	# Number of worker processes used to compile glyphs. With the default
+	# of 0 (or 1) glyphs are compiled serially; None means os.cpu_count().
+	# Only simple glyphs that have been expanded (i.e. decompiled or newly
+	# built) are sent to the workers, and only if there are at least
+	# 'parallelCompileThreshold' of them, as for smaller fonts the cost of
+	# starting the processes and pickling the glyphs outweighs the gain.
+	compileWorkers = 0
+	parallelCompileThreshold = 2000
+
 	def decompile(self, data, ttFont):
 		loca = ttFont['loca']
 		pos = int(loca[0])
@@ -93,14 +105,19 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
 		currentLocation = 0
 		dataList = []
 		recalcBBoxes = ttFont.recalcBBoxes
-		for glyphName in self.glyphOrder:
-			glyph = self.glyphs[glyphName]
-			glyphData = glyph.compile(self, recalcBBoxes)
-			if padding > 1:
-				glyphData = pad(glyphData, size=padding)
-			locations.append(currentLocation)
-			currentLocation = currentLocation + len(glyphData)
-			dataList.append(glyphData)
+		compiled = self._compileSimpleGlyphsInParallel(recalcBBoxes)
+		compileGlyph = profiling.timed(Glyph.compile, "compileGlyph", self.tableTag)
+		with self.componentCache():
+			for glyphName in self.glyphOrder:
+				glyphData = compiled.get(glyphName)
+				if glyphData is None:
+					glyph = self.glyphs[glyphName]
+					glyphData = compileGlyph(glyph, self, recalcBBoxes)
+				if padding > 1:
+					glyphData = pad(glyphData, size=padding)
+				locations.append(currentLocation)
+				currentLocation = currentLocation + len(glyphData)
+				dataList.append(glyphData)
 		locations.append(currentLocation)
 
 		if padding == 1 and currentLocation < 0x20000:
@@ -124,6 +141,42 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
 			ttFont['maxp'].numGlyphs = len(self.glyphs)
 		return data
 
+	def _compileSimpleGlyphsInParallel(self, recalcBBoxes):
+		"""Compile the expanded simple glyphs in a pool of worker processes,
+		if so configured, and return a {glyphName: data} dict. Composite
+		glyphs need the whole table to recalculate their bounds, so they
+		are always compiled in this process, like compact glyphs.
+		"""
+		workers = self.compileWorkers
+		if workers is None:
+			workers = os.cpu_count() or 1
+		if workers <= 1:
+			return {}
+		glyphNames = [
+			glyphName for glyphName in self.glyphOrder
+			if not hasattr(self.glyphs[glyphName], "data")
+			and self.glyphs[glyphName].numberOfContours > 0
+		]
+		if len(glyphNames) < max(self.parallelCompileThreshold, 1):
+			return {}
+
+		results = mapInProcesses(
+			_compileGlyphs,
+			[self.glyphs[glyphName] for glyphName in glyphNames],
+			workers,
+			(recalcBBoxes,))
+		if results is None:
+			return {}
+
+		compiled = {}
+		for glyphName, (data, bounds) in zip(glyphNames, results):
+			if bounds is not None:
+				# bring the recalculated bounds back into this process
+				glyph = self.glyphs[glyphName]
+				glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax = bounds
+			compiled[glyphName] = data
+		return compiled
+
 	def toXML(self, writer, ttFont, splitGlyphs=False):
 		notice = (
 			"The xMin, yMin, xMax and yMax values\n"
@@ -239,15 +292,49 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
 		self.glyphs[glyphName] = glyph
 		if glyphName not in self.glyphOrder:
 			self.glyphOrder.append(glyphName)
+		self.invalidateComponentCache()
 
 	def __delitem__(self, glyphName):
 		del self.glyphs[glyphName]
 		self.glyphOrder.remove(glyphName)
+		self.invalidateComponentCache()
 
 	def __len__(self):
 		assert len(self.glyphOrder) == len(self.glyphs)
 		return len(self.glyphs)
 
+	@contextmanager
+	def componentCache(self):
+		"""Context manager within which the flattened coordinates and the
+		maxp values of glyphs used as components are computed only once.
+
+		Composite glyphs resolve their components recursively every time
+		Glyph.getCoordinates() or Glyph.getCompositeMaxpValues() is called,
+		so deeply nested composites get flattened over and over when all
+		the glyphs are processed in a row, e.g. by compile(). Inside this
+		context the results are memoized by component glyph name.
+
+		The cache is cleared when setting or deleting glyphs, or calling
+		setCoordinates(); Glyph objects modified in place while the cache
+		is active require calling invalidateComponentCache(). The cache is
+		discarded when the outermost context exits.
+		"""
+		if hasattr(self, "_componentCache"):
+			# nested
+			yield
+			return
+		self._componentCache = _ComponentCache()
+		try:
+			yield
+		finally:
+			del self._componentCache
+
+	def invalidateComponentCache(self):
+		"""Clear the values memoized inside componentCache(), if any."""
+		cache = getattr(self, "_componentCache", None)
+		if cache is not None:
+			cache.clear()
+
 	def getPhantomPoints(self, glyphName, ttFont, defaultVerticalOrigin=None):
 		"""Compute the four "phantom points" for the given glyph from its bounding box
 		and the horizontal and vertical advance widths and sidebearings stored in the
@@ -382,6 +469,7 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
 			assert len(coord) == len(glyph.coordinates)
 			glyph.coordinates = GlyphCoordinates(coord)
 
+		self.invalidateComponentCache()
 		glyph.recalcBounds(self)
 
 		horizontalAdvanceWidth = otRound(rightSideX - leftSideX)
@@ -400,11 +488,40 @@ class table__g_l_y_f(DefaultTable.DefaultTable):
 			ttFont["vmtx"].metrics[glyphName] = verticalAdvanceWidth, topSideBearing
 
 
+def _compileGlyphs(glyphs, recalcBBoxes):
+	"""Compile a list of simple glyphs in a worker process; see
+	table__g_l_y_f._compileSimpleGlyphsInParallel(). Return a list of
+	(data, bounds) tuples, where bounds is None unless recalculated."""
+	results = []
+	for glyph in glyphs:
+		data = glyph.compile(None, recalcBBoxes)
+		if recalcBBoxes:
+			bounds = (glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax)
+		else:
+			bounds = None
+		results.append((data, bounds))
+	return results
+
+
 _GlyphControls = namedtuple(
 	"_GlyphControls", "numberOfContours endPts flags components"
 )
 
 
+class _ComponentCache(object):
+
+	"""Memoized values for table__g_l_y_f.componentCache(), keyed by
+	glyph name."""
+
+	def __init__(self):
+		self.coordinates = {}
+		self.maxpValues = {}
+
+	def clear(self):
+		self.coordinates.clear()
+		self.maxpValues.clear()
+
+
 glyphHeaderFormat = """
 		>	# big endian
 		numberOfContours:	h
@@ -414,6 +531,8 @@ glyphHeaderFormat = """
 		yMax:				h
 """
 
+glyphHeaderStruct = sstruct.compile(glyphHeaderFormat)
+
 # flags
 flagOnCurve = 0x01
 flagXShort = 0x02
@@ -426,6 +545,7 @@ flagReserved = 0x80
 
 # These flags are kept for XML output after decompiling the coordinates
 keepFlags = flagOnCurve + flagOverlapSimple
+_keepFlagsTable = bytes(bytearray(i & keepFlags for i in range(256)))
 
 _flagSignBytes = {
 	0: 2,
@@ -531,30 +651,43 @@ class Glyph(object):
 			del self.data
 			self.numberOfContours = 0
 			return
-		dummy, data = sstruct.unpack2(glyphHeaderFormat, self.data, self)
+		dummy, data = glyphHeaderStruct.unpack2(self.data, self)
 		del self.data
 		# Some fonts (eg. Neirizi.ttf) have a 0 for numberOfContours in
 		# some glyphs; decompileCoordinates assumes that there's at least
 		# one, so short-circuit here.
 		if self.numberOfContours == 0:
 			return
+		# most glyphs are quick to decompile: don't even call measure()
+		start = profiling.clock() if profiling.enabled else None
 		if self.isComposite():
 			self.decompileComponents(data, glyfTable)
 		else:
 			self.decompileCoordinates(data)
+		if start is not None:
+			profiling.emit("decompileGlyph", "glyf", profiling.clock() - start)
 
 	def compile(self, glyfTable, recalcBBoxes=True):
+		data = None
 		if hasattr(self, "data"):
 			if recalcBBoxes:
 				# must unpack glyph in order to recalculate bounding box
+				data = self.data
 				self.expand(glyfTable)
 			else:
 				return self.data
 		if self.numberOfContours == 0:
 			return ""
 		if recalcBBoxes:
+			if data is not None:
+				bounds = (self.xMin, self.yMin, self.xMax, self.yMax)
 			self.recalcBounds(glyfTable)
-		data = sstruct.pack(glyphHeaderFormat, self)
+			if data is not None and bounds == (self.xMin, self.yMin, self.xMax, self.yMax):
+				# the glyph was only unpacked to check its bounding box,
+				# which is correct: its data is used as is, like it is
+				# when bounding boxes are not recalculated
+				return data
+		data = glyphHeaderStruct.pack(self)
 		if self.isComposite():
 			data = data + self.compileComponents(glyfTable)
 		else:
@@ -642,6 +775,7 @@ class Glyph(object):
 
 	def getCompositeMaxpValues(self, glyfTable, maxComponentDepth=1):
 		assert self.isComposite()
+		cache = getattr(glyfTable, "_componentCache", None)
 		nContours = 0
 		nPoints = 0
 		for compo in self.components:
@@ -650,9 +784,19 @@ class Glyph(object):
 				continue
 			elif baseGlyph.numberOfContours > 0:
 				nP, nC = baseGlyph.getMaxpValues()
-			else:
+			elif cache is None:
 				nP, nC, maxComponentDepth = baseGlyph.getCompositeMaxpValues(
 						glyfTable, maxComponentDepth + 1)
+			else:
+				# The returned depth is always the component's own depth
+				# (as computed with maxComponentDepth=1) plus the depth
+				# passed in minus one, so memoize the former.
+				values = cache.maxpValues.get(compo.glyphName)
+				if values is None:
+					values = baseGlyph.getCompositeMaxpValues(glyfTable)
+					cache.maxpValues[compo.glyphName] = values
+				nP, nC, depth = values
+				maxComponentDepth = depth + maxComponentDepth
 			nPoints = nPoints + nP
 			nContours = nContours + nC
 		return CompositeMaxpValues(nPoints, nContours, maxComponentDepth)
@@ -698,51 +842,52 @@ class Glyph(object):
 		flags, xCoordinates, yCoordinates = \
 				self.decompileCoordinatesRaw(nCoordinates, data)
 
-		# fill in repetitions and apply signs
-		self.coordinates = coordinates = GlyphCoordinates.zeros(nCoordinates)
+		# fill in repetitions and apply signs, and make the coordinates
+		# absolute, building the array in one go
+		xShort, xSame, yShort, ySame = flagXShort, flagXsame, flagYShort, flagYsame
+		values = []
+		append = values.append
+		x = y = 0
 		xIndex = 0
 		yIndex = 0
-		for i in range(nCoordinates):
-			flag = flags[i]
+		for flag in flags:
 			# x coordinate
-			if flag & flagXShort:
-				if flag & flagXsame:
-					x = xCoordinates[xIndex]
+			if flag & xShort:
+				if flag & xSame:
+					x += xCoordinates[xIndex]
 				else:
-					x = -xCoordinates[xIndex]
-				xIndex = xIndex + 1
-			elif flag & flagXsame:
-				x = 0
-			else:
-				x = xCoordinates[xIndex]
-				xIndex = xIndex + 1
+					x -= xCoordinates[xIndex]
+				xIndex += 1
+			elif not flag & xSame:
+				x += xCoordinates[xIndex]
+				xIndex += 1
 			# y coordinate
-			if flag & flagYShort:
-				if flag & flagYsame:
-					y = yCoordinates[yIndex]
+			if flag & yShort:
+				if flag & ySame:
+					y += yCoordinates[yIndex]
 				else:
-					y = -yCoordinates[yIndex]
-				yIndex = yIndex + 1
-			elif flag & flagYsame:
-				y = 0
-			else:
-				y = yCoordinates[yIndex]
-				yIndex = yIndex + 1
-			coordinates[i] = (x, y)
+					y -= yCoordinates[yIndex]
+				yIndex += 1
+			elif not flag & ySame:
+				y += yCoordinates[yIndex]
+				yIndex += 1
+			append(x)
+			append(y)
 		assert xIndex == len(xCoordinates)
 		assert yIndex == len(yCoordinates)
-		coordinates.relativeToAbsolute()
+		self.coordinates = coordinates = GlyphCoordinates()
+		coordinates._setValues(values)
 		# discard all flags except "keepFlags"
-		self.flags = array.array("B", (f & keepFlags for f in flags))
+		self.flags = array.array("B", flags.tobytes().translate(_keepFlagsTable))
 
 	def decompileCoordinatesRaw(self, nCoordinates, data):
 		# unpack flags and prepare unpacking of coordinates
-		flags = array.array("B", [0] * nCoordinates)
+		flags = []
 		# Warning: deep Python trickery going on. We use the struct module to unpack
 		# the coordinates. We build a format string based on the flags, so we can
 		# unpack the coordinates in one struct.unpack() call.
-		xFormat = ">" # big endian
-		yFormat = ">" # big endian
+		xFormat = [">"] # big endian
+		yFormat = [">"] # big endian
 		i = j = 0
 		while True:
 			flag = byteord(data[i])
@@ -751,20 +896,25 @@ class Glyph(object):
 			if flag & flagRepeat:
 				repeat = byteord(data[i]) + 1
 				i = i + 1
-			for k in range(repeat):
-				if flag & flagXShort:
-					xFormat = xFormat + 'B'
-				elif not (flag & flagXsame):
-					xFormat = xFormat + 'h'
-				if flag & flagYShort:
-					yFormat = yFormat + 'B'
-				elif not (flag & flagYsame):
-					yFormat = yFormat + 'h'
-				flags[j] = flag
-				j = j + 1
+			if flag & flagXShort:
+				xFormat.append('B' * repeat)
+			elif not (flag & flagXsame):
+				xFormat.append('h' * repeat)
+			if flag & flagYShort:
+				yFormat.append('B' * repeat)
+			elif not (flag & flagYsame):
+				yFormat.append('h' * repeat)
+			if repeat == 1:
+				flags.append(flag)
+			else:
+				flags.extend([flag] * repeat)
+			j = j + repeat
 			if j >= nCoordinates:
 				break
 		assert j == nCoordinates, "bad glyph flags"
+		flags = array.array("B", flags)
+		xFormat = "".join(xFormat)
+		yFormat = "".join(yFormat)
 		data = data[i:]
 		# unpack raw coordinates, krrrrrr-tching!
 		xDataLen = struct.calcsize(xFormat)
@@ -819,8 +969,8 @@ class Glyph(object):
 		# Implements greedy algorithm for packing coordinate deltas:
 		# uses shortest representation one coordinate at a time.
 		compressedflags = []
-		xPoints = []
-		yPoints = []
+		xPoints = bytearray()
+		yPoints = bytearray()
 		lastflag = None
 		repeat = 0
 		for flag,(x,y) in zip(flags, deltas):
@@ -834,9 +984,9 @@ class Glyph(object):
 					flag = flag | flagXsame
 				else:
 					x = -x
-				xPoints.append(bytechr(x))
+				xPoints.append(x)
 			else:
-				xPoints.append(struct.pack(">h", x))
+				xPoints.extend(struct.pack(">h", x))
 			# do y
 			if y == 0:
 				flag = flag | flagYsame
@@ -846,9 +996,9 @@ class Glyph(object):
 					flag = flag | flagYsame
 				else:
 					y = -y
-				yPoints.append(bytechr(y))
+				yPoints.append(y)
 			else:
-				yPoints.append(struct.pack(">h", y))
+				yPoints.extend(struct.pack(">h", y))
 			# handle repeating flags
 			if flag == lastflag and repeat != 255:
 				repeat = repeat + 1
@@ -862,8 +1012,8 @@ class Glyph(object):
 				compressedflags.append(flag)
 			lastflag = flag
 		compressedFlags = array.array("B", compressedflags).tobytes()
-		compressedXs = bytesjoin(xPoints)
-		compressedYs = bytesjoin(yPoints)
+		compressedXs = bytes(xPoints)
+		compressedYs = bytes(yPoints)
 		return (compressedFlags, compressedXs, compressedYs)
 
 	def compileDeltasOptimal(self, flags, deltas):
@@ -1000,12 +1150,22 @@ class Glyph(object):
 			allCoords = GlyphCoordinates()
 			allFlags = array.array("B")
 			allEndPts = []
+			cache = getattr(glyfTable, "_componentCache", None)
 			for compo in self.components:
 				g = glyfTable[compo.glyphName]
-				try:
-					coordinates, endPts, flags = g.getCoordinates(glyfTable)
-				except RecursionError:
-					raise ttLib.TTLibError("glyph '%s' contains a recursive component reference" % compo.glyphName)
+				if cache is not None and g.numberOfContours < 0:
+					cached = cache.coordinates.get(compo.glyphName)
+				else:
+					cached = None
+				if cached is not None:
+					coordinates, endPts, flags = cached
+				else:
+					try:
+						coordinates, endPts, flags = g.getCoordinates(glyfTable)
+					except RecursionError:
+						raise ttLib.TTLibError("glyph '%s' contains a recursive component reference" % compo.glyphName)
+					if cache is not None and g.numberOfContours < 0:
+						cache.coordinates[compo.glyphName] = (coordinates, endPts, flags)
 				if hasattr(compo, "firstPt"):
 					# move according to two reference points
 					x1,y1 = allCoords[compo.firstPt]
@@ -1458,6 +1618,10 @@ class GlyphCoordinates(object):
 	def __len__(self):
 		return len(self._a) // 2
 
+	def __iter__(self):
+		a = self._a
+		return zip(a[0::2], a[1::2])
+
 	def __getitem__(self, k):
 		if isinstance(k, slice):
 			indices = range(*k.indices(len(self)))
@@ -1487,10 +1651,30 @@ class GlyphCoordinates(object):
 		self._a.extend(tuple(p))
 
 	def extend(self, iterable):
+		if not self.isFloat():
+			# try extending the array of integers in one go, which fails
+			# without modifying it if a value is a float, or out of range
+			values = [v for p in iterable for v in p]
+			try:
+				self._a.extend(array.array("h", values))
+				return
+			except (TypeError, OverflowError):
+				iterable = zip(values[::2], values[1::2])
 		for p in iterable:
 			p = self._checkFloat(p)
 			self._a.extend(p)
 
+	def _setValues(self, values):
+		# Replace the flat list of coordinates with 'values', keeping the
+		# array of integers unless a value is out of range, like _checkFloat.
+		if not self.isFloat():
+			try:
+				self._a = array.array("h", values)
+				return
+			except OverflowError:
+				pass
+		self._a = array.array("d", values)
+
 	def toInt(self):
 		if not self.isFloat():
 			return
@@ -1501,21 +1685,23 @@ class GlyphCoordinates(object):
 
 	def relativeToAbsolute(self):
 		a = self._a
+		values = [0] * len(a)
 		x,y = 0,0
-		for i in range(len(a) // 2):
-			x = a[2*i  ] + x
-			y = a[2*i+1] + y
-			self[i] = (x, y)
+		for i in range(0, len(a), 2):
+			x = values[i] = a[i] + x
+			y = values[i+1] = a[i+1] + y
+		self._setValues(values)
 
 	def absoluteToRelative(self):
 		a = self._a
+		values = [0] * len(a)
 		x,y = 0,0
-		for i in range(len(a) // 2):
-			dx = a[2*i  ] - x
-			dy = a[2*i+1] - y
-			x = a[2*i  ]
-			y = a[2*i+1]
-			self[i] = (dx, dy)
+		for i in range(0, len(a), 2):
+			values[i] = a[i] - x
+			values[i+1] = a[i+1] - y
+			x = a[i]
+			y = a[i+1]
+		self._setValues(values)
 
 	def translate(self, p):
 		"""
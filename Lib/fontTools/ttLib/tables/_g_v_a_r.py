@@ -1,6 +1,7 @@
 from fontTools.misc.py23 import *
 from fontTools import ttLib
 from fontTools.misc import sstruct
+from fontTools.misc import profiling
 from fontTools.misc.textTools import safeEval
 from fontTools.ttLib import TTLibError
 from . import DefaultTable
@@ -37,7 +38,8 @@ GVAR_HEADER_FORMAT = """
 	offsetToGlyphVariationData:	I
 """
 
-GVAR_HEADER_SIZE = sstruct.calcsize(GVAR_HEADER_FORMAT)
+GVAR_HEADER_STRUCT = sstruct.compile(GVAR_HEADER_FORMAT)
+GVAR_HEADER_SIZE = GVAR_HEADER_STRUCT.size
 
 
 class table__g_v_a_r(DefaultTable.DefaultTable):
@@ -73,7 +75,7 @@ class table__g_v_a_r(DefaultTable.DefaultTable):
 		header["glyphCount"] = len(compiledGlyphs)
 		header["flags"] = tableFormat
 		header["offsetToGlyphVariationData"] = header["offsetToSharedTuples"] + sharedTupleSize
-		compiledHeader = sstruct.pack(GVAR_HEADER_FORMAT, header)
+		compiledHeader = GVAR_HEADER_STRUCT.pack(header)
 
 		result = [compiledHeader, compiledOffsets]
 		result.extend(sharedTuples)
@@ -82,18 +84,19 @@ class table__g_v_a_r(DefaultTable.DefaultTable):
 
 	def compileGlyphs_(self, ttFont, axisTags, sharedCoordIndices):
 		result = []
+		compileGlyph = profiling.timed(compileGlyph_, "compileGlyph", self.tableTag)
 		for glyphName in ttFont.getGlyphOrder():
 			glyph = ttFont["glyf"][glyphName]
 			pointCount = self.getNumPoints_(glyph)
 			variations = self.variations.get(glyphName, [])
-			result.append(compileGlyph_(variations, pointCount,
-			                            axisTags, sharedCoordIndices))
+			result.append(compileGlyph(variations, pointCount,
+			                           axisTags, sharedCoordIndices))
 		return result
 
 	def decompile(self, data, ttFont):
 		axisTags = [axis.axisTag for axis in ttFont["fvar"].axes]
 		glyphs = ttFont.getGlyphOrder()
-		sstruct.unpack(GVAR_HEADER_FORMAT, data[0:GVAR_HEADER_SIZE], self)
+		GVAR_HEADER_STRUCT.unpack_into(self, data)
 		assert len(glyphs) == self.glyphCount
 		assert len(axisTags) == self.axisCount
 		offsets = self.decompileOffsets_(data[GVAR_HEADER_SIZE:], tableFormat=(self.flags & 1), glyphCount=self.glyphCount)
@@ -101,13 +104,14 @@ class table__g_v_a_r(DefaultTable.DefaultTable):
 			axisTags, self.sharedTupleCount, data, self.offsetToSharedTuples)
 		self.variations = {}
 		offsetToData = self.offsetToGlyphVariationData
+		decompileGlyph = profiling.timed(decompileGlyph_, "decompileGlyph", self.tableTag)
 		for i in range(self.glyphCount):
 			glyphName = glyphs[i]
 			glyph = ttFont["glyf"][glyphName]
 			numPointsInGlyph = self.getNumPoints_(glyph)
 			gvarData = data[offsetToData + offsets[i] : offsetToData + offsets[i + 1]]
 			try:
-				self.variations[glyphName] = decompileGlyph_(
+				self.variations[glyphName] = decompileGlyph(
 					numPointsInGlyph, sharedCoords, axisTags, gvarData)
 			except Exception:
 				log.error(
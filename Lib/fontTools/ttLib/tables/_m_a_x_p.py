@@ -73,25 +73,26 @@ class table__m_a_x_p(DefaultTable.DefaultTable):
 		maxComponentElements = 0
 		maxComponentDepth = 0
 		allXMinIsLsb = 1
-		for glyphName in ttFont.getGlyphOrder():
-			g = glyfTable[glyphName]
-			if g.numberOfContours:
-				if hmtxTable[glyphName][1] != g.xMin:
-					allXMinIsLsb = 0
-				xMin = min(xMin, g.xMin)
-				yMin = min(yMin, g.yMin)
-				xMax = max(xMax, g.xMax)
-				yMax = max(yMax, g.yMax)
-				if g.numberOfContours > 0:
-					nPoints, nContours = g.getMaxpValues()
-					maxPoints = max(maxPoints, nPoints)
-					maxContours = max(maxContours, nContours)
-				else:
-					nPoints, nContours, componentDepth = g.getCompositeMaxpValues(glyfTable)
-					maxCompositePoints = max(maxCompositePoints, nPoints)
-					maxCompositeContours = max(maxCompositeContours, nContours)
-					maxComponentElements = max(maxComponentElements, len(g.components))
-					maxComponentDepth = max(maxComponentDepth, componentDepth)
+		with glyfTable.componentCache():
+			for glyphName in ttFont.getGlyphOrder():
+				g = glyfTable[glyphName]
+				if g.numberOfContours:
+					if hmtxTable[glyphName][1] != g.xMin:
+						allXMinIsLsb = 0
+					xMin = min(xMin, g.xMin)
+					yMin = min(yMin, g.yMin)
+					xMax = max(xMax, g.xMax)
+					yMax = max(yMax, g.yMax)
+					if g.numberOfContours > 0:
+						nPoints, nContours = g.getMaxpValues()
+						maxPoints = max(maxPoints, nPoints)
+						maxContours = max(maxContours, nContours)
+					else:
+						nPoints, nContours, componentDepth = g.getCompositeMaxpValues(glyfTable)
+						maxCompositePoints = max(maxCompositePoints, nPoints)
+						maxCompositeContours = max(maxCompositeContours, nContours)
+						maxComponentElements = max(maxComponentElements, len(g.components))
+						maxComponentDepth = max(maxComponentDepth, componentDepth)
 		if xMin == +INFINITY:
 			headTable.xMin = 0
 			headTable.yMin = 0
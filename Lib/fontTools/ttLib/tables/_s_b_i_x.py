@@ -52,9 +52,10 @@ class table__s_b_i_x(DefaultTable.DefaultTable):
 			self.strikeOffsets.append(offset_entry.strikeOffset)
 
 		# decompile Strikes
+		end = len(data)
 		for i in range(self.numStrikes-1, -1, -1):
-			current_strike = Strike(rawdata=data[self.strikeOffsets[i]:])
-			data = data[:self.strikeOffsets[i]]
+			current_strike = Strike(rawdata=data[self.strikeOffsets[i]:end])
+			end = self.strikeOffsets[i]
 			current_strike.decompile(ttFont)
 			#print "  Strike length: %xh" % len(bitmapSetData)
 			#print "Number of Glyph entries:", len(current_strike.glyphs)
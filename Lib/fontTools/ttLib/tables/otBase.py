@@ -1,4 +1,5 @@
 from fontTools.misc.py23 import *
+from fontTools.misc import profiling
 from .DefaultTable import DefaultTable
 import sys
 import array
@@ -78,21 +79,22 @@ class BaseTTXConverter(DefaultTable):
 				log.info("Attempting to fix OTLOffsetOverflowError %s", e)
 				lastItem = overflowRecord
 
-				ok = 0
-				if overflowRecord.itemName is None:
-					from .otTables import fixLookupOverFlows
-					ok = fixLookupOverFlows(font, overflowRecord)
-				else:
-					from .otTables import fixSubTableOverFlows
-					ok = fixSubTableOverFlows(font, overflowRecord)
-				if not ok:
-					# Try upgrading lookup to Extension and hope
-					# that cross-lookup sharing not happening would
-					# fix overflow...
-					from .otTables import fixLookupOverFlows
-					ok = fixLookupOverFlows(font, overflowRecord)
+				with profiling.measure("fixOverflows", self.tableTag):
+					ok = 0
+					if overflowRecord.itemName is None:
+						from .otTables import fixLookupOverFlows
+						ok = fixLookupOverFlows(font, overflowRecord)
+					else:
+						from .otTables import fixSubTableOverFlows
+						ok = fixSubTableOverFlows(font, overflowRecord)
 					if not ok:
-						raise
+						# Try upgrading lookup to Extension and hope
+						# that cross-lookup sharing not happening would
+						# fix overflow...
+						from .otTables import fixLookupOverFlows
+						ok = fixLookupOverFlows(font, overflowRecord)
+						if not ok:
+							raise
 
 	def toXML(self, writer, font):
 		self.table.toXML2(writer, font)
@@ -106,6 +108,20 @@ class BaseTTXConverter(DefaultTable):
 		self.table.populateDefaults()
 
 
+# precompiled formats of the values OTTableReader reads; unpack_from reads
+# them from the table data in place, without slicing it
+_int8Struct = struct.Struct(">b")
+_uint8Struct = struct.Struct(">B")
+_shortStruct = struct.Struct(">h")
+_ushortStruct = struct.Struct(">H")
+_uint24Struct = struct.Struct(">BH")
+_longStruct = struct.Struct(">l")
+_ulongStruct = struct.Struct(">L")
+
+# array typecodes of 32-bit integers
+_longTypecode, _ulongTypecode = ("i", "I") if array.array("i").itemsize == 4 else ("l", "L")
+
+
 class OTTableReader(object):
 
 	"""Helper class to retrieve data from an OpenType table."""
@@ -134,63 +150,93 @@ class OTTableReader(object):
 		offset = self.offset + offset
 		return self.__class__(self.data, self.localState, offset, self.tableTag)
 
-	def readUShort(self):
+	def readValue(self, valueStruct):
+		"""Read a tuple of values with a struct.Struct."""
 		pos = self.pos
-		newpos = pos + 2
-		value, = struct.unpack(">H", self.data[pos:newpos])
-		self.pos = newpos
+		value = valueStruct.unpack_from(self.data, pos)
+		self.pos = pos + valueStruct.size
 		return value
 
-	def readUShortArray(self, count):
+	def readArray(self, typecode, staticSize, count):
+		"""Read an array.array of 'count' big-endian integers of the given
+		typecode and size in bytes."""
 		pos = self.pos
-		newpos = pos + count * 2
-		value = array.array("H", self.data[pos:newpos])
-		if sys.byteorder != "big": value.byteswap()
+		newpos = pos + count * staticSize
+		value = array.array(typecode)
+		value.frombytes(memoryview(self.data)[pos:newpos])
+		if staticSize > 1 and sys.byteorder != "big": value.byteswap()
 		self.pos = newpos
 		return value
 
 	def readInt8(self):
 		pos = self.pos
-		newpos = pos + 1
-		value, = struct.unpack(">b", self.data[pos:newpos])
-		self.pos = newpos
+		value, = _int8Struct.unpack_from(self.data, pos)
+		self.pos = pos + 1
 		return value
 
-	def readShort(self):
+	def readInt8Array(self, count):
+		return self.readArray("b", 1, count)
+
+	def readUInt8(self):
 		pos = self.pos
-		newpos = pos + 2
-		value, = struct.unpack(">h", self.data[pos:newpos])
-		self.pos = newpos
+		value, = _uint8Struct.unpack_from(self.data, pos)
+		self.pos = pos + 1
 		return value
 
-	def readLong(self):
+	def readUInt8Array(self, count):
+		return self.readArray("B", 1, count)
+
+	def readShort(self):
 		pos = self.pos
-		newpos = pos + 4
-		value, = struct.unpack(">l", self.data[pos:newpos])
-		self.pos = newpos
+		value, = _shortStruct.unpack_from(self.data, pos)
+		self.pos = pos + 2
 		return value
 
-	def readUInt8(self):
+	def readShortArray(self, count):
+		return self.readArray("h", 2, count)
+
+	def readUShort(self):
 		pos = self.pos
-		newpos = pos + 1
-		value, = struct.unpack(">B", self.data[pos:newpos])
-		self.pos = newpos
+		value, = _ushortStruct.unpack_from(self.data, pos)
+		self.pos = pos + 2
 		return value
 
+	def readUShortArray(self, count):
+		return self.readArray("H", 2, count)
+
 	def readUInt24(self):
 		pos = self.pos
-		newpos = pos + 3
-		value, = struct.unpack(">l", b'\0'+self.data[pos:newpos])
+		high, low = _uint24Struct.unpack_from(self.data, pos)
+		self.pos = pos + 3
+		return (high << 16) | low
+
+	def readUInt24Array(self, count):
+		pos = self.pos
+		newpos = pos + count * 3
+		data = self.data[pos:newpos]
+		value = array.array(_ulongTypecode,
+			[int.from_bytes(data[i:i+3], "big") for i in range(0, len(data), 3)])
 		self.pos = newpos
 		return value
 
+	def readLong(self):
+		pos = self.pos
+		value, = _longStruct.unpack_from(self.data, pos)
+		self.pos = pos + 4
+		return value
+
+	def readLongArray(self, count):
+		return self.readArray(_longTypecode, 4, count)
+
 	def readULong(self):
 		pos = self.pos
-		newpos = pos + 4
-		value, = struct.unpack(">L", self.data[pos:newpos])
-		self.pos = newpos
+		value, = _ulongStruct.unpack_from(self.data, pos)
+		self.pos = pos + 4
 		return value
 
+	def readULongArray(self, count):
+		return self.readArray(_ulongTypecode, 4, count)
+
 	def readTag(self):
 		pos = self.pos
 		newpos = pos + 4
@@ -229,6 +275,8 @@ class OTTableWriter(object):
 		self.tableTag = tableTag
 		self.longOffset = False
 		self.parent = None
+		self._hash = None
+		self._hashedItems = None
 
 	def __setitem__(self, name, value):
 		state = self.localState.copy() if self.localState else dict()
@@ -247,7 +295,9 @@ class OTTableWriter(object):
 		"""Return the length of this table in bytes, without subtables."""
 		l = 0
 		for item in self.items:
-			if hasattr(item, "getCountData"):
+			if item.__class__ is bytes:
+				l += len(item)
+			elif hasattr(item, "getCountData"):
 				l += item.size
 			elif hasattr(item, "getData"):
 				l += 4 if item.longOffset else 2
@@ -263,7 +313,7 @@ class OTTableWriter(object):
 		for i in range(numItems):
 			item = items[i]
 
-			if hasattr(item, "getData"):
+			if item.__class__ is not bytes and hasattr(item, "getData"):
 				if item.longOffset:
 					items[i] = packULong(item.pos - pos)
 				else:
@@ -278,8 +328,15 @@ class OTTableWriter(object):
 		return bytesjoin(items)
 
 	def __hash__(self):
-		# only works after self._doneWriting() has been called
-		return hash(self.items)
+		# only works after self._doneWriting() has been called.
+		# The hash of a writer is the one of its items, which hash their
+		# own subtables in turn; it is cached, and computed again only if
+		# self.items was replaced since.
+		items = self.items
+		if self._hashedItems is not items:
+			self._hash = hash(items)
+			self._hashedItems = items
+		return self._hash
 
 	def __ne__(self, other):
 		result = self.__eq__(other)
@@ -288,6 +345,8 @@ class OTTableWriter(object):
 	def __eq__(self, other):
 		if type(self) != type(other):
 			return NotImplemented
+		if self is other:
+			return True
 		return self.longOffset == other.longOffset and self.items == other.items
 
 	def _doneWriting(self, internedTables):
@@ -310,14 +369,27 @@ class OTTableWriter(object):
 			internedTables = {}
 
 		items = self.items
+		if items.__class__ is tuple:
+			# already done, as a subtable with several parents
+			return
+		isLeaf = True
 		for i in range(len(items)):
 			item = items[i]
+			if item.__class__ is bytes:
+				continue
 			if hasattr(item, "getCountData"):
 				items[i] = item.getCountData()
 			elif hasattr(item, "getData"):
+				isLeaf = False
 				item._doneWriting(internedTables)
 				if not dontShare:
 					items[i] = item = internedTables.setdefault(item, item)
+		if isLeaf and len(items) > 1:
+			# Tables without subtables, like anchors, devices and most
+			# coverage tables, are the most numerous and the most often
+			# identical: their items are joined in one bytes object, so
+			# that comparing and hashing them compares and hashes bytes.
+			items = [b"".join(items)]
 		self.items = tuple(items)
 
 	def _gatherTables(self, tables, extTables, done):
@@ -377,6 +449,10 @@ class OTTableWriter(object):
 
 	def getAllData(self):
 		"""Assemble all data, including all subtables."""
+		with profiling.measure("getAllData", self.tableTag):
+			return self._getAllData()
+
+	def _getAllData(self):
 		internedTables = {}
 		self._doneWriting(internedTables)
 		tables = []
@@ -602,7 +678,16 @@ class BaseTable(object):
 		self.readFormat(reader)
 		table = {}
 		self.__rawTable = table  # for debugging
-		for conv in self.getConverters():
+		for conv in _getReadPlan(self.getConverters()):
+			if conv.__class__ is _StructRun:
+				try:
+					table.update(zip(conv.names, reader.readValue(conv.struct)))
+				except Exception as e:
+					e.args = e.args + (conv.names[0],)
+					raise
+				for name in conv.propagated:
+					reader[name] = table[name]
+				continue
 			if conv.name == "SubTable":
 				conv = conv.getConverter(reader.tableTag,
 						table["LookupType"])
@@ -636,7 +721,7 @@ class BaseTable(object):
 				e.args = e.args + (name,)
 				raise
 
-		if hasattr(self, 'postRead'):
+		if hasattr(self.__class__, 'postRead'):
 			self.postRead(table, font)
 		else:
 			self.__dict__.update(table)
@@ -645,16 +730,19 @@ class BaseTable(object):
 
 	def compile(self, writer, font):
 		self.ensureDecompiled()
-		if hasattr(self, 'preWrite'):
+		if hasattr(self.__class__, 'preWrite'):
 			table = self.preWrite(font)
 		else:
 			table = self.__dict__.copy()
 
-
-		if hasattr(self, 'sortCoverageLast'):
+		# These flags are set on a few tables or table classes; they are
+		# looked up without going through __getattr__, which would be
+		# called in vain for all the others.
+		cls = self.__class__
+		if 'sortCoverageLast' in self.__dict__ or hasattr(cls, 'sortCoverageLast'):
 			writer.sortCoverageLast = 1
 
-		if hasattr(self, 'DontShare'):
+		if 'DontShare' in self.__dict__ or hasattr(cls, 'DontShare'):
 			writer.DontShare = True
 
 		if hasattr(self.__class__, 'LookupType'):
@@ -778,6 +866,44 @@ class BaseTable(object):
 		return self.__dict__ == other.__dict__
 
 
+class _StructRun(object):
+
+	"""Consecutive converters of simple values, read at once with a
+	precompiled struct.Struct."""
+
+	def __init__(self, converters):
+		self.names = [conv.name for conv in converters]
+		self.propagated = [conv.name for conv in converters if conv.isPropagated]
+		self.struct = struct.Struct(">" + "".join(conv.structFormat for conv in converters))
+
+
+_readPlans = {}
+
+def _getReadPlan(converters):
+	"""Return the list of converters of a table, where the runs of two or
+	more converters of values of a fixed struct format (that are neither
+	repeated nor conditional) are replaced by a _StructRun."""
+	plan = _readPlans.get(id(converters))
+	if plan is not None and plan[0] is converters:
+		return plan[1]
+	steps = []
+	run = []
+	for conv in converters + [None]:
+		if conv is not None and conv.structFormat and not conv.repeat and not conv.aux:
+			run.append(conv)
+			continue
+		if len(run) > 1:
+			steps.append(_StructRun(run))
+		else:
+			steps.extend(run)
+		run = []
+		if conv is not None:
+			steps.append(conv)
+	# keep a reference to converters, so that its id is not reused
+	_readPlans[id(converters)] = (converters, steps)
+	return steps
+
+
 class FormatSwitchingBaseTable(BaseTable):
 
 	"""Minor specialization of BaseTable, for tables that have multiple
@@ -851,6 +977,8 @@ class ValueRecordFactory(object):
 			if valueFormat & mask:
 				format.append((name, isDevice, signed))
 		self.format = format
+		self.struct = struct.Struct(">" + "".join(
+			"h" if signed else "H" for name, isDevice, signed in format))
 
 	def __len__(self):
 		return len(self.format)
@@ -860,11 +988,8 @@ class ValueRecordFactory(object):
 		if not format:
 			return None
 		valueRecord = ValueRecord()
-		for name, isDevice, signed in format:
-			if signed:
-				value = reader.readShort()
-			else:
-				value = reader.readUShort()
+		values = reader.readValue(self.struct)
+		for (name, isDevice, signed), value in zip(format, values):
 			if isDevice:
 				if value:
 					from . import otTables
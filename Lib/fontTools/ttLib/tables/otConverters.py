@@ -127,6 +127,11 @@ class BaseConverter(object):
 	"""Base class for converter objects. Apart from the constructor, this
 	is an abstract class."""
 
+	# struct module format of the values of converters whose read() only
+	# unpacks a value of fixed size; BaseTable.decompile reads consecutive
+	# ones at once
+	structFormat = None
+
 	def __init__(self, name, repeat, aux, tableClass=None):
 		self.name = name
 		self.repeat = repeat
@@ -197,15 +202,21 @@ class IntValue(SimpleValue):
 
 class Long(IntValue):
 	staticSize = 4
+	structFormat = "l"
 	def read(self, reader, font, tableDict):
 		return reader.readLong()
+	def readArray(self, reader, font, tableDict, count):
+		return reader.readLongArray(count).tolist()
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeLong(value)
 
 class ULong(IntValue):
 	staticSize = 4
+	structFormat = "L"
 	def read(self, reader, font, tableDict):
 		return reader.readULong()
+	def readArray(self, reader, font, tableDict, count):
+		return reader.readULongArray(count).tolist()
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeULong(value)
 
@@ -216,29 +227,41 @@ class Flags32(ULong):
 
 class Short(IntValue):
 	staticSize = 2
+	structFormat = "h"
 	def read(self, reader, font, tableDict):
 		return reader.readShort()
+	def readArray(self, reader, font, tableDict, count):
+		return reader.readShortArray(count).tolist()
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeShort(value)
 
 class UShort(IntValue):
 	staticSize = 2
+	structFormat = "H"
 	def read(self, reader, font, tableDict):
 		return reader.readUShort()
+	def readArray(self, reader, font, tableDict, count):
+		return reader.readUShortArray(count).tolist()
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeUShort(value)
 
 class Int8(IntValue):
 	staticSize = 1
+	structFormat = "b"
 	def read(self, reader, font, tableDict):
 		return reader.readInt8()
+	def readArray(self, reader, font, tableDict, count):
+		return reader.readInt8Array(count).tolist()
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeInt8(value)
 
 class UInt8(IntValue):
 	staticSize = 1
+	structFormat = "B"
 	def read(self, reader, font, tableDict):
 		return reader.readUInt8()
+	def readArray(self, reader, font, tableDict, count):
+		return reader.readUInt8Array(count).tolist()
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeUInt8(value)
 
@@ -246,6 +269,8 @@ class UInt24(IntValue):
 	staticSize = 3
 	def read(self, reader, font, tableDict):
 		return reader.readUInt24()
+	def readArray(self, reader, font, tableDict, count):
+		return reader.readUInt24Array(count).tolist()
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeUInt24(value)
 
@@ -318,6 +343,8 @@ class Fixed(FloatValue):
 	staticSize = 4
 	def read(self, reader, font, tableDict):
 		return  fi2fl(reader.readLong(), 16)
+	def readArray(self, reader, font, tableDict, count):
+		return [fi2fl(value, 16) for value in reader.readLongArray(count)]
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeLong(fl2fi(value, 16))
 	def xmlRead(self, attrs, content, font):
@@ -330,6 +357,8 @@ class F2Dot14(FloatValue):
 	staticSize = 2
 	def read(self, reader, font, tableDict):
 		return  fi2fl(reader.readShort(), 14)
+	def readArray(self, reader, font, tableDict, count):
+		return [fi2fl(value, 14) for value in reader.readShortArray(count)]
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		writer.writeShort(fl2fi(value, 14))
 	def xmlRead(self, attrs, content, font):
@@ -502,6 +531,9 @@ class Table(Struct):
 	def readOffset(self, reader):
 		return reader.readUShort()
 
+	def readOffsetArray(self, reader, count):
+		return reader.readUShortArray(count)
+
 	def writeNullOffset(self, writer):
 		if self.longOffset:
 			writer.writeULong(0)
@@ -509,7 +541,16 @@ class Table(Struct):
 			writer.writeUShort(0)
 
 	def read(self, reader, font, tableDict):
-		offset = self.readOffset(reader)
+		return self.readTable(reader, font, self.readOffset(reader))
+
+	def readArray(self, reader, font, tableDict, count):
+		if font.lazy and count > 8:
+			return Struct.readArray(self, reader, font, tableDict, count)
+		# read all offsets at once
+		return [self.readTable(reader, font, offset)
+			for offset in self.readOffsetArray(reader, count)]
+
+	def readTable(self, reader, font, offset):
 		if offset == 0:
 			return None
 		table = self.tableClass()
@@ -541,6 +582,9 @@ class LTable(Table):
 	def readOffset(self, reader):
 		return reader.readULong()
 
+	def readOffsetArray(self, reader, count):
+		return reader.readULongArray(count)
+
 
 # TODO Clean / merge the SubTable and SubStruct
 
@@ -1444,16 +1488,16 @@ class DeltaValue(BaseConverter):
 		mask = (1 << nBits) - 1
 		signMask = 1 << (nBits - 1)
 
+		itemsPerWord = 16 // nBits
+		words = reader.readUShortArray(max(nItems + itemsPerWord - 1, 0) // itemsPerWord)
 		DeltaValue = []
-		tmp, shift = 0, 0
-		for i in range(nItems):
-			if shift == 0:
-				tmp, shift = reader.readUShort(), 16
-			shift = shift - nBits
-			value = (tmp >> shift) & mask
-			if value & signMask:
-				value = value - minusOffset
-			DeltaValue.append(value)
+		for tmp in words:
+			for shift in range(16 - nBits, -1, -nBits):
+				value = (tmp >> shift) & mask
+				if value & signMask:
+					value = value - minusOffset
+				DeltaValue.append(value)
+		del DeltaValue[nItems:]
 		return DeltaValue
 
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
@@ -1497,20 +1541,15 @@ class VarIdxMapValue(BaseConverter):
 		outerShift = 16 - innerBits
 
 		entrySize = 1 + ((fmt & 0x0030) >> 4)
-		read = {
-			1: reader.readUInt8,
-			2: reader.readUShort,
-			3: reader.readUInt24,
-			4: reader.readULong,
+		readArray = {
+			1: reader.readUInt8Array,
+			2: reader.readUShortArray,
+			3: reader.readUInt24Array,
+			4: reader.readULongArray,
 		}[entrySize]
 
-		mapping = []
-		for i in range(nItems):
-			raw = read()
-			idx = ((raw & outerMask) << outerShift) | (raw & innerMask)
-			mapping.append(idx)
-
-		return mapping
+		return [((raw & outerMask) << outerShift) | (raw & innerMask)
+			for raw in readArray(nItems)]
 
 	def write(self, writer, font, tableDict, value, repeatIndex=None):
 		fmt = tableDict['EntryFormat']
@@ -1537,17 +1576,12 @@ class VarIdxMapValue(BaseConverter):
 class VarDataValue(BaseConverter):
 
 	def read(self, reader, font, tableDict):
-		values = []
-
 		regionCount = tableDict["VarRegionCount"]
 		shortCount = tableDict["NumShorts"]
 
-		for i in range(min(regionCount, shortCount)):
-			values.append(reader.readShort())
-		for i in range(min(regionCount, shortCount), regionCount):
-			values.append(reader.readInt8())
-		for i in range(regionCount, shortCount):
-			reader.readInt8()
+		values = reader.readShortArray(min(regionCount, shortCount)).tolist()
+		values.extend(reader.readInt8Array(max(regionCount - shortCount, 0)))
+		reader.advance(max(shortCount - regionCount, 0))
 
 		return values
 
@@ -8,6 +8,8 @@ converter objects from otConverters.py.
 from fontTools.misc.py23 import *
 from fontTools.misc.textTools import pad, safeEval
 from .otBase import BaseTable, FormatSwitchingBaseTable, ValueRecord
+from bisect import bisect_left, bisect_right
+import array
 import logging
 import struct
 
@@ -503,6 +505,100 @@ class FeatureParamsStylisticSet(FeatureParams):
 class FeatureParamsCharacterVariants(FeatureParams):
 	pass
 
+class _CoverageGlyphIDs(object):
+
+	"""The glyphs of a Coverage table, as glyph IDs into 'glyphOrder'.
+
+	Coverage tables read from a font keep their glyphs in this form until
+	their list of glyph names is needed. The glyph IDs are sorted: either
+	'starts' is the array of the glyph IDs and 'ends' is None, or the glyphs
+	are ranges, from starts[i] to ends[i] (excluded), and indices[i] is the
+	coverage index of starts[i]. Glyph IDs are looked up with bisect.
+	"""
+
+	def __init__(self, glyphOrder, starts, ends=None, indices=None):
+		self.glyphOrder = glyphOrder
+		self.starts = starts
+		self.ends = ends
+		self.indices = indices
+
+	def __len__(self):
+		if self.ends is None:
+			return len(self.starts)
+		if not self.starts:
+			return 0
+		return self.indices[-1] + self.ends[-1] - self.starts[-1]
+
+	def __iter__(self):
+		if self.ends is None:
+			return iter(self.starts)
+		return (glyphID
+			for start, end in zip(self.starts, self.ends)
+			for glyphID in range(start, end))
+
+	def __deepcopy__(self, memo):
+		# the glyph order is shared, not copied
+		return self.__class__(self.glyphOrder, list(self.starts),
+			None if self.ends is None else list(self.ends),
+			None if self.indices is None else list(self.indices))
+
+	def getGlyphNames(self):
+		glyphOrder = self.glyphOrder
+		return [glyphOrder[glyphID] for glyphID in self]
+
+	def getIndex(self, glyphID):
+		"""Return the coverage index of glyphID, or -1 if it is not covered."""
+		starts = self.starts
+		i = bisect_right(starts, glyphID) - 1
+		if i < 0:
+			return -1
+		if self.ends is None:
+			return i if starts[i] == glyphID else -1
+		if glyphID < self.ends[i]:
+			return self.indices[i] + glyphID - starts[i]
+		return -1
+
+	def getGlyphID(self, index):
+		"""Return the glyph ID at a coverage index."""
+		starts = self.starts
+		if self.ends is None:
+			return starts[index]
+		i = bisect_right(self.indices, index) - 1
+		return starts[i] + index - self.indices[i]
+
+	def intersect(self, glyphs, glyphIDs=None):
+		"""Return the ascending list of the coverage indices of the glyph
+		names in 'glyphs'. If 'glyphIDs', the sorted list of the glyph IDs
+		of 'glyphs' in the glyph order, is given, they are looked up by glyph
+		ID; otherwise all the glyph names of the coverage are tested."""
+		starts = self.starts
+		if glyphIDs is None or (self.ends is None and len(starts) <= len(glyphIDs)):
+			glyphOrder = self.glyphOrder
+			return [i for i, glyphID in enumerate(self) if glyphOrder[glyphID] in glyphs]
+		if len(glyphIDs) < len(starts):
+			getIndex = self.getIndex
+			indices = [getIndex(glyphID) for glyphID in glyphIDs]
+			return [i for i in indices if i >= 0]
+		indices = []
+		lo = 0
+		for start, end, index in zip(starts, self.ends, self.indices):
+			lo = bisect_left(glyphIDs, start, lo)
+			hi = bisect_left(glyphIDs, end, lo)
+			if hi > lo:
+				indices.extend(index + glyphID - start for glyphID in glyphIDs[lo:hi])
+				lo = hi
+		return indices
+
+	def take(self, indices):
+		"""Return the glyph IDs at the given coverage indices, or None if
+		they are not sorted."""
+		getGlyphID = self.getGlyphID
+		glyphIDs = array.array("H", [getGlyphID(i) for i in indices])
+		if any(a >= b for a, b in zip(glyphIDs, glyphIDs[1:])):
+			return None
+		return self.__class__(self.glyphOrder, glyphIDs)
+
+
 class Coverage(FormatSwitchingBaseTable):
 
 	# manual implementation to get rid of glyphID dependencies
@@ -511,6 +607,58 @@ class Coverage(FormatSwitchingBaseTable):
 		if not hasattr(self, 'glyphs'):
 			self.glyphs = []
 
+	# The list of glyph names is only made when it is first needed: the
+	# glyphs of a Coverage read from a font are kept as a _CoverageGlyphIDs
+	# in _glyphIDs until then, and the subsetter works on those directly.
+
+	@property
+	def glyphs(self):
+		d = self.__dict__
+		if "glyphs" in d:
+			return d["glyphs"]
+		glyphIDs = d.get("_glyphIDs")
+		if glyphIDs is None:
+			raise AttributeError("glyphs")
+		glyphs = d["glyphs"] = glyphIDs.getGlyphNames()
+		del d["_glyphIDs"]
+		return glyphs
+
+	@glyphs.setter
+	def glyphs(self, glyphs):
+		d = self.__dict__
+		d["glyphs"] = glyphs
+		d.pop("_glyphIDs", None)
+
+	@glyphs.deleter
+	def glyphs(self):
+		d = self.__dict__
+		if "glyphs" not in d and "_glyphIDs" not in d:
+			raise AttributeError("glyphs")
+		d.pop("glyphs", None)
+		d.pop("_glyphIDs", None)
+
+	def getGlyphIDs(self):
+		"""Return the _CoverageGlyphIDs of a Coverage read from a font, or
+		None if its glyphs were accessed as names."""
+		self.ensureDecompiled()
+		return self.__dict__.get("_glyphIDs")
+
+	def setGlyphIDs(self, glyphIDs):
+		"""Set the glyphs to those of a _CoverageGlyphIDs."""
+		d = self.__dict__
+		d.pop("glyphs", None)
+		d["_glyphIDs"] = glyphIDs
+
+	def __eq__(self, other):
+		if type(self) != type(other):
+			return NotImplemented
+		# compare glyph names
+		self.ensureDecompiled()
+		other.ensureDecompiled()
+		getattr(self, "glyphs", None)
+		getattr(other, "glyphs", None)
+		return self.__dict__ == other.__dict__
+
 	def postRead(self, rawTable, font):
 		if self.Format == 1:
 			# TODO only allow glyphs that are valid?
@@ -551,16 +699,80 @@ class Coverage(FormatSwitchingBaseTable):
 			self.glyphs = []
 			log.warning("Unknown Coverage format: %s", self.Format)
 
+	def decompile(self, reader, font):
+		# Like postRead, but with the glyph IDs instead of their names.
+		self.readFormat(reader)
+		glyphOrder = font.getGlyphOrder()
+		numGlyphs = len(glyphOrder)
+		if self.Format == 1:
+			glyphIDs = reader.readUShortArray(reader.readUShort())
+			if all(a < b for a, b in zip(glyphIDs, glyphIDs[1:])) and \
+					(not glyphIDs or glyphIDs[-1] < numGlyphs):
+				self.setGlyphIDs(_CoverageGlyphIDs(glyphOrder, glyphIDs))
+			else:
+				# TODO only allow glyphs that are valid?
+				self.glyphs = [font.getGlyphName(glyphID) for glyphID in glyphIDs]
+		elif self.Format == 2:
+			rangeCount = reader.readUShort()
+			records = reader.readUShortArray(3 * rangeCount)
+			ranges = list(zip(records[0::3], records[1::3], records[2::3]))
+			# Some SIL fonts have coverage entries that don't have sorted
+			# StartCoverageIndex.  If it is so, fixup and warn.  We undo
+			# this when writing font out.
+			sorted_ranges = sorted(ranges, key=lambda a: a[2])
+			if ranges != sorted_ranges:
+				log.warning("GSUB/GPOS Coverage is not sorted by glyph ids.")
+				ranges = sorted_ranges
+			del sorted_ranges
+			starts = []
+			ends = []
+			indices = []
+			count = 0
+			for startID, endID, startCoverageIndex in ranges:
+				assert startCoverageIndex == count, (startCoverageIndex, count)
+				if startID >= numGlyphs:
+					log.warning("Coverage table has start glyph ID out of range: %s.",
+						font.getGlyphName(startID))
+					continue
+				if endID >= numGlyphs:
+					# Apparently some tools use 65535 to "match all" the range
+					if endID != 0xFFFF:
+						log.warning("Coverage table has end glyph ID out of range: %s.",
+							font.getGlyphName(endID))
+					# NOTE: We clobber out-of-range things here.  There are legit uses for those,
+					# but none that we have seen in the wild.
+					endID = numGlyphs - 1
+				if endID < startID:
+					continue
+				starts.append(startID)
+				ends.append(endID + 1)
+				indices.append(count)
+				count += endID + 1 - startID
+			if all(end <= start for end, start in zip(ends, starts[1:])):
+				self.setGlyphIDs(_CoverageGlyphIDs(glyphOrder, starts, ends, indices))
+			else:
+				self.glyphs = [glyphOrder[glyphID]
+					for start, end in zip(starts, ends)
+					for glyphID in range(start, end)]
+		else:
+			self.glyphs = []
+			log.warning("Unknown Coverage format: %s", self.Format)
+
 	def preWrite(self, font):
-		glyphs = getattr(self, "glyphs", None)
-		if glyphs is None:
-			glyphs = self.glyphs = []
+		glyphIDs = self.__dict__.get("_glyphIDs")
+		if glyphIDs is not None and glyphIDs.glyphOrder is font.getGlyphOrder():
+			glyphs = glyphIDs.getGlyphNames()
+			glyphIDs = list(glyphIDs)
+		else:
+			glyphs = getattr(self, "glyphs", None)
+			if glyphs is None:
+				glyphs = self.glyphs = []
+			getGlyphID = font.getGlyphID
+			glyphIDs = [getGlyphID(glyphName) for glyphName in glyphs]
 		format = 1
 		rawTable = {"GlyphArray": glyphs}
-		getGlyphID = font.getGlyphID
 		if glyphs:
 			# find out whether Format 2 is more compact or not
-			glyphIDs = [getGlyphID(glyphName) for glyphName in glyphs ]
 			brokenOrder = sorted(glyphIDs) != glyphIDs
 
 			last = glyphIDs[0]
@@ -844,12 +1056,150 @@ class MultipleSubst(FormatSwitchingBaseTable):
 		return seq
 
 
+class _ClassDefGlyphIDs(object):
+
+	"""The classes of a ClassDef table, by ranges of glyph IDs into
+	'glyphOrder'.
+
+	ClassDef tables read from a font keep their classes in this form until
+	their dictionary of glyph names is needed. The glyphs from starts[i] to
+	ends[i] (excluded) are in class classes[i]; the ranges are sorted, and
+	looked up with bisect.
+	"""
+
+	def __init__(self, glyphOrder, starts, ends, classes):
+		self.glyphOrder = glyphOrder
+		self.starts = starts
+		self.ends = ends
+		self.classes = classes
+
+	@classmethod
+	def fromItems(cls, glyphOrder, items):
+		"""Make a _ClassDefGlyphIDs from a list of (glyphID, class) tuples
+		sorted by glyph ID."""
+		starts = []
+		ends = []
+		classes = []
+		for glyphID, klass in items:
+			if ends and ends[-1] == glyphID and classes[-1] == klass:
+				ends[-1] = glyphID + 1
+			else:
+				starts.append(glyphID)
+				ends.append(glyphID + 1)
+				classes.append(klass)
+		return cls(glyphOrder, starts, ends, classes)
+
+	def __len__(self):
+		return sum(end - start for start, end in zip(self.starts, self.ends))
+
+	def __iter__(self):
+		"""Iterate over the (glyphID, class) tuples."""
+		for start, end, klass in zip(self.starts, self.ends, self.classes):
+			for glyphID in range(start, end):
+				yield glyphID, klass
+
+	def __deepcopy__(self, memo):
+		# the glyph order is shared, not copied
+		return self.__class__(self.glyphOrder,
+			list(self.starts), list(self.ends), list(self.classes))
+
+	def getClassDefs(self):
+		glyphOrder = self.glyphOrder
+		return {glyphOrder[glyphID]: klass for glyphID, klass in self}
+
+	def getClass(self, glyphID):
+		"""Return the class of glyphID, or None if it is not in a range."""
+		i = bisect_right(self.starts, glyphID) - 1
+		if i >= 0 and glyphID < self.ends[i]:
+			return self.classes[i]
+		return None
+
+	def intersect(self, glyphs, glyphIDs=None):
+		"""Return the list of the (glyphID, class) tuples of the glyph names
+		in 'glyphs', sorted by glyph ID. 'glyphIDs' is as for
+		_CoverageGlyphIDs.intersect()."""
+		items = []
+		if glyphIDs is None:
+			glyphOrder = self.glyphOrder
+			for start, end, klass in zip(self.starts, self.ends, self.classes):
+				items.extend((glyphID, klass) for glyphID in range(start, end)
+					if glyphOrder[glyphID] in glyphs)
+			return items
+		if len(glyphIDs) < len(self.starts):
+			getClass = self.getClass
+			for glyphID in glyphIDs:
+				klass = getClass(glyphID)
+				if klass is not None:
+					items.append((glyphID, klass))
+			return items
+		lo = 0
+		for start, end, klass in zip(self.starts, self.ends, self.classes):
+			lo = bisect_left(glyphIDs, start, lo)
+			hi = bisect_left(glyphIDs, end, lo)
+			if hi > lo:
+				items.extend((glyphID, klass) for glyphID in glyphIDs[lo:hi])
+				lo = hi
+		return items
+
+
 class ClassDef(FormatSwitchingBaseTable):
 
 	def populateDefaults(self, propagator=None):
 		if not hasattr(self, 'classDefs'):
 			self.classDefs = {}
 
+	# As for Coverage, the dictionary of glyph names is only made when it is
+	# first needed: the classes of a ClassDef read from a font are kept as a
+	# _ClassDefGlyphIDs in _glyphIDs until then.
+
+	@property
+	def classDefs(self):
+		d = self.__dict__
+		if "classDefs" in d:
+			return d["classDefs"]
+		glyphIDs = d.get("_glyphIDs")
+		if glyphIDs is None:
+			raise AttributeError("classDefs")
+		classDefs = d["classDefs"] = glyphIDs.getClassDefs()
+		del d["_glyphIDs"]
+		return classDefs
+
+	@classDefs.setter
+	def classDefs(self, classDefs):
+		d = self.__dict__
+		d["classDefs"] = classDefs
+		d.pop("_glyphIDs", None)
+
+	@classDefs.deleter
+	def classDefs(self):
+		d = self.__dict__
+		if "classDefs" not in d and "_glyphIDs" not in d:
+			raise AttributeError("classDefs")
+		d.pop("classDefs", None)
+		d.pop("_glyphIDs", None)
+
+	def getGlyphIDs(self):
+		"""Return the _ClassDefGlyphIDs of a ClassDef read from a font, or
+		None if its classes were accessed by glyph name."""
+		self.ensureDecompiled()
+		return self.__dict__.get("_glyphIDs")
+
+	def setGlyphIDs(self, glyphIDs):
+		"""Set the classes to those of a _ClassDefGlyphIDs."""
+		d = self.__dict__
+		d.pop("classDefs", None)
+		d["_glyphIDs"] = glyphIDs
+
+	def __eq__(self, other):
+		if type(self) != type(other):
+			return NotImplemented
+		# compare glyph names
+		self.ensureDecompiled()
+		other.ensureDecompiled()
+		getattr(self, "classDefs", None)
+		getattr(other, "classDefs", None)
+		return self.__dict__ == other.__dict__
+
 	def postRead(self, rawTable, font):
 		classDefs = {}
 		glyphOrder = font.getGlyphOrder()
@@ -901,17 +1251,87 @@ class ClassDef(FormatSwitchingBaseTable):
 			log.warning("Unknown ClassDef format: %s", self.Format)
 		self.classDefs = classDefs
 
+	def decompile(self, reader, font):
+		# Like postRead, but with the glyph IDs instead of their names.
+		self.readFormat(reader)
+		glyphOrder = font.getGlyphOrder()
+		numGlyphs = len(glyphOrder)
+		ranges = []
+
+		if self.Format == 1:
+			startID = reader.readUShort()
+			classList = reader.readUShortArray(reader.readUShort())
+			if startID >= numGlyphs:
+				log.warning("ClassDef table has start glyph ID out of range: %s.",
+					font.getGlyphName(startID))
+				startID = numGlyphs
+			endID = startID + len(classList)
+			if endID > numGlyphs:
+				log.warning("ClassDef table has entries for out of range glyph IDs: %s,%s.",
+					font.getGlyphName(startID), len(classList))
+				# NOTE: We clobber out-of-range things here.  There are legit uses for those,
+				# but none that we have seen in the wild.
+				endID = numGlyphs
+
+			lastCls = 0
+			for glyphID, cls in zip(range(startID, endID), classList):
+				if cls != lastCls:
+					if lastCls:
+						ranges[-1][1] = glyphID
+					if cls:
+						ranges.append([glyphID, endID, cls])
+					lastCls = cls
+
+		elif self.Format == 2:
+			rangeCount = reader.readUShort()
+			records = reader.readUShortArray(3 * rangeCount)
+			for startID, endID, cls in zip(records[0::3], records[1::3], records[2::3]):
+				if startID >= numGlyphs:
+					log.warning("ClassDef table has start glyph ID out of range: %s.",
+						font.getGlyphName(startID))
+					continue
+				if endID >= numGlyphs:
+					# Apparently some tools use 65535 to "match all" the range
+					if endID != 0xFFFF:
+						log.warning("ClassDef table has end glyph ID out of range: %s.",
+							font.getGlyphName(endID))
+					# NOTE: We clobber out-of-range things here.  There are legit uses for those,
+					# but none that we have seen in the wild.
+					endID = numGlyphs - 1
+				if cls and startID <= endID:
+					ranges.append([startID, endID + 1, cls])
+			sortedRanges = sorted(ranges)
+			if any(r1[1] > r2[0] for r1, r2 in zip(sortedRanges, sortedRanges[1:])):
+				# overlapping ranges; the last one wins
+				classDefs = {}
+				for startID, endID, cls in ranges:
+					for glyphID in range(startID, endID):
+						classDefs[glyphOrder[glyphID]] = cls
+				self.classDefs = classDefs
+				return
+			ranges = sortedRanges
+		else:
+			log.warning("Unknown ClassDef format: %s", self.Format)
+
+		self.setGlyphIDs(_ClassDefGlyphIDs(glyphOrder,
+			[r[0] for r in ranges], [r[1] for r in ranges], [r[2] for r in ranges]))
+
 	def _getClassRanges(self, font):
-		classDefs = getattr(self, "classDefs", None)
-		if classDefs is None:
-			self.classDefs = {}
-			return
-		getGlyphID = font.getGlyphID
-		items = []
-		for glyphName, cls in classDefs.items():
-			if not cls:
-				continue
-			items.append((getGlyphID(glyphName), glyphName, cls))
+		glyphIDs = self.__dict__.get("_glyphIDs")
+		if glyphIDs is not None and glyphIDs.glyphOrder is font.getGlyphOrder():
+			glyphOrder = glyphIDs.glyphOrder
+			items = [(glyphID, glyphOrder[glyphID], cls) for glyphID, cls in glyphIDs if cls]
+		else:
+			classDefs = getattr(self, "classDefs", None)
+			if classDefs is None:
+				self.classDefs = {}
+				return
+			getGlyphID = font.getGlyphID
+			items = []
+			for glyphName, cls in classDefs.items():
+				if not cls:
+					continue
+				items.append((getGlyphID(glyphName), glyphName, cls))
 		if items:
 			items.sort()
 			last, lastName, lastCls = items[0]
@@ -73,6 +73,9 @@ class Glyph(object):
 			# TODO: if ttFont has no maxp, cmap etc., ignore glyph names and compile by index?
 			# (needed if you just want to compile the sbix table on its own)
 		self.gid = struct.pack(">H", ttFont.getGlyphID(self.glyphName))
+		if self.graphicType == "dupe" and self.referenceGlyphName is not None:
+			# decompiled references only keep the name of the referenced glyph
+			self.imageData = struct.pack(">H", ttFont.getGlyphID(self.referenceGlyphName))
 		if self.graphicType is None:
 			self.rawdata = b""
 		else:
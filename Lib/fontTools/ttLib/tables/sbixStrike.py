@@ -1,6 +1,7 @@
 from fontTools.misc.py23 import *
 from fontTools.misc import sstruct
 from fontTools.misc.textTools import readHex
+from fontTools.misc.lazyTools import LazyDict
 from .sbixGlyph import *
 import struct
 
@@ -47,47 +48,49 @@ class Strike(object):
 		self.numGlyphs = (firstGlyphDataOffset - sbixStrikeHeaderFormatSize) // sbixGlyphDataOffsetFormatSize - 1
 		# ^ -1 because there's one more offset than glyphs
 
-		# build offset list for single glyph data offsets
-		self.glyphDataOffsets = []
-		for i in range(self.numGlyphs + 1): # + 1 because there's one more offset than glyphs
-			start = i * sbixGlyphDataOffsetFormatSize + sbixStrikeHeaderFormatSize
-			current_offset, = struct.unpack(">L", self.data[start:start + sbixGlyphDataOffsetFormatSize])
-			self.glyphDataOffsets.append(current_offset)
-
-		# iterate through offset list and slice raw data into glyph data records
-		for i in range(self.numGlyphs):
-			current_glyph = Glyph(rawdata=self.data[self.glyphDataOffsets[i]:self.glyphDataOffsets[i+1]], gid=i)
-			current_glyph.decompile(ttFont)
-			self.glyphs[current_glyph.glyphName] = current_glyph
-		del self.glyphDataOffsets
+		# read offset list for single glyph data offsets
+		glyphDataOffsets = struct.unpack_from(
+			">%dL" % (self.numGlyphs + 1), # + 1 because there's one more offset than glyphs
+			self.data, sbixStrikeHeaderFormatSize)
+
+		# the glyph data records are sliced from the raw data and decompiled
+		# when they are accessed
+		self.glyphs = LazyGlyphs(ttFont, self.data, glyphDataOffsets)
 		del self.numGlyphs
 		del self.data
 
 	def compile(self, ttFont):
-		self.glyphDataOffsets = b""
-		self.bitmapData = b""
+		glyphDataOffsets = []
+		bitmapData = []
 
 		glyphOrder = ttFont.getGlyphOrder()
 
 		# first glyph starts right after the header
 		currentGlyphDataOffset = sbixStrikeHeaderFormatSize + sbixGlyphDataOffsetFormatSize * (len(glyphOrder) + 1)
+		lazyGlyphs = self.glyphs if isinstance(self.glyphs, LazyGlyphs) else None
 		for glyphName in glyphOrder:
+			rawdata = None
 			if glyphName in self.glyphs:
-				# we have glyph data for this glyph
-				current_glyph = self.glyphs[glyphName]
+				if lazyGlyphs is not None:
+					# pass through the data of glyphs that were not accessed
+					rawdata = lazyGlyphs.getRawData(glyphName)
+				if rawdata is None:
+					# we have glyph data for this glyph
+					current_glyph = self.glyphs[glyphName]
 			else:
 				# must add empty glyph data record for this glyph
 				current_glyph = Glyph(glyphName=glyphName)
-			current_glyph.compile(ttFont)
-			current_glyph.glyphDataOffset = currentGlyphDataOffset
-			self.bitmapData += current_glyph.rawdata
-			currentGlyphDataOffset += len(current_glyph.rawdata)
-			self.glyphDataOffsets += sstruct.pack(sbixGlyphDataOffsetFormat, current_glyph)
+			if rawdata is None:
+				current_glyph.compile(ttFont)
+				rawdata = current_glyph.rawdata
+			glyphDataOffsets.append(currentGlyphDataOffset)
+			bitmapData.append(rawdata)
+			currentGlyphDataOffset += len(rawdata)
 
 		# add last "offset", really the end address of the last glyph data record
-		dummy = Glyph()
-		dummy.glyphDataOffset = currentGlyphDataOffset
-		self.glyphDataOffsets += sstruct.pack(sbixGlyphDataOffsetFormat, dummy)
+		glyphDataOffsets.append(currentGlyphDataOffset)
+		self.glyphDataOffsets = struct.pack(">%dL" % len(glyphDataOffsets), *glyphDataOffsets)
+		self.bitmapData = bytesjoin(bitmapData)
 
 		# pack header
 		self.data = sstruct.pack(sbixStrikeHeaderFormat, self)
@@ -147,3 +150,48 @@ class Strike(object):
 		else:
 			from fontTools import ttLib
 			raise ttLib.TTLibError("can't handle '%s' element" % name)
+
+
+class LazyGlyphs(LazyDict):
+
+	"""
+	The glyphs of a decompiled strike: a dict of Glyph objects by glyph
+	name, which are only sliced from the strike data and decompiled when
+	they are accessed.
+	"""
+
+	def __init__(self, ttFont, data, glyphDataOffsets):
+		glyphOrder = ttFont.getGlyphOrder()
+		numGlyphs = len(glyphDataOffsets) - 1
+		if numGlyphs <= len(glyphOrder):
+			glyphNames = glyphOrder[:numGlyphs]
+		else:
+			glyphNames = [ttFont.getGlyphName(gid) for gid in range(numGlyphs)]
+		LazyDict.__init__(self, glyphNames)
+		self._gids = {glyphName: gid for gid, glyphName in enumerate(glyphNames)}
+		self._ttFont = ttFont
+		self._data = data
+		self._glyphDataOffsets = glyphDataOffsets
+
+	def _getData(self, glyphName):
+		gid = self._gids[glyphName]
+		return self._data[self._glyphDataOffsets[gid]:self._glyphDataOffsets[gid+1]]
+
+	def _loadValue(self, glyphName):
+		glyph = Glyph(rawdata=self._getData(glyphName), gid=self._gids[glyphName])
+		glyph.decompile(self._ttFont)
+		glyph.glyphName = glyphName
+		return glyph
+
+	def getRawData(self, glyphName):
+		"""
+		Return the original data of a glyph that was not accessed, or None
+		if it was accessed, or if it refers to another glyph by glyph ID,
+		which may have changed.
+		"""
+		if self.isLoaded(glyphName) or glyphName not in self._gids:
+			return None
+		rawdata = self._getData(glyphName)
+		if rawdata[4:8] == b"dupe":
+			return None
+		return rawdata
@@ -13,10 +13,13 @@ class TTCollection(object):
 	The main API is self.fonts being a list of TTFont instances.
 
 	If shareTables is True, then different fonts in the collection
-	might point to the same table object if the data for the table was
-	the same in the font file.  Note, however, that this might result
-	in suprises and incorrect behavior if the different fonts involved
-	have different GlyphOrder.  Use only if you know what you are doing.
+	might point to the same table object if the table is stored only
+	once in the font file, i.e. if it has the same offset and length in
+	the table directories of these fonts.  Such a table is read and
+	decompiled once, when it is first accessed in any of these fonts.
+	Note, however, that this might result in suprises and incorrect
+	behavior if the different fonts involved have different GlyphOrder.
+	Use only if you know what you are doing.
 	"""
 
 	def __init__(self, file=None, shareTables=False, **kwargs):
@@ -27,7 +30,23 @@ class TTCollection(object):
 		assert 'fontNumber' not in kwargs, kwargs
 
 		if not hasattr(file, "read"):
+			closeStream = True
 			file = open(file, "rb")
+		else:
+			closeStream = False
+
+		if not kwargs.get("lazy"):
+			# Unless lazy is True, each TTFont reads the whole file in
+			# memory; read it only once, as the in-memory streams of the
+			# fonts can then share the same data.
+			file.seek(0)
+			tmp = BytesIO(file.read())
+			if hasattr(file, 'name'):
+				# save reference to input file name
+				tmp.name = file.name
+			if closeStream:
+				file.close()
+			file = tmp
 
 		tableCache = {} if shareTables else None
 
@@ -60,6 +79,7 @@ class TTCollection(object):
 			final = file
 			file = BytesIO()
 
+		# maps the tags and digests of the written tables to their entries
 		tableCache = {} if shareTables else None
 
 		offsets_offset = writeTTCHeader(file, len(self.fonts))
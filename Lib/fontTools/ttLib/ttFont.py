@@ -1,14 +1,27 @@
 from fontTools.misc import xmlWriter
 from fontTools.misc.py23 import *
 from fontTools.misc.loggingTools import deprecateArgument
+from fontTools.misc import profiling
 from fontTools.ttLib import TTLibError
 from fontTools.ttLib.sfnt import SFNTReader, SFNTWriter
+import hashlib
 import os
+import pickle
 import logging
 import itertools
 
 log = logging.getLogger(__name__)
 
+# Tables read by the compile() method of a table, besides those listed in
+# its 'dependencies': these are not written before the table, but the table
+# must be compiled again when one of them was modified.
+_compileReads = {
+	# usFirstCharIndex and usLastCharIndex are taken from 'cmap'
+	"OS/2": ["cmap"],
+	# maxp.recalc() sets bit 1 of head.flags from the left side bearings
+	"maxp": ["hmtx"],
+}
+
 class TTFont(object):
 
 	"""The main font object. It manages file input and output, and offers
@@ -21,7 +34,7 @@ class TTFont(object):
 			sfntVersion="\000\001\000\000", flavor=None, checkChecksums=False,
 			verbose=None, recalcBBoxes=True, allowVID=False, ignoreDecompileErrors=False,
 			recalcTimestamp=True, fontNumber=-1, lazy=None, quiet=None,
-			_tableCache=None):
+			reuseUnmodifiedTables=False, _tableCache=None):
 
 		"""The constructor can be called with a few different arguments.
 		When reading a font from disk, 'file' should be either a pathname
@@ -78,6 +91,15 @@ class TTFont(object):
 		If lazy is set to True, many data structures are loaded lazily, upon
 		access only.  If it is set to False, many data structures are loaded
 		immediately.  The default is lazy=None which is somewhere in between.
+
+		If reuseUnmodifiedTables is set to True, a fingerprint of the tables
+		is taken when they are decompiled, and the tables which are found
+		unmodified upon save are written from their original data, instead
+		of being compiled again. Taking the fingerprint makes decompiling
+		the tables slower. A table also counts as modified if one of the
+		tables it depends on was, and all tables count as modified once the
+		glyph order is set; for other changes the fingerprint can't detect,
+		see markDirty().
 		"""
 
 		for name in ("verbose", "quiet"):
@@ -89,7 +111,9 @@ class TTFont(object):
 		self.lazy = lazy
 		self.recalcBBoxes = recalcBBoxes
 		self.recalcTimestamp = recalcTimestamp
+		self.reuseUnmodifiedTables = reuseUnmodifiedTables
 		self.tables = {}
+		self._tableFingerprints = {}
 		self.reader = None
 
 		# Permit the user to reference glyphs that are not int the font.
@@ -198,6 +222,7 @@ class TTFont(object):
 
 		if self.recalcTimestamp and 'head' in self:
 			self['head']  # make sure 'head' is loaded so the recalculation is actually done
+			self.markDirty('head')
 
 		tags = list(self.keys())
 		if "GlyphOrder" in tags:
@@ -207,8 +232,9 @@ class TTFont(object):
 		writer = SFNTWriter(file, numTables, self.sfntVersion, self.flavor, self.flavorData)
 
 		done = []
+		checked = {}
 		for tag in tags:
-			self._writeTable(tag, writer, done, tableCache)
+			self._writeTable(tag, writer, done, tableCache, checked)
 
 		writer.close()
 
@@ -307,10 +333,11 @@ class TTFont(object):
 			attrs['raw'] = True
 		writer.begintag(xmlTag, **attrs)
 		writer.newline()
-		if tag == "glyf":
-			table.toXML(writer, self, splitGlyphs=splitGlyphs)
-		else:
-			table.toXML(writer, self)
+		with profiling.measure("toXML", tag):
+			if tag == "glyf":
+				table.toXML(writer, self, splitGlyphs=splitGlyphs)
+			else:
+				table.toXML(writer, self)
 		writer.endtag(xmlTag)
 		writer.newline()
 		writer.newline()
@@ -339,6 +366,57 @@ class TTFont(object):
 		decompiled and loaded into memory."""
 		return tag in self.tables
 
+	def isDirty(self, tag):
+		"""Return true if the table identified by 'tag' is loaded, and
+		must be compiled when the font is saved: because it, or one of the
+		tables it depends on, was modified since it was decompiled, or was
+		not read from the font file. Loaded tables are always dirty unless
+		the font was opened with reuseUnmodifiedTables=True."""
+		return self._isDirty(Tag(tag), {})
+
+	def markDirty(self, tag):
+		"""Mark the table identified by 'tag' as modified, so that it is
+		compiled when the font is saved. This is only needed for changes
+		the fingerprint of the table can't detect: when reuseUnmodifiedTables
+		is True, and the compiled data of the table depends on another
+		table which neither is listed in its dependencies nor known to be
+		read by its compile() method."""
+		self._tableFingerprints.pop(Tag(tag), None)
+
+	def _isDirty(self, tag, checked):
+		# 'checked' maps the tags of the tables whose fingerprint was
+		# already compared to whether it was unchanged
+		if tag not in self.tables:
+			return False
+		unmodified = checked.get(tag)
+		if unmodified is None:
+			fingerprint = self._tableFingerprints.get(tag)
+			unmodified = (
+				fingerprint is not None and
+				fingerprint == self._fingerprintTable(self.tables[tag]))
+			if not unmodified:
+				# once modified, a table stays so
+				self.markDirty(tag)
+			checked[tag] = unmodified
+		if not unmodified:
+			return True
+		masterTables = itertools.chain(
+			self.tables[tag].dependencies, _compileReads.get(tag, ()))
+		return any(
+			self._isDirty(masterTable, checked)
+			for masterTable in masterTables)
+
+	def _fingerprintTable(self, table):
+		"""Return a digest of the pickled data of a table, or None if it
+		can't be pickled."""
+		digest = hashlib.sha256()
+		try:
+			_TablePickler(_DigestWriter(digest), self).dump(table)
+		except Exception as e:
+			log.debug("Can't take the fingerprint of '%s' table: %s", table.tableTag, e)
+			return None
+		return digest.digest()
+
 	def has_key(self, tag):
 		if self.isLoaded(tag):
 			return True
@@ -377,18 +455,24 @@ class TTFont(object):
 				return table
 			if self.reader is not None:
 				import traceback
-				log.debug("Reading '%s' table from disk", tag)
-				data = self.reader[tag]
 				if self._tableCache is not None:
-					table = self._tableCache.get((Tag(tag), data))
+					# the fonts of a collection share the tables stored
+					# only once in the file, which have the same offset
+					# and length in the table directories of these fonts
+					entry = self.reader.tables[tag]
+					cacheKey = (tag, entry.offset, entry.length)
+					table = self._tableCache.get(cacheKey)
 					if table is not None:
 						return table
+				log.debug("Reading '%s' table from disk", tag)
+				data = self.reader[tag]
 				tableClass = getTableClass(tag)
 				table = tableClass(tag)
 				self.tables[tag] = table
 				log.debug("Decompiling '%s' table", tag)
 				try:
-					table.decompile(data, self)
+					with profiling.measure("decompile", tag):
+						table.decompile(data, self)
 				except:
 					if not self.ignoreDecompileErrors:
 						raise
@@ -402,20 +486,26 @@ class TTFont(object):
 					table.ERROR = file.getvalue()
 					self.tables[tag] = table
 					table.decompile(data, self)
+				if self.reuseUnmodifiedTables:
+					fingerprint = self._fingerprintTable(table)
+					if fingerprint is not None:
+						self._tableFingerprints[tag] = fingerprint
 				if self._tableCache is not None:
-					self._tableCache[(Tag(tag), data)] = table
+					self._tableCache[cacheKey] = table
 				return table
 			else:
 				raise KeyError("'%s' table not found" % tag)
 
 	def __setitem__(self, tag, table):
 		self.tables[Tag(tag)] = table
+		self.markDirty(tag)
 
 	def __delitem__(self, tag):
 		if tag not in self:
 			raise KeyError("'%s' table not found" % tag)
 		if tag in self.tables:
 			del self.tables[tag]
+		self.markDirty(tag)
 		if self.reader and tag in self.reader:
 			del self.reader[tag]
 
@@ -427,6 +517,8 @@ class TTFont(object):
 
 	def setGlyphOrder(self, glyphOrder):
 		self.glyphOrder = glyphOrder
+		# the compiled data of most tables depends on the glyph order
+		self._tableFingerprints.clear()
 
 	def getGlyphOrder(self):
 		try:
@@ -434,11 +526,10 @@ class TTFont(object):
 		except AttributeError:
 			pass
 		if 'CFF ' in self:
-			cff = self['CFF ']
-			self.glyphOrder = cff.getGlyphOrder()
+			self.glyphOrder = self._getTableGlyphOrder('CFF ')
 		elif 'post' in self:
 			# TrueType font
-			glyphOrder = self['post'].getGlyphOrder()
+			glyphOrder = self._getTableGlyphOrder('post')
 			if glyphOrder is None:
 				#
 				# No names found in the 'post' table.
@@ -609,13 +700,26 @@ class TTFont(object):
 			self._buildReverseGlyphOrderDict()
 		return self._reverseGlyphOrderDict
 
+	def _getTableGlyphOrder(self, tag):
+		table = self[tag]
+		# 'post' gives its glyph order away, and 'CFF ' loads its charset:
+		# the fingerprint of these tables is updated if they were unmodified
+		fingerprint = self._tableFingerprints.get(tag)
+		unmodified = (
+			fingerprint is not None and
+			fingerprint == self._fingerprintTable(table))
+		glyphOrder = table.getGlyphOrder()
+		if unmodified:
+			self._tableFingerprints[tag] = self._fingerprintTable(table)
+		return glyphOrder
+
 	def _buildReverseGlyphOrderDict(self):
 		self._reverseGlyphOrderDict = d = {}
 		glyphOrder = self.getGlyphOrder()
 		for glyphID in range(len(glyphOrder)):
 			d[glyphOrder[glyphID]] = glyphID
 
-	def _writeTable(self, tag, writer, done, tableCache=None):
+	def _writeTable(self, tag, writer, done, tableCache=None, checked=None):
 		"""Internal helper function for self.save(). Keeps track of
 		inter-table dependencies.
 		"""
@@ -625,13 +729,16 @@ class TTFont(object):
 		for masterTable in tableClass.dependencies:
 			if masterTable not in done:
 				if masterTable in self:
-					self._writeTable(masterTable, writer, done, tableCache)
+					self._writeTable(masterTable, writer, done, tableCache, checked)
 				else:
 					done.append(masterTable)
 		done.append(tag)
-		tabledata = self.getTableData(tag)
+		tabledata = self._getTableData(Tag(tag), {} if checked is None else checked)
 		if tableCache is not None:
-			entry = tableCache.get((Tag(tag), tabledata))
+			# key the written tables by a digest of their data, so that
+			# the data of all the tables need not be kept around
+			cacheKey = (Tag(tag), hashlib.sha256(tabledata).digest())
+			entry = tableCache.get(cacheKey)
 			if entry is not None:
 				log.debug("reusing '%s' table", tag)
 				writer.setEntry(tag, entry)
@@ -639,15 +746,18 @@ class TTFont(object):
 		log.debug("writing '%s' table to disk", tag)
 		writer[tag] = tabledata
 		if tableCache is not None:
-			tableCache[(Tag(tag), tabledata)] = writer[tag]
+			tableCache[cacheKey] = writer[tag]
 
 	def getTableData(self, tag):
 		"""Returns raw table data, whether compiled or directly read from disk.
 		"""
-		tag = Tag(tag)
-		if self.isLoaded(tag):
+		return self._getTableData(Tag(tag), {})
+
+	def _getTableData(self, tag, checked):
+		if self._isDirty(tag, checked):
 			log.debug("compiling '%s' table", tag)
-			return self.tables[tag].compile(self)
+			with profiling.measure("compile", tag):
+				return self.tables[tag].compile(self)
 		elif self.reader and tag in self.reader:
 			log.debug("Reading '%s' table from disk", tag)
 			return self.reader[tag]
@@ -782,6 +892,29 @@ class _TTGlyphGlyf(_TTGlyph):
 		glyph.drawPoints(pen, glyfTable, offset)
 
 
+class _DigestWriter(object):
+
+	"""File-like object which feeds what is written to a hashlib object."""
+
+	def __init__(self, digest):
+		self.write = digest.update
+
+
+class _TablePickler(pickle.Pickler):
+
+	"""Pickler for the fingerprints of tables, which leaves out the font
+	that lazily loaded (sub)tables refer to."""
+
+	def __init__(self, file, ttFont):
+		pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+		self.ttFont = ttFont
+
+	def persistent_id(self, obj):
+		if obj is self.ttFont:
+			return "ttFont"
+		return None
+
+
 class GlyphOrder(object):
 
 	"""A pseudo table. The glyph order isn't in the font as a separate
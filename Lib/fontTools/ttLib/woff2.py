@@ -538,6 +538,8 @@ bboxFormat = """
 		yMax:				h
 """
 
+bboxStruct = sstruct.compile(bboxFormat)
+
 
 def getKnownTagIndex(tag):
 	"""Return index of 'tag' in woff2KnownTags list. Return 63 if not found."""
@@ -794,7 +796,7 @@ class WOFF2GlyfTable(getTableClass('glyf')):
 		if glyph.isComposite() and not haveBBox:
 			raise TTLibError('no bbox values for composite glyph %d' % glyphID)
 		if haveBBox:
-			dummy, self.bboxStream = sstruct.unpack2(bboxFormat, self.bboxStream, glyph)
+			dummy, self.bboxStream = bboxStruct.unpack2(self.bboxStream, glyph)
 		else:
 			glyph.recalcBounds(self)
 
@@ -917,7 +919,7 @@ class WOFF2GlyfTable(getTableClass('glyf')):
 			if currentBBox == calculatedBBox:
 				return
 		self.bboxBitmap[glyphID >> 3] |= 0x80 >> (glyphID & 7)
-		self.bboxStream += sstruct.pack(bboxFormat, glyph)
+		self.bboxStream += bboxStruct.pack(glyph)
 
 	def _encodeTriplets(self, glyph):
 		assert len(glyph.coordinates) == len(glyph.flags)
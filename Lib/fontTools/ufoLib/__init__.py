@@ -21,6 +21,7 @@ from fontTools.ufoLib.filenames import userNameToFileName
 from fontTools.ufoLib.converters import convertUFO1OrUFO2KerningToUFO3Kerning
 from fontTools.ufoLib.errors import UFOLibError
 from fontTools.ufoLib.utils import numberTypes
+from fontTools.ufoLib.zipfs import ZipReaderFS
 
 """
 A library for importing .ufo files and their descendants.
@@ -208,7 +209,7 @@ class UFOReader(_UFOBaseIO):
 			structure = _sniffFileStructure(path)
 			try:
 				if structure is UFOFileStructure.ZIP:
-					parentFS = fs.zipfs.ZipFS(path, write=False, encoding="utf-8")
+					parentFS = ZipReaderFS(path)
 				else:
 					parentFS = fs.osfs.OSFS(path)
 			except fs.errors.CreateFailed as e:
@@ -627,7 +628,7 @@ class UFOReader(_UFOBaseIO):
 		# this will already have been raised during __init__
 		raise UFOLibError("The default layer is not defined in layercontents.plist.")
 
-	def getGlyphSet(self, layerName=None, validateRead=None, validateWrite=None):
+	def getGlyphSet(self, layerName=None, validateRead=None, validateWrite=None, useIndex=False):
 		"""
 		Return the GlyphSet associated with the
 		glyphs directory mapped to layerName
@@ -639,6 +640,7 @@ class UFOReader(_UFOBaseIO):
 		class's validate value, can be overridden.
 		``validateWrte`` will validate the written data, by default it is set to the
 		class's validate value, can be overridden.
+		``useIndex`` is passed on to the GlyphSet, see its documentation.
 		"""
 		from fontTools.ufoLib.glifLib import GlyphSet
 
@@ -667,16 +669,22 @@ class UFOReader(_UFOBaseIO):
 			ufoFormatVersion=self._formatVersion,
 			validateRead=validateRead,
 			validateWrite=validateWrite,
+			useIndex=useIndex,
 		)
 
-	def getCharacterMapping(self, layerName=None, validate=None):
+	def getCharacterMapping(self, layerName=None, validate=None, useIndex=False):
 		"""
 		Return a dictionary that maps unicode values (ints) to
 		lists of glyph names.
+
+		If ``useIndex`` is ``True``, the unicodes are cached in an index
+		stored in the glyphs directory, see GlyphSet.
 		"""
 		if validate is None:
 			validate = self._validate
-		glyphSet = self.getGlyphSet(layerName, validateRead=validate, validateWrite=True)
+		glyphSet = self.getGlyphSet(
+			layerName, validateRead=validate, validateWrite=True, useIndex=useIndex
+		)
 		allUnicodes = glyphSet.getUnicodes()
 		cmap = {}
 		for glyphName, unicodes in allUnicodes.items():
@@ -864,7 +872,7 @@ class UFOWriter(UFOReader):
 					# contents to a temporary location and work from there, then
 					# upon closing UFOWriter we create the final zip file
 					parentFS = fs.tempfs.TempFS()
-					with fs.zipfs.ZipFS(path, encoding="utf-8") as origFS:
+					with ZipReaderFS(path) as origFS:
 						fs.copy.copy_fs(origFS, parentFS)
 					# if output path is an existing zip, we require that it contains
 					# one, and only one, root directory (with arbitrary name), in turn
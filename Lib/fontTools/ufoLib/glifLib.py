@@ -10,17 +10,24 @@ in a folder. It offers two ways to read glyph data, and one way to write
 glyph data. See the class doc string for details.
 """
 
+import logging
+import os
 from warnings import warn
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import fs
 import fs.base
 import fs.errors
+import fs.memoryfs
 import fs.osfs
 import fs.path
+import fs.wrapfs
 from fontTools.misc.py23 import tobytes
+from fontTools.misc.bulkTools import mapInProcesses, pausedGarbageCollection
 from fontTools.misc import plistlib
 from fontTools.pens.pointPen import AbstractPointPen, PointToSegmentPen
-from fontTools.ufoLib.errors import GlifLibError
+from fontTools.pens.recordingPen import RecordingPointPen
+from fontTools.ufoLib.errors import GlifLibError, UFOLibError
 from fontTools.ufoLib.filenames import userNameToFileName
 from fontTools.ufoLib.validators import (
 	genericTypeValidator,
@@ -44,11 +51,16 @@ __all__ = [
 ]
 
 
+logger = logging.getLogger(__name__)
+
+
 # ---------
 # Constants
 # ---------
 
 CONTENTS_FILENAME = "contents.plist"
+GLYPHINDEX_FILENAME = ".glyphindex.plist"
+glyphIndexFormatVersion = 1
 LAYERINFO_FILENAME = "layerinfo.plist"
 supportedUFOFormatVersions = [1, 2, 3]
 supportedGLIFFormatVersions = [1, 2]
@@ -111,6 +123,7 @@ class GlyphSet(_UFOBaseIO):
 		ufoFormatVersion=3,
 		validateRead=True,
 		validateWrite=True,
+		useIndex=False,
 	):
 		"""
 		'path' should be a path (string) to an existing local directory, or
@@ -124,6 +137,13 @@ class GlyphSet(_UFOBaseIO):
 
 		``validateRead`` will validate read operations. Its default is ``True``.
 		``validateWrite`` will validate write operations. Its default is ``True``.
+
+		If ``useIndex`` is ``True``, the unicodes and component references
+		of the glyphs are cached in a '.glyphindex.plist' file next to
+		'contents.plist', together with the modification time and size of
+		their .glif files. getUnicodes() and getComponentReferences() then
+		only parse the .glif files that changed since the index was written.
+		Its default is ``False``.
 		"""
 		if ufoFormatVersion not in supportedUFOFormatVersions:
 			raise GlifLibError("Unsupported UFO format version: %s" % ufoFormatVersion)
@@ -165,6 +185,8 @@ class GlyphSet(_UFOBaseIO):
 		self._validateWrite = validateWrite
 		self._existingFileNames = None
 		self._reverseContents = None
+		self._useIndex = useIndex
+		self._glyphIndex = None
 
 		self.rebuildContents()
 
@@ -352,6 +374,107 @@ class GlyphSet(_UFOBaseIO):
 			formatVersions = (1, 2)
 		_readGlyphFromTree(tree, glyphObject, pointPen, formatVersions=formatVersions, validate=validate)
 
+	def readGlyphs(self, glyphNames=None, glyphObjects=None, pointPens=None, validate=None, maxWorkers=None, useProcesses=False):
+		"""
+		Read the .glif files of many glyphs at once. This is equivalent to
+		calling readGlyph() for each name in 'glyphNames' (by default, all
+		glyphs in the glyph set), in order:
+
+			for glyphName in glyphNames:
+				glyphSet.readGlyph(
+					glyphName,
+					glyphObjects.get(glyphName),
+					pointPens.get(glyphName),
+				)
+
+		'glyphObjects' and 'pointPens' are optional dictionaries mapping
+		glyph names to glyph objects and PointPens, as accepted by
+		readGlyph(); glyphs missing from them are read without an object
+		or a pen, respectively.
+
+		The files are read by a pool of 'maxWorkers' threads, which pays
+		off on slow or remote file systems. By default, files on a local
+		disk are read one after the other, and other files by as many
+		threads as ThreadPoolExecutor would use. They are parsed in this
+		thread, as parsing holds the global interpreter lock.
+
+		If ``useProcesses`` is ``True``, the .glif data is instead parsed
+		in a pool of 'maxWorkers' processes (by default, one per CPU), and
+		the resulting attributes and pen calls are replayed here. This
+		pays off for large glyph sets on machines with several CPUs. If
+		the process pool can't be used, the data is parsed in this thread.
+
+		readGlyphs() will raise KeyError if a glyph is not present in
+		the glyph set, before reading any glyph.
+
+		``validate`` will validate the data, by default it is set to the
+		class's ``validateRead`` value, can be overridden.
+		"""
+		if validate is None:
+			validate = self._validateRead
+		if glyphNames is None:
+			glyphNames = list(self.contents.keys())
+		else:
+			glyphNames = list(glyphNames)
+			for glyphName in glyphNames:
+				if glyphName not in self.contents:
+					raise KeyError(glyphName)
+		if glyphObjects is None:
+			glyphObjects = {}
+		if pointPens is None:
+			pointPens = {}
+		if self.ufoFormatVersion < 3:
+			formatVersions = (1,)
+		else:
+			formatVersions = (1, 2)
+
+		glifs = self._readGLIFs(glyphNames, maxWorkers)
+		results = None
+		if useProcesses:
+			results = _readGlyphsInProcesses(
+				glyphNames, glifs, glyphObjects, pointPens,
+				formatVersions, validate, maxWorkers)
+		# the glyphs consist of many small objects
+		with pausedGarbageCollection():
+			if results is not None:
+				for glyphName, (attributes, recording) in zip(glyphNames, results):
+					glyphObject = glyphObjects.get(glyphName)
+					for attr, value in attributes:
+						_relaxedSetattr(glyphObject, attr, value)
+					pointPen = pointPens.get(glyphName)
+					if pointPen is not None:
+						recording.replay(pointPen)
+				return
+			for glyphName, glif in zip(glyphNames, glifs):
+				_readGlyphFromTree(
+					_glifTreeFromString(glif),
+					glyphObjects.get(glyphName),
+					pointPens.get(glyphName),
+					formatVersions=formatVersions,
+					validate=validate,
+				)
+
+	def _readGLIFs(self, glyphNames, maxWorkers=None):
+		"""
+		Return a list with the raw GLIF data of the given glyphs, read
+		in one go if the file system supports it. Otherwise, the files are
+		read in a pool of threads if 'maxWorkers' is more than one, or if
+		the file system isn't local, and one after the other if not.
+		"""
+		filesystem, path = self.fs, "/"
+		while isinstance(filesystem, fs.wrapfs.WrapFS):
+			filesystem, path = filesystem.delegate_path(path)
+		readMany = getattr(filesystem, "readmany", None)
+		if readMany is not None:
+			paths = [fs.path.join(path, self.contents[glyphName]) for glyphName in glyphNames]
+			try:
+				return readMany(paths)
+			except fs.errors.ResourceNotFound:
+				pass  # let getGLIF raise the error
+		if maxWorkers is None and isinstance(filesystem, _LOCAL_FILESYSTEMS):
+			maxWorkers = 1
+		return _mapInThreads(self.getGLIF, glyphNames, maxWorkers)
+
 	def writeGlyph(self, glyphName, glyphObject=None, drawPointsFunc=None, formatVersion=None, validate=None):
 		"""
 		Write a .glif file for 'glyphName' to the glyph set. The
@@ -422,6 +545,8 @@ class GlyphSet(_UFOBaseIO):
 		):
 			return
 		self.fs.writebytes(fileName, data)
+		if self._glyphIndex is not None:
+			self._glyphIndex.pop(glyphName, None)
 
 	def deleteGlyph(self, glyphName):
 		"""Permanently delete the glyph from the glyph set on disk. Will
@@ -433,6 +558,8 @@ class GlyphSet(_UFOBaseIO):
 			del self._existingFileNames[fileName]
 		if self._reverseContents is not None:
 			del self._reverseContents[self.contents[glyphName].lower()]
+		if self._glyphIndex is not None:
+			self._glyphIndex.pop(glyphName, None)
 		del self.contents[glyphName]
 
 	# dict-like support
@@ -461,12 +588,20 @@ class GlyphSet(_UFOBaseIO):
 		the unicode value[s] for that glyph, if any. This parses the .glif
 		files partially, so it is a lot faster than parsing all files completely.
 		By default this checks all glyphs, but a subset can be passed with glyphNames.
+		If the glyph set uses an index, only the .glif files that changed
+		since it was written are parsed.
 		"""
-		unicodes = {}
 		if glyphNames is None:
 			glyphNames = self.contents.keys()
-		for glyphName in glyphNames:
-			text = self.getGLIF(glyphName)
+		if self._useIndex:
+			index = self._updateGlyphIndex(glyphNames)
+			return {
+				glyphName: list(index[glyphName]["unicodes"])
+				for glyphName in glyphNames
+			}
+		unicodes = {}
+		glyphNames = list(glyphNames)
+		for glyphName, text in zip(glyphNames, self._readGLIFs(glyphNames)):
 			unicodes[glyphName] = _fetchUnicodes(text)
 		return unicodes
 
@@ -476,12 +611,20 @@ class GlyphSet(_UFOBaseIO):
 		base glyph name of components in the glyph. This parses the .glif
 		files partially, so it is a lot faster than parsing all files completely.
 		By default this checks all glyphs, but a subset can be passed with glyphNames.
+		If the glyph set uses an index, only the .glif files that changed
+		since it was written are parsed.
 		"""
-		components = {}
 		if glyphNames is None:
 			glyphNames = self.contents.keys()
-		for glyphName in glyphNames:
-			text = self.getGLIF(glyphName)
+		if self._useIndex:
+			index = self._updateGlyphIndex(glyphNames)
+			return {
+				glyphName: list(index[glyphName]["components"])
+				for glyphName in glyphNames
+			}
+		components = {}
+		glyphNames = list(glyphNames)
+		for glyphName, text in zip(glyphNames, self._readGLIFs(glyphNames)):
 			components[glyphName] = _fetchComponentBases(text)
 		return components
 
@@ -495,11 +638,101 @@ class GlyphSet(_UFOBaseIO):
 		images = {}
 		if glyphNames is None:
 			glyphNames = self.contents.keys()
-		for glyphName in glyphNames:
-			text = self.getGLIF(glyphName)
+		glyphNames = list(glyphNames)
+		for glyphName, text in zip(glyphNames, self._readGLIFs(glyphNames)):
 			images[glyphName] = _fetchImageFileName(text)
 		return images
 
+	# glyph index
+
+	def _readGlyphIndex(self):
+		"""
+		Return the glyph index stored in the glyph set, or an empty
+		dict if there is none or it can't be used.
+		"""
+		try:
+			data = self._getPlist(GLYPHINDEX_FILENAME, {})
+		except UFOLibError as e:
+			logger.warning("Ignoring glyph index: %s", e)
+			return {}
+		if (
+			not isinstance(data, dict)
+			or data.get("formatVersion") != glyphIndexFormatVersion
+			or not isinstance(data.get("glyphs"), dict)
+		):
+			return {}
+		return data["glyphs"]
+
+	def _updateGlyphIndex(self, glyphNames):
+		"""
+		Bring the index entries of the given glyphs up to date, and return
+		the index: a {glyphName: entry} dict, where each entry is a dict with
+		the file name, modification time and size of the glyph's .glif file,
+		and its unicodes and component references.
+
+		The modification times and sizes of all .glif files are gathered
+		with a single directory scan; the files which don't match their
+		entries are read in a pool of threads, and parsed partially.
+		The index is written back to the glyph set if it changed.
+		"""
+		if self._glyphIndex is None:
+			self._glyphIndex = self._readGlyphIndex()
+		index = self._glyphIndex
+		stats = {}
+		try:
+			for info in self.fs.scandir("/", namespaces=["details"]):
+				if info.is_file and info.modified is not None:
+					stats[info.name] = (info.modified.timestamp(), info.size)
+		except fs.errors.FSError:
+			pass
+
+		outdated = []
+		for glyphName in glyphNames:
+			fileName = self.contents[glyphName]
+			entry = index.get(glyphName)
+			stat = stats.get(fileName)
+			if (
+				stat is None
+				or entry is None
+				or entry.get("fileName") != fileName
+				or (entry.get("modified"), entry.get("size")) != stat
+			):
+				outdated.append(glyphName)
+		changed = False
+		if outdated:
+			glifs = self._readGLIFs(outdated)
+			for glyphName, glif in zip(outdated, glifs):
+				fileName = self.contents[glyphName]
+				entry = dict(fileName=fileName)
+				unicodes, entry["components"] = _fetchUnicodesAndComponentBases(glif)
+				entry["unicodes"] = unicodes
+				stat = stats.get(fileName)
+				if stat is not None:
+					entry["modified"], entry["size"] = stat
+				index[glyphName] = entry
+			changed = True
+		for glyphName in list(index):
+			if glyphName not in self.contents:
+				del index[glyphName]
+				changed = True
+		if changed:
+			self._writeGlyphIndex()
+		return index
+
+	def _writeGlyphIndex(self):
+		# entries whose file couldn't be stat'ed are never valid on disk
+		glyphs = {
+			glyphName: entry
+			for glyphName, entry in self._glyphIndex.items()
+			if "modified" in entry
+		}
+		data = dict(formatVersion=glyphIndexFormatVersion, glyphs=glyphs)
+		try:
+			self._writePlist(GLYPHINDEX_FILENAME, data)
+		except (fs.errors.FSError, UFOLibError) as e:
+			# e.g. read-only file systems, like zipped UFOs
+			logger.debug("Could not write glyph index: %s", e)
+
 	def close(self):
 		if self._shouldClose:
 			self.fs.close()
@@ -511,6 +744,77 @@ class GlyphSet(_UFOBaseIO):
 		self.close()
 
 
+# ---------------------
+# Bulk Reading Support
+# ---------------------
+
+# file systems on which reading files in threads doesn't pay off
+_LOCAL_FILESYSTEMS = (fs.osfs.OSFS, fs.memoryfs.MemoryFS)
+
+
+def _mapInThreads(func, items, maxWorkers=None):
+	"""
+	Return [func(item) for item in items], computed in a pool of threads.
+	The items are handed to the threads in chunks, to keep the overhead
+	low when func is quick, like reading a small file from a local disk.
+	"""
+	workers = maxWorkers
+	if workers is None:
+		workers = min(32, (os.cpu_count() or 1) + 4)
+	if len(items) < 2 or workers <= 1:
+		return [func(item) for item in items]
+	chunkSize = -(-len(items) // (workers * 4))
+	chunks = [items[i:i+chunkSize] for i in range(0, len(items), chunkSize)]
+	with ThreadPoolExecutor(workers) as executor:
+		results = executor.map(lambda chunk: [func(item) for item in chunk], chunks)
+		return [result for chunkResults in results for result in chunkResults]
+
+
+class _GlyphAttributeRecorder:
+
+	"""
+	Stand-in for a glyph object in a worker process, recording the
+	attributes set on it in order.
+	"""
+
+	def __init__(self):
+		object.__setattr__(self, "attributes", [])
+
+	def __setattr__(self, attr, value):
+		self.attributes.append((attr, value))
+
+
+def _readGlyphsInProcesses(glyphNames, glifs, glyphObjects, pointPens, formatVersions, validate, maxWorkers=None):
+	"""
+	Parse the GLIF data of the given glyphs in a pool of worker processes.
+	Return a list of (attributes, RecordingPointPen) tuples, or None if
+	the process pool can't be used.
+	"""
+	items = [
+		(glif, glyphObjects.get(glyphName) is not None, pointPens.get(glyphName) is not None)
+		for glyphName, glif in zip(glyphNames, glifs)
+	]
+	return mapInProcesses(_readGlyphsChunk, items, maxWorkers, (formatVersions, validate))
+
+
+def _readGlyphsChunk(items, formatVersions, validate):
+	# runs in a worker process
+	results = []
+	for glif, hasGlyphObject, hasPointPen in items:
+		glyphObject = _GlyphAttributeRecorder() if hasGlyphObject else None
+		pointPen = RecordingPointPen()
+		_readGlyphFromTree(
+			_glifTreeFromString(glif),
+			glyphObject,
+			pointPen if hasPointPen else None,
+			formatVersions=formatVersions,
+			validate=validate,
+		)
+		attributes = glyphObject.attributes if hasGlyphObject else []
+		results.append((attributes, pointPen))
+	return results
+
+
 # -----------------------
 # Glyph Name to File Name
 # -----------------------
@@ -1484,6 +1788,30 @@ class _FetchComponentBasesParser(_BaseParser):
 			raise _DoneParsing
 		super().endElementHandler(name)
 
+# unicodes and component references
+
+def _fetchUnicodesAndComponentBases(glif):
+	"""
+	Get the lists of unicodes and component base glyphs listed in glif,
+	parsing it once.
+	"""
+	parser = _FetchUnicodesAndComponentBasesParser()
+	parser.parse(glif)
+	return parser.unicodes, parser.bases
+
+class _FetchUnicodesAndComponentBasesParser(_FetchUnicodesParser):
+
+	def __init__(self):
+		self.bases = []
+		super().__init__()
+
+	def startElementHandler(self, name, attrs):
+		if name == "component" and self._elementStack and self._elementStack[-1] == "outline":
+			base = attrs.get("base")
+			if base is not None:
+				self.bases.append(base)
+		super().startElementHandler(name, attrs)
+
 # --------------
 # GLIF Point Pen
 # --------------
@@ -0,0 +1,391 @@
+"""
+glyphCache.py -- Persistent cache of glyphs compiled from UFO glyph sets.
+
+Converting the glyphs of a UFO to TrueType or CFF outlines is a large part
+of building a font, even when only a few .glif files changed since the last
+build. A GlyphCache stores the compiled outlines of each glyph in an SQLite
+database on disk, together with its advance width, unicodes and bounds, so
+that later builds only compile the glyphs that changed:
+
+	with GlyphCache("build/glyphs.sqlite") as cache:
+		glyphs = cache.getTTGlyphs(reader.getGlyphSet())
+
+Entries are keyed by a hash of the .glif data of a glyph, and of the glyphs
+it references as components (which are drawn, decomposed, to compute the
+bounds of composite glyphs and the charstrings of CFF glyphs), and by the
+compile options. So entries never go stale; the ones that were not used
+since the cache was opened can be removed with prune().
+
+The entries only hold data: the compiled glyph data, and JSON for the other
+fields. Entries which don't have the expected form are ignored, and the
+glyphs compiled again.
+"""
+
+import hashlib
+import json
+import numbers
+import sqlite3
+from collections import namedtuple
+from fontTools.pens.boundsPen import BoundsPen, ControlBoundsPen
+from fontTools.pens.pointPen import PointToSegmentPen
+from fontTools.pens.recordingPen import RecordingPointPen
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.misc.arrayTools import calcIntBounds
+from fontTools.misc.psCharStrings import T2CharString
+from fontTools.ttLib.tables._g_l_y_f import Glyph as TTGlyph, GlyphComponent
+from fontTools.ufoLib.glifLib import _fetchComponentBases
+
+
+__all__ = ["GlyphCache", "CompiledGlyph"]
+
+
+CompiledGlyph = namedtuple("CompiledGlyph", ["glyph", "width", "unicodes", "bounds"])
+CompiledGlyph.__doc__ = """
+A compiled glyph. 'glyph' is a glyf table Glyph or a T2CharString,
+'width' the advance width, 'unicodes' the list of unicode values, and
+'bounds' a (xMin, yMin, xMax, yMax) tuple, or None for empty glyphs.
+"""
+
+
+class _GlyphAttributes:
+
+	"""
+	Glyph object which only collects the attributes GlyphSet.readGlyph()
+	sets on it.
+	"""
+
+	def __init__(self):
+		self.width = 0
+		self.unicodes = []
+
+
+class GlyphCache:
+
+	"""
+	GlyphCache keeps compiled glyphs in an SQLite database.
+
+	Its constructor takes the path of the database file, which is created
+	if it doesn't exist; ":memory:" makes a cache that is not persisted.
+	"""
+
+	formatVersion = 2
+
+	def __init__(self, path):
+		self.path = path
+		self._db = sqlite3.connect(path)
+		self._usedKeys = set()
+		version = self._db.execute("PRAGMA user_version").fetchone()[0]
+		with self._db:
+			if version != self.formatVersion:
+				self._db.execute("DROP TABLE IF EXISTS glyphs")
+				self._db.execute("PRAGMA user_version = %d" % self.formatVersion)
+			self._db.execute(
+				"CREATE TABLE IF NOT EXISTS glyphs "
+				"(key TEXT PRIMARY KEY, data BLOB NOT NULL, info TEXT NOT NULL)"
+			)
+
+	def getTTGlyphs(self, glyphSet, glyphNames=None, componentFlags=0x4, maxWorkers=None):
+		"""
+		Return a dictionary that maps glyph names to CompiledGlyph tuples
+		holding glyf table Glyph objects, as drawn by TTGlyphPen. The
+		bounds are the ones the glyf table stores: the integer bounds of
+		the control points. The outlines of the glyphs must be quadratic.
+
+		'glyphSet' is a glifLib.GlyphSet; by default all its glyphs are
+		returned, but a subset can be passed with glyphNames. The glyphs
+		which are not in the cache are read with GlyphSet.readGlyphs(),
+		which is passed 'maxWorkers'.
+		"""
+		results = self._getGlyphs(
+			glyphSet, glyphNames, ("glyf", componentFlags), _compileTTGlyph, maxWorkers
+		)
+		compiled = {}
+		for glyphName, (data, width, unicodes, bounds, components) in results.items():
+			if components is None:
+				glyph = TTGlyph(data)
+			else:
+				glyph = _makeCompositeGlyph(components)
+			compiled[glyphName] = CompiledGlyph(glyph, width, unicodes, bounds)
+		return compiled
+
+	def getCharStrings(self, glyphSet, glyphNames=None, private=None, globalSubrs=None, roundTolerance=0.5, CFF2=False, optimize=True, maxWorkers=None):
+		"""
+		Return a dictionary that maps glyph names to CompiledGlyph tuples
+		holding T2CharString objects, as drawn by T2CharStringPen with the
+		advance width of the glyphs (unless 'CFF2' is true), and with the
+		given 'private' and 'globalSubrs'. The bounds are the ones of the
+		outlines.
+
+		See getTTGlyphs() for the other arguments.
+		"""
+		results = self._getGlyphs(
+			glyphSet,
+			glyphNames,
+			("CharString", roundTolerance, bool(CFF2), bool(optimize)),
+			_compileCharString,
+			maxWorkers,
+		)
+		compiled = {}
+		for glyphName, (data, width, unicodes, bounds, _) in results.items():
+			charString = T2CharString(
+				bytecode=data, private=private, globalSubrs=globalSubrs
+			)
+			compiled[glyphName] = CompiledGlyph(charString, width, unicodes, bounds)
+		return compiled
+
+	def prune(self):
+		"""
+		Remove the entries that were not used since the cache was opened.
+		"""
+		with self._db:
+			self._db.execute("CREATE TEMP TABLE usedKeys (key TEXT PRIMARY KEY)")
+			try:
+				self._db.executemany(
+					"INSERT INTO usedKeys VALUES (?)",
+					((key,) for key in self._usedKeys)
+				)
+				self._db.execute(
+					"DELETE FROM glyphs WHERE key NOT IN (SELECT key FROM usedKeys)"
+				)
+			finally:
+				self._db.execute("DROP TABLE usedKeys")
+
+	def clear(self):
+		"""
+		Remove all entries.
+		"""
+		with self._db:
+			self._db.execute("DELETE FROM glyphs")
+		self._usedKeys.clear()
+
+	def close(self):
+		self._db.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_tb):
+		self.close()
+
+	def __len__(self):
+		return self._db.execute("SELECT COUNT(*) FROM glyphs").fetchone()[0]
+
+	# internals
+
+	def _getGlyphs(self, glyphSet, glyphNames, options, compileFunc, maxWorkers):
+		if glyphNames is None:
+			glyphNames = glyphSet.keys()
+		glyphNames = list(dict.fromkeys(glyphNames))
+		keys = _makeKeys(glyphSet, glyphNames, options, maxWorkers)
+
+		entries = {}
+		uniqueKeys = list(set(keys.values()))
+		# stay below SQLite's limit on the number of query parameters
+		for i in range(0, len(uniqueKeys), 500):
+			batch = uniqueKeys[i:i+500]
+			query = "SELECT key, data, info FROM glyphs WHERE key IN (%s)" % ",".join("?" * len(batch))
+			for key, data, info in self._db.execute(query, batch):
+				entry = _decodeEntry(data, info)
+				if entry is not None:
+					entries[key] = entry
+
+		missing = [glyphName for glyphName in glyphNames if keys[glyphName] not in entries]
+		if missing:
+			glyphObjects = {glyphName: _GlyphAttributes() for glyphName in missing}
+			pointPens = {glyphName: RecordingPointPen() for glyphName in missing}
+			glyphSet.readGlyphs(missing, glyphObjects, pointPens, maxWorkers=maxWorkers)
+			rows = []
+			for glyphName in missing:
+				key = keys[glyphName]
+				if key in entries:
+					continue
+				entry = compileFunc(glyphSet, glyphObjects[glyphName], pointPens[glyphName], options)
+				data, info = _encodeEntry(entry)
+				entries[key] = _decodeEntry(data, info)
+				rows.append((key, data, info))
+			with self._db:
+				self._db.executemany(
+					"INSERT OR REPLACE INTO glyphs (key, data, info) VALUES (?, ?, ?)", rows
+				)
+
+		self._usedKeys.update(uniqueKeys)
+		results = {}
+		for glyphName in glyphNames:
+			# the entries are immutable; only the list of unicodes is copied,
+			# so that identical glyphs don't share it
+			data, width, unicodes, bounds, components = entries[keys[glyphName]]
+			results[glyphName] = (data, width, list(unicodes), bounds, components)
+		return results
+
+
+def _encodeEntry(entry):
+	"""
+	Return the (data, info) row of a (data, width, unicodes, bounds,
+	components) entry: the compiled glyph data, and a JSON list of the
+	other fields.
+	"""
+	data, width, unicodes, bounds, components = entry
+	return data, json.dumps([width, unicodes, bounds, components])
+
+
+def _isNumber(value):
+	return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _decodeEntry(data, info):
+	"""
+	Return the entry of a (data, info) row, made of tuples, or None if the
+	row doesn't have the expected form.
+	"""
+	try:
+		width, unicodes, bounds, components = json.loads(info)
+	except (TypeError, ValueError):
+		return None
+	if not isinstance(data, bytes) or not _isNumber(width):
+		return None
+	if not isinstance(unicodes, list) or not all(
+		isinstance(u, int) and not isinstance(u, bool) for u in unicodes
+	):
+		return None
+	if bounds is not None:
+		if not isinstance(bounds, list) or len(bounds) != 4 or not all(map(_isNumber, bounds)):
+			return None
+		bounds = tuple(bounds)
+	if components is not None:
+		if not isinstance(components, list):
+			return None
+		decoded = []
+		for component in components:
+			if not isinstance(component, list) or len(component) != 5:
+				return None
+			glyphName, x, y, transform, flags = component
+			if not (
+				isinstance(glyphName, str)
+				and _isNumber(x)
+				and _isNumber(y)
+				and isinstance(flags, int)
+			):
+				return None
+			if transform is not None:
+				if not isinstance(transform, list) or len(transform) != 4 or not all(map(_isNumber, transform)):
+					return None
+				transform = tuple(transform)
+			decoded.append((glyphName, x, y, transform, flags))
+		components = tuple(decoded)
+	return data, width, tuple(unicodes), bounds, components
+
+
+def _makeCompositeGlyph(components):
+	"""
+	Return a composite glyf table Glyph, as drawn by TTGlyphPen, from
+	(glyphName, x, y, transform, flags) tuples; 'transform' is None or
+	a (xx, xy, yx, yy) tuple.
+	"""
+	glyph = TTGlyph()
+	glyph.numberOfContours = -1
+	glyph.components = []
+	for glyphName, x, y, transform, flags in components:
+		component = GlyphComponent()
+		component.glyphName = glyphName
+		component.x, component.y = x, y
+		if transform is not None:
+			component.transform = (transform[:2], transform[2:])
+		component.flags = flags
+		glyph.components.append(component)
+	return glyph
+
+
+def _makeKeys(glyphSet, glyphNames, options, maxWorkers=None):
+	"""
+	Return a {glyphName: key} dict, where the key is a hex digest of the
+	compile options, the .glif data of the glyph, and the keys of its
+	components.
+	"""
+	glifs = {}
+	components = {}
+	pending = list(dict.fromkeys(glyphNames))
+	while pending:
+		for glyphName, glif in zip(pending, glyphSet._readGLIFs(pending, maxWorkers)):
+			glifs[glyphName] = glif
+			# most glyphs have no components, and need not be parsed
+			if b"<component" in glif:
+				components[glyphName] = _fetchComponentBases(glif)
+			else:
+				components[glyphName] = []
+		pending = list(dict.fromkeys(
+			baseGlyph
+			for glyphName in pending
+			for baseGlyph in components[glyphName]
+			if baseGlyph not in glifs and baseGlyph in glyphSet
+		))
+
+	prefix = repr(options).encode("utf-8")
+	keys = {}
+
+	def makeKey(glyphName, stack):
+		key = keys.get(glyphName)
+		if key is not None:
+			return key
+		h = hashlib.sha256(prefix)
+		h.update(b"\0")
+		h.update(glifs[glyphName])
+		for baseGlyph in components[glyphName]:
+			h.update(b"\0")
+			h.update(baseGlyph.encode("utf-8"))
+			if baseGlyph in stack:
+				h.update(b"\0cycle")
+			elif baseGlyph in glifs:
+				h.update(makeKey(baseGlyph, stack | {baseGlyph}).encode("ascii"))
+			else:
+				h.update(b"\0missing")
+		key = keys[glyphName] = h.hexdigest()
+		return key
+
+	return {glyphName: makeKey(glyphName, {glyphName}) for glyphName in glyphNames}
+
+
+def _bounds(boundsPen, recording):
+	recording.replay(PointToSegmentPen(boundsPen))
+	return boundsPen.bounds
+
+
+def _compileTTGlyph(glyphSet, glyphObject, recording, options):
+	_, componentFlags = options
+	pen = TTGlyphPen(glyphSet)
+	recording.replay(PointToSegmentPen(pen))
+	glyph = pen.glyph(componentFlags)
+	components = None
+	if glyph.isComposite():
+		# compiling composite glyphs needs the glyph order of the font, so
+		# the components are kept instead
+		data = b""
+		components = []
+		for component in glyph.components:
+			transform = getattr(component, "transform", None)
+			if transform is not None:
+				transform = list(transform[0]) + list(transform[1])
+			components.append(
+				(component.glyphName, component.x, component.y, transform, component.flags)
+			)
+		bounds = _bounds(ControlBoundsPen(glyphSet), recording)
+		if bounds is not None:
+			bounds = calcIntBounds([bounds[:2], bounds[2:]])
+	elif glyph.numberOfContours == 0:
+		data = b""
+		bounds = None
+	else:
+		data = glyph.compile(None)
+		bounds = (glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax)
+	return data, glyphObject.width, glyphObject.unicodes, bounds, components
+
+
+def _compileCharString(glyphSet, glyphObject, recording, options):
+	_, roundTolerance, CFF2, optimize = options
+	width = None if CFF2 else glyphObject.width
+	pen = T2CharStringPen(width, glyphSet, roundTolerance=roundTolerance, CFF2=CFF2)
+	recording.replay(PointToSegmentPen(pen))
+	charString = pen.getCharString(optimize=optimize)
+	charString.compile(isCFF2=CFF2)
+	bounds = _bounds(BoundsPen(glyphSet), recording)
+	return charString.bytecode, glyphObject.width, glyphObject.unicodes, bounds, None
@@ -0,0 +1,298 @@
+"""
+zipfs.py -- Read-only file system for zipped UFOs (.ufoz files).
+
+fs.zipfs.ReadZipFS goes through several layers for every file it opens:
+it checks the path against an in-memory copy of the directory tree, and
+then reads the member through a zipfile.ZipExtFile. Reading a UFO means
+opening thousands of small .glif files, so UFOReader uses the ZipReaderFS
+defined here instead. It reads the central directory of the zip file once,
+into dictionaries of files and directories, and reads members straight
+from the underlying file:
+
+	zipFS = ZipReaderFS("MyFont.ufoz")
+	data = zipFS.readbytes("MyFont.ufo/metainfo.plist")
+
+readmany() reads a batch of files at once, in the order in which they are
+stored in the zip file; GlyphSet uses it, when available, to read many
+.glif files. Recently read files are kept in a cache of limited size, as
+the same plist files are often read more than once.
+"""
+
+import io
+import struct
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+import fs.base
+import fs.errors
+import fs.info
+import fs.path
+from fs.enums import ResourceType
+from fs.time import datetime_to_epoch
+
+
+__all__ = ["ZipReaderFS"]
+
+
+# size of the fixed part of a local file header, and format of the fields
+# giving the length of the variable part (see zipfile.structFileHeader)
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_NAME_LENGTHS = struct.Struct("<HH")
+_LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+
+# default maximum total size of the members kept in the cache
+CACHE_SIZE = 8 * 1024 * 1024
+
+
+class ZipReaderFS(fs.base.FS):
+
+	"""
+	A read-only file system with the contents of a zip file, given as a
+	path or a binary file object.
+
+	'cacheSize' is the maximum total size in bytes of the decompressed
+	members which are cached; set it to 0 to disable caching.
+	"""
+
+	_meta = {
+		"case_insensitive": False,
+		"network": False,
+		"read_only": True,
+		"supports_rename": False,
+		"thread_safe": True,
+		"unicode_paths": True,
+		"virtual": False,
+	}
+
+	@fs.errors.CreateFailed.catch_all
+	def __init__(self, file, cacheSize=CACHE_SIZE):
+		super().__init__()
+		self._file = file
+		self._zip = zipfile.ZipFile(file, "r")
+		self._fp = self._zip.fp
+		self._readLock = threading.Lock()
+		self._cacheSize = cacheSize
+		self._cache = OrderedDict()  # path --> data
+		self._cachedBytes = 0
+		self._files = {}  # path --> ZipInfo
+		self._dirs = {"/": {}}  # path --> {name: isDir}
+		for info in self._zip.infolist():
+			path = "/" + info.filename.strip("/")
+			if info.is_dir():
+				self._addDir(path)
+			elif path != "/":
+				self._addDir(fs.path.dirname(path))
+				self._dirs[fs.path.dirname(path)][fs.path.basename(path)] = False
+				self._files[path] = info
+
+	def _addDir(self, path):
+		while path not in self._dirs:
+			self._dirs[path] = {}
+			parent, name = fs.path.split(path)
+			self._dirs.setdefault(parent, {})[name] = True
+			path = parent
+
+	def __repr__(self):
+		return "ZipReaderFS({!r})".format(self._file)
+
+	def __str__(self):
+		return "<zipfs '{}'>".format(self._file)
+
+	# info
+
+	def getinfo(self, path, namespaces=None):
+		self.check()
+		_path = self.validatepath(path)
+		namespaces = namespaces or ()
+		if _path in self._dirs:
+			rawInfo = {"basic": {"name": fs.path.basename(_path), "is_dir": True}}
+			if "details" in namespaces:
+				rawInfo["details"] = {"type": int(ResourceType.directory)}
+			return fs.info.Info(rawInfo)
+		info = self._files.get(_path)
+		if info is None:
+			raise fs.errors.ResourceNotFound(path)
+		return fs.info.Info(self._rawFileInfo(_path, info, namespaces))
+
+	@staticmethod
+	def _rawFileInfo(path, info, namespaces):
+		rawInfo = {"basic": {"name": fs.path.basename(path), "is_dir": False}}
+		if "details" in namespaces:
+			rawInfo["details"] = {
+				"size": info.file_size,
+				"type": int(ResourceType.file),
+				"modified": datetime_to_epoch(datetime(*info.date_time)),
+			}
+		return rawInfo
+
+	def exists(self, path):
+		_path = self.validatepath(path)
+		return _path in self._files or _path in self._dirs
+
+	def isdir(self, path):
+		return self.validatepath(path) in self._dirs
+
+	def isfile(self, path):
+		return self.validatepath(path) in self._files
+
+	def listdir(self, path):
+		self.check()
+		_path = self.validatepath(path)
+		if _path in self._files:
+			raise fs.errors.DirectoryExpected(path)
+		if _path not in self._dirs:
+			raise fs.errors.ResourceNotFound(path)
+		return list(self._dirs[_path])
+
+	def scandir(self, path, namespaces=None, page=None):
+		self.check()
+		_path = self.validatepath(path)
+		if _path in self._files:
+			raise fs.errors.DirectoryExpected(path)
+		if _path not in self._dirs:
+			raise fs.errors.ResourceNotFound(path)
+		namespaces = namespaces or ()
+		entries = []
+		for name, isDir in self._dirs[_path].items():
+			childPath = fs.path.join(_path, name)
+			if isDir:
+				entries.append(self.getinfo(childPath, namespaces))
+			else:
+				entries.append(fs.info.Info(
+					self._rawFileInfo(childPath, self._files[childPath], namespaces)
+				))
+		if page is not None:
+			start, end = page
+			entries = entries[start:end]
+		return iter(entries)
+
+	# reading
+
+	def readbytes(self, path):
+		self.check()
+		_path = self.validatepath(path)
+		data = self._getCached(_path)
+		if data is not None:
+			return data
+		info = self._files.get(_path)
+		if info is None:
+			if _path in self._dirs:
+				raise fs.errors.FileExpected(path)
+			raise fs.errors.ResourceNotFound(path)
+		return self._readMembers([(_path, info)])[0]
+
+	def readmany(self, paths):
+		"""
+		Return a list with the contents of the files at the given paths.
+
+		The files that are not cached are read in the order in which they
+		are stored in the zip file, which avoids seeking back and forth,
+		and decompressed in one go.
+		"""
+		self.check()
+		results = [None] * len(paths)
+		toRead = []
+		for i, path in enumerate(paths):
+			_path = self.validatepath(path)
+			data = self._getCached(_path)
+			if data is not None:
+				results[i] = data
+				continue
+			info = self._files.get(_path)
+			if info is None:
+				if _path in self._dirs:
+					raise fs.errors.FileExpected(path)
+				raise fs.errors.ResourceNotFound(path)
+			toRead.append((i, _path, info))
+		toRead.sort(key=lambda item: item[2].header_offset)
+		members = [(_path, info) for _, _path, info in toRead]
+		for (i, _, _), data in zip(toRead, self._readMembers(members)):
+			results[i] = data
+		return results
+
+	def _readMembers(self, members):
+		results = []
+		with self._readLock:
+			for path, info in members:
+				data = self._readMember(info)
+				results.append(data)
+				self._cacheMember(path, data)
+		return results
+
+	def _readMember(self, info):
+		if (
+			info.flag_bits & 0x1  # encrypted
+			or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+		):
+			return self._zip.read(info)
+		self._fp.seek(info.header_offset)
+		header = self._fp.read(_LOCAL_HEADER_SIZE)
+		if (
+			len(header) != _LOCAL_HEADER_SIZE
+			or header[:4] != _LOCAL_HEADER_SIGNATURE
+		):
+			raise zipfile.BadZipFile(
+				"Bad magic number for file header: %s" % info.filename
+			)
+		nameLength, extraLength = _LOCAL_HEADER_NAME_LENGTHS.unpack(header[26:])
+		self._fp.seek(nameLength + extraLength, io.SEEK_CUR)
+		data = self._fp.read(info.compress_size)
+		if info.compress_type == zipfile.ZIP_DEFLATED:
+			data = zlib.decompress(data, -zlib.MAX_WBITS)
+		if len(data) != info.file_size or zlib.crc32(data) != info.CRC:
+			raise zipfile.BadZipFile("Bad CRC-32 for file %r" % info.filename)
+		return data
+
+	def _getCached(self, path):
+		with self._readLock:
+			data = self._cache.get(path)
+			if data is not None:
+				self._cache.move_to_end(path)
+			return data
+
+	def _cacheMember(self, path, data):
+		# called with the read lock held
+		if len(data) > self._cacheSize:
+			return
+		previous = self._cache.pop(path, None)
+		if previous is not None:
+			# read twice, e.g. listed twice in readmany()
+			self._cachedBytes -= len(previous)
+		self._cache[path] = data
+		self._cachedBytes += len(data)
+		while self._cachedBytes > self._cacheSize:
+			_, evicted = self._cache.popitem(last=False)
+			self._cachedBytes -= len(evicted)
+
+	def openbin(self, path, mode="r", buffering=-1, **options):
+		self.check()
+		if "w" in mode or "+" in mode or "a" in mode:
+			raise fs.errors.ResourceReadOnly(path)
+		return io.BytesIO(self.readbytes(path))
+
+	# read-only
+
+	def makedir(self, path, permissions=None, recreate=False):
+		self.check()
+		raise fs.errors.ResourceReadOnly(path)
+
+	def remove(self, path):
+		self.check()
+		raise fs.errors.ResourceReadOnly(path)
+
+	def removedir(self, path):
+		self.check()
+		raise fs.errors.ResourceReadOnly(path)
+
+	def setinfo(self, path, info):
+		self.check()
+		raise fs.errors.ResourceReadOnly(path)
+
+	def close(self):
+		super().close()
+		if hasattr(self, "_zip"):
+			self._zip.close()
+			self._cache.clear()
+			self._cachedBytes = 0
@@ -581,10 +581,10 @@ def _add_MVAR(font, masterModel, master_ttfs, axisTags):
 		mvar.ValueRecord = sorted(records, key=lambda r: r.ValueTag)
 
 
-def _merge_OTL(font, model, master_fonts, axisTags):
+def _merge_OTL(font, model, master_fonts, axisTags, compactPairPos=False):
 
 	log.info("Merging OpenType Layout tables")
-	merger = VariationMerger(model, axisTags, font)
+	merger = VariationMerger(model, axisTags, font, compactPairPos)
 
 	merger.mergeTables(font, master_fonts, ['GSUB', 'GDEF', 'GPOS'])
 	store = merger.store_builder.finish()
@@ -616,9 +616,7 @@ def _merge_OTL(font, model, master_fonts, axisTags):
 def _add_GSUB_feature_variations(font, axes, internal_axis_supports, rules, rulesProcessingLast):
 
 	def normalize(name, value):
-		return models.normalizeLocation(
-			{name: value}, internal_axis_supports
-		)[name]
+		return models.normalizeValue(value, internal_axis_supports[name])
 
 	log.info("Generating GSUB FeatureVariations")
 
@@ -719,7 +717,11 @@ def load_designspace(designspace):
 				axis.labelNames["en"] = tounicode(axis_name)
 
 		axes[axis_name] = axis
-	log.info("Axes:\n%s", pformat([axis.asdict() for axis in axes.values()]))
+	# formatting the locations of large designspaces takes time, so it is
+	# only done when the messages are logged
+	logInfo = log.isEnabledFor(logging.INFO)
+	if logInfo:
+		log.info("Axes:\n%s", pformat([axis.asdict() for axis in axes.values()]))
 
 	# Check all master and instance locations are valid and fill in defaults
 	for obj in masters+instances:
@@ -737,17 +739,20 @@ def load_designspace(designspace):
 	# Normalize master locations
 
 	internal_master_locs = [o.location for o in masters]
-	log.info("Internal master locations:\n%s", pformat(internal_master_locs))
+	if logInfo:
+		log.info("Internal master locations:\n%s", pformat(internal_master_locs))
 
 	# TODO This mapping should ideally be moved closer to logic in _add_fvar/avar
 	internal_axis_supports = {}
 	for axis in axes.values():
 		triple = (axis.minimum, axis.default, axis.maximum)
 		internal_axis_supports[axis.name] = [axis.map_forward(v) for v in triple]
-	log.info("Internal axis supports:\n%s", pformat(internal_axis_supports))
+	if logInfo:
+		log.info("Internal axis supports:\n%s", pformat(internal_axis_supports))
 
 	normalized_master_locs = [models.normalizeLocation(m, internal_axis_supports) for m in internal_master_locs]
-	log.info("Normalized master locations:\n%s", pformat(normalized_master_locs))
+	if logInfo:
+		log.info("Normalized master locations:\n%s", pformat(normalized_master_locs))
 
 	# Find base master
 	base_idx = None
@@ -809,13 +814,17 @@ def set_default_weight_width_slant(font, location):
 			font["post"].italicAngle = italicAngle
 
 
-def build(designspace, master_finder=lambda s:s, exclude=[], optimize=True):
+def build(designspace, master_finder=lambda s:s, exclude=[], optimize=True,
+		compactPairPos=False):
 	"""
 	Build variation font from a designspace file.
 
 	If master_finder is set, it should be a callable that takes master
 	filename as found in designspace file and map it to master font
 	binary as to be opened (eg. .ttf or .otf).
+
+	If compactPairPos is true, class-based kerning subtables are split
+	where that makes GPOS smaller (see fontTools.otlLib.optimize).
 	"""
 	if hasattr(designspace, "sources"):  # Assume a DesignspaceDocument
 		pass
@@ -865,7 +874,8 @@ def build(designspace, master_finder=lambda s:s, exclude=[], optimize=True):
 	if 'VVAR' not in exclude and 'vmtx' in vf:
 		_add_VVAR(vf, model, master_fonts, axisTags)
 	if 'GDEF' not in exclude or 'GPOS' not in exclude:
-		_merge_OTL(vf, model, master_fonts, axisTags)
+		_merge_OTL(vf, model, master_fonts, axisTags,
+			   compactPairPos=compactPairPos)
 	if 'gvar' not in exclude and 'glyf' in vf:
 		_add_gvar(vf, model, master_fonts, optimize=optimize)
 	if 'cvar' not in exclude and 'glyf' in vf:
@@ -987,6 +997,12 @@ def main(args=None):
 		action='store_false',
 		help='do not perform IUP optimization'
 	)
+	parser.add_argument(
+		'--compact-pairpos',
+		dest='compactPairPos',
+		action='store_true',
+		help='split class kerning subtables where this makes GPOS smaller'
+	)
 	parser.add_argument(
 		'--master-finder',
 		default='master_ttf_interpolatable/{stem}.ttf',
@@ -1025,7 +1041,8 @@ def main(args=None):
 		designspace_filename,
 		finder,
 		exclude=options.exclude,
-		optimize=options.optimize
+		optimize=options.optimize,
+		compactPairPos=options.compactPairPos
 	)
 
 	outfile = options.outfile
@@ -13,6 +13,7 @@ from fontTools.varLib.models import nonNone, allNone, allEqual, allEqualTo
 from fontTools.varLib.varStore import VarStoreInstancer
 from functools import reduce
 from fontTools.otlLib.builder import buildSinglePos
+from fontTools.otlLib.optimize import compactLookup
 
 
 class Merger(object):
@@ -112,7 +113,11 @@ class Merger(object):
 # Aligning merger
 #
 class AligningMerger(Merger):
-	pass
+
+	# If true, merged PairPos lookups, whose class-based subtables have
+	# been flattened into one, are split again where that saves space;
+	# see fontTools.otlLib.optimize.
+	compactPairPos = False
 
 @AligningMerger.merger(ot.GDEF, "GlyphClassDef")
 def merge(merger, self, lst):
@@ -810,6 +815,9 @@ def merge(merger, self, lst):
 			self.SubTable.pop(-1)
 			self.SubTableCount -= 1
 
+		if merger.compactPairPos:
+			compactLookup(self, merger.font.getReverseGlyphMap())
+
 	elif isSinglePos and flattened:
 		singlePosTable = self.SubTable[0]
 		glyphs = singlePosTable.Coverage.glyphs
@@ -977,8 +985,9 @@ class VariationMerger(AligningMerger):
 	"""A merger that takes multiple master fonts, and builds a
 	variable font."""
 
-	def __init__(self, model, axisTags, font):
+	def __init__(self, model, axisTags, font, compactPairPos=False):
 		Merger.__init__(self, font)
+		self.compactPairPos = compactPairPos
 		self.store_builder = varStore.OnlineVarStoreBuilder(axisTags)
 		self.setModel(model)
 
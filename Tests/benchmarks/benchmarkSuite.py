@@ -0,0 +1,502 @@
+"""Time the core operations of fontTools on synthetic fonts, and compare runs.
+
+    python Tests/benchmarks/benchmarkSuite.py run [--glyphs N] [--masters N] [--repeat N] [-k PATTERN] [-o RESULTS.json] [--profile]
+    python Tests/benchmarks/benchmarkSuite.py compare BEFORE.json AFTER.json [--threshold PERCENT] [--stat min|median]
+    python Tests/benchmarks/benchmarkSuite.py list
+
+The fonts are built with fontBuilder from a fixed random seed, so that runs
+are reproducible offline: a TrueType font with many glyphs, class and pair
+kerning, mark positioning, ligatures and single substitutions, and the
+masters of a variable font along a weight axis, which only differ in their
+outlines, metrics, kerning values and anchors.
+
+Each benchmark prepares its input, then times a single operation on it;
+this is repeated, and the minimum and median times are reported. 'run'
+writes them as JSON with -o; 'compare' reads two such files and reports the
+change of each benchmark, exiting with status 1 if any is slower by more
+than the threshold. With --profile, each benchmark is run once more with
+fontTools.misc.profiling, and the events which took the longest are listed.
+
+The woff2 benchmarks are skipped if brotli is not installed.
+"""
+from fontTools import version
+from fontTools.designspaceLib import (
+    AxisDescriptor,
+    DesignSpaceDocument,
+    SourceDescriptor,
+)
+from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+from fontTools.fontBuilder import FontBuilder
+from fontTools.misc import profiling
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont, woff2
+from fontTools import subset, varLib
+from fontTools.varLib.instancer import instantiateVariableFont
+from io import BytesIO, StringIO
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+
+
+def makeGlyphOrder(numGlyphs):
+    return [".notdef"] + ["glyph%05d" % i for i in range(1, numGlyphs)]
+
+
+def makeCharacterMap(glyphOrder):
+    cmap = {}
+    for i, name in enumerate(glyphOrder[1:]):
+        codepoint = 0x4E00 + i
+        if codepoint >= 0xD800:
+            # skip the surrogates
+            codepoint += 0x800
+        cmap[codepoint] = name
+    return cmap
+
+
+def drawGlyph(pen, index, weight):
+    stroke = 40 + int(120 * weight)
+    for j in range(3):
+        x = (index * 7 + j * 230) % 600
+        y = j * 220
+        pen.moveTo((x, y))
+        pen.lineTo((x + stroke, y))
+        pen.qCurveTo((x + stroke + 100, y + 100), (x + stroke, y + 200))
+        pen.lineTo((x, y + 200))
+        pen.closePath()
+
+
+def makeFeatures(glyphOrder, weight=0.0, numKernClasses=100, seed=0):
+    """Return feature file code for the given glyphs. The rules only depend
+    on the glyphs and the seed; the weight, from 0 to 1, scales the kerning
+    values and moves the anchors, so that masters get compatible features."""
+    rand = random.Random(seed)
+    glyphs = glyphOrder[1:]
+    numMarks = max(1, len(glyphs) // 20)
+    bases, marks = glyphs[:-numMarks], glyphs[-numMarks:]
+    lines = ["languagesystem DFLT dflt;"]
+
+    classSize = max(1, len(bases) // numKernClasses)
+    kernClasses = [
+        bases[i:i + classSize] for i in range(0, len(bases), classSize)]
+    for i, kernClass in enumerate(kernClasses):
+        lines.append("@kern%d = [%s];" % (i, " ".join(kernClass)))
+    lines.append("feature kern {")
+    pairs = set()
+    for _ in range(len(bases) // 2):
+        pairs.add((rand.choice(bases), rand.choice(bases)))
+    for left, right in sorted(pairs):
+        lines.append("    pos %s %s %d;" % (
+            left, right, round(rand.randint(-150, -10) * (1 + weight))))
+    for i in range(len(kernClasses)):
+        for j in range(len(kernClasses)):
+            if rand.random() < 0.2:
+                lines.append("    pos @kern%d @kern%d %d;" % (
+                    i, j, round(rand.randint(-100, -10) * (1 + weight))))
+    lines.append("} kern;")
+
+    lines.append("markClass [%s] <anchor 0 700> @TOP;" % " ".join(marks))
+    lines.append("feature mark {")
+    for i, base in enumerate(bases):
+        lines.append("    pos base %s <anchor %d 700> mark @TOP;" % (
+            base, (i * 13) % 500 + round(100 * weight)))
+    lines.append("} mark;")
+
+    lines.append("feature liga {")
+    ligatures = set()
+    for _ in range(len(bases) // 20):
+        ligatures.add((rand.choice(bases), rand.choice(bases)))
+    for first, second in sorted(ligatures):
+        lines.append("    sub %s %s by %s;" % (first, second, rand.choice(bases)))
+    lines.append("} liga;")
+
+    half = len(bases) // 2
+    lines.append("feature smcp {")
+    lines.append("    sub [%s] by [%s];" % (
+        " ".join(bases[:half]), " ".join(bases[half:2 * half])))
+    lines.append("} smcp;")
+    return "\n".join(lines) + "\n"
+
+
+def makeFont(numGlyphs, weight=0.0, features=True, seed=0):
+    """Return a TrueType font with 'numGlyphs' glyphs, and its features
+    unless 'features' is false. 'weight', from 0 to 1, changes the outlines,
+    advance widths and features, keeping them compatible."""
+    glyphOrder = makeGlyphOrder(numGlyphs)
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+    fb.setupCharacterMap(makeCharacterMap(glyphOrder))
+    glyphs = {}
+    for i, name in enumerate(glyphOrder):
+        pen = TTGlyphPen(None)
+        drawGlyph(pen, i, weight)
+        glyphs[name] = pen.glyph()
+    fb.setupGlyf(glyphs)
+    advance = 700 + round(200 * weight)
+    fb.setupHorizontalMetrics(
+        {name: (advance, glyphs[name].xMin) for name in glyphOrder})
+    fb.setupHorizontalHeader(ascent=880, descent=-120)
+    fb.setupNameTable({"familyName": "Benchmark", "styleName": "Regular"})
+    fb.setupOS2(usWeightClass=100 + round(800 * weight))
+    fb.setupPost()
+    if features:
+        fb.addOpenTypeFeatures(makeFeatures(glyphOrder, weight, seed=seed))
+    return fb.font
+
+
+def fontData(font, flavor=None):
+    font.flavor = flavor
+    buf = BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+def loadFont(data):
+    font = TTFont(BytesIO(data))
+    for tag in font.keys():
+        font[tag]
+    return font
+
+
+class Inputs(object):
+
+    """The synthetic fonts shared by the benchmarks, built on first use."""
+
+    def __init__(self, numGlyphs, numMasters, seed=0):
+        self.numGlyphs = numGlyphs
+        self.numMasters = numMasters
+        self.seed = seed
+        self._cache = {}
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def features(self):
+        return self._get("features", lambda: makeFeatures(
+            makeGlyphOrder(self.numGlyphs), seed=self.seed))
+
+    @property
+    def fontData(self):
+        return self._get("fontData", lambda: fontData(
+            makeFont(self.numGlyphs, seed=self.seed)))
+
+    @property
+    def noFeaturesFontData(self):
+        return self._get("noFeaturesFontData", lambda: fontData(
+            makeFont(self.numGlyphs, features=False, seed=self.seed)))
+
+    @property
+    def masterData(self):
+        return self._get("masterData", lambda: [
+            fontData(makeFont(self.numGlyphs, weight, seed=self.seed))
+            for weight in self.masterWeights])
+
+    @property
+    def masterWeights(self):
+        if self.numMasters < 2:
+            return [0.0]
+        return [i / (self.numMasters - 1) for i in range(self.numMasters)]
+
+    @property
+    def variableFontData(self):
+        return self._get("variableFontData", lambda: fontData(
+            varLib.build(self.makeDesignSpace())[0]))
+
+    @property
+    def ttx(self):
+        def build():
+            buf = StringIO()
+            TTFont(BytesIO(self.fontData)).saveXML(buf)
+            return buf.getvalue()
+        return self._get("ttx", build)
+
+    @property
+    def woff2Data(self):
+        return self._get("woff2Data", lambda: fontData(
+            TTFont(BytesIO(self.fontData)), flavor="woff2"))
+
+    def makeDesignSpace(self):
+        """Return a designspace whose sources are new master fonts."""
+        doc = DesignSpaceDocument()
+        axis = AxisDescriptor()
+        axis.tag = "wght"
+        axis.name = "Weight"
+        axis.minimum = axis.default = 100
+        axis.maximum = 900
+        doc.addAxis(axis)
+        for i, (weight, data) in enumerate(zip(self.masterWeights, self.masterData)):
+            source = SourceDescriptor()
+            source.name = "master%d" % i
+            source.font = TTFont(BytesIO(data))
+            source.location = {"Weight": 100 + 800 * weight}
+            doc.addSource(source)
+        return doc
+
+
+# The benchmarks, in the order they are run: each is a function which is
+# passed the Inputs, prepares what it needs, and returns the function to
+# time. It may raise SkipBenchmark if it cannot run here.
+BENCHMARKS = []
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+def benchmark(name):
+    def decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return decorator
+
+
+@benchmark("fontBuilder.build")
+def benchFontBuilder(inputs):
+    return lambda: fontData(
+        makeFont(inputs.numGlyphs, features=False, seed=inputs.seed))
+
+
+@benchmark("TTFont.load")
+def benchLoad(inputs):
+    data = inputs.fontData
+    return lambda: loadFont(data)
+
+
+@benchmark("TTFont.save")
+def benchSave(inputs):
+    font = loadFont(inputs.fontData)
+    return lambda: font.save(BytesIO())
+
+
+@benchmark("subset")
+def benchSubset(inputs):
+    font = TTFont(BytesIO(inputs.fontData))
+    unicodes = sorted(font.getBestCmap())[::2]
+    subsetter = subset.Subsetter(subset.Options(layout_features=["*"]))
+
+    def run():
+        subsetter.populate(unicodes=unicodes)
+        subsetter.subset(font)
+        font.save(BytesIO())
+
+    return run
+
+
+@benchmark("varLib.build")
+def benchVarLibBuild(inputs):
+    designspace = inputs.makeDesignSpace()
+    return lambda: varLib.build(designspace)
+
+
+@benchmark("varLib.instancer")
+def benchInstancer(inputs):
+    font = TTFont(BytesIO(inputs.variableFontData))
+    return lambda: instantiateVariableFont(font, {"wght": 550}, inplace=True)
+
+
+@benchmark("ttx.dump")
+def benchTTXDump(inputs):
+    font = TTFont(BytesIO(inputs.fontData))
+    return lambda: font.saveXML(StringIO())
+
+
+@benchmark("ttx.compile")
+def benchTTXCompile(inputs):
+    ttx = inputs.ttx
+
+    def run():
+        font = TTFont()
+        font.importXML(StringIO(ttx))
+        font.save(BytesIO())
+
+    return run
+
+
+@benchmark("woff2.compress")
+def benchWOFF2Compress(inputs):
+    if not woff2.haveBrotli:
+        raise SkipBenchmark("brotli is not installed")
+    font = loadFont(inputs.fontData)
+    font.flavor = "woff2"
+    return lambda: font.save(BytesIO())
+
+
+@benchmark("woff2.decompress")
+def benchWOFF2Decompress(inputs):
+    if not woff2.haveBrotli:
+        raise SkipBenchmark("brotli is not installed")
+    data = inputs.woff2Data
+
+    def run():
+        font = loadFont(data)
+        font.flavor = None
+        font.save(BytesIO())
+
+    return run
+
+
+@benchmark("feaLib.compile")
+def benchFeaLib(inputs):
+    font = TTFont(BytesIO(inputs.noFeaturesFontData))
+    features = inputs.features
+    return lambda: addOpenTypeFeaturesFromString(font, features)
+
+
+def selectBenchmarks(patterns):
+    if not patterns:
+        return list(BENCHMARKS)
+    return [(name, func) for name, func in BENCHMARKS
+            if any(pattern in name for pattern in patterns)]
+
+
+def runBenchmark(func, inputs, repeat):
+    times = []
+    for _ in range(repeat):
+        run = func(inputs)
+        start = timeit.default_timer()
+        run()
+        times.append(timeit.default_timer() - start)
+    return times
+
+
+def profileBenchmark(func, inputs):
+    run = func(inputs)
+    with profiling.Stats() as stats:
+        run()
+    return stats
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def runBenchmarks(benchmarks, inputs, repeat, profile=False, log=print):
+    """Run the benchmarks and return the results, as written by 'run'."""
+    results = {}
+    skipped = {}
+    for name, func in benchmarks:
+        try:
+            times = runBenchmark(func, inputs, repeat)
+        except SkipBenchmark as e:
+            skipped[name] = str(e)
+            log("%-18s skipped: %s" % (name, e))
+            continue
+        results[name] = {"min": min(times), "median": median(times), "times": times}
+        log("%-18s %8.3f s (min) %8.3f s (median)" % (
+            name, results[name]["min"], results[name]["median"]))
+        if profile:
+            log(profileBenchmark(func, inputs).report(limit=10))
+            log("")
+    return {
+        "fontTools": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {
+            "glyphs": inputs.numGlyphs,
+            "masters": inputs.numMasters,
+            "seed": inputs.seed,
+            "repeat": repeat,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compareResults(before, after, threshold=5.0, stat="min"):
+    """Return the lines of the comparison of two runs, and the names of the
+    benchmarks which are slower by more than 'threshold' percent."""
+    lines = []
+    if before["options"] != after["options"]:
+        lines.append("warning: the runs have different options: %s and %s" % (
+            json.dumps(before["options"], sort_keys=True),
+            json.dumps(after["options"], sort_keys=True)))
+    lines.append("%-18s %10s %10s %8s" % (
+        "benchmark", "before (s)", "after (s)", "change"))
+    slower = []
+    names = list(before["results"])
+    names += [name for name in after["results"] if name not in before["results"]]
+    for name in names:
+        old = before["results"].get(name)
+        new = after["results"].get(name)
+        if old is None or new is None:
+            lines.append("%-18s %10s %10s" % (
+                name,
+                "-" if old is None else "%.3f" % old[stat],
+                "-" if new is None else "%.3f" % new[stat]))
+            continue
+        change = 100.0 * (new[stat] - old[stat]) / old[stat] if old[stat] else 0.0
+        note = ""
+        if change > threshold:
+            note = "slower"
+            slower.append(name)
+        elif change < -threshold:
+            note = "faster"
+        lines.append(("%-18s %10.3f %10.3f %+7.1f%% %s" % (
+            name, old[stat], new[stat], change, note)).rstrip())
+    return lines, slower
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+
+    runParser = commands.add_parser("run", help="run the benchmarks")
+    runParser.add_argument("--glyphs", type=int, default=1000,
+                           help="number of glyphs of the fonts (default: 1000)")
+    runParser.add_argument("--masters", type=int, default=5,
+                           help="number of masters of the variable font (default: 5)")
+    runParser.add_argument("--seed", type=int, default=0)
+    runParser.add_argument("--repeat", type=int, default=3)
+    runParser.add_argument("-k", dest="patterns", action="append", metavar="PATTERN",
+                           help="only run the benchmarks whose name contains PATTERN")
+    runParser.add_argument("-o", dest="output", metavar="RESULTS.json",
+                           help="write the results to a JSON file")
+    runParser.add_argument("--profile", action="store_true",
+                           help="list the fontTools events which took the longest")
+
+    compareParser = commands.add_parser("compare", help="compare two runs")
+    compareParser.add_argument("before", metavar="BEFORE.json")
+    compareParser.add_argument("after", metavar="AFTER.json")
+    compareParser.add_argument("--threshold", type=float, default=5.0, metavar="PERCENT",
+                               help="change below which timings are deemed equal (default: 5)")
+    compareParser.add_argument("--stat", choices=["min", "median"], default="min")
+
+    commands.add_parser("list", help="list the benchmarks")
+
+    options = parser.parse_args(args)
+
+    if options.command == "run":
+        inputs = Inputs(options.glyphs, options.masters, options.seed)
+        results = runBenchmarks(
+            selectBenchmarks(options.patterns), inputs, options.repeat, options.profile)
+        if options.output:
+            with open(options.output, "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+    elif options.command == "compare":
+        with open(options.before) as f:
+            before = json.load(f)
+        with open(options.after) as f:
+            after = json.load(f)
+        lines, slower = compareResults(before, after, options.threshold, options.stat)
+        print("\n".join(lines))
+        return 1 if slower else 0
+    elif options.command == "list":
+        for name, _ in BENCHMARKS:
+            print(name)
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
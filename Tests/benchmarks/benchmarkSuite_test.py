@@ -0,0 +1,63 @@
+from benchmarkSuite import BENCHMARKS, Inputs, compareResults, main, makeFont
+from fontTools.ttLib import woff2
+import json
+import pytest
+
+
+def test_makeFont():
+    font = makeFont(40, weight=0.5)
+    assert len(font.getGlyphOrder()) == 40
+    assert len(font.getBestCmap()) == 39
+    assert {"GDEF", "GSUB", "GPOS"} <= set(font.keys())
+
+
+@pytest.mark.parametrize("name, func", BENCHMARKS, ids=[name for name, _ in BENCHMARKS])
+def test_benchmark(name, func):
+    if name.startswith("woff2") and not woff2.haveBrotli:
+        pytest.skip("brotli is not installed")
+    func(Inputs(numGlyphs=40, numMasters=2))()
+
+
+def makeResults(times, glyphs=1000):
+    return {
+        "options": {"glyphs": glyphs, "masters": 5, "seed": 0, "repeat": 3},
+        "results": {
+            name: {"min": t, "median": t, "times": [t]} for name, t in times.items()
+        },
+    }
+
+
+def test_compareResults():
+    before = makeResults({"subset": 1.0, "ttx.dump": 2.0, "TTFont.load": 0.5})
+    after = makeResults({"subset": 1.2, "ttx.dump": 1.0, "feaLib.compile": 0.1})
+    lines, slower = compareResults(before, after, threshold=10)
+    assert slower == ["subset"]
+    assert [line.split() for line in lines] == [
+        ["benchmark", "before", "(s)", "after", "(s)", "change"],
+        ["subset", "1.000", "1.200", "+20.0%", "slower"],
+        ["ttx.dump", "2.000", "1.000", "-50.0%", "faster"],
+        ["TTFont.load", "0.500", "-"],
+        ["feaLib.compile", "-", "0.100"],
+    ]
+
+    lines, slower = compareResults(before, makeResults({}, glyphs=10))
+    assert lines[0].startswith("warning: the runs have different options")
+    assert slower == []
+
+
+def test_main(tmpdir, capsys):
+    before = str(tmpdir / "before.json")
+    after = str(tmpdir / "after.json")
+    assert main(["run", "--glyphs", "20", "--masters", "2", "--repeat", "2",
+                 "-k", "TTFont", "-o", before]) == 0
+    with open(before) as f:
+        results = json.load(f)
+    assert sorted(results["results"]) == ["TTFont.load", "TTFont.save"]
+    assert len(results["results"]["TTFont.load"]["times"]) == 2
+
+    with open(after, "w") as f:
+        json.dump(makeResults({"TTFont.load": 1000, "TTFont.save": 1000}, glyphs=20), f)
+    capsys.readouterr()
+    assert main(["compare", after, before]) == 0
+    assert main(["compare", before, after]) == 1
+    assert "slower" in capsys.readouterr().out
@@ -0,0 +1,136 @@
+"""Time loading, looking up sources and processing rules in a large
+designspace.
+
+    python Tests/designspaceLib/designspace_benchmark.py [--axes N] [--sources N]
+        [--rules N] [--glyphs N] [--repeat N] [DESIGNSPACE]
+
+Without a DESIGNSPACE argument, a synthetic document is used, with the
+given number of axes, sources (and as many instances) and rules.
+"""
+from fontTools.designspaceLib import (
+    DesignSpaceDocument, AxisDescriptor, SourceDescriptor, InstanceDescriptor,
+    RuleDescriptor, CompiledRules, processRules,
+)
+from fontTools.varLib import load_designspace
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+
+def makeDesignSpace(numAxes, numSources, numRules):
+    rnd = random.Random(0)
+    doc = DesignSpaceDocument()
+    axisNames = ["axis%d" % i for i in range(numAxes)]
+    for name in axisNames:
+        axis = AxisDescriptor()
+        axis.name = axis.tag = name[:1] + name[-3:].rjust(3, "x")
+        axis.minimum = axis.default = 0
+        axis.maximum = 1000
+        doc.addAxis(axis)
+    axisNames = [axis.name for axis in doc.axes]
+    for i in range(numSources):
+        source = SourceDescriptor()
+        source.name = "master%d" % i
+        source.filename = "Master%d.ufo" % (i // 10)
+        source.layerName = None if i % 10 == 0 else "layer%d" % i
+        source.location = {
+            name: 0 if i == 0 else rnd.randint(0, 10) * 100 for name in axisNames
+        }
+        doc.addSource(source)
+        instance = InstanceDescriptor()
+        instance.name = "instance%d" % i
+        instance.filename = "instances/Instance%d.ufo" % i
+        instance.familyName = "Family"
+        instance.styleName = "Style%d" % i
+        instance.location = {name: rnd.randint(0, 20) * 50 for name in axisNames}
+        doc.addInstance(instance)
+    for i in range(numRules):
+        rule = RuleDescriptor()
+        rule.name = "rule%d" % i
+        for _ in range(rnd.randint(1, 2)):
+            rule.conditionSets.append([
+                dict(name=name, minimum=rnd.randint(0, 5) * 100,
+                     maximum=rnd.randint(5, 10) * 100)
+                for name in rnd.sample(axisNames, min(2, numAxes))
+            ])
+        rule.subs = [("glyph%d" % j, "glyph%d.alt" % j) for j in range(i * 5, i * 5 + 5)]
+        doc.addRule(rule)
+    return doc
+
+
+def timeit(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        result = func()
+        times.append(time.time() - start)
+    return min(times), result
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("designspace", metavar="DESIGNSPACE", nargs="?")
+    parser.add_argument("--axes", type=int, default=5)
+    parser.add_argument("--sources", type=int, default=1000)
+    parser.add_argument("--rules", type=int, default=200)
+    parser.add_argument("--glyphs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        if options.designspace:
+            path = options.designspace
+        else:
+            path = os.path.join(tmp, "Synthetic.designspace")
+            makeDesignSpace(options.axes, options.sources, options.rules).write(path)
+
+        t, doc = timeit(lambda: DesignSpaceDocument.fromfile(path), options.repeat)
+        print("read: %.3f s" % t)
+        t, _ = timeit(lambda: load_designspace(DesignSpaceDocument.fromfile(path)), options.repeat)
+        print("read and load_designspace: %.3f s" % t)
+
+        def findSourcesLinear():
+            return [
+                [s for s in doc.sources if s.name == source.name]
+                + [s for s in doc.sources if s.location == source.location]
+                for source in doc.sources
+            ]
+
+        def findSourcesIndexed():
+            return [
+                [doc.getSource(source.name)]
+                + doc.getSourcesAtLocation(source.location)
+                for source in doc.sources
+            ]
+
+        linear, expected = timeit(findSourcesLinear, options.repeat)
+        indexed, result = timeit(findSourcesIndexed, options.repeat)
+        assert result == expected
+        print("look up every source by name and location: %.3f s (linear: %.3f s)"
+              % (indexed, linear))
+
+        glyphNames = ["glyph%d" % i for i in range(options.glyphs)]
+        locations = [instance.location for instance in doc.instances]
+        rules, expected = timeit(
+            lambda: [processRules(doc.rules, loc, glyphNames) for loc in locations],
+            options.repeat,
+        )
+
+        def processCompiled():
+            compiled = CompiledRules(doc.rules)
+            return [compiled.processRules(loc, glyphNames) for loc in locations]
+
+        compiled, result = timeit(processCompiled, options.repeat)
+        assert result == expected
+        print("process rules at every instance: %.3f s (processRules: %.3f s)"
+              % (compiled, rules))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,8 @@ from fontTools.misc.py23 import open
 from fontTools.misc import plistlib
 from fontTools.designspaceLib import (
     DesignSpaceDocument, SourceDescriptor, AxisDescriptor, RuleDescriptor,
-    InstanceDescriptor, evaluateRule, processRules, posix, DesignSpaceDocumentError)
+    InstanceDescriptor, CompiledRules, evaluateRule, processRules, posix,
+    DesignSpaceDocumentError)
 from fontTools import ttLib
 
 def _axesAsDict(axes):
@@ -693,6 +694,46 @@ def test_rulesConditions(tmpdir):
     assert evaluateRule(r4, dict(axisName_a = 0, axisName_b = 0)) == False
     assert evaluateRule(r4, dict(axisName_a = 1000, axisName_b = 1000)) == False
 
+def test_compiledRules():
+    r1 = RuleDescriptor()
+    r1.conditionSets.append([
+        dict(name='axisName_a', minimum=0, maximum=1000),
+        dict(name='axisName_b', minimum=0, maximum=3000)
+    ])
+    r1.subs.append(("a", "a.alt"))
+    r2 = RuleDescriptor()
+    r2.conditionSets.append([dict(name='axisName_a', maximum=500)])
+    r2.conditionSets.append([dict(name='axisName_b', minimum=2000)])
+    r2.subs.append(("a.alt", "a.alt2"))
+    r2.subs.append(("b", "b.alt"))
+    r2.subs.append(("b", "b.alt2"))
+    rules = [r1, r2]
+    compiled = CompiledRules(rules)
+
+    glyphNames = ["a", "a.alt", "b", "c"]
+    for a in (-100, 0, 250, 500, 500.5, 1000, 1000.0001):
+        for b in (-100, 0, 1999.9, 2000, 3000, 3001):
+            location = dict(axisName_a=a, axisName_b=b)
+            assert compiled.processRules(location, glyphNames) == (
+                processRules(rules, location, glyphNames)
+            )
+    location = dict(axisName_a=250, axisName_b=0)
+    assert compiled.processRules(location, glyphNames) == [
+        "a.alt2", "a.alt2", "b.alt", "c"
+    ]
+    assert compiled.getSubstitutions(location) == {
+        "a": "a.alt2", "a.alt": "a.alt2", "b": "b.alt"
+    }
+    # only one set of substitutions is kept for the locations where the
+    # same rules match
+    assert len(compiled._substitutions) == 3
+    # no rule matches
+    assert compiled.getSubstitutions(dict(axisName_a=2000, axisName_b=0)) == {}
+    # missing axes are handled like evaluateRule() does
+    with pytest.raises(KeyError):
+        compiled.processRules(dict(axisName_a=0), glyphNames)
+
+
 def test_rulesDocument(tmpdir):
     # tests of rules in a document, roundtripping.
     tmpdir = str(tmpdir)
@@ -912,6 +953,57 @@ def test_findDefault_axis_mapping():
     assert designspace.findDefault().filename == "Font-Regular.ufo"
 
 
+def test_lookups():
+    doc = DesignSpaceDocument()
+    for name in ("weight", "width"):
+        axis = AxisDescriptor()
+        axis.name = name
+        axis.tag = name[:4]
+        axis.minimum = 0
+        axis.default = 0
+        axis.maximum = 1000
+        doc.addAxis(axis)
+    for i, (weight, width) in enumerate([(0, 0), (1000, 0), (0, 1000), (0, 0)]):
+        source = SourceDescriptor()
+        source.name = "master%d" % i
+        source.filename = "Font%d.ufo" % (i % 3)
+        source.location = dict(weight=weight, width=width)
+        doc.addSource(source)
+    instance = InstanceDescriptor()
+    instance.name = "instance"
+    instance.location = dict(width=0.0, weight=1000.0)
+    doc.addInstance(instance)
+
+    assert doc.getAxis("width") is doc.axes[1]
+    assert doc.getAxis("missing") is None
+    assert doc.getSource("master1") is doc.sources[1]
+    assert doc.getSource("missing") is None
+    assert doc.getInstance("instance") is instance
+    assert doc.getSourcesByFilename("Font0.ufo") == [doc.sources[0], doc.sources[3]]
+    assert doc.getSourcesAtLocation(dict(width=0, weight=0)) == [
+        doc.sources[0], doc.sources[3]
+    ]
+    assert doc.getInstancesAtLocation(dict(weight=1000, width=0)) == [instance]
+    assert doc.findDefault() is doc.sources[0]
+
+    # the index is updated when descriptors are added or changed
+    doc.sources[0].location = dict(weight=500, width=0)
+    assert doc.findDefault() is doc.sources[3]
+    doc.sources[1].name = "renamed"
+    assert doc.getSource("master1") is None
+    assert doc.getSource("renamed") is doc.sources[1]
+    source = SourceDescriptor()
+    source.name = "master1"
+    doc.addSource(source)
+    assert doc.getSource("master1") is source
+    doc.sources = doc.sources[:1]
+    assert doc.getSourcesByFilename("Font0.ufo") == [doc.sources[0]]
+
+    # locations that can't be hashed are compared one by one
+    doc.sources[0].location = dict(weight=[500], width=0)
+    assert doc.getSourcesAtLocation(dict(weight=[500], width=0)) == doc.sources
+
+
 def test_loadSourceFonts():
 
     def opener(path):
@@ -8,6 +8,7 @@ from fontTools.feaLib.parser import Parser
 from fontTools.feaLib import ast
 from fontTools.feaLib.lexer import Lexer
 import difflib
+import itertools
 import os
 import shutil
 import sys
@@ -511,6 +512,46 @@ class BuilderTest(unittest.TestCase):
         addOpenTypeFeatures(font, tree)
         assert "GSUB" in font
 
+    def test_buildWorkers(self):
+        for name in ("GPOS_4", "GPOS_6", "spec6h_ii", "spec8a", "bug512"):
+            serial = makeTTFont()
+            addOpenTypeFeatures(serial, self.getpath("%s.fea" % name))
+            parallel = makeTTFont()
+            builder = Builder(parallel, self.getpath("%s.fea" % name))
+            builder.buildWorkers = 2
+            builder.build()
+            for tag in ('GDEF', 'GSUB', 'GPOS'):
+                self.assertEqual(tag in serial, tag in parallel)
+                if tag in serial:
+                    self.assertEqual(serial[tag].compile(serial),
+                                     parallel[tag].compile(parallel))
+
+    def test_compactPairPos(self):
+        rules = []
+        for glyphs in ("abcdefghijkl", "ABCDEFGHIJKL"):
+            for first, second in itertools.product(glyphs, glyphs):
+                rules.append("pos [%s] [%s] -10;" % (first, second))
+        features = "feature kern { %s } kern;" % " ".join(rules)
+        subtableCounts = []
+        for compact in (False, True):
+            font = makeTTFont()
+            builder = Builder(font, UnicodeIO(features))
+            builder.compactPairPos = compact
+            builder.build()
+            lookup = font["GPOS"].table.LookupList.Lookup[0]
+            subtableCounts.append(lookup.SubTableCount)
+        self.assertEqual(subtableCounts, [1, 2])
+
+    def test_parseTreeCache(self):
+        from fontTools.feaLib.cache import ParseTreeCache
+        cache = ParseTreeCache()
+        path = self.getpath("spec8a.fea")
+        for i in range(2):
+            font = makeTTFont()
+            addOpenTypeFeatures(font, path, parseTreeCache=cache)
+            self.expect_ttx(font, self.getpath("spec8a.ttx"))
+        self.assertEqual(len(cache.entries_), 1)
+
     def test_unsupported_subtable_break(self):
         logger = logging.getLogger("fontTools.feaLib.builder")
         with CapturingLogHandler(logger, level='WARNING') as captor:
@@ -0,0 +1,117 @@
+from fontTools.misc.py23 import *
+from fontTools.misc.loggingTools import CapturingLogHandler
+from fontTools.feaLib.cache import ParseTreeCache
+from fontTools.feaLib.parser import Parser
+from unittest import mock
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+
+class ParseTreeCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        # keep the default signing key out of the user's home directory
+        home = os.path.join(self.tempdir, "home")
+        patcher = mock.patch.dict(os.environ, {"HOME": home, "USERPROFILE": home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def write(self, name, text):
+        path = os.path.join(self.tempdir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def parse(self, cache, featurefile, glyphNames=()):
+        with CapturingLogHandler("fontTools.feaLib.cache", "DEBUG") as captor:
+            doc = cache.parse(featurefile, glyphNames)
+        hit = any("Using cached" in r.msg for r in captor.records)
+        return doc.asFea(), hit
+
+    def test_cache_hit(self):
+        path = self.write("test.fea", "feature liga { sub f i by f_i; } liga;")
+        expected = Parser(path).parse().asFea()
+        cache = ParseTreeCache()
+        self.assertEqual(self.parse(cache, path), (expected, False))
+        self.assertEqual(self.parse(cache, path), (expected, True))
+        # a different glyph set may resolve glyph ranges differently
+        self.assertEqual(self.parse(cache, path, ["f", "i", "f_i"]),
+                         (expected, False))
+
+    def test_fresh_copies(self):
+        path = self.write("test.fea", "feature liga { sub f i by f_i; } liga;")
+        cache = ParseTreeCache()
+        doc1 = cache.parse(path)
+        doc1.statements.clear()
+        doc2 = cache.parse(path)
+        self.assertIsNot(doc1, doc2)
+        self.assertEqual(len(doc2.statements), 1)
+
+    def test_file_object(self):
+        cache = ParseTreeCache()
+        fea = "feature kern { pos a b -10; } kern;"
+        self.assertFalse(self.parse(cache, UnicodeIO(fea))[1])
+        self.assertTrue(self.parse(cache, UnicodeIO(fea))[1])
+        self.assertFalse(self.parse(cache, UnicodeIO(fea + "\n"))[1])
+
+    def test_changed_include(self):
+        self.write("kern.fea", "pos a b -10;")
+        path = self.write(
+            "test.fea", "feature kern { include(kern.fea); } kern;")
+        cache = ParseTreeCache()
+        self.assertFalse(self.parse(cache, path)[1])
+        self.assertTrue(self.parse(cache, path)[1])
+
+        self.write("kern.fea", "pos a b -20;")
+        fea, hit = self.parse(cache, path)
+        self.assertFalse(hit)
+        self.assertIn("-20", fea)
+        self.assertTrue(self.parse(cache, path)[1])
+
+    def test_directory(self):
+        path = self.write("test.fea", "feature liga { sub f i by f_i; } liga;")
+        directory = os.path.join(self.tempdir, "cache")
+        self.assertFalse(self.parse(ParseTreeCache(directory), path)[1])
+        self.assertEqual(len(os.listdir(directory)), 1)
+        self.assertTrue(self.parse(ParseTreeCache(directory), path)[1])
+        keyPath = os.path.join(
+            self.tempdir, "home", ".cache", "fonttools", "feaLib-cache.key")
+        self.assertTrue(os.path.isfile(keyPath))
+        # other keys don't accept the entry
+        self.assertFalse(
+            self.parse(ParseTreeCache(directory, key=b"other"), path)[1])
+
+    def test_directory_unsigned(self):
+        path = self.write("test.fea", "feature liga { sub f i by f_i; } liga;")
+        directory = os.path.join(self.tempdir, "cache")
+        cache = ParseTreeCache(directory, key=b"secret")
+        self.assertFalse(self.parse(cache, path)[1])
+        self.assertTrue(self.parse(ParseTreeCache(directory, key=b"secret"), path)[1])
+        # an entry replaced by anything not signed with the key is ignored
+        # rather than unpickled
+        victim = self.write("victim.txt", "")
+
+        class Payload(object):
+            def __reduce__(self):
+                return os.remove, (victim,)
+
+        entryPath = os.path.join(directory, os.listdir(directory)[0])
+        with open(entryPath, "wb") as f:
+            f.write(pickle.dumps(Payload()))
+        with CapturingLogHandler("fontTools.feaLib.cache", "WARNING") as captor:
+            self.assertFalse(
+                self.parse(ParseTreeCache(directory, key=b"secret"), path)[1])
+        captor.assertRegex("bad signature")
+        self.assertTrue(os.path.exists(victim))
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(unittest.main())
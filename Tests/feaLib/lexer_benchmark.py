@@ -0,0 +1,66 @@
+"""Measure the throughput of the feature file lexer.
+
+    python Tests/feaLib/lexer_benchmark.py [--repeat N] [file.fea ...]
+
+Without arguments, a synthetic feature file resembling the output of
+font editors (kerning classes and large pair positioning lookups) is
+generated and lexed.
+"""
+from fontTools.misc.py23 import *
+from fontTools.feaLib.lexer import Lexer
+import argparse
+import random
+import timeit
+
+
+def makeFeatureText(numGlyphs=3000, numLookups=200, numPairs=200, seed=0):
+    rand = random.Random(seed)
+    suffixes = ["alt", "ss01", "sc", "init.ss02", "medi"]
+    glyphs = ["uni%04X.%s" % (i, rand.choice(suffixes))
+              for i in range(numGlyphs)]
+    lines = ["# generated by lexer_benchmark.py",
+             "languagesystem DFLT dflt;", ""]
+    for i in range(numLookups):
+        lines.append("@kern%d = [%s];" % (i, " ".join(rand.sample(glyphs, 20))))
+    lines.append("feature kern {")
+    for i in range(numLookups):
+        lines.append("    lookup kern%d {" % i)
+        lines.append("        lookupflag IgnoreMarks;  # lookup %d" % i)
+        for _ in range(numPairs):
+            first, second = rand.sample(glyphs, 2)
+            lines.append("        pos %s %s %d;" % (
+                first, second, rand.randint(-200, 200)))
+        lines.append("    } kern%d;" % i)
+    lines.append("} kern;")
+    return "\n".join(lines) + "\n"
+
+
+def lex(text):
+    return sum(1 for _ in Lexer(text, "<benchmark>"))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", metavar="FILE", nargs="*")
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    if options.files:
+        inputs = []
+        for path in options.files:
+            with open(path, "r", encoding="utf-8") as f:
+                inputs.append((path, f.read()))
+    else:
+        inputs = [("<synthetic>", makeFeatureText())]
+
+    for name, text in inputs:
+        numTokens = lex(text)
+        seconds = min(timeit.repeat(
+            lambda: lex(text), number=1, repeat=options.repeat))
+        print("%s: %d tokens, %.1f MB in %.3f s (%.0f tokens/s, %.2f MB/s)" % (
+            name, numTokens, len(text) / 1e6, seconds, numTokens / seconds,
+            len(text) / 1e6 / seconds))
+
+
+if __name__ == "__main__":
+    main()
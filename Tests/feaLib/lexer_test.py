@@ -70,6 +70,7 @@ class LexerTest(unittest.TestCase):
         self.assertEqual(lex("0xCAFED00D"), [(Lexer.HEXADECIMAL, 0xCAFED00D)])
         self.assertEqual(lex("0xcafed00d"), [(Lexer.HEXADECIMAL, 0xCAFED00D)])
         self.assertEqual(lex("010"), [(Lexer.OCTAL, 0o10)])
+        self.assertEqual(lex("0"), [(Lexer.NUMBER, 0)])
 
     def test_float(self):
         self.assertEqual(lex("1.23 -4.5"),
@@ -82,6 +83,7 @@ class LexerTest(unittest.TestCase):
         self.assertEqual(
             lex("foo - -2"),
             [(Lexer.NAME, "foo"), (Lexer.SYMBOL, "-"), (Lexer.NUMBER, -2)])
+        self.assertEqual(lex("+:a"), [(Lexer.NAME, "+:a")])
 
     def test_comment(self):
         self.assertEqual(lex("# Comment\n#"),
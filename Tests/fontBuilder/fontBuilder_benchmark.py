@@ -0,0 +1,111 @@
+"""Time building and saving a font with many glyphs with fontBuilder.
+
+    python Tests/fontBuilder/fontBuilder_benchmark.py [--glyphs N] [--repeat N]
+
+The font is built twice: from dicts of glyph objects drawn with TTGlyphPen
+and of metrics keyed by glyph name, and with the bulk paths, from lists in
+glyph order of compiled glyph data and metrics. The glyphs are made of a few
+hundred distinct outlines; the data of these is compiled once. The glyph
+names are not stored, as the 'post' table format 2 cannot hold 65535 of
+them.
+"""
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from io import BytesIO
+import argparse
+import time
+
+
+NUM_OUTLINES = 500
+
+
+def drawGlyph(pen, index):
+    x = (index % NUM_OUTLINES) * 2
+    pen.moveTo((x, 0))
+    pen.lineTo((x + 100, 0))
+    pen.qCurveTo((x + 200, 100), (x + 100, 200))
+    pen.lineTo((x, 200))
+    pen.closePath()
+    pen.moveTo((x, 300))
+    pen.lineTo((x + 50, 500))
+    pen.lineTo((x + 100, 300))
+    pen.closePath()
+
+
+def makeCharacterMap(glyphOrder):
+    cmap = {}
+    for i, glyphName in enumerate(glyphOrder[1:]):
+        codepoint = 0x4E00 + i
+        if codepoint >= 0xD800:
+            # skip the surrogates
+            codepoint += 0x800
+        cmap[codepoint] = glyphName
+    return cmap
+
+
+def setupOtherTables(fb):
+    fb.setupHorizontalHeader(ascent=880, descent=-120)
+    fb.setupNameTable({"familyName": "Benchmark", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost(keepGlyphNames=False)
+
+
+def buildFromObjects(glyphOrder):
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+    fb.setupCharacterMap(makeCharacterMap(glyphOrder))
+    glyphs = {}
+    for i, glyphName in enumerate(glyphOrder):
+        pen = TTGlyphPen(None)
+        drawGlyph(pen, i)
+        glyphs[glyphName] = pen.glyph()
+    fb.setupGlyf(glyphs)
+    fb.setupHorizontalMetrics(
+        {glyphName: (1000, glyphs[glyphName].xMin) for glyphName in glyphOrder})
+    setupOtherTables(fb)
+    return fb
+
+
+def buildFromData(glyphOrder):
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+    fb.setupCharacterMap(makeCharacterMap(glyphOrder))
+    outlines = []
+    for i in range(NUM_OUTLINES):
+        pen = TTGlyphPen(None)
+        drawGlyph(pen, i)
+        glyph = pen.glyph()
+        glyph.recalcBounds(None)
+        outlines.append((glyph.compile(None), glyph.xMin))
+    numGlyphs = len(glyphOrder)
+    fb.setupGlyf(
+        [outlines[i % NUM_OUTLINES][0] for i in range(numGlyphs)])
+    fb.setupHorizontalMetrics(
+        [(1000, outlines[i % NUM_OUTLINES][1]) for i in range(numGlyphs)])
+    setupOtherTables(fb)
+    return fb
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--glyphs", type=int, default=65535)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    glyphOrder = [".notdef"] + ["uni%04X" % i for i in range(1, options.glyphs)]
+    for name, build in [("objects", buildFromObjects), ("bulk", buildFromData)]:
+        buildTimes = []
+        saveTimes = []
+        for _ in range(options.repeat):
+            start = time.time()
+            fb = build(glyphOrder)
+            buildTimes.append(time.time() - start)
+            start = time.time()
+            fb.save(BytesIO())
+            saveTimes.append(time.time() - start)
+        print("%-8s %d glyphs: build %.3f s, save %.3f s (best of %d)" % (
+            name, len(glyphOrder), min(buildTimes), min(saveTimes), options.repeat))
+
+
+if __name__ == "__main__":
+    main()
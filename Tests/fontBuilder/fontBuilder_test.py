@@ -313,3 +313,42 @@ def test_unicodeVariationSequences(tmpdir):
     fb.setupCharacterMap(cmap, uvs)
     fb.save(outPath)
     _verifyOutput(outPath, tables=["cmap"])
+
+
+def _buildBulkTestFont(glyphs, metrics):
+    fb, _, nameStrings = _setupFontBuilder(True)
+    fb.updateHead(created=0, modified=0)
+    fb.setupGlyf(glyphs)
+    fb.setupHorizontalMetrics(metrics)
+    fb.setupHorizontalHeader(ascent=824, descent=200)
+    fb.setupNameTable(nameStrings)
+    fb.setupOS2()
+    fb.setupPost()
+    return fb
+
+
+def test_setupGlyf_setupHorizontalMetrics_glyphOrder(tmpdir):
+    pen = TTGlyphPen(None)
+    drawTestGlyph(pen)
+    glyph = pen.glyph()
+    glyph.recalcBounds(None)
+    glyphData = glyph.compile(None)
+    glyphOrder = [".notdef", ".null", "A", "a"]
+    fbDict = _buildBulkTestFont(
+        {gn: glyph for gn in glyphOrder}, {gn: (600, 100) for gn in glyphOrder})
+    # the bulk paths: lists in glyph order, and compiled glyph data
+    fbList = _buildBulkTestFont([glyphData] * 4, [(600, 100)] * 4)
+
+    assert not hasattr(fbList.font["glyf"].glyphs["A"], "xMin")
+    assert fbList.font["hmtx"].metrics == fbDict.font["hmtx"].metrics
+    assert fbList.font["OS/2"].xAvgCharWidth == 600
+
+    pathDict = os.path.join(str(tmpdir), "dict.ttf")
+    pathList = os.path.join(str(tmpdir), "list.ttf")
+    fbDict.save(pathDict)
+    fbList.save(pathList)
+    with open(pathDict, "rb") as f1, open(pathList, "rb") as f2:
+        assert f1.read() == f2.read()
+
+    with pytest.raises(ValueError, match="expected 4 values in glyph order, got 3"):
+        fbList.setupHorizontalMetrics([(600, 100)] * 3)
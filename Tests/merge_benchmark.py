@@ -0,0 +1,110 @@
+"""Time merging fonts with fontTools.merge, and report its peak memory.
+
+    python Tests/merge_benchmark.py [--fonts N] [--glyphs N] [--repeat N]
+
+N synthetic fonts of N glyphs each are built with fontBuilder. Each font
+maps its own block of characters, and has a 'kern' feature of pair and
+class kerning. Half of the glyph names are the same in all fonts, so that
+the merger has to rename these. The fonts are merged from their compiled
+data, and the merged font is then saved.
+"""
+from fontTools.fontBuilder import FontBuilder
+from fontTools.merge import Merger
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from io import BytesIO
+import argparse
+import time
+import tracemalloc
+
+
+def makeFont(index, numGlyphs):
+    glyphOrder = [".notdef"]
+    for i in range(1, numGlyphs):
+        if i % 2:
+            glyphOrder.append("glyph%05d" % i)
+        else:
+            glyphOrder.append("font%d.glyph%05d" % (index, i))
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+    fb.setupCharacterMap(
+        {0x4E00 + index * numGlyphs + i: glyphName
+         for i, glyphName in enumerate(glyphOrder[1:])})
+    glyphs = {}
+    for i, glyphName in enumerate(glyphOrder):
+        pen = TTGlyphPen(None)
+        x = (i * 7 + index * 13) % 800
+        pen.moveTo((x, 0))
+        pen.lineTo((x + 100, 50))
+        pen.qCurveTo((x + 150, 100), (x, 150))
+        pen.closePath()
+        glyphs[glyphName] = pen.glyph()
+    fb.setupGlyf(glyphs)
+    fb.setupHorizontalMetrics(
+        {glyphName: (1000, glyphs[glyphName].xMin) for glyphName in glyphOrder})
+    fb.setupHorizontalHeader(ascent=880, descent=-120)
+    fb.setupNameTable({"familyName": "Merge%d" % index, "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    fb.addOpenTypeFeatures(makeFeatures(glyphOrder))
+    data = BytesIO()
+    fb.save(data)
+    return data.getvalue()
+
+
+def makeFeatures(glyphOrder):
+    glyphNames = glyphOrder[1:]
+    half = len(glyphNames) // 2
+    lines = [
+        "@LEFT = [%s];" % " ".join(glyphNames[:half]),
+        "@RIGHT = [%s];" % " ".join(glyphNames[half:]),
+        "feature kern {",
+    ]
+    for i in range(0, min(half, 200), 2):
+        lines.append("    pos %s %s -%d;" % (glyphNames[i], glyphNames[i + half], i % 50))
+    lines.append("    pos @LEFT @RIGHT -20;")
+    lines.append("} kern;")
+    return "\n".join(lines)
+
+
+def timeit(func, repeat):
+    """Return the best time of 'repeat' runs of func, and the peak memory
+    allocated during another run, which is slower as it is traced."""
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fonts", type=int, default=4)
+    parser.add_argument("--glyphs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    fontData = [makeFont(i, options.glyphs) for i in range(options.fonts)]
+    print("%d fonts of %d glyphs: %d bytes" % (
+        options.fonts, options.glyphs, sum(len(data) for data in fontData)))
+
+    def merge():
+        return Merger().merge([BytesIO(data) for data in fontData])
+
+    t, peak = timeit(merge, options.repeat)
+    print("merge: %.3f s, peak memory %.1f MB" % (t, peak / 2**20))
+
+    font = merge()
+    output = BytesIO()
+    t, peak = timeit(lambda: font.save(BytesIO()), options.repeat)
+    font.save(output)
+    print("save:  %.3f s, peak memory %.1f MB, %d glyphs, %d bytes" % (
+        t, peak / 2**20, len(font.getGlyphOrder()), len(output.getvalue())))
+
+
+if __name__ == "__main__":
+    main()
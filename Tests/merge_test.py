@@ -1,12 +1,68 @@
 from fontTools.misc.py23 import *
 from fontTools import ttLib
 from fontTools.merge import *
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
 import unittest
 
 
+def makeFont(glyphOrder, cmapping, postNames=True):
+	fb = FontBuilder(1000, isTTF=True)
+	fb.setupGlyphOrder(glyphOrder)
+	fb.setupCharacterMap(cmapping)
+	glyphs = {}
+	for i, glyphName in enumerate(glyphOrder):
+		pen = TTGlyphPen(None)
+		pen.moveTo((0, 0))
+		pen.lineTo((0, 100 + i))
+		pen.lineTo((100, 100 + i))
+		pen.closePath()
+		glyphs[glyphName] = pen.glyph()
+	fb.setupGlyf(glyphs)
+	fb.setupHorizontalMetrics({glyphName: (500 + i, 0)
+		for i, glyphName in enumerate(glyphOrder)})
+	fb.setupHorizontalHeader(ascent=800, descent=-200)
+	fb.setupNameTable(dict(familyName="Test", styleName="Regular"))
+	fb.setupOS2()
+	fb.setupPost(keepGlyphNames=postNames)
+	f = BytesIO()
+	fb.save(f)
+	f.seek(0)
+	return f
+
+
 class MergeIntegrationTest(unittest.TestCase):
-	# TODO
-	pass
+
+	def test_merge_renames_glyphs(self):
+		font1 = makeFont([".notdef", "A", "B"], {0x41: "A", 0x42: "B"})
+		font2 = makeFont([".notdef", "A", "C"], {0x391: "A", 0x43: "C"})
+		mega = Merger().merge([font1, font2])
+
+		self.assertEqual(mega.getGlyphOrder(),
+			[".notdef", "A", "B", ".notdef#1", "A#1", "C"])
+		self.assertEqual(mega["maxp"].numGlyphs, 6)
+		self.assertEqual(mega.getBestCmap(),
+			{0x41: "A", 0x42: "B", 0x391: "A#1", 0x43: "C"})
+		self.assertEqual(mega["hmtx"]["A#1"], (501, 0))
+		self.assertEqual(mega["hmtx"]["C"], (502, 0))
+		self.assertEqual(mega["glyf"]["C"].yMax, 102)
+
+		f = BytesIO()
+		mega.save(f)
+		f.seek(0)
+		font = ttLib.TTFont(f)
+		self.assertEqual(font.getGlyphOrder(), mega.getGlyphOrder())
+		self.assertEqual(font["glyf"]["A#1"].yMax, 101)
+
+	def test_merge_without_glyph_names(self):
+		font1 = makeFont([".notdef", "A"], {0x41: "A"}, postNames=False)
+		font2 = makeFont([".notdef", "B"], {0x42: "B"}, postNames=False)
+		mega = Merger().merge([font1, font2])
+
+		self.assertEqual(mega.getGlyphOrder(),
+			[".notdef", "A", ".notdef#1", "B"])
+		self.assertEqual(mega.getBestCmap(), {0x41: "A", 0x42: "B"})
+		self.assertEqual(mega["hmtx"]["B"], (501, 0))
 
 class gaspMergeUnitTest(unittest.TestCase):
 	def setUp(self):
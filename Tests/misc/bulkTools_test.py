@@ -0,0 +1,55 @@
+from fontTools.misc.bulkTools import mapInProcesses, pausedGarbageCollection
+import concurrent.futures
+import gc
+import pytest
+
+
+def double(chunk, offset=0):
+    return [item * 2 + offset for item in chunk]
+
+
+class _Local(object):
+    pass
+
+
+def test_mapInProcesses():
+    items = list(range(100))
+    assert mapInProcesses(double, items, 2) == [i * 2 for i in items]
+    assert mapInProcesses(double, items, 2, (1,)) == [i * 2 + 1 for i in items]
+
+
+@pytest.mark.parametrize("maxWorkers, items", [(1, [1, 2]), (0, [1, 2]), (2, [1])])
+def test_mapInProcesses_serial(maxWorkers, items):
+    assert mapInProcesses(double, items, maxWorkers) is None
+
+
+def test_mapInProcesses_unpicklable(caplog):
+    def local(chunk):
+        return chunk
+
+    assert mapInProcesses(local, [1, 2], 2) is None
+    assert mapInProcesses(double, [1, 2], 2, (lambda: None,)) is None
+    assert "running it serially" in caplog.text
+
+
+def test_mapInProcesses_noProcesses(monkeypatch):
+    def noProcesses(*args, **kwargs):
+        raise OSError("no processes")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", noProcesses)
+    assert mapInProcesses(double, [1, 2], 2) is None
+
+
+def test_pausedGarbageCollection():
+    assert gc.isenabled()
+    with pausedGarbageCollection():
+        assert not gc.isenabled()
+        with pausedGarbageCollection():
+            assert not gc.isenabled()
+        # only the outermost one enables it again
+        assert not gc.isenabled()
+    assert gc.isenabled()
+    with pytest.raises(ValueError):
+        with pausedGarbageCollection():
+            raise ValueError
+    assert gc.isenabled()
@@ -0,0 +1,31 @@
+from fontTools.misc.lazyTools import LazyDict
+
+
+class SquaresDict(LazyDict):
+
+    def __init__(self, keys):
+        LazyDict.__init__(self, keys)
+        self.loaded = []
+
+    def _loadValue(self, key):
+        self.loaded.append(key)
+        return key * key
+
+
+def test_LazyDict():
+    d = SquaresDict([3, 1, 2])
+    assert list(d) == [3, 1, 2]
+    assert len(d) == 3
+    assert 2 in d and 4 not in d
+    assert d.loaded == []
+    assert d[2] == 4
+    assert d[2] == 4
+    assert d.loaded == [2]
+    assert d.isLoaded(2) and not d.isLoaded(3)
+    d[3] = "three"
+    assert d.isLoaded(3)
+    del d[1]
+    d[5] = 0
+    assert dict(d.items()) == {3: "three", 2: 4, 5: 0}
+    assert d.loaded == [2]
+    assert d == {2: 4, 3: "three", 5: 0}
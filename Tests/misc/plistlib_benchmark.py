@@ -0,0 +1,99 @@
+"""Compare the time it takes to read and write large property lists with
+fontTools.misc.plistlib, and through an element tree, as it used to do.
+
+    python Tests/misc/plistlib_benchmark.py [--pairs N] [--repeat N] [PLIST ...]
+
+Without PLIST arguments, synthetic kerning.plist and groups.plist data with
+the given number of kerning pairs is used.
+"""
+from fontTools.misc import etree
+from fontTools.misc import plistlib
+from io import BytesIO
+import argparse
+import os
+import random
+import time
+
+
+def makeKerning(numPairs, pairsPerGlyph=100, numGlyphs=5000):
+    rnd = random.Random(0)
+    kerning = {}
+    for i in range(numPairs // pairsPerGlyph):
+        first = "public.kern1.group%d" % i if i % 3 else "glyph%d" % i
+        kerning[first] = {
+            "glyph%d" % j: rnd.randint(-200, 200)
+            for j in rnd.sample(range(numGlyphs), pairsPerGlyph)
+        }
+    return kerning
+
+
+def makeGroups(numGroups, glyphsPerGroup=20):
+    groups = {}
+    for i in range(numGroups):
+        glyphNames = ["glyph%d" % j for j in range(i, i + glyphsPerGroup)]
+        groups["public.kern1.group%d" % i] = glyphNames
+        groups["public.kern2.group%d" % i] = glyphNames
+    return groups
+
+
+def loadsTree(data):
+    parser = etree.XMLParser(target=plistlib.PlistTarget())
+    result = etree.parse(BytesIO(data), parser=parser)
+    try:
+        return result.getroot()
+    except AttributeError:
+        return result
+
+
+def dumpsTree(value):
+    root = etree.Element("plist", version="1.0")
+    root.append(plistlib.totree(value))
+    fp = BytesIO()
+    fp.write(b"\n".join((plistlib.XML_DECLARATION, plistlib.PLIST_DOCTYPE, b"")))
+    etree.ElementTree(root).write(
+        fp, encoding="utf-8", pretty_print=True, xml_declaration=False
+    )
+    return fp.getvalue()
+
+
+def timeit(func, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        result = func(arg)
+        times.append(time.time() - start)
+    return min(times), result
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("plists", metavar="PLIST", nargs="*")
+    parser.add_argument("--pairs", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    if options.plists:
+        samples = []
+        for path in options.plists:
+            with open(path, "rb") as f:
+                samples.append((os.path.basename(path), plistlib.load(f)))
+    else:
+        samples = [
+            ("kerning", makeKerning(options.pairs)),
+            ("groups", makeGroups(options.pairs // 100)),
+        ]
+
+    for name, value in samples:
+        treeDump, data = timeit(dumpsTree, value, options.repeat)
+        dump, newData = timeit(plistlib.dumps, value, options.repeat)
+        assert newData == data
+        treeLoad, loaded = timeit(loadsTree, data, options.repeat)
+        load, newLoaded = timeit(plistlib.loads, data, options.repeat)
+        assert newLoaded == loaded
+        print("%s (%d bytes)" % (name, len(data)))
+        print("  dump: %.3f s (tree: %.3f s)" % (dump, treeDump))
+        print("  load: %.3f s (tree: %.3f s)" % (load, treeLoad))
+
+
+if __name__ == "__main__":
+    main()
@@ -538,6 +538,65 @@ def test_custom_mapping():
     assert plistlib.loads(data) == {"a": 1, "b": 2}
 
 
+def _dumps_tree(value, pretty_print=True, **kwargs):
+    # serialize the element tree built by totree(), as dumps() used to do
+    root = etree.Element("plist", version="1.0")
+    root.append(plistlib.totree(value, pretty_print=pretty_print, **kwargs))
+    fp = BytesIO()
+    etree.ElementTree(root).write(
+        fp, encoding="utf-8", pretty_print=pretty_print, xml_declaration=False
+    )
+    return fp.getvalue()
+
+
+@pytest.mark.parametrize("pretty_print", [True, False])
+def test_dumps_same_as_tree(parametrized_pl, pretty_print):
+    pl, use_builtin_types = parametrized_pl
+    pl["nested"] = [
+        {},
+        [],
+        [[b"\0" * 100], {"data": b"\1" * 80, "empty": b""}],
+        {"<&>": "a < b && c > d", "": "", "tab": "\t", "newline": "\n"},
+        {1: "skipped"},
+        (-1 << 63, (1 << 64) - 1, 1e-300, float("inf"), True),
+    ]
+    if not use_builtin_types:
+        del pl["nested"][2]
+    data = plistlib.dumps(
+        pl,
+        use_builtin_types=use_builtin_types,
+        pretty_print=pretty_print,
+        skipkeys=True,
+    )
+    if pretty_print:
+        header = plistlib.XML_DECLARATION + b"\n" + plistlib.PLIST_DOCTYPE + b"\n"
+    else:
+        header = plistlib.XML_DECLARATION + plistlib.PLIST_DOCTYPE
+    assert data == header + _dumps_tree(
+        pl,
+        use_builtin_types=use_builtin_types,
+        pretty_print=pretty_print,
+        skipkeys=True,
+    )
+    pl2 = plistlib.loads(data, use_builtin_types=use_builtin_types)
+    assert pl2["aDict"] == pl["aDict"]
+
+
+def test_entity_declarations():
+    data = (
+        b'<?xml version="1.0" encoding="UTF-8"?>'
+        b'<!DOCTYPE plist [<!ENTITY entity "replacement text">]>'
+        b'<plist version="1.0"><string>&entity;</string></plist>'
+    )
+    with pytest.raises(ValueError):
+        plistlib.loads(data)
+
+
+def test_parse_error():
+    with pytest.raises(etree.ParseError):
+        plistlib.loads(b"<plist><dict><key>a</key></plist>")
+
+
 if __name__ == "__main__":
     import sys
 
@@ -0,0 +1,114 @@
+from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+from fontTools.misc import profiling
+from fontTools.misc.py23 import BytesIO, StringIO
+from fontTools.ttLib import TTFont
+import json
+import logging
+import os
+import pytest
+
+
+TEST_GVAR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "subset", "data", "TestGVAR.ttx"
+)
+
+
+def test_disabled():
+    assert not profiling.enabled
+    assert profiling.measure("compile", "glyf") is profiling.measure("other")
+
+    def func():
+        pass
+
+    assert profiling.timed(func, "compile") is func
+
+
+def test_addSink():
+    events = []
+
+    def sink(event, key, elapsed):
+        events.append((event, key))
+
+    profiling.addSink(sink)
+    try:
+        assert profiling.enabled
+        with profiling.measure("compile", "glyf"):
+            pass
+        profiling.timed(lambda x: x, "compileGlyph", "gvar")(1)
+        profiling.emit("fixOverflows", None, 0.5)
+    finally:
+        profiling.removeSink(sink)
+    assert not profiling.enabled
+    assert events == [
+        ("compile", "glyf"),
+        ("compileGlyph", "gvar"),
+        ("fixOverflows", None),
+    ]
+
+
+def test_measure_exception():
+    with profiling.Stats() as stats:
+        with pytest.raises(ValueError):
+            with profiling.measure("decompile", "head"):
+                raise ValueError
+    assert stats.counts == {("decompile", "head"): 1}
+
+
+def test_Stats_font():
+    with profiling.Stats() as stats:
+        font = TTFont()
+        font.importXML(TEST_GVAR)
+        buf = BytesIO()
+        font.save(buf)
+        font = TTFont(buf)
+        font["gvar"]
+        font.saveXML(StringIO(), tables=["gvar"])
+    assert not profiling.enabled
+
+    numGlyphs = len(font.getGlyphOrder())
+    counts = stats.counts
+    assert counts[("fromXML", "glyf")] == numGlyphs
+    assert counts[("compile", "gvar")] == 1
+    assert counts[("compileGlyph", "glyf")] == numGlyphs
+    assert counts[("compileGlyph", "gvar")] == numGlyphs
+    assert counts[("decompile", "gvar")] == 1
+    assert counts[("decompileGlyph", "gvar")] == numGlyphs
+    assert counts[("decompileGlyph", "glyf")] > 0
+    assert counts[("toXML", "gvar")] == 1
+    assert all(t >= 0 for t in stats.times.values())
+
+    lines = stats.report(limit=3).splitlines()
+    assert len(lines) == 4
+    assert lines[0].split() == ["event", "key", "count", "time", "(s)"]
+
+
+def test_getAllData():
+    font = TTFont()
+    font.importXML(TEST_GVAR)
+    addOpenTypeFeaturesFromString(font, "feature kern { pos zero plus -10; } kern;")
+    with profiling.Stats() as stats:
+        font.getTableData("GPOS")
+    assert stats.counts == {("compile", "GPOS"): 1, ("getAllData", "GPOS"): 1}
+    assert stats.times[("compile", "GPOS")] >= stats.times[("getAllData", "GPOS")]
+
+
+def test_LoggingSink(caplog):
+    with caplog.at_level(logging.DEBUG, logger="fontTools.misc.profiling"):
+        with profiling.LoggingSink():
+            profiling.emit("compile", "glyf", 0.25)
+            profiling.emit("fixOverflows", None, 0.5)
+    assert [r.getMessage() for r in caplog.records] == [
+        "Took 0.250s to compile 'glyf'",
+        "Took 0.500s to fixOverflows",
+    ]
+
+
+def test_JSONSink():
+    f = StringIO()
+    with profiling.JSONSink(f):
+        profiling.emit("compile", "glyf", 0.25)
+        profiling.emit("fixOverflows", None, 0.5)
+    assert [json.loads(line) for line in f.getvalue().splitlines()] == [
+        {"event": "compile", "key": "glyf", "time": 0.25},
+        {"event": "fixOverflows", "key": None, "time": 0.5},
+    ]
@@ -0,0 +1,95 @@
+from fontTools.misc.py23 import *
+from fontTools.misc import sstruct
+import struct
+import pytest
+
+
+FORMAT = """
+    # comments are allowed
+    >  # big endian
+    ashort: h
+    along: l
+    abyte: b  # a byte
+    achar: c
+    astr: 5s
+    afloat: f; adouble: d
+    afixed: 16.16F
+    x  # pad byte
+    ubyte: B
+"""
+
+VALUES = dict(
+    ashort=0x7fff, along=-2, abyte=0x7f, achar="a", astr="12345",
+    afloat=0.5, adouble=0.25, afixed=1.5, ubyte=255)
+
+
+class Obj(object):
+    pass
+
+
+def test_compile_cached():
+    compiled = sstruct.compile(FORMAT)
+    assert sstruct.compile(FORMAT) is compiled
+    assert compiled.size == sstruct.calcsize(FORMAT) == 31
+    assert compiled.names == [
+        "ashort", "along", "abyte", "achar", "astr", "afloat", "adouble",
+        "afixed", "ubyte"]
+    assert compiled.fixes == {"afixed": 16}
+
+
+def test_pack_unpack_matches_struct():
+    compiled = sstruct.compile(FORMAT)
+    data = compiled.pack(VALUES)
+    assert data == struct.pack(
+        ">hlbc5sfdlxB", 0x7fff, -2, 0x7f, b"a", b"12345", 0.5, 0.25,
+        0x18000, 255)
+    assert sstruct.pack(FORMAT, VALUES) == data
+    assert compiled.unpack(data) == VALUES
+    assert sstruct.unpack(FORMAT, data) == VALUES
+
+
+def test_unpack_object():
+    compiled = sstruct.compile(FORMAT)
+    data = compiled.pack(VALUES)
+    obj = Obj()
+    assert compiled.unpack(data, obj) is obj
+    assert vars(obj) == VALUES
+    assert compiled.pack(obj) == data
+
+
+def test_unpack2():
+    compiled = sstruct.compile(FORMAT)
+    data = compiled.pack(VALUES)
+    obj, rest = compiled.unpack2(data + b"rest")
+    assert obj == VALUES
+    assert rest == b"rest"
+    with pytest.raises(struct.error):
+        compiled.unpack(data + b"rest")
+
+
+def test_unpack_into_memoryview():
+    compiled = sstruct.compile(FORMAT)
+    data = b"head" + compiled.pack(VALUES) + b"tail"
+    obj = compiled.unpack_into(Obj(), memoryview(data), 4)
+    assert vars(obj) == VALUES
+    assert compiled.unpack_into({}, bytearray(data), 4) == VALUES
+    with pytest.raises(struct.error):
+        compiled.unpack_into({}, data, 9)
+
+
+def test_pack_into():
+    compiled = sstruct.compile(FORMAT)
+    buf = bytearray(compiled.size + 2)
+    compiled.pack_into(buf, 2, VALUES)
+    assert bytes(buf[2:]) == compiled.pack(VALUES)
+
+
+def test_undecodable_string():
+    compiled = sstruct.compile(">\ntag: 4s")
+    assert compiled.unpack(b"\xff\x00ab") == {"tag": b"\xff\x00ab"}
+    assert compiled.unpack(b"OS/2") == {"tag": "OS/2"}
+
+
+def test_bad_format():
+    with pytest.raises(sstruct.Error):
+        sstruct.compile("foo: 5h")
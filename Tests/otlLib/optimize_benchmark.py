@@ -0,0 +1,109 @@
+"""Measure how much fontTools.otlLib.optimize shrinks class kerning.
+
+    python Tests/otlLib/optimize_benchmark.py [--classes N] [--density D] [font.ttf ...]
+
+For each font, the compiled size of GPOS is reported before and after
+compacting its PairPos lookups, together with the time and peak memory it
+took. Without arguments, the real class kerning of a test font of the
+cffLib tests is used, and a synthetic font, with N classes (by default,
+60) for each of three scripts that are never kerned against each other;
+each pair of classes of a script is kerned with probability D (by default,
+0.5). Sparse kerning leads to many merges of first classes.
+"""
+from fontTools.misc.py23 import *
+from fontTools.feaLib.builder import addOpenTypeFeatures
+from fontTools.fontBuilder import FontBuilder
+from fontTools.otlLib.optimize import compactGPOS
+from fontTools.ttLib import TTFont
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+
+TEST_FONT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "cffLib", "data", "LinLibertine_RBI.otf")
+
+
+def makeKerningFont(scripts=("latn", "grek", "cyrl"), numClasses=60,
+                    classSize=4, density=0.5, seed=0):
+    rand = random.Random(seed)
+    glyphClasses = {
+        script: [["%s.%d.%d" % (script, i, j) for j in range(classSize)]
+                 for i in range(numClasses)]
+        for script in scripts}
+    glyphOrder = [".notdef"] + [
+        glyph for script in scripts for glyphClass in glyphClasses[script]
+        for glyph in glyphClass]
+
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+
+    lines = []
+    for script in scripts:
+        for i, glyphClass in enumerate(glyphClasses[script]):
+            lines.append("@%s_%d = [%s];" % (script, i, " ".join(glyphClass)))
+    lines.append("feature kern {")
+    for script in scripts:
+        for i in range(numClasses):
+            for j in range(numClasses):
+                if rand.random() < density:
+                    lines.append("    pos @%s_%d @%s_%d %d;" % (
+                        script, i, script, j, rand.randint(-100, 50)))
+    lines.append("} kern;")
+    addOpenTypeFeatures(fb.font, UnicodeIO("\n".join(lines)))
+    return fb.font
+
+
+def gposSize(font):
+    return len(font["GPOS"].compile(font))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=60)
+    parser.add_argument("--density", type=float, default=0.5)
+    parser.add_argument("fonts", metavar="FONT", nargs="*")
+    options = parser.parse_args(args)
+
+    # compiling GPOS may split large subtables, so each measurement is
+    # made on a newly loaded font
+    if options.fonts:
+        fonts = [(path, lambda path=path: TTFont(path))
+                 for path in options.fonts]
+    else:
+        fonts = [
+            (os.path.basename(TEST_FONT), lambda: TTFont(TEST_FONT)),
+            ("<synthetic>", lambda: makeKerningFont(
+                numClasses=options.classes, density=options.density)),
+        ]
+
+    for name, loadFont in fonts:
+        font = loadFont()
+        if "GPOS" not in font:
+            print("%s: no GPOS table" % name)
+            continue
+        before = gposSize(font)
+        # the peak memory is measured in another run, which is slower as
+        # it is traced
+        font = loadFont()
+        font["GPOS"]
+        tracemalloc.start()
+        compactGPOS(font)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        font = loadFont()
+        font["GPOS"]
+        start = time.time()
+        compactGPOS(font)
+        seconds = time.time() - start
+        after = gposSize(font)
+        print("%s: GPOS %d -> %d bytes (%.1f%%) in %.3f s, "
+              "peak memory %.1f MB" % (
+                  name, before, after, 100.0 * after / before, seconds,
+                  peak / 2**20))
+
+if __name__ == "__main__":
+    main()
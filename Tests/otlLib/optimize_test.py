@@ -0,0 +1,205 @@
+from fontTools.otlLib import builder
+from fontTools.otlLib.optimize import (
+    compactGPOS, compactLookup, compactPairPosSubtable, _Cluster,
+    _clusterRows, _MergeCandidates)
+from fontTools.ttLib import TTFont, newTable
+from fontTools.ttLib.tables import otTables
+import itertools
+import random
+import pytest
+
+
+LATIN = ["a%d" % i for i in range(20)]
+GREEK = ["alpha%d" % i for i in range(20)]
+GLYPHS = [".notdef"] + LATIN + GREEK
+GLYPHMAP = {name: num for num, name in enumerate(GLYPHS)}
+
+
+def classes(glyphs, size=2):
+    return [tuple(glyphs[i:i+size]) for i in range(0, len(glyphs), size)]
+
+
+def makeSubtable(pairs):
+    values = {}
+    for i, (gc1, gc2) in enumerate(pairs):
+        value = builder.buildValue({"XAdvance": -(i % 50) - 1})
+        values[(gc1, gc2)] = (value, None)
+    return builder.buildPairPosClassesSubtable(values, GLYPHMAP)
+
+
+def scriptPairs():
+    # kerning within each script only, so the matrix is sparse
+    pairs = []
+    for glyphs in (LATIN, GREEK):
+        pairs.extend(itertools.product(classes(glyphs), classes(glyphs)))
+    return pairs
+
+
+def blockPairs(size):
+    # kerning within blocks of 'size' glyphs only
+    pairs = []
+    for glyphs in (LATIN, GREEK):
+        for i in range(0, len(glyphs), size):
+            block = classes(glyphs[i:i+size])
+            pairs.extend(itertools.product(block, block))
+    return pairs
+
+
+def clusterRowsGreedily(masks, rowSizes, columnSize, valueSize, maxClusters):
+    """Reference for _clusterRows: merge the pair of clusters that gains
+    most, considering all pairs each time."""
+    byMask = {}
+    for class1 in sorted(masks):
+        byMask.setdefault(masks[class1], []).append(class1)
+    clusters = []
+    for mask, classes1 in byMask.items():
+        cluster = _Cluster.fromRows(mask, classes1, rowSizes)
+        cluster.estimateSize(columnSize, valueSize)
+        clusters.append(cluster)
+    while len(clusters) > 1:
+        gain, i, j = max(
+            (a.mergeGain(b, columnSize, valueSize), -i, -j)
+            for i, a in enumerate(clusters)
+            for j, b in enumerate(clusters) if i < j)
+        if gain <= 0 and len(clusters) <= maxClusters:
+            break
+        merged = clusters[-i].merge(clusters[-j])
+        merged.estimateSize(columnSize, valueSize)
+        del clusters[-j], clusters[-i]
+        clusters.append(merged)
+    return sorted(((cluster.mask, sorted(cluster.classes1))
+                   for cluster in clusters),
+                  key=lambda cluster: cluster[1][0])
+
+
+def positioning(subtables):
+    """{(glyph1, glyph2): values}, as applied by a shaping engine."""
+    result = {}
+    for glyph1, glyph2 in itertools.product(GLYPHS, GLYPHS):
+        for st in subtables:
+            if glyph1 not in st.Coverage.glyphs:
+                continue
+            class1 = st.ClassDef1.classDefs.get(glyph1, 0)
+            class2 = st.ClassDef2.classDefs.get(glyph2, 0)
+            record = st.Class1Record[class1].Class2Record[class2]
+            result[(glyph1, glyph2)] = (
+                getattr(record.Value1, "XAdvance", 0) or 0,
+                getattr(record.Value2, "XAdvance", 0) or 0)
+            break
+    return result
+
+
+def makeFont(subtables):
+    font = TTFont()
+    font.setGlyphOrder(GLYPHS)
+    lookup = builder.buildLookup(subtables)
+    gpos = otTables.GPOS()
+    gpos.Version = 0x00010000
+    gpos.ScriptList = otTables.ScriptList()
+    gpos.ScriptList.ScriptRecord = []
+    gpos.FeatureList = otTables.FeatureList()
+    gpos.FeatureList.FeatureRecord = []
+    gpos.LookupList = otTables.LookupList()
+    gpos.LookupList.Lookup = [lookup]
+    font["GPOS"] = newTable("GPOS")
+    font["GPOS"].table = gpos
+    return font
+
+
+class CompactPairPosTest(object):
+
+    def test_split_sparse(self):
+        subtable = makeSubtable(scriptPairs())
+        expected = positioning([subtable])
+        compacted = compactPairPosSubtable(subtable, GLYPHMAP)
+        assert len(compacted) == 2
+        assert [st.Class2Count for st in compacted] == [11, 11]
+        assert positioning(compacted) == expected
+
+        font = makeFont([subtable])
+        before = font["GPOS"].compile(font)
+        font = makeFont(compacted)
+        after = font["GPOS"].compile(font)
+        assert len(after) < len(before)
+
+    def test_dense_unchanged(self):
+        subtable = makeSubtable(
+            list(itertools.product(classes(LATIN), classes(GREEK))))
+        assert compactPairPosSubtable(subtable, GLYPHMAP) == [subtable]
+
+    def test_unused_columns_dropped(self):
+        pairs = list(itertools.product(classes(LATIN), classes(LATIN)))
+        subtable = makeSubtable(pairs)
+        # a second class that is only kerned with zeros
+        zero = builder.buildValue({"XAdvance": 0})
+        for rec1 in subtable.Class1Record:
+            rec1.Class2Record[-1].Value1 = zero
+        expected = positioning([subtable])
+        compacted = compactPairPosSubtable(subtable, GLYPHMAP)
+        assert len(compacted) == 1
+        assert compacted[0].Class2Count == subtable.Class2Count - 1
+        assert positioning(compacted) == expected
+
+    def test_class0_column_keeps_all(self):
+        subtable = makeSubtable(scriptPairs())
+        # the glyphs of the first class 0 position all other glyphs
+        value = builder.buildValue({"XAdvance": 7})
+        subtable.Class1Record[0].Class2Record[0].Value1 = value
+        glyph = next(g for g in subtable.Coverage.glyphs
+                     if g not in subtable.ClassDef1.classDefs)
+        expected = positioning([subtable])
+        compacted = compactPairPosSubtable(subtable, GLYPHMAP)
+        assert positioning(compacted) == expected
+        for st in compacted:
+            if glyph in st.Coverage.glyphs:
+                assert st.Class2Count == subtable.Class2Count
+
+    def test_maxSubtables(self):
+        subtable = makeSubtable(blockPairs(4))
+        expected = positioning([subtable])
+        assert len(compactPairPosSubtable(subtable, GLYPHMAP)) > 3
+        compacted = compactPairPosSubtable(subtable, GLYPHMAP, maxSubtables=3)
+        assert len(compacted) == 3
+        assert positioning(compacted) == expected
+
+    @pytest.mark.parametrize("limit", [2, _MergeCandidates.LIMIT])
+    @pytest.mark.parametrize("density", [0.02, 0.1, 0.5])
+    def test_clusterRows(self, density, limit, monkeypatch):
+        # only the best merges of each cluster are kept track of, but the
+        # clusters are the same as when looking at all pairs each time
+        monkeypatch.setattr(_MergeCandidates, "LIMIT", limit)
+        rand = random.Random(1)
+        masks = {}
+        for class1 in range(80):
+            block = class1 % 5 * 20
+            masks[class1] = sum(1 << (block + class2 + 1)
+                                for class2 in range(20)
+                                if rand.random() < density)
+        rowSizes = {class1: 2 * rand.randint(1, 3) for class1 in masks}
+        for maxClusters in (2, 8):
+            assert _clusterRows(masks, rowSizes, 2.0, 2, maxClusters) == \
+                clusterRowsGreedily(masks, rowSizes, 2.0, 2, maxClusters)
+
+    @pytest.mark.parametrize("extension", [False, True])
+    def test_compactLookup(self, extension):
+        subtable = makeSubtable(scriptPairs())
+        expected = positioning([subtable])
+        font = makeFont([subtable])
+        lookup = font["GPOS"].table.LookupList.Lookup[0]
+        if extension:
+            ext = otTables.ExtensionPos()
+            ext.Format = 1
+            ext.ExtensionLookupType = 2
+            ext.ExtSubTable = subtable
+            lookup.LookupType = 9
+            lookup.SubTable = [ext]
+        compactGPOS(font)
+        assert lookup.SubTableCount == 2
+        subtables = lookup.SubTable
+        if extension:
+            assert all(st.ExtensionLookupType == 2 for st in subtables)
+            subtables = [st.ExtSubTable for st in subtables]
+        assert positioning(subtables) == expected
+        # compacting again changes nothing
+        compactLookup(lookup, GLYPHMAP)
+        assert lookup.SubTableCount == 2
@@ -0,0 +1,145 @@
+from fontTools.misc.py23 import *
+from fontTools.ttLib import TTFont
+from fontTools.pens.arrayRecordingPen import ArrayRecordingPen
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.pointPen import SegmentToPointPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+import os
+import pytest
+
+
+DATA_DIR = os.path.join(
+    os.path.abspath(os.path.dirname(os.path.realpath(__file__))),
+    '..', 'ttLib', 'data')
+
+
+def draw_(pen):
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 100))
+    pen.qCurveTo((50, 75), (60, 50), (50, 25), (0, 0))
+    pen.closePath()
+    pen.qCurveTo((0, 0), (0, 10), (10, 10), None)
+    pen.closePath()
+    pen.moveTo((10, 10))
+    pen.curveTo((20, 20), (30, 20), (40, 10))
+    pen.endPath()
+    pen.addComponent("a", (1, 0, 0, 1, 10, 20))
+
+
+class _Glyph(object):
+
+    def draw(self, pen):
+        draw_(pen)
+
+
+def recording(drawable):
+    pen = RecordingPen()
+    drawable.draw(pen)
+    return pen.value
+
+
+class _PointRecorder(object):
+
+    def __init__(self):
+        self.value = []
+
+    def beginPath(self, **kwargs):
+        self.value.append("beginPath")
+
+    def addPoint(self, pt, segmentType=None, smooth=False, name=None,
+                 **kwargs):
+        self.value.append((pt, segmentType))
+
+    def endPath(self):
+        self.value.append("endPath")
+
+    def addComponent(self, glyphName, transformation, **kwargs):
+        self.value.append((glyphName, transformation))
+
+
+class ArrayRecordingPenTest(object):
+
+    def test_record_replay(self):
+        pen = ArrayRecordingPen()
+        draw_(pen)
+        assert pen.value == recording(_Glyph())
+        assert len(pen) == len(pen.value)
+
+    def test_fromRecording(self):
+        value = recording(_Glyph())
+        pen = ArrayRecordingPen.fromRecording(value)
+        assert pen.value == value
+        assert pen == ArrayRecordingPen.fromGlyph(_Glyph())
+
+    def test_contours(self):
+        pen = ArrayRecordingPen()
+        draw_(pen)
+        assert pen.numContours == 3
+        value = recording(_Glyph())
+        assert pen.getContour(0).value == value[:4]
+        assert pen.getContour(1).value == value[4:6]
+        assert pen.getContour(-1).value == value[6:9]
+        assert [c.numContours for c in pen.contours()] == [1, 1, 1]
+        with pytest.raises(IndexError):
+            pen.getContour(3)
+        rec = RecordingPen()
+        pen.drawContour(2, rec)
+        assert rec.value == value[6:9]
+
+    def test_transform(self):
+        pen = ArrayRecordingPen()
+        draw_(pen)
+        transformation = (2, 0, 0, 3, 5, -5)
+        expected = RecordingPen()
+        from fontTools.pens.transformPen import TransformPen
+        draw_(TransformPen(expected, transformation))
+        assert pen.transform(transformation).value == expected.value
+
+    def test_drawPoints(self):
+        pen = ArrayRecordingPen()
+        draw_(pen)
+        expected = _PointRecorder()
+        draw_(SegmentToPointPen(expected))
+        result = _PointRecorder()
+        pen.drawPoints(result)
+        assert result.value == expected.value
+
+    def test_typecode(self):
+        pen = ArrayRecordingPen("f")
+        pen.moveTo((0.5, 1))
+        pen.closePath()
+        assert pen.value == [("moveTo", ((0.5, 1),)), ("closePath", ())]
+
+    def test_largeCurve(self):
+        points = [(i, i % 7) for i in range(70000)]
+        pen = ArrayRecordingPen()
+        pen.qCurveTo(*(points + [None]))
+        pen.closePath()
+        assert pen.value == [("qCurveTo", tuple(points) + (None,)),
+                             ("closePath", ())]
+        rec = RecordingPen()
+        pen.drawContour(0, rec)
+        assert rec.value == pen.value
+
+    @pytest.mark.parametrize(
+        "filename", ["TestTTF-Regular.ttx", "TestOTF-Regular.otx"])
+    def test_fromGlyph_font(self, filename):
+        font = TTFont()
+        font.importXML(os.path.join(DATA_DIR, filename))
+        glyphSet = font.getGlyphSet()
+        for glyphName in glyphSet.keys():
+            glyph = glyphSet[glyphName]
+            assert ArrayRecordingPen.fromGlyph(glyph).value == recording(glyph)
+
+    def test_fromGlyfGlyph_allOffCurve(self):
+        ttPen = TTGlyphPen(None)
+        ttPen.qCurveTo((0, 0), (0, 10), (10, 10), (10, 0), None)
+        ttPen.closePath()
+        ttPen.moveTo((0, 0))
+        ttPen.qCurveTo((5, 5), (10, 5), (15, 0))
+        ttPen.lineTo((10, -10))
+        ttPen.closePath()
+        glyph = ttPen.glyph()
+        rec = RecordingPen()
+        glyph.draw(rec, None)
+        assert ArrayRecordingPen.fromGlyfGlyph(glyph, None).value == rec.value
@@ -0,0 +1,139 @@
+from fontTools.misc.py23 import *
+from fontTools.ttLib import TTFont
+from fontTools.pens.batchStatistics import (
+    calcGlyphSetStatistics, flattenGlyphSet, FlattenPen,
+    MOVE, LINE, QCURVE, CURVE, CLOSE)
+from fontTools.pens.boundsPen import BoundsPen, ControlBoundsPen
+from fontTools.pens.statisticsPen import StatisticsPen
+import os
+import pytest
+
+
+DATA_DIR = os.path.join(
+    os.path.abspath(os.path.dirname(os.path.realpath(__file__))),
+    '..', 'ttLib', 'data')
+
+
+class Glyph(object):
+
+    def __init__(self, drawFunc):
+        self.drawFunc = drawFunc
+
+    def draw(self, pen):
+        self.drawFunc(pen)
+
+
+def draw_(pen):
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 100))
+    pen.qCurveTo((50, 75), (60, 50), (50, 25), (0, 0))
+    pen.curveTo((-50, 25), (-60, 50), (-50, 75), (0, 100))
+    pen.closePath()
+
+
+def drawAllOffCurve_(pen):
+    pen.qCurveTo((0, 0), (0, 100), (100, 100), (100, 0), None)
+    pen.closePath()
+
+
+def drawEmpty_(pen):
+    pass
+
+
+def loadFont(filename):
+    font = TTFont()
+    font.importXML(os.path.join(DATA_DIR, filename))
+    return font
+
+
+def assertMatchesPens(glyphSet, stats):
+    for i, glyphName in enumerate(stats.glyphNames):
+        boundsPen = BoundsPen(glyphSet)
+        glyphSet[glyphName].draw(boundsPen)
+        bounds = stats.getBounds(glyphName)
+        if boundsPen.bounds is None:
+            assert bounds is None
+        else:
+            assert bounds == pytest.approx(boundsPen.bounds)
+        statsPen = StatisticsPen(glyphSet)
+        glyphSet[glyphName].draw(statsPen)
+        assert stats.area[i] == pytest.approx(statsPen.area)
+        assert stats.momentX[i] == pytest.approx(statsPen.momentX)
+        assert stats.momentYY[i] == pytest.approx(statsPen.momentYY)
+        assert stats.meanX[i] == pytest.approx(statsPen.meanX)
+        assert stats.meanY[i] == pytest.approx(statsPen.meanY)
+
+
+def test_flattenPen():
+    pen = FlattenPen()
+    pen.moveTo((0, 0))
+    pen.qCurveTo((10, 10), (20, 10), (30, 0))
+    pen.curveTo((30, -10), (20, -20), (0, -20))
+    pen.closePath()
+    assert list(pen.types) == [MOVE, QCURVE, QCURVE, CURVE, CLOSE]
+    assert list(pen.coords) == [
+        0, 0, 10, 10, 15, 10, 20, 10, 30, 0, 30, -10, 20, -20, 0, -20]
+
+
+def test_glyphSet():
+    glyphSet = {
+        "a": Glyph(draw_),
+        "b": Glyph(drawAllOffCurve_),
+        "empty": Glyph(drawEmpty_),
+    }
+    stats = calcGlyphSetStatistics(glyphSet, moments=True)
+    assert stats.glyphNames == ["a", "b", "empty"]
+    assertMatchesPens(glyphSet, stats)
+    assert stats.getBounds("empty") is None
+    assert stats.area[2] == 0
+
+
+def test_controlBounds():
+    glyphSet = {"a": Glyph(draw_)}
+    stats = calcGlyphSetStatistics(glyphSet, controlBounds=True, area=False)
+    pen = ControlBoundsPen(glyphSet)
+    draw_(pen)
+    assert stats.getBounds("a") == pen.bounds
+    assert stats.area is None
+
+
+def test_areaOnly():
+    glyphSet = {"a": Glyph(draw_), "b": Glyph(drawAllOffCurve_)}
+    areaOnly = calcGlyphSetStatistics(glyphSet, bounds=False)
+    withMoments = calcGlyphSetStatistics(glyphSet, bounds=False, moments=True)
+    assert areaOnly.xMin is None
+    assert areaOnly.momentX is None
+    assert list(areaOnly.area) == pytest.approx(list(withMoments.area))
+
+
+def test_openContour():
+    def drawOpen(pen):
+        pen.moveTo((0, 0))
+        pen.lineTo((10, 10))
+        pen.endPath()
+    glyphSet = {"a": Glyph(drawOpen)}
+    stats = calcGlyphSetStatistics(glyphSet, area=False)
+    assert stats.getBounds("a") == (0, 0, 10, 10)
+    with pytest.raises(NotImplementedError):
+        calcGlyphSetStatistics(glyphSet)
+
+
+@pytest.mark.parametrize("filename", ["TestTTF-Regular.ttx", "TestOTF-Regular.otx"])
+def test_font(filename):
+    font = loadFont(filename)
+    glyphSet = font.getGlyphSet()
+    stats = calcGlyphSetStatistics(glyphSet, moments=True)
+    assert stats.glyphNames == list(glyphSet.keys())
+    assertMatchesPens(glyphSet, stats)
+
+
+def test_glyfFlattenMatchesPen():
+    font = loadFont("TestTTF-Regular.ttx")
+    glyphSet = font.getGlyphSet()
+    glyphNames, types, coords, typeStarts = flattenGlyphSet(glyphSet)
+    pen = FlattenPen(glyphSet)
+    for glyphName in glyphNames:
+        glyphSet[glyphName].draw(pen)
+    assert types == pen.types
+    assert coords == pen.coords
+    assert typeStarts[-1] == len(types)
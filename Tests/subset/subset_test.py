@@ -727,6 +727,69 @@ class SubsetTest(unittest.TestCase):
 
         self.assertEqual(ttf.flavor, None)
 
+    def test_subset_coverage_glyphIDs(self):
+        from fontTools.misc.testTools import FakeFont
+        from fontTools.misc.textTools import deHexStr
+        from fontTools.ttLib.tables import otTables
+        from fontTools.ttLib.tables.otBase import OTTableReader
+
+        font = FakeFont(".notdef A B C D E a b c d e".split())
+        for data in ("0001 0005 0001 0002 0003 0007 0008",
+                     "0002 0002 0001 0003 0000 0007 0008 0003"):
+            coverage = otTables.Coverage()
+            coverage.decompile(OTTableReader(deHexStr(data)), font)
+            glyphs = {"B", "b", "c", "x"}
+            self.assertEqual(coverage.intersect(glyphs), [1, 3, 4])
+            self.assertEqual(coverage.intersect({"A", "B", "C", "a", "b", "c", "d", "e"}),
+                             [0, 1, 2, 3, 4])
+            self.assertEqual(coverage.intersect_glyphs(glyphs), {"B", "b", "c"})
+            # the glyph IDs of the glyphs retained by the subsetter
+            retained = subset._GlyphSet({"B": 2, "b": 7, "c": 8}, font.getGlyphOrder())
+            self.assertEqual(coverage.intersect(retained), [1, 3, 4])
+            self.assertEqual(coverage.intersect_glyphs(retained), {"B", "b", "c"})
+            self.assertEqual(coverage.subset(glyphs), [1, 3, 4])
+            coverage.remap([0, 2])
+            # the subset and remapped coverage still holds glyph IDs
+            self.assertIsNotNone(coverage.getGlyphIDs())
+            self.assertEqual(coverage.glyphs, ["B", "c"])
+
+    def test_subset_classdef_glyphIDs(self):
+        from fontTools.misc.testTools import FakeFont
+        from fontTools.misc.textTools import deHexStr
+        from fontTools.ttLib.tables import otTables
+        from fontTools.ttLib.tables.otBase import OTTableReader
+
+        font = FakeFont(".notdef A B C D E a b c d e".split())
+        classDef = otTables.ClassDef()
+        classDef.decompile(OTTableReader(deHexStr(
+            "0002 0003 0001 0002 0001 0003 0005 0002 0007 000A 0003")), font)
+        glyphs = {"A", "D", "b", "x"}
+        self.assertEqual(classDef.intersect(glyphs), [0, 1, 2, 3])
+        self.assertEqual(classDef.intersect({"A", "B"}), [1])
+        self.assertEqual(classDef.intersect_class(glyphs, 0), {"x"})
+        self.assertEqual(classDef.intersect_class(glyphs, 2), {"D"})
+        retained = subset._GlyphSet({"A": 1, "D": 4, "b": 7}, font.getGlyphOrder())
+        self.assertEqual(classDef.intersect(retained), [1, 2, 3])
+        self.assertEqual(classDef.intersect_class(retained, 2), {"D"})
+        self.assertEqual(classDef.subset({"A", "D", "b"}, remap=True), [1, 2, 3])
+        self.assertIsNotNone(classDef.getGlyphIDs())
+        self.assertEqual(classDef.classDefs, {"A": 0, "D": 1, "b": 2})
+
+    def test_subset_coverage_glyphIDs_renamed(self):
+        from fontTools.misc.testTools import FakeFont
+        from fontTools.misc.textTools import deHexStr
+        from fontTools.ttLib.tables import otTables
+        from fontTools.ttLib.tables.otBase import OTTableReader
+
+        font = FakeFont(".notdef A B C".split())
+        coverage = otTables.Coverage()
+        coverage.decompile(OTTableReader(deHexStr("0001 0003 0001 0002 0003")), font)
+        self.assertEqual(coverage.intersect({"C"}), [2])
+        # glyphs renamed in place, as fontTools.merge does
+        font.getGlyphOrder()[3] = "C#1"
+        self.assertEqual(coverage.intersect({"C"}), [])
+        self.assertEqual(coverage.intersect({"C#1"}), [2])
+
 
 if __name__ == "__main__":
     sys.exit(unittest.main())
@@ -0,0 +1,50 @@
+from fontTools.misc.py23 import *
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables.E_B_D_T_ import LazyBitmapGlyphs
+import os
+import pytest
+
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "subset", "data"
+)
+
+
+@pytest.fixture
+def fontData():
+    font = TTFont()
+    font.importXML(os.path.join(DATA_DIR, "google_color.ttx"))
+    buf = BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+def test_lazy_glyphs(fontData):
+    font = TTFont(BytesIO(fontData))
+    strikeData = font["CBDT"].strikeData
+    assert len(strikeData) == 1
+    glyphs = strikeData[0]
+    assert isinstance(glyphs, LazyBitmapGlyphs)
+    assert list(glyphs) == ["x", "y"]
+    assert not glyphs.isLoaded("x")
+    glyph = glyphs["x"]
+    assert glyph.getFormat() == 17
+    assert glyph.imageData == b"\xde\xad"
+    assert glyphs.isLoaded("x")
+    assert not glyphs.isLoaded("y")
+
+
+def test_compile_passthrough(fontData):
+    font = TTFont(BytesIO(fontData))
+    data = font.reader["CBDT"]
+    assert font["CBDT"].compile(font) == data
+
+    font = TTFont(BytesIO(fontData))
+    glyph = font["CBDT"].strikeData[0]["y"]
+    glyph.metrics.BearingX = 7
+    buf = BytesIO()
+    font.save(buf)
+    font = TTFont(buf)
+    glyphs = font["CBDT"].strikeData[0]
+    assert glyphs["y"].metrics.BearingX == 7
+    assert glyphs["x"].imageData == b"\xde\xad"
@@ -0,0 +1,102 @@
+"""Time decoding, subsetting and compiling a large COLR table.
+
+    python Tests/ttLib/tables/C_O_L_R__benchmark.py [--glyphs N] [--layers N] [--palettes N] [--repeat N]
+
+A synthetic font with N base glyphs of N layers each, and CPAL palettes,
+is built in memory. The times reported are those to decompile the COLR and
+CPAL tables, to subset COLR to a tenth of its base glyphs, to get the
+layers of all base glyphs, and to compile COLR; the peak memory allocated
+while decompiling is reported too.
+"""
+from fontTools.ttLib import TTFont, newTable
+from fontTools.ttLib.tables.C_O_L_R_ import LayerRecord
+from fontTools.ttLib.tables.C_P_A_L_ import Color
+import argparse
+import time
+import tracemalloc
+
+
+def makeTables(font, numGlyphs, numLayers, numPalettes):
+    glyphOrder = [".notdef"]
+    glyphOrder += ["base%05d" % i for i in range(numGlyphs)]
+    glyphOrder += ["layer%05d" % i for i in range(numGlyphs)]
+    font.setGlyphOrder(glyphOrder)
+    colr = newTable("COLR")
+    colr.version = 0
+    colr.ColorLayers = {
+        "base%05d" % i: [
+            LayerRecord("layer%05d" % ((i + j * 7) % numGlyphs), j)
+            for j in range(numLayers)
+        ]
+        for i in range(numGlyphs)
+    }
+    cpal = newTable("CPAL")
+    cpal.version = 0
+    cpal.numPaletteEntries = numLayers
+    cpal.palettes = [
+        [Color(i & 0xFF, j & 0xFF, (i * j) & 0xFF, 0xFF) for j in range(numLayers)]
+        for i in range(numPalettes)
+    ]
+    return colr.compile(font), cpal.compile(font)
+
+
+def timeit(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--glyphs", type=int, default=8000)
+    parser.add_argument("--layers", type=int, default=8)
+    parser.add_argument("--palettes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    font = TTFont()
+    colrData, cpalData = makeTables(font, options.glyphs, options.layers, options.palettes)
+    print("COLR: %d bytes, CPAL: %d bytes" % (len(colrData), len(cpalData)))
+
+    def decompile():
+        colr = newTable("COLR")
+        colr.decompile(colrData, font)
+        cpal = newTable("CPAL")
+        cpal.decompile(cpalData, font)
+        return colr
+
+    t = timeit(decompile, options.repeat)
+    tracemalloc.start()
+    colr = decompile()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("%-10s %.4f s, peak memory %.1f MB" % ("decompile", t, peak / 2**20))
+
+    glyphNames = {"base%05d" % i for i in range(0, options.glyphs, 10)}
+
+    def subset():
+        colr = decompile()
+        colorLayers = colr.ColorLayers
+        if hasattr(colorLayers, "subset"):
+            colr.ColorLayers = colorLayers.subset(glyphNames)
+        else:
+            colr.ColorLayers = {g: colorLayers[g] for g in glyphNames if g in colorLayers}
+
+    def getLayers():
+        colr = decompile()
+        for glyphName in colr.ColorLayers:
+            colr[glyphName]
+
+    for name, func in [
+        ("subset", subset),
+        ("getLayers", getLayers),
+        ("compile", lambda: colr.compile(font)),
+    ]:
+        print("%-10s %.4f s" % (name, timeit(func, options.repeat)))
+
+
+if __name__ == "__main__":
+    main()
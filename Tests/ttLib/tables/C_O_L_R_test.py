@@ -0,0 +1,101 @@
+from fontTools.misc.py23 import *
+from fontTools.misc.testTools import getXML
+from fontTools.misc.textTools import deHexStr
+from fontTools.ttLib import TTFont, newTable
+from fontTools.ttLib.tables.C_O_L_R_ import ColorLayers, LayerRecord
+import pytest
+
+
+COLR_DATA = deHexStr(
+    '0000 0003 '              # version=0, numBaseGlyphRecords=3
+    '0000000E 00000020 '      # offsetBaseGlyphRecord=14, offsetLayerRecord=32
+    '0005 '                   # numLayerRecords=5
+    '0001 0000 0002 '         # gid=1, firstLayerIndex=0, numLayers=2
+    '0002 0002 0001 '         # gid=2, firstLayerIndex=2, numLayers=1
+    '0004 0003 0002 '         # gid=4, firstLayerIndex=3, numLayers=2
+    '0005 0000 0006 0001 '    # layers: (5, 0), (6, 1)
+    '0007 0002 '              # (7, 2)
+    '0005 0003 0008 FFFF')    # (5, 3), (8, 0xFFFF)
+
+
+@pytest.fixture
+def font():
+    font = TTFont()
+    font.setGlyphOrder([".notdef"] + ["glyph%d" % i for i in range(1, 9)])
+    return font
+
+
+def decompile(font, data=COLR_DATA):
+    table = newTable("COLR")
+    table.decompile(data, font)
+    return table
+
+
+def layers(records):
+    return [(layer.name, layer.colorID) for layer in records]
+
+
+def test_decompile(font):
+    table = decompile(font)
+    colorLayers = table.ColorLayers
+    assert isinstance(colorLayers, ColorLayers)
+    assert list(colorLayers) == ["glyph1", "glyph2", "glyph4"]
+    assert not any(colorLayers.isLoaded(g) for g in colorLayers)
+    assert colorLayers.getLayerGlyphNames("glyph4") == ["glyph5", "glyph8"]
+    assert not colorLayers.isLoaded("glyph4")
+    assert layers(table["glyph1"]) == [("glyph5", 0), ("glyph6", 1)]
+    assert layers(table[4]) == [("glyph5", 3), ("glyph8", 0xFFFF)]
+    assert table["glyph3"] is None
+
+
+def test_compile(font):
+    table = decompile(font)
+    assert table.compile(font) == COLR_DATA
+    table["glyph2"][0].colorID = 9
+    table["glyph3"] = [LayerRecord("glyph1", 4)]
+    del table["glyph4"]
+    table = decompile(font, table.compile(font))
+    assert {g: layers(table[g]) for g in table.ColorLayers} == {
+        "glyph1": [("glyph5", 0), ("glyph6", 1)],
+        "glyph2": [("glyph7", 9)],
+        "glyph3": [("glyph1", 4)],
+    }
+
+
+def test_compile_glyphOrderChanged():
+    font = TTFont()
+    font.setGlyphOrder([".notdef", "a", "b", "c"])
+    font.getGlyphID("c")
+    # the reverse glyph map still maps "c" to 3, past the new glyph order
+    font.setGlyphOrder([".notdef", "c"])
+    table = newTable("COLR")
+    table.version = 0
+    table.ColorLayers = {"c": [LayerRecord("c", 0)]}
+    table = decompile(font, table.compile(font))
+    assert layers(table["c"]) == [("c", 0)]
+    assert font.getGlyphID("c") == 1
+
+
+def test_subset(font):
+    table = decompile(font)
+    table["glyph1"][1].colorID = 7
+    colorLayers = table.ColorLayers.subset({"glyph1", "glyph4", "glyph5"})
+    assert list(colorLayers) == ["glyph1", "glyph4"]
+    assert colorLayers.isLoaded("glyph1")
+    assert not colorLayers.isLoaded("glyph4")
+    assert colorLayers._layers.tolist() == [5, 3, 8, 0xFFFF]
+    assert layers(colorLayers["glyph1"]) == [("glyph5", 0), ("glyph6", 7)]
+    assert layers(colorLayers["glyph4"]) == [("glyph5", 3), ("glyph8", 0xFFFF)]
+
+
+def test_toXML(font):
+    table = decompile(font)
+    expected = newTable("COLR")
+    expected.version = 0
+    expected.ColorLayers = {
+        "glyph1": [LayerRecord("glyph5", 0), LayerRecord("glyph6", 1)],
+        "glyph2": [LayerRecord("glyph7", 2)],
+        "glyph4": [LayerRecord("glyph5", 3), LayerRecord("glyph8", 0xFFFF)],
+    }
+    assert getXML(table.toXML, font) == getXML(expected.toXML, font)
+    assert expected.compile(font) == COLR_DATA
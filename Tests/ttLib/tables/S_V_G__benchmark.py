@@ -0,0 +1,121 @@
+"""Time reading SVG documents from a large color font.
+
+    python Tests/ttLib/tables/S_V_G__benchmark.py [--glyphs N] [--repeat N] [FONT]
+
+Without a FONT argument, a synthetic font is built with fontBuilder, with
+one gzipped SVG document per glyph, like emoji fonts. The times reported
+are those to open the font and get the document of one glyph, and of a
+hundred glyphs; to decode all documents; and to save the font after the
+'SVG ' table was loaded.
+"""
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont, newTable
+from io import BytesIO
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+
+def makeDoc(glyphID):
+    paths = "".join(
+        '<path fill="#%06X" d="M%d,%dL%d,%dL%d,%dZ"/>' % (
+            (glyphID * 7919 + i * 104729) & 0xFFFFFF,
+            i * 10, -i * 10, i * 10 + 500, -i * 10 - 300, i * 5, -800,
+        )
+        for i in range(60)
+    )
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" version="1.1">'
+        '<g id="glyph%d">%s</g></svg>' % (glyphID, paths)
+    )
+
+
+def makeFont(path, numGlyphs):
+    glyphOrder = [".notdef"] + ["u%05X" % (0x1F000 + i) for i in range(1, numGlyphs)]
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+    fb.setupCharacterMap({0x1F000 + i: name for i, name in enumerate(glyphOrder[1:], 1)})
+    pen = TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 1000))
+    pen.lineTo((1000, 1000))
+    pen.closePath()
+    glyph = pen.glyph()
+    fb.setupGlyf({name: glyph for name in glyphOrder})
+    fb.setupHorizontalMetrics({name: (1000, 0) for name in glyphOrder})
+    fb.setupHorizontalHeader(ascent=880, descent=-120)
+    fb.setupNameTable({"familyName": "Synthetic Color", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    svg = fb.font["SVG "] = newTable("SVG ")
+    svg.docList = [[makeDoc(i), i, i] for i in range(1, numGlyphs)]
+    svg.compressed = True
+    fb.font.save(path)
+
+
+def timeit(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("font", metavar="FONT", nargs="?")
+    parser.add_argument("--glyphs", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        if options.font:
+            path = options.font
+        else:
+            path = os.path.join(tmp, "Synthetic.ttf")
+            makeFont(path, options.glyphs)
+        print("%s: %d bytes" % (os.path.basename(path), os.path.getsize(path)))
+        with TTFont(path) as font:
+            glyphIDs = sorted(
+                {glyphID for _, start, end in font["SVG "].docList
+                 for glyphID in range(start, end + 1)}
+            )
+
+        def getDocuments(glyphIDs):
+            with TTFont(path) as font:
+                svg = font["SVG "]
+                for glyphID in glyphIDs:
+                    assert svg.getDocument(glyphID) is not None
+
+        def decodeAll():
+            with TTFont(path) as font:
+                for item in font["SVG "].docList:
+                    pass
+
+        def save():
+            with TTFont(path) as font:
+                font["SVG "]
+                font.save(BytesIO())
+
+        rng = random.Random(0)
+        oneGlyph = [glyphIDs[len(glyphIDs) // 2]]
+        manyGlyphs = [rng.choice(glyphIDs) for _ in range(100)]
+        for name, func in [
+            ("1 glyph", lambda: getDocuments(oneGlyph)),
+            ("100 glyphs", lambda: getDocuments(manyGlyphs)),
+            ("all documents", decodeAll),
+            ("save", save),
+        ]:
+            print("%-14s %.4f s" % (name, timeit(func, options.repeat)))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from fontTools.misc.py23 import *
+from fontTools.misc.testTools import getXML
+from fontTools.ttLib import newTable
+from fontTools.ttLib.tables.S_V_G_ import SVGDocumentList
+import gzip
+import pytest
+
+
+def makeDoc(glyphID):
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        '<g id="glyph%d">%s</g></svg>' % (glyphID, '<path d="M0,0L100,100Z"/>' * 20)
+    )
+
+
+DOCS = [
+    [makeDoc(1), 1, 1],
+    [makeDoc(2), 2, 4],
+    [makeDoc(7), 7, 7],
+]
+
+
+def makeTable(compressed=False):
+    table = newTable("SVG ")
+    table.docList = [list(item) for item in DOCS]
+    if compressed:
+        table.compressed = True
+    return table
+
+
+def decompile(data):
+    table = newTable("SVG ")
+    table.decompile(data, ttFont=None)
+    return table
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_decompile_lazy(compressed):
+    data = makeTable(compressed).compile(ttFont=None)
+    table = decompile(data)
+    docList = table.docList
+    assert isinstance(docList, SVGDocumentList)
+    assert getattr(table, "compressed", False) == compressed
+    assert len(docList) == 3
+    assert table.getDocument(3) == makeDoc(2)
+    assert table.getDocument(5) is None
+    assert table.getDocument(0) is None
+    # looking up documents doesn't decode the items
+    assert docList._items == [None, None, None]
+    assert docList == DOCS
+    # untouched documents are compiled from their original data
+    table.colorPalettes = None
+    assert table.compile(ttFont=None) == data
+
+
+def test_modify():
+    table = decompile(makeTable(compressed=True).compile(ttFont=None))
+    docList = table.docList
+    compressedDoc = docList._getBytes(*docList._records[2][2:])
+    assert compressedDoc.startswith(b"\x1f\x8b")
+    assert docList[1] == DOCS[1]
+    docList[1][0] = "<svg/>"
+    docList[2][1] = 6
+    del docList[0]
+    docList.append(["<svg>new</svg>", 9, 9])
+    data = table.compile(ttFont=None)
+    table = decompile(data)
+    assert table.docList == [
+        ["<svg/>", 2, 4],
+        [makeDoc(7), 6, 7],
+        ["<svg>new</svg>", 9, 9],
+    ]
+    assert table.getDocument(6) == makeDoc(7)
+    # the document that was not replaced was not compressed again
+    assert compressedDoc in data
+
+
+def test_getDocument_accessed_items():
+    table = decompile(makeTable().compile(ttFont=None))
+    docList = table.docList
+    docList[0][1:] = [10, 10]
+    assert table.getDocument(1) is None
+    assert table.getDocument(10) == makeDoc(1)
+    docList.insert(0, ["<svg/>", 0, 0])
+    assert table.getDocument(0) == "<svg/>"
+
+
+def test_getDocument_cache():
+    table = decompile(makeTable().compile(ttFont=None))
+    docList = table.docList
+    docList._cacheSize = 2
+    for glyphID in (1, 2, 7, 3):
+        docList.getDocument(glyphID)
+    assert list(docList._cache.values()) == [makeDoc(7), makeDoc(2)]
+
+
+def test_toXML():
+    table = decompile(makeTable(compressed=True).compile(ttFont=None))
+    assert getXML(table.toXML) == getXML(makeTable().toXML)
+    assert table.docList._items == [None, None, None]
+
@@ -1,9 +1,11 @@
 from fontTools.misc.py23 import *
+from fontTools.misc.arrayTools import calcIntBounds
 from fontTools.misc.fixedTools import otRound
 from fontTools.misc.testTools import getXML, parseXML
 from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.ttLib import TTFont, newTable, TTLibError
 from fontTools.ttLib.tables._g_l_y_f import (
+    Glyph,
     GlyphCoordinates,
     GlyphComponent,
     ARGS_ARE_XY_VALUES,
@@ -14,6 +16,7 @@ from fontTools.ttLib.tables._g_l_y_f import (
 from fontTools.ttLib.tables import ttProgram
 import sys
 import array
+import struct
 import itertools
 import pytest
 import re
@@ -173,6 +176,24 @@ class GlyphCoordinatesTest(object):
         assert g.array.typecode == "d"
         assert g.array == array.array("d", [1.0, 1.0, 32768.0, 0.0])
 
+    def test_extend(self):
+        g = GlyphCoordinates([(1, 2), (3.0, 4)])
+        assert g.array == array.array("h", [1, 2, 3, 4])
+        g.extend([(5, 6.5)])
+        assert g.array == array.array("d", [1, 2, 3, 4, 5, 6.5])
+        g = GlyphCoordinates([(1, 2), (0x8000, 0)])
+        assert g.array == array.array("d", [1, 2, 0x8000, 0])
+
+    def test__iter__(self):
+        assert list(GlyphCoordinates([(1, 2), (3, 4)])) == [(1, 2), (3, 4)]
+
+    def test_relativeToAbsolute_overflow(self):
+        g = GlyphCoordinates([(0x7FFF, 0), (1, -1)])
+        g.relativeToAbsolute()
+        assert g.array == array.array("d", [0x7FFF, 0, 0x8000, -1])
+        g.absoluteToRelative()
+        assert list(g) == [(0x7FFF, 0), (1, -1)]
+
 
 CURR_DIR = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
 DATA_DIR = os.path.join(CURR_DIR, 'data')
@@ -285,6 +306,123 @@ class glyfTableTest(unittest.TestCase):
         composite.compact(glyfTable)
 
 
+    def _buildNestedComposites(self):
+        glyfTable = newTable("glyf")
+        glyfTable.glyphs = {}
+        glyfTable.glyphOrder = []
+        pen = TTGlyphPen(None)
+        pen.moveTo((0, 0))
+        pen.lineTo((0, 100))
+        pen.lineTo((100, 0))
+        pen.closePath()
+        glyfTable["base"] = pen.glyph()
+        pen = TTGlyphPen(glyfTable)
+        pen.addComponent("base", (1, 0, 0, 1, 10, 0))
+        pen.addComponent("base", (1, 0, 0, 1, 0, 200))
+        glyfTable["comp1"] = pen.glyph()
+        pen = TTGlyphPen(glyfTable)
+        pen.addComponent("comp1", (1, 0, 0, 1, 0, 0))
+        pen.addComponent("base", (0.5, 0, 0, 0.5, 300, 0))
+        glyfTable["comp2"] = pen.glyph()
+        pen = TTGlyphPen(glyfTable)
+        pen.addComponent("comp2", (1, 0, 0, 1, 50, 50))
+        pen.addComponent("comp1", (1, 0, 0, 1, 0, 0))
+        glyfTable["comp3"] = pen.glyph()
+        return glyfTable
+
+    def test_componentCache(self):
+        glyfTable = self._buildNestedComposites()
+        names = ["comp1", "comp2", "comp3"]
+        expected = {
+            name: (
+                list(glyfTable[name].getCoordinates(glyfTable)[0]),
+                glyfTable[name].getCompositeMaxpValues(glyfTable),
+            )
+            for name in names
+        }
+        with glyfTable.componentCache():
+            with glyfTable.componentCache():
+                for name in names:
+                    glyph = glyfTable[name]
+                    coords = list(glyph.getCoordinates(glyfTable)[0])
+                    maxpValues = glyph.getCompositeMaxpValues(glyfTable)
+                    self.assertEqual((coords, maxpValues), expected[name])
+            self.assertIn("comp1", glyfTable._componentCache.coordinates)
+            self.assertIn("comp2", glyfTable._componentCache.maxpValues)
+        self.assertFalse(hasattr(glyfTable, "_componentCache"))
+        self.assertEqual(expected["comp3"][1], (15, 5, 4))
+
+    def test_componentCache_invalidation(self):
+        glyfTable = self._buildNestedComposites()
+        with glyfTable.componentCache():
+            glyfTable["comp3"].recalcBounds(glyfTable)
+            self.assertEqual(glyfTable["comp3"].xMax, 400)
+
+            pen = TTGlyphPen(None)
+            pen.moveTo((0, 0))
+            pen.lineTo((0, 100))
+            pen.lineTo((200, 0))
+            pen.closePath()
+            glyfTable["base"] = pen.glyph()
+            glyfTable["comp3"].recalcBounds(glyfTable)
+            self.assertEqual(glyfTable["comp3"].xMax, 450)
+
+            font = TTFont()
+            font.setGlyphOrder(glyfTable.glyphOrder)
+            font["hmtx"] = hmtx = newTable("hmtx")
+            hmtx.metrics = {name: (500, 0) for name in glyfTable.glyphOrder}
+            coords = [(0, 0), (0, 100), (300, 0)]
+            glyfTable.setCoordinates(
+                "base", coords + [(0, 0), (500, 0), (0, 0), (0, 0)], font)
+            glyfTable["comp3"].recalcBounds(glyfTable)
+            self.assertEqual(glyfTable["comp3"].xMax, 500)
+            glyfTable["base"].coordinates[2] = (100, 0)
+            # modified in place, stale until invalidated
+            glyfTable["comp3"].recalcBounds(glyfTable)
+            self.assertEqual(glyfTable["comp3"].xMax, 500)
+            glyfTable.invalidateComponentCache()
+            glyfTable["comp3"].recalcBounds(glyfTable)
+            self.assertEqual(glyfTable["comp3"].xMax, 400)
+
+
+    def test_compile_parallel(self):
+        font = TTFont(sfntVersion="\x00\x01\x00\x00")
+        font.importXML(GLYF_TTX)
+        glyfTable = font['glyf']
+        for glyph in glyfTable.glyphs.values():
+            glyph.expand(glyfTable)
+            if glyph.numberOfContours > 0:
+                glyph.xMin = glyph.yMin = glyph.xMax = glyph.yMax = 0
+        glyfTable.compileWorkers = 2
+        glyfTable.parallelCompileThreshold = 1
+        glyfData = glyfTable.compile(font)
+        self.assertEqual(glyfData, self.glyfData)
+        for glyph in glyfTable.glyphs.values():
+            if glyph.numberOfContours > 0:
+                xMin, yMin, xMax, yMax = calcIntBounds(glyph.coordinates)
+                self.assertEqual(
+                    (glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax),
+                    (xMin, yMin, xMax, yMax))
+
+    def test_compile_compactGlyph(self):
+        pen = TTGlyphPen(None)
+        pen.moveTo((100, 0))
+        pen.lineTo((300, 0))
+        pen.lineTo((200, 400))
+        pen.closePath()
+        glyph = pen.glyph()
+        glyph.recalcBounds(None)
+        data = glyph.compile(None)
+        # with correct bounds, the data is used as is
+        self.assertIs(Glyph(data).compile(None), data)
+        # with wrong bounds, the glyph is compiled again
+        wrongData = data[:2] + struct.pack(">h", 99) + data[4:]
+        glyph = Glyph(wrongData)
+        self.assertEqual(glyph.compile(None), data)
+        self.assertEqual(glyph.xMin, 100)
+        self.assertEqual(Glyph(wrongData).compile(None, recalcBBoxes=False), wrongData)
+
+
 class GlyphComponentTest:
 
     def test_toXML_no_transform(self):
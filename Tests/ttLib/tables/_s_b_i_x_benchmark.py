@@ -0,0 +1,105 @@
+"""Time reading a few bitmap glyphs from a large sbix font.
+
+    python Tests/ttLib/tables/_s_b_i_x_benchmark.py [--glyphs N] [--strikes N] [--repeat N] [FONT]
+
+Without a FONT argument, a synthetic font is built with fontBuilder, with
+an 'sbix' table holding several strikes of PNG-sized images, like color
+emoji fonts. With a FONT argument, its 'sbix', 'CBDT' or 'EBDT' table is
+used. The times reported are those to open the font and get ten glyphs
+of one strike, and to save the font after the bitmap table was loaded.
+"""
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont, newTable
+from fontTools.ttLib.tables.sbixGlyph import Glyph
+from fontTools.ttLib.tables.sbixStrike import Strike
+from io import BytesIO
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+
+def makeFont(path, numGlyphs, numStrikes):
+    rng = random.Random(0)
+    glyphOrder = [".notdef"] + ["u%05X" % (0x1F000 + i) for i in range(1, numGlyphs)]
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+    fb.setupCharacterMap({0x1F000 + i: name for i, name in enumerate(glyphOrder[1:], 1)})
+    pen = TTGlyphPen(None)
+    glyph = pen.glyph()
+    fb.setupGlyf({name: glyph for name in glyphOrder})
+    fb.setupHorizontalMetrics({name: (1000, 0) for name in glyphOrder})
+    fb.setupHorizontalHeader(ascent=880, descent=-120)
+    fb.setupNameTable({"familyName": "Synthetic Bitmap", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    sbix = fb.font["sbix"] = newTable("sbix")
+    for i in range(numStrikes):
+        ppem = 20 << i
+        strike = sbix.strikes[ppem] = Strike(ppem=ppem)
+        size = 32 * ppem
+        for name in glyphOrder[1:]:
+            imageData = b"\x89PNG\r\n\x1a\n" + bytes(rng.getrandbits(8) for _ in range(8)) * (size // 8)
+            strike.glyphs[name] = Glyph(glyphName=name, graphicType="png ", imageData=imageData)
+    fb.font.save(path)
+
+
+def getGlyphs(font, glyphNames):
+    if "sbix" in font:
+        strikes = font["sbix"].strikes
+        glyphs = strikes[max(strikes)].glyphs
+        return [glyphs[glyphName].imageData for glyphName in glyphNames if glyphName in glyphs]
+    tag = "CBDT" if "CBDT" in font else "EBDT"
+    glyphs = font[tag].strikeData[-1]
+    return [glyphs[glyphName].imageData for glyphName in glyphNames if glyphName in glyphs]
+
+
+def timeit(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("font", metavar="FONT", nargs="?")
+    parser.add_argument("--glyphs", type=int, default=3000)
+    parser.add_argument("--strikes", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        if options.font:
+            path = options.font
+        else:
+            path = os.path.join(tmp, "Synthetic.ttf")
+            makeFont(path, options.glyphs, options.strikes)
+        print("%s: %d bytes" % (os.path.basename(path), os.path.getsize(path)))
+        with TTFont(path) as font:
+            glyphOrder = font.getGlyphOrder()
+        glyphNames = random.Random(0).sample(glyphOrder[1:], min(10, len(glyphOrder) - 1))
+
+        def readGlyphs():
+            with TTFont(path) as font:
+                assert getGlyphs(font, glyphNames)
+
+        def save():
+            with TTFont(path) as font:
+                getGlyphs(font, glyphNames)
+                font.save(BytesIO())
+
+        for name, func in [("10 glyphs", readGlyphs), ("save", save)]:
+            print("%-10s %.4f s" % (name, timeit(func, options.repeat)))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from fontTools.misc.py23 import *
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables.sbixGlyph import Glyph
+from fontTools.ttLib.tables.sbixStrike import LazyGlyphs
+import os
+import struct
+import pytest
+
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "subset", "data"
+)
+
+
+@pytest.fixture
+def fontData():
+    font = TTFont()
+    font.importXML(os.path.join(DATA_DIR, "sbix.ttx"))
+    for strike in font["sbix"].strikes.values():
+        # a reference to the image data of glyph ID 1
+        strike.glyphs["Y"] = Glyph(
+            glyphName="Y", graphicType="dupe", imageData=struct.pack(">H", 1)
+        )
+    return saveFont(font)
+
+
+def saveFont(font):
+    buf = BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+def test_lazy_glyphs(fontData):
+    font = TTFont(BytesIO(fontData))
+    strike = font["sbix"].strikes[20]
+    glyphs = strike.glyphs
+    assert isinstance(glyphs, LazyGlyphs)
+    assert list(glyphs) == [".notdef", "X", "Y"]
+    assert not any(glyphs.isLoaded(glyphName) for glyphName in glyphs)
+
+    assert glyphs.getRawData("Y") is None
+    rawdata = glyphs.getRawData("X")
+    glyph = glyphs["X"]
+    assert glyph.glyphName == "X"
+    assert glyph.graphicType == "png "
+    assert rawdata == struct.pack(">hh4s", 0, 0, b"png ") + glyph.imageData
+    assert glyphs.isLoaded("X")
+    assert glyphs.getRawData("X") is None
+    assert glyphs["Y"].referenceGlyphName == "X"
+
+
+def test_compile_passthrough(fontData):
+    font = TTFont(BytesIO(fontData))
+    data = font.reader["sbix"]
+    assert font["sbix"].compile(font) == data
+
+    font = TTFont(BytesIO(fontData))
+    strikes = font["sbix"].strikes
+    strikes[20].glyphs["X"].originOffsetX = 5
+    font = TTFont(BytesIO(saveFont(font)))
+    glyphs = font["sbix"].strikes[20].glyphs
+    assert glyphs["X"].originOffsetX == 5
+    assert glyphs["Y"].referenceGlyphName == "X"
@@ -0,0 +1,91 @@
+"""Time decompiling and compiling large GSUB and GPOS tables.
+
+    python Tests/ttLib/tables/otBase_benchmark.py [--glyphs N] [--repeat N] [FONT]
+
+Synthetic GSUB and GPOS tables, with single and ligature substitutions,
+glyph pair and class pair kerning, and mark attachment for N glyphs, are
+built with feaLib; many of their anchors, value records and coverage
+tables are identical, as in real fonts. The times reported are the ones
+to decompile each table fully, and to compile it again from the
+decompiled table (which has no offset overflows left to fix). With a
+FONT argument, the GSUB and GPOS tables of the font are used instead.
+"""
+from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+from fontTools.ttLib import TTFont, newTable
+import argparse
+import time
+
+
+def makeFeatures(numGlyphs):
+    bases = ["g%05d" % i for i in range(numGlyphs)]
+    marks = ["mark%03d" % i for i in range(100)]
+    fea = []
+    fea.append("@BASES = [%s];" % " ".join(bases))
+    fea.append("feature smcp {")
+    fea.extend("  sub %s by %s;" % (a, b) for a, b in zip(bases, reversed(bases)))
+    fea.append("} smcp;")
+    fea.append("feature liga {")
+    fea.extend("  sub %s %s by %s;" % (bases[i], bases[i + 1], bases[i + 2])
+               for i in range(0, numGlyphs - 2, 3))
+    fea.append("} liga;")
+    fea.append("feature kern {")
+    fea.extend("  pos %s %s %d;" % (bases[i], bases[(i * 7) % numGlyphs], -(i % 50))
+               for i in range(0, numGlyphs, 2))
+    numClasses = 40
+    for c in range(numClasses):
+        fea.append("  @L%d = [%s];" % (c, " ".join(bases[c::numClasses])))
+        fea.append("  @R%d = [%s];" % (c, " ".join(bases[(c + 5) % numClasses::numClasses])))
+    fea.extend("  pos @L%d @R%d %d;" % (i, j, (i * j) % 30 - 15)
+               for i in range(numClasses) for j in range(numClasses) if (i + j) % 3)
+    fea.append("} kern;")
+    for i, mark in enumerate(marks):
+        fea.append("markClass %s <anchor %d 0> @MC%d;" % (mark, i, i % 4))
+    fea.append("feature mark {")
+    for c in range(4):
+        fea.extend("  pos base %s <anchor %d %d> mark @MC%d;" % (base, (i % 20) * 25, c * 10, c)
+                   for i, base in enumerate(bases))
+    fea.append("} mark;")
+    return bases + marks, "\n".join(fea)
+
+
+def timeit(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("font", metavar="FONT", nargs="?")
+    parser.add_argument("--glyphs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    if options.font:
+        font = TTFont(options.font)
+        tables = {tag: font.getTableData(tag) for tag in ("GSUB", "GPOS") if tag in font}
+    else:
+        glyphOrder, features = makeFeatures(options.glyphs)
+        font = TTFont()
+        font.setGlyphOrder([".notdef"] + glyphOrder)
+        addOpenTypeFeaturesFromString(font, features)
+        tables = {tag: font[tag].compile(font) for tag in ("GSUB", "GPOS")}
+
+    for tag, data in sorted(tables.items()):
+        def decompile():
+            newTable(tag).decompile(data, font)
+        table = newTable(tag)
+        table.decompile(data, font)
+        table.table.ensureDecompiled()
+        def compile():
+            table.compile(font)
+        print("%s (%d bytes) decompile %.3f s, compile %.3f s" % (
+            tag, len(data), timeit(decompile, options.repeat),
+            timeit(compile, options.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,30 @@ class OTTableReaderTest(unittest.TestCase):
                          [0xDEAD, 0xBEEF, 0xCAFE])
         self.assertEqual(reader.pos, 6)
 
+    def test_readArrays(self):
+        data = deHexStr("DE AD BE EF CA FE F0 0D")
+        for method, itemSize, expected in [
+            ("readInt8Array", 1, [-34, -83, -66, -17, -54, -2, -16, 13]),
+            ("readUInt8Array", 1, [0xDE, 0xAD, 0xBE, 0xEF, 0xCA, 0xFE, 0xF0, 0x0D]),
+            ("readShortArray", 2, [-8531, -16657, -13570, -4083]),
+            ("readUShortArray", 2, [0xDEAD, 0xBEEF, 0xCAFE, 0xF00D]),
+            ("readUInt24Array", 3, [0xDEADBE, 0xEFCAFE]),
+            ("readLongArray", 4, [-559038737, -889262067]),
+            ("readULongArray", 4, [0xDEADBEEF, 0xCAFEF00D]),
+        ]:
+            reader = OTTableReader(data)
+            self.assertEqual(
+                getattr(reader, method)(len(expected)).tolist(), expected)
+            self.assertEqual(reader.pos, itemSize * len(expected))
+            self.assertEqual(getattr(reader, method)(0).tolist(), [])
+
+    def test_readValue(self):
+        import struct
+        reader = OTTableReader(deHexStr("CA FE BE EF"))
+        reader.advance(1)
+        self.assertEqual(reader.readValue(struct.Struct(">Bh")), (0xFE, -16657))
+        self.assertEqual(reader.pos, 4)
+
     def test_readUInt24(self):
         reader = OTTableReader(deHexStr("C3 13 37"))
         self.assertEqual(reader.readUInt24(), 0xC31337)
@@ -89,6 +113,45 @@ class OTTableWriterTest(unittest.TestCase):
         writer.writeULong(0xBEEFCAFE)
         self.assertEqual(writer.getData(), deHexStr("BE EF CA FE"))
 
+    def makeTree(self):
+        writer = OTTableWriter()
+        for value in (1, 2, 1):
+            subWriter = writer.getSubWriter()
+            subWriter.writeUShort(value)
+            subWriter.writeUShort(0)
+            writer.writeSubTable(subWriter)
+        return writer
+
+    def test_getAllData_sharesIdenticalSubtables(self):
+        writer = self.makeTree()
+        first, second, third = writer.items
+        self.assertEqual(
+            writer.getAllData(),
+            deHexStr("000A 0006 000A 0002 0000 0001 0000"))
+        # identical leaf tables are merged, and their items joined
+        self.assertEqual(writer.items, (first, second, first))
+        self.assertEqual(first.items, (deHexStr("0001 0000"),))
+
+    def test_getAllData_dontShare(self):
+        writer = self.makeTree()
+        writer.DontShare = True
+        self.assertEqual(
+            writer.getAllData(),
+            deHexStr("0006 000A 000E 0001 0000 0002 0000 0001 0000"))
+
+    def test_hash(self):
+        writer = self.makeTree()
+        writer._doneWriting({})
+        h = hash(writer)
+        self.assertEqual(hash(writer), h)
+        other = self.makeTree()
+        other._doneWriting({})
+        self.assertEqual(other, writer)
+        self.assertEqual(hash(other), h)
+        # replacing the items invalidates the cached hash
+        writer.items = writer.items[:2]
+        self.assertEqual(hash(writer), hash(writer.items))
+
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,120 @@
+"""Time decompiling, subsetting and compiling Coverage and ClassDef tables.
+
+    python Tests/ttLib/tables/otTables_benchmark.py [--glyphs N] [--tables N] [--repeat N]
+
+N Coverage tables and N ClassDef tables, of both formats, over a glyph
+order of N glyphs, are compiled in memory. The times reported are those to
+decompile all of them, to intersect and subset them with a hundredth of the
+glyphs (as the subsetter does), to access all their glyph names, and to
+compile them.
+"""
+from fontTools.ttLib import TTFont
+import fontTools.subset  # adds the subsetting methods
+from fontTools.ttLib.tables import otTables
+from fontTools.ttLib.tables.otBase import OTTableReader, OTTableWriter
+import argparse
+import random
+import time
+
+
+def makeTables(font, numTables, rng):
+    glyphOrder = font.getGlyphOrder()
+    coverages = []
+    classDefs = []
+    for i in range(numTables):
+        start = rng.randrange(len(glyphOrder) // 2)
+        if i % 2:
+            # sparse glyphs, compiled to format 1
+            glyphs = sorted(rng.sample(range(start, len(glyphOrder)), 200))
+        else:
+            # few long ranges, compiled to format 2
+            glyphs = [g for g in range(start, start + 2000) if g % 500 < 400]
+        coverage = otTables.Coverage()
+        coverage.glyphs = [glyphOrder[g] for g in glyphs]
+        classDef = otTables.ClassDef()
+        classDef.classDefs = {glyphOrder[g]: 1 + g // 50 % 8 for g in glyphs}
+        for table, tables in ((coverage, coverages), (classDef, classDefs)):
+            writer = OTTableWriter()
+            table.compile(writer, font)
+            tables.append(writer.getAllData())
+    return coverages, classDefs
+
+
+def decompile(font, tableClass, tables):
+    result = []
+    for data in tables:
+        table = tableClass()
+        table.decompile(OTTableReader(data), font)
+        result.append(table)
+    return result
+
+
+def compile(font, tables):
+    for table in tables:
+        writer = OTTableWriter()
+        table.compile(writer, font)
+        writer.getAllData()
+
+
+def timeit(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--glyphs", type=int, default=20000)
+    parser.add_argument("--tables", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    rng = random.Random(0)
+    glyphOrder = [".notdef"] + ["glyph%05d" % i for i in range(1, options.glyphs)]
+    font = TTFont()
+    font.setGlyphOrder(glyphOrder)
+    coverageData, classDefData = makeTables(font, options.tables, rng)
+    # the retained glyphs, with their glyph IDs, as the subsetter passes them
+    reverseGlyphMap = font.getReverseGlyphMap()
+    keep = fontTools.subset._GlyphSet(
+        {glyphName: reverseGlyphMap[glyphName]
+         for glyphName in rng.sample(glyphOrder, len(glyphOrder) // 100)},
+        font.getGlyphOrder())
+
+    def decompileAll():
+        return (decompile(font, otTables.Coverage, coverageData),
+                decompile(font, otTables.ClassDef, classDefData))
+
+    def subsetAll():
+        coverages, classDefs = decompileAll()
+        for coverage in coverages:
+            coverage.intersect(keep)
+            coverage.subset(keep)
+        for classDef in classDefs:
+            classDef.intersect(keep)
+            classDef.subset(keep, remap=True)
+
+    def namesAll():
+        coverages, classDefs = decompileAll()
+        for coverage in coverages:
+            coverage.glyphs
+        for classDef in classDefs:
+            classDef.classDefs
+
+    def compileAll():
+        coverages, classDefs = decompileAll()
+        compile(font, coverages)
+        compile(font, classDefs)
+
+    decompileTime = timeit(decompileAll, options.repeat)
+    print("decompile %.3f s" % decompileTime)
+    print("subset    %.3f s" % (timeit(subsetAll, options.repeat) - decompileTime))
+    print("names     %.3f s" % (timeit(namesAll, options.repeat) - decompileTime))
+    print("compile   %.3f s" % (timeit(compileAll, options.repeat) - decompileTime))
+
+
+if __name__ == "__main__":
+    main()
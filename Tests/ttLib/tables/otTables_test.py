@@ -369,6 +369,116 @@ class AlternateSubstTest(unittest.TestCase):
         })
 
 
+class CoverageTest(unittest.TestCase):
+    def setUp(self):
+        self.glyphs = ".notdef A B C D E a b c d e".split()
+        self.font = FakeFont(self.glyphs)
+
+    def decompile(self, data):
+        table = otTables.Coverage()
+        table.decompile(OTTableReader(deHexStr(data)), self.font)
+        return table
+
+    def test_decompile_format1(self):
+        table = self.decompile("0001 0003 0001 0003 0008")
+        self.assertIsNotNone(table.getGlyphIDs())
+        self.assertEqual(list(table.getGlyphIDs()), [1, 3, 8])
+        self.assertEqual(table.glyphs, ["A", "C", "c"])
+        # once the names are accessed, they are the glyphs of the table
+        self.assertIsNone(table.getGlyphIDs())
+
+    def test_decompile_format1_unsorted(self):
+        table = self.decompile("0001 0002 0003 0001")
+        self.assertIsNone(table.getGlyphIDs())
+        self.assertEqual(table.glyphs, ["C", "A"])
+
+    def test_decompile_format2(self):
+        table = self.decompile(
+            "0002 0002 0001 0003 0000 0007 FFFF 0003")
+        glyphIDs = table.getGlyphIDs()
+        self.assertEqual(len(glyphIDs), 7)
+        self.assertEqual(
+            [glyphIDs.getIndex(gid) for gid in range(11)],
+            [-1, 0, 1, 2, -1, -1, -1, 3, 4, 5, 6])
+        self.assertEqual([glyphIDs.getGlyphID(i) for i in range(7)],
+                         [1, 2, 3, 7, 8, 9, 10])
+        self.assertEqual(table.glyphs, ["A", "B", "C", "b", "c", "d", "e"])
+
+    def test_compile(self):
+        for data in ("0001 0003 0001 0003 0008",
+                     "0002 0002 0001 0003 0000 0007 000A 0003"):
+            table = self.decompile(data)
+            writer = OTTableWriter()
+            table.compile(writer, self.font)
+            self.assertEqual(hexStr(writer.getAllData()),
+                             hexStr(deHexStr(data)))
+            self.assertIsNotNone(table.getGlyphIDs())
+
+    def test_eq(self):
+        table = self.decompile("0001 0003 0001 0003 0008")
+        other = makeCoverage(["A", "C", "c"])
+        other.Format = 1
+        self.assertEqual(table, other)
+        other.glyphs = ["A", "C"]
+        self.assertNotEqual(table, other)
+
+    def test_setGlyphs(self):
+        table = self.decompile("0001 0003 0001 0003 0008")
+        table.glyphs = ["B"]
+        self.assertIsNone(table.getGlyphIDs())
+        self.assertEqual(table.glyphs, ["B"])
+
+
+class ClassDefTest(unittest.TestCase):
+    def setUp(self):
+        self.glyphs = ".notdef A B C D E a b c d e".split()
+        self.font = FakeFont(self.glyphs)
+
+    def decompile(self, data):
+        table = otTables.ClassDef()
+        table.decompile(OTTableReader(deHexStr(data)), self.font)
+        return table
+
+    def test_decompile_format1(self):
+        table = self.decompile("0001 0002 0005 0001 0001 0000 0002 0002")
+        glyphIDs = table.getGlyphIDs()
+        self.assertEqual(list(glyphIDs), [(2, 1), (3, 1), (5, 2), (6, 2)])
+        self.assertEqual([glyphIDs.getClass(gid) for gid in range(8)],
+                         [None, None, 1, 1, None, 2, 2, None])
+        self.assertEqual(table.classDefs, {"B": 1, "C": 1, "E": 2, "a": 2})
+        self.assertIsNone(table.getGlyphIDs())
+
+    def test_decompile_format2(self):
+        table = self.decompile(
+            "0002 0003 0007 FFFF 0003 0001 0002 0001 0004 0004 0000")
+        self.assertEqual(table.getGlyphIDs().starts, [1, 7])
+        self.assertEqual(table.getGlyphIDs().ends, [3, 11])
+        self.assertEqual(table.classDefs, {
+            "A": 1, "B": 1, "b": 3, "c": 3, "d": 3, "e": 3})
+
+    def test_decompile_format2_overlapping(self):
+        table = self.decompile("0002 0002 0001 0003 0001 0002 0002 0002")
+        self.assertIsNone(table.getGlyphIDs())
+        self.assertEqual(table.classDefs, {"A": 1, "B": 2, "C": 1})
+
+    def test_compile(self):
+        for data in ("0001 0002 0005 0001 0001 0000 0002 0002",
+                     "0002 0002 0001 0002 0001 0007 000A 0003"):
+            table = self.decompile(data)
+            writer = OTTableWriter()
+            table.compile(writer, self.font)
+            self.assertEqual(hexStr(writer.getAllData()),
+                             hexStr(deHexStr(data)))
+            self.assertIsNotNone(table.getGlyphIDs())
+
+    def test_eq(self):
+        table = self.decompile("0001 0002 0002 0001 0002")
+        other = otTables.ClassDef()
+        other.Format = 1
+        other.classDefs = {"B": 1, "C": 2}
+        self.assertEqual(table, other)
+
+
 class RearrangementMorphActionTest(unittest.TestCase):
     def setUp(self):
         self.font = FakeFont(['.notdef', 'A', 'B', 'C'])
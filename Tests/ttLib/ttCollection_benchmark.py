@@ -0,0 +1,116 @@
+"""Time reading and saving a large font collection, whose fonts share most
+of their tables.
+
+    python Tests/ttLib/ttCollection_benchmark.py [--fonts N] [--glyphs N] [--repeat N] [TTC]
+
+Without a TTC argument, a synthetic collection is built with fontBuilder:
+the fonts have the same glyphs, and only differ in their 'name' table.
+The collection is read with shareTables=True and the given tables are
+decompiled in all fonts; then it is saved.
+"""
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont, TTCollection
+from io import BytesIO
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+
+def makeFont(numGlyphs, styleName):
+    glyphOrder = [".notdef"] + ["glyph%05d" % i for i in range(1, numGlyphs)]
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyphOrder)
+    fb.setupCharacterMap({0x4E00 + i: name for i, name in enumerate(glyphOrder[1:])})
+    glyphs = {}
+    for i, name in enumerate(glyphOrder):
+        pen = TTGlyphPen(None)
+        for j in range(4):
+            x = (i * 7 + j * 150) % 800
+            pen.moveTo((x, j * 200))
+            pen.lineTo((x + 100, j * 200 + 50))
+            pen.qCurveTo((x + 150, j * 200 + 100), (x, j * 200 + 150))
+            pen.closePath()
+        glyphs[name] = pen.glyph()
+    fb.setupGlyf(glyphs)
+    fb.setupHorizontalMetrics({name: (1000, glyphs[name].xMin) for name in glyphOrder})
+    fb.setupHorizontalHeader(ascent=880, descent=-120)
+    fb.setupNameTable({"familyName": "Synthetic", "styleName": styleName})
+    fb.setupOS2()
+    fb.setupPost()
+    return fb.font
+
+
+def makeCollection(path, numFonts, numGlyphs):
+    font = makeFont(numGlyphs, "Style0")
+    data = BytesIO()
+    font.save(data)
+    collection = TTCollection()
+    for i in range(numFonts):
+        font = TTFont(BytesIO(data.getvalue()))
+        font["name"].setName("Style%d" % i, 2, 3, 1, 0x409)
+        collection.fonts.append(font)
+    collection.save(path)
+
+
+def timeit(func, repeat):
+    """Return the best time of 'repeat' runs of func, and the peak memory
+    allocated during another run, which is slower as it is traced."""
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ttc", metavar="TTC", nargs="?")
+    parser.add_argument("--fonts", type=int, default=20)
+    parser.add_argument("--glyphs", type=int, default=20000)
+    parser.add_argument("--tables", default="cmap,hmtx,glyf")
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+    tags = options.tables.split(",")
+
+    tmp = tempfile.mkdtemp()
+    try:
+        if options.ttc:
+            path = options.ttc
+        else:
+            path = os.path.join(tmp, "Synthetic.ttc")
+            makeCollection(path, options.fonts, options.glyphs)
+        print("%s: %d bytes" % (os.path.basename(path), os.path.getsize(path)))
+
+        def read(lazy=None):
+            collection = TTCollection(path, shareTables=True, lazy=lazy)
+            for font in collection:
+                for tag in tags:
+                    if tag in font:
+                        font[tag]
+            return collection
+
+        for lazy in (None, True):
+            t, peak = timeit(lambda: read(lazy).close(), options.repeat)
+            print("read (lazy=%s): %.3f s, peak memory %.1f MB" % (lazy, t, peak / 2**20))
+
+        collection = read()
+        outPath = os.path.join(tmp, "Saved.ttc")
+        t, peak = timeit(lambda: collection.save(outPath), options.repeat)
+        print("save: %.3f s, peak memory %.1f MB, %d bytes" % (
+            t, peak / 2**20, os.path.getsize(outPath)))
+        collection.close()
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from fontTools.misc.py23 import *
+from fontTools.ttLib import TTCollection
+from fontTools.ttLib.sfnt import SFNTReader
+import os
+import pytest
+
+
+TTC_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "ttx", "data", "TestTTC.ttc"
+)
+
+
+@pytest.fixture
+def ttcPath(tmpdir):
+    # a collection whose fonts share all their tables, except 'name'
+    with TTCollection(TTC_PATH) as collection:
+        collection[1]["name"].setName("Other", 1, 3, 1, 0x409)
+        path = str(tmpdir / "test.ttc")
+        collection.save(path)
+    return path
+
+
+def test_save_shareTables(ttcPath):
+    with TTCollection(ttcPath) as collection:
+        font0, font1 = collection
+        assert sorted(font0.reader.keys()) == sorted(font1.reader.keys())
+        for tag in font0.reader.keys():
+            entry0 = font0.reader.tables[tag]
+            entry1 = font1.reader.tables[tag]
+            if tag == "name":
+                assert entry0.offset != entry1.offset
+            else:
+                assert (entry0.offset, entry0.length) == (entry1.offset, entry1.length)
+        assert font1["name"].getName(1, 3, 1, 0x409).toUnicode() == "Other"
+
+
+@pytest.mark.parametrize("lazy", [None, True])
+def test_read_shareTables(ttcPath, monkeypatch, lazy):
+    reads = []
+    getitem = SFNTReader.__getitem__
+
+    def readTable(self, tag):
+        reads.append(tag)
+        return getitem(self, tag)
+
+    monkeypatch.setattr(SFNTReader, "__getitem__", readTable)
+    with TTCollection(ttcPath, shareTables=True, lazy=lazy) as collection:
+        font0, font1 = collection
+        assert font0["glyf"] is font1["glyf"]
+        assert font0["cmap"] is font1["cmap"]
+        assert font0["name"] is not font1["name"]
+        # shared tables are only read once
+        assert reads.count("glyf") == reads.count("cmap") == 1
+        assert reads.count("name") == 2
+        if not lazy:
+            # the fonts don't read the file each
+            assert font0.reader.file.getvalue() is font1.reader.file.getvalue()
+
+
+def test_read_no_shareTables(ttcPath):
+    with TTCollection(ttcPath) as collection:
+        font0, font1 = collection
+        assert font0["cmap"] is not font1["cmap"]
+        assert font0["cmap"].getcmap(3, 1).cmap == font1["cmap"].getcmap(3, 1).cmap
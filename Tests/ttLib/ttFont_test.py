@@ -0,0 +1,140 @@
+from fontTools.misc.py23 import *
+from fontTools.ttLib import TTFont, newTable
+import os
+import pytest
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ttx", "data")
+TTF_PATH = os.path.join(DATA_DIR, "TestTTF.ttf")
+OTF_PATH = os.path.join(DATA_DIR, "TestOTF.otf")
+
+
+def loadAllTables(font):
+    for tag in font.keys():
+        font[tag]
+
+
+def getTableData(font, tag):
+    data = font.reader[tag]
+    if tag == "head":
+        # leave out checkSumAdjustment, which is set upon save
+        data = data[:8] + data[12:]
+    return data
+
+
+def saveFont(font):
+    buf = BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def compiledTags(monkeypatch):
+    tags = []
+    for tag in ("glyf", "loca", "maxp", "hmtx", "hhea", "cmap", "name", "post", "CFF "):
+        tableClass = type(newTable(tag))
+        compile = tableClass.compile
+
+        def recordCompile(self, ttFont, compile=compile):
+            tags.append(self.tableTag)
+            return compile(self, ttFont)
+
+        monkeypatch.setattr(tableClass, "compile", recordCompile)
+    return tags
+
+
+@pytest.mark.parametrize("path", [TTF_PATH, OTF_PATH])
+def test_save_reuseUnmodifiedTables(path, compiledTags):
+    with TTFont(path, recalcTimestamp=False, reuseUnmodifiedTables=True) as font:
+        loadAllTables(font)
+        tags = [tag for tag in font.keys() if tag != "GlyphOrder"]
+        assert not any(font.isDirty(tag) for tag in tags)
+        font["name"].setName("Changed", 1, 3, 1, 0x409)
+        assert [tag for tag in tags if font.isDirty(tag)] == ["name"]
+        data = saveFont(font)
+        nameData = font["name"].compile(font)
+    assert compiledTags == ["name", "name"]
+
+    with TTFont(path) as original, TTFont(BytesIO(data)) as saved:
+        assert saved.keys() == original.keys()
+        for tag in tags:
+            if tag == "name":
+                assert saved.reader[tag] == nameData
+            else:
+                assert getTableData(saved, tag) == getTableData(original, tag)
+
+
+def test_isDirty_dependencies():
+    with TTFont(TTF_PATH, reuseUnmodifiedTables=True) as font:
+        loadAllTables(font)
+        assert not font.isDirty("loca")
+        glyph = font["glyf"]["period"]
+        glyph.coordinates[0] = (glyph.coordinates[0][0] + 1, 0)
+        # the tables depending on 'glyf' are compiled again with it
+        for tag in ("glyf", "loca", "maxp", "head", "hhea"):
+            assert font.isDirty(tag)
+        assert not font.isDirty("cmap")
+        assert not font.isDirty("missing")
+
+    with TTFont(TTF_PATH, reuseUnmodifiedTables=True) as font:
+        loadAllTables(font)
+        advance, lsb = font["hmtx"]["period"]
+        font["hmtx"]["period"] = (advance, lsb + 1)
+        # 'maxp' sets the flags of 'head' from the side bearings
+        for tag in ("hmtx", "hhea", "maxp", "head"):
+            assert font.isDirty(tag)
+        assert not font.isDirty("glyf")
+
+
+def test_isDirty_compileReads():
+    def addCharacter(font):
+        loadAllTables(font)
+        for table in font["cmap"].tables:
+            if table.isUnicode():
+                table.cmap[0xE000] = "period"
+
+    with TTFont(TTF_PATH, recalcTimestamp=False) as font:
+        addCharacter(font)
+        expected = saveFont(font)
+    with TTFont(TTF_PATH, recalcTimestamp=False, reuseUnmodifiedTables=True) as font:
+        addCharacter(font)
+        tags = [tag for tag in font.keys() if tag != "GlyphOrder"]
+        # 'OS/2' reads usFirstCharIndex and usLastCharIndex from 'cmap'
+        dirtyTags = [tag for tag in tags if font.isDirty(tag)]
+        assert dirtyTags == ["OS/2", "cmap"]
+        data = saveFont(font)
+
+    with TTFont(TTF_PATH) as original, TTFont(BytesIO(expected)) as plain, \
+            TTFont(BytesIO(data)) as saved:
+        assert saved["OS/2"].usLastCharIndex == 0xE000
+        for tag in tags:
+            if tag in dirtyTags:
+                assert getTableData(saved, tag) == getTableData(plain, tag)
+            else:
+                assert getTableData(saved, tag) == getTableData(original, tag)
+
+
+def test_markDirty(compiledTags):
+    with TTFont(TTF_PATH, reuseUnmodifiedTables=True) as font:
+        font["cmap"]
+        font["post"]
+        assert not font.isDirty("cmap")
+        font.markDirty("cmap")
+        assert font.isDirty("cmap")
+        # the recalculated timestamp of 'head' is always compiled
+        saveFont(font)
+        assert compiledTags == ["cmap"]
+        assert font.isDirty("head")
+        # all tables depend on the glyph order
+        font.setGlyphOrder(font.getGlyphOrder())
+        assert font.isDirty("post")
+
+
+def test_isDirty_not_tracked():
+    with TTFont(TTF_PATH) as font:
+        assert not font.isDirty("cmap")
+        font["cmap"]
+        assert font.isDirty("cmap")
+    font = TTFont()
+    font["name"] = newTable("name")
+    assert font.isDirty("name")
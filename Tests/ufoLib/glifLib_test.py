@@ -2,12 +2,15 @@ import os
 import tempfile
 import shutil
 import unittest
+from unittest import mock
 from io import open
 from .testSupport import getDemoFontGlyphSetPath
+from fontTools.ufoLib import glifLib
 from fontTools.ufoLib.glifLib import (
 	GlyphSet, glyphNameToFileName, readGlyphFromString, writeGlyphToString,
 )
 from fontTools.misc.etree import XML_DECLARATION
+from fontTools.pens.recordingPen import RecordingPointPen
 
 GLYPHSETDIR = getDemoFontGlyphSetPath()
 
@@ -107,6 +110,94 @@ class GlyphSetTests(unittest.TestCase):
 			else:
 				self.assertEqual(g.unicodes, unicodes[glyphName])
 
+	def _readGlyphsOneByOne(self, gset):
+		glyphs = {}
+		for glyphName in gset.keys():
+			glyph = _Glyph()
+			pen = RecordingPointPen()
+			gset.readGlyph(glyphName, glyph, pen)
+			glyphs[glyphName] = (glyph.__dict__, pen.value)
+		return glyphs
+
+	def _readGlyphs(self, gset, **kwargs):
+		glyphNames = gset.keys()
+		glyphObjects = {glyphName: _Glyph() for glyphName in glyphNames}
+		pointPens = {glyphName: RecordingPointPen() for glyphName in glyphNames}
+		gset.readGlyphs(glyphNames, glyphObjects, pointPens, **kwargs)
+		return {
+			glyphName: (glyphObjects[glyphName].__dict__, pointPens[glyphName].value)
+			for glyphName in glyphNames
+		}
+
+	def testReadGlyphs(self):
+		gset = GlyphSet(GLYPHSETDIR, validateRead=True, validateWrite=True)
+		expected = self._readGlyphsOneByOne(gset)
+		self.assertEqual(self._readGlyphs(gset), expected)
+		self.assertEqual(self._readGlyphs(gset, maxWorkers=1), expected)
+		self.assertEqual(
+			self._readGlyphs(gset, maxWorkers=2, useProcesses=True), expected)
+
+	def testReadGLIFsThreads(self):
+		gset = GlyphSet(GLYPHSETDIR, validateRead=True, validateWrite=True)
+		glyphNames = gset.keys()
+		expected = [gset.getGLIF(glyphName) for glyphName in glyphNames]
+		with mock.patch.object(
+				glifLib, "ThreadPoolExecutor", wraps=glifLib.ThreadPoolExecutor) as executor:
+			# files on a local disk are read one after the other by default
+			self.assertEqual(gset._readGLIFs(glyphNames), expected)
+			gset.getUnicodes()
+			executor.assert_not_called()
+			self.assertEqual(gset._readGLIFs(glyphNames, maxWorkers=2), expected)
+			executor.assert_called_once_with(2)
+
+	def testReadGlyphsPartial(self):
+		gset = GlyphSet(GLYPHSETDIR, validateRead=True, validateWrite=True)
+		glyph = _Glyph()
+		pen = RecordingPointPen()
+		# glyphs without an object or pen are only parsed
+		gset.readGlyphs(["A", "B", "a"], {"A": glyph}, {"B": pen})
+		self.assertEqual(glyph.unicodes, [0x41])
+		self.assertTrue(pen.value)
+		with self.assertRaises(KeyError):
+			gset.readGlyphs(["A", "missing"])
+
+	def testGlyphIndex(self):
+		dstDir = os.path.join(self.dstDir, "glyphs")
+		shutil.copytree(GLYPHSETDIR, dstDir)
+		gset = GlyphSet(dstDir, useIndex=True)
+		unicodes = gset.getUnicodes()
+		components = gset.getComponentReferences()
+		self.assertTrue(os.path.exists(os.path.join(dstDir, ".glyphindex.plist")))
+		plain = GlyphSet(dstDir)
+		self.assertEqual(unicodes, plain.getUnicodes())
+		self.assertEqual(components, plain.getComponentReferences())
+
+		# a new glyph set reuses the stored index, and picks up changes
+		glyph = _Glyph()
+		gset.readGlyph("A", glyph)
+		glyph.unicodes = [0x41, 0x61]
+		gset.writeGlyph("A", glyph, gset["A"].drawPoints)
+		gset.writeGlyph("new", glyph, lambda pen: pen.addComponent("A", (1, 0, 0, 1, 0, 0)))
+		gset.deleteGlyph("B")
+		gset.writeContents()
+		gset = GlyphSet(dstDir, useIndex=True)
+		unicodes = gset.getUnicodes()
+		self.assertEqual(unicodes["A"], [0x41, 0x61])
+		self.assertEqual(unicodes["new"], [0x41, 0x61])
+		self.assertNotIn("B", unicodes)
+		self.assertEqual(gset.getComponentReferences(["new"]), {"new": ["A"]})
+		plain = GlyphSet(dstDir)
+		self.assertEqual(unicodes, plain.getUnicodes())
+		self.assertEqual(gset.getComponentReferences(), plain.getComponentReferences())
+
+	def testGlyphIndexCorrupt(self):
+		dstDir = os.path.join(self.dstDir, "glyphs")
+		shutil.copytree(GLYPHSETDIR, dstDir)
+		with open(os.path.join(dstDir, ".glyphindex.plist"), "wb") as f:
+			f.write(b"not a plist")
+		gset = GlyphSet(dstDir, useIndex=True)
+		self.assertEqual(gset.getUnicodes(), GlyphSet(dstDir).getUnicodes())
+
 
 class FileNameTests(unittest.TestCase):
 
@@ -0,0 +1,149 @@
+from fontTools.ufoLib.glifLib import GlyphSet
+from fontTools.ufoLib.glyphCache import GlyphCache
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from .testSupport import getDemoFontGlyphSetPath
+import pickle
+import pytest
+import sqlite3
+
+
+class _Glyph:
+    pass
+
+
+def drawSquare(pen, size):
+    pen.beginPath()
+    pen.addPoint((0, 0), "line")
+    pen.addPoint((0, size), "line")
+    pen.addPoint((size, size), "line")
+    pen.addPoint((size, 0), "line")
+    pen.endPath()
+
+
+def drawQuadratic(pen):
+    pen.beginPath()
+    pen.addPoint((0, 0), "qcurve")
+    pen.addPoint((0, 100))
+    pen.addPoint((100, 100), "qcurve")
+    pen.addPoint((100, 0))
+    pen.endPath()
+
+
+def writeGlyph(glyphSet, glyphName, drawPointsFunc, unicodes=(), width=500):
+    glyph = _Glyph()
+    glyph.width = width
+    glyph.unicodes = list(unicodes)
+    glyphSet.writeGlyph(glyphName, glyph, drawPointsFunc)
+    glyphSet.writeContents()
+
+
+@pytest.fixture
+def glyphSet(tmp_path):
+    path = tmp_path / "glyphs"
+    path.mkdir()
+    glyphSet = GlyphSet(str(path))
+    writeGlyph(glyphSet, "a", lambda pen: drawSquare(pen, 100), [0x61])
+    writeGlyph(glyphSet, "b", drawQuadratic, [0x62], width=600)
+    writeGlyph(glyphSet, "c", lambda pen: (
+        pen.addComponent("a", (1, 0, 0, 1, 0, 0)),
+        pen.addComponent("b", (1, 0, 0, 1, 200, 0)),
+    ))
+    writeGlyph(glyphSet, "space", lambda pen: None, [0x20], width=250)
+    return glyphSet
+
+
+def compileTTGlyph(glyphSet, glyphName):
+    pen = TTGlyphPen(glyphSet)
+    glyphSet[glyphName].draw(pen)
+    return pen.glyph()
+
+
+class GlyphCacheTest(object):
+
+    def test_getTTGlyphs(self, glyphSet, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        with GlyphCache(path) as cache:
+            glyphs = cache.getTTGlyphs(glyphSet)
+            assert len(cache) == 4
+        assert sorted(glyphs) == ["a", "b", "c", "space"]
+        for glyphName, compiled in glyphs.items():
+            expected = compileTTGlyph(glyphSet, glyphName)
+            if expected.isComposite():
+                assert compiled.glyph.components == expected.components
+            else:
+                assert compiled.glyph.compile(None) == expected.compile(None)
+        assert glyphs["a"].unicodes == [0x61]
+        assert glyphs["b"].width == 600
+        assert glyphs["c"].bounds == (0, 0, 300, 100)
+        assert glyphs["space"].bounds is None
+
+        with GlyphCache(path) as cache:
+            cached = cache.getTTGlyphs(glyphSet)
+        for glyphName, compiled in glyphs.items():
+            assert cached[glyphName][1:] == compiled[1:]
+            assert cached[glyphName].glyph is not compiled.glyph
+
+    def test_invalid_entries(self, glyphSet, tmp_path):
+        writeGlyph(glyphSet, "d", lambda pen: (
+            pen.addComponent("a", (0.5, 0, 0, 1.5, 10, 0)),
+        ))
+        path = str(tmp_path / "cache.sqlite")
+        with GlyphCache(path) as cache:
+            glyphs = cache.getTTGlyphs(glyphSet)
+        assert glyphs["d"].glyph.components == compileTTGlyph(glyphSet, "d").components
+
+        # the entries are data only: anything else is ignored, and the
+        # glyphs compiled again
+        db = sqlite3.connect(path)
+        with db:
+            db.execute("UPDATE glyphs SET info = ? WHERE rowid % 2", (
+                pickle.dumps((b"", 500, [], None)),))
+            db.execute("UPDATE glyphs SET info = '[500, [\"a\"], null, null]' WHERE NOT rowid % 2")
+        db.close()
+        with GlyphCache(path) as cache:
+            cached = cache.getTTGlyphs(glyphSet)
+            assert len(cache) == 5
+        for glyphName, compiled in glyphs.items():
+            assert cached[glyphName][1:] == compiled[1:]
+        assert cached["d"].glyph.components == glyphs["d"].glyph.components
+
+    def test_changed_component(self, glyphSet, tmp_path, monkeypatch):
+        path = str(tmp_path / "cache.sqlite")
+        with GlyphCache(path) as cache:
+            cache.getTTGlyphs(glyphSet)
+        writeGlyph(glyphSet, "a", lambda pen: drawSquare(pen, 300), [0x61])
+
+        compiled = []
+        readGlyphs = glyphSet.readGlyphs
+        def recordingReadGlyphs(glyphNames, *args, **kwargs):
+            compiled.extend(glyphNames)
+            return readGlyphs(glyphNames, *args, **kwargs)
+        monkeypatch.setattr(glyphSet, "readGlyphs", recordingReadGlyphs)
+
+        cache = GlyphCache(path)
+        glyphs = cache.getTTGlyphs(glyphSet)
+        # the composite depends on the bounds of its components
+        assert compiled == ["a", "c"]
+        assert glyphs["c"].bounds == (0, 0, 300, 300)
+        assert len(cache) == 6
+        # only the entries used since the cache was opened are kept
+        cache.prune()
+        assert len(cache) == 4
+        cache.close()
+
+    def test_getCharStrings(self):
+        glyphSet = GlyphSet(getDemoFontGlyphSetPath())
+        with GlyphCache(":memory:") as cache:
+            glyphs = cache.getCharStrings(glyphSet)
+            assert cache.getCharStrings(glyphSet, CFF2=True)
+            assert len(cache) == 2 * len(glyphSet)
+            cached = cache.getCharStrings(glyphSet, ["A", "B"])
+            assert len(cache) == 2 * len(glyphSet)
+        for glyphName in ("A", "B"):
+            glyph = glyphSet[glyphName]
+            pen = T2CharStringPen(glyphs[glyphName].width, glyphSet)
+            glyph.draw(pen)
+            expected = pen.getCharString()
+            expected.compile()
+            assert cached[glyphName].glyph.bytecode == expected.bytecode
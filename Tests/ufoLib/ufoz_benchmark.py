@@ -0,0 +1,107 @@
+"""Compare the time it takes to read a UFO from a directory and from a zip.
+
+    python Tests/ufoLib/ufoz_benchmark.py [--glyphs N] [--repeat N] [FONT.ufo]
+
+The UFO is zipped into a temporary .ufoz file, and read in three ways: as
+a directory, as a .ufoz file (which UFOReader reads with its ZipReaderFS),
+and through fs.zipfs.ReadZipFS, which UFOReader used before. The time to
+open the UFO and its default layer is reported separately from the time to
+get the character mapping and read all glyphs of the default layer.
+Without a FONT argument, a synthetic UFO is used.
+"""
+from fontTools.ufoLib import UFOReader, UFOWriter
+import fs.zipfs
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+
+class Glyph:
+    pass
+
+
+def makeUFO(path, numGlyphs):
+    def drawPoints(pen):
+        for contour in range(3):
+            pen.beginPath()
+            for i in range(20):
+                pen.addPoint((i * 10, contour * 100 + i),
+                             "line" if i % 3 == 0 else None if i % 3 == 1 else "curve")
+            pen.endPath()
+
+    with UFOWriter(path) as writer:
+        glyphSet = writer.getGlyphSet()
+        for i in range(numGlyphs):
+            glyph = Glyph()
+            glyph.width = 500
+            glyph.unicodes = [0xE000 + i]
+            glyphSet.writeGlyph("glyph%05d" % i, glyph, drawPoints)
+        glyphSet.writeContents()
+        writer.writeLayerContents()
+
+
+def zipUFO(ufoPath, ufozPath):
+    rootDir = os.path.basename(os.path.normpath(ufoPath))
+    with zipfile.ZipFile(ufozPath, "w", zipfile.ZIP_DEFLATED) as zf:
+        for dirPath, dirNames, fileNames in os.walk(ufoPath):
+            dirNames.sort()
+            for fileName in sorted(fileNames):
+                path = os.path.join(dirPath, fileName)
+                arcName = os.path.join(rootDir, os.path.relpath(path, ufoPath))
+                zf.write(path, arcName)
+
+
+def readUFO(makeReader):
+    """Return the time it takes to open the UFO and its default layer, and
+    to read the character mapping and all glyphs."""
+    start = time.time()
+    with makeReader() as reader:
+        glyphSet = reader.getGlyphSet()
+        opened = time.time()
+        reader.getCharacterMapping()
+        glyphNames = glyphSet.keys()
+        glyphSet.readGlyphs(glyphNames, {name: Glyph() for name in glyphNames})
+    return opened - start, time.time() - opened
+
+
+def openReadZipFS(path):
+    zipFS = fs.zipfs.ReadZipFS(path)
+    rootDir = [name for name in zipFS.listdir("/") if name != "__MACOSX"][0]
+    return zipFS.opendir(rootDir)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("font", metavar="FONT", nargs="?")
+    parser.add_argument("--glyphs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args(args)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        if options.font:
+            ufoPath = options.font
+        else:
+            ufoPath = os.path.join(tmp, "Synthetic.ufo")
+            makeUFO(ufoPath, options.glyphs)
+        ufozPath = os.path.join(tmp, "Font.ufoz")
+        zipUFO(ufoPath, ufozPath)
+
+        readers = [
+            ("directory", lambda: UFOReader(ufoPath, validate=False)),
+            ("ufoz", lambda: UFOReader(ufozPath, validate=False)),
+            ("fs.zipfs", lambda: UFOReader(openReadZipFS(ufozPath), validate=False)),
+        ]
+        for name, makeReader in readers:
+            times = [readUFO(makeReader) for _ in range(options.repeat)]
+            print("%-10s open %.3f s, read %.3f s" % (
+                name, min(t[0] for t in times), min(t[1] for t in times)))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
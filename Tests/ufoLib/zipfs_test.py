@@ -0,0 +1,105 @@
+from fontTools.ufoLib import UFOReader
+from fontTools.ufoLib.glifLib import GlyphSet
+from fontTools.ufoLib.zipfs import ZipReaderFS
+import fs.errors
+import os
+import zipfile
+import pytest
+
+
+TESTDATA = os.path.join(os.path.dirname(__file__), "testdata")
+TEST_UFO3 = os.path.join(TESTDATA, "TestFont1 (UFO3).ufo")
+TEST_UFOZ = os.path.join(TESTDATA, "TestFont1 (UFO3).ufoz")
+
+
+@pytest.fixture
+def zipPath(tmp_path):
+    path = str(tmp_path / "test.zip")
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("root/", b"")
+        zf.writestr("root/a.txt", b"a" * 100, zipfile.ZIP_DEFLATED)
+        zf.writestr("root/sub/b.txt", b"b", zipfile.ZIP_STORED)
+        zf.writestr("root/c.txt", b"c" * 10, zipfile.ZIP_DEFLATED)
+        zf.writestr("other.txt", b"zzzzz")
+    return path
+
+
+class ZipReaderFSTest(object):
+
+    def test_listing(self, zipPath):
+        with ZipReaderFS(zipPath) as zipFS:
+            assert sorted(zipFS.listdir("/")) == ["other.txt", "root"]
+            assert zipFS.listdir("root") == ["a.txt", "sub", "c.txt"]
+            # implied directory
+            assert zipFS.isdir("root/sub")
+            assert zipFS.isfile("/root/sub/b.txt")
+            assert not zipFS.exists("root/missing.txt")
+            infos = {
+                info.name: info
+                for info in zipFS.scandir("root", namespaces=["details"])
+            }
+            assert infos["a.txt"].size == 100
+            assert not infos["a.txt"].is_dir
+            assert infos["sub"].is_dir
+            with pytest.raises(fs.errors.ResourceNotFound):
+                zipFS.listdir("missing")
+            with pytest.raises(fs.errors.DirectoryExpected):
+                zipFS.listdir("root/a.txt")
+
+    def test_reading(self, zipPath):
+        with ZipReaderFS(zipPath) as zipFS:
+            assert zipFS.readbytes("root/a.txt") == b"a" * 100
+            assert zipFS.readtext("/root/sub/b.txt") == "b"
+            assert zipFS.readmany(["root/c.txt", "other.txt", "root/a.txt"]) == [
+                b"c" * 10, b"zzzzz", b"a" * 100
+            ]
+            with zipFS.openbin("root/c.txt") as f:
+                assert f.read() == b"c" * 10
+            with pytest.raises(fs.errors.ResourceNotFound):
+                zipFS.readbytes("root/missing.txt")
+            with pytest.raises(fs.errors.FileExpected):
+                zipFS.readbytes("root/sub")
+            with pytest.raises(fs.errors.ResourceReadOnly):
+                zipFS.openbin("root/a.txt", "w")
+            with pytest.raises(fs.errors.ResourceReadOnly):
+                zipFS.remove("root/a.txt")
+
+    def test_cache(self, zipPath):
+        with ZipReaderFS(zipPath, cacheSize=100) as zipFS:
+            # the files are read in the order they are stored in the zip
+            zipFS.readmany(["other.txt", "root/c.txt", "root/a.txt"])
+            # and the least recently read ones are evicted first
+            assert list(zipFS._cache) == ["/root/c.txt", "/other.txt"]
+            assert zipFS.readbytes("root/c.txt") == b"c" * 10
+            assert list(zipFS._cache) == ["/other.txt", "/root/c.txt"]
+            assert zipFS._cachedBytes == 15
+
+    def test_cache_duplicates(self, zipPath):
+        with ZipReaderFS(zipPath, cacheSize=100) as zipFS:
+            assert zipFS.readmany(["root/a.txt", "root/a.txt"]) == [b"a" * 100] * 2
+            assert list(zipFS._cache) == ["/root/a.txt"]
+            assert zipFS._cachedBytes == 100
+            zipFS.readmany(["root/c.txt", "other.txt", "root/c.txt"])
+            assert list(zipFS._cache) == ["/root/c.txt", "/other.txt"]
+            assert zipFS._cachedBytes == 15
+
+    def test_bad_crc(self, zipPath, tmp_path):
+        with open(zipPath, "rb") as f:
+            data = f.read()
+        path = str(tmp_path / "bad.zip")
+        with open(path, "wb") as f:
+            f.write(data.replace(b"zzzzz", b"yyyyy"))
+        with ZipReaderFS(path) as zipFS:
+            with pytest.raises(zipfile.BadZipFile):
+                zipFS.readbytes("other.txt")
+
+    def test_UFOReader(self):
+        with UFOReader(TEST_UFOZ) as ufoz, UFOReader(TEST_UFO3) as ufo:
+            assert isinstance(ufoz.fs.delegate_fs(), ZipReaderFS)
+            assert ufoz.getCharacterMapping() == ufo.getCharacterMapping()
+            assert ufoz.readLib() == ufo.readLib()
+            glyphSet = ufoz.getGlyphSet()
+            glyphNames = glyphSet.keys()
+            assert glyphSet._readGLIFs(glyphNames) == [
+                ufo.getGlyphSet().getGLIF(glyphName) for glyphName in glyphNames
+            ]
@@ -676,6 +676,32 @@ class BuildTest(unittest.TestCase):
             ("B", "D"): 40,
         }
 
+    def test_kerning_merging_compactPairPos(self):
+        ds_path = self.get_test_input("KerningMerging.designspace")
+        ttx_dir = self.get_test_input("master_kerning_merging")
+
+        kerning = []
+        for compactPairPos in (False, True):
+            ds = DesignSpaceDocument.fromfile(ds_path)
+            for source in ds.sources:
+                ttx_dump = TTFont()
+                ttx_dump.importXML(
+                    os.path.join(
+                        ttx_dir,
+                        os.path.basename(source.filename).replace(".ttf", ".ttx"),
+                    )
+                )
+                source.font = reload_font(ttx_dump)
+            varfont, _, _ = build(ds, compactPairPos=compactPairPos)
+            varfont = reload_font(varfont)
+            flat = {}
+            for lookup in varfont["GPOS"].table.LookupList.Lookup:
+                for subtable in lookup.SubTable:
+                    if subtable.Format == 2:
+                        flat.update(_extract_flat_kerning(varfont, subtable))
+            kerning.append(flat)
+        assert kerning[0] == kerning[1]
+
 
 def test_load_masters_layerName_without_required_font():
     ds = DesignSpaceDocument()